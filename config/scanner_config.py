@@ -1,6 +1,8 @@
 # src/scanner/scanner_config.py
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Any, Optional, Iterable
+import hashlib
+import json
 from enum import Enum
 from datetime import datetime
 
@@ -30,12 +32,17 @@ class ScannerConfig:
     # Scan Behavior Configuration
     max_symbols_to_scan: int = 500
     real_time_scan_interval: int = 300  # 5 minutes for real-time scanning
+    real_time_watchlist_size: int = 50  # Symbols subscribed to live prices in real-time scanning
     cache_duration: int = 300  # 5 minutes
+    max_concurrency: int = 8  # Worker threads for history fetches without a scheduler and for analysis
+    analysis_batch_size: int = 50  # Symbols analyzed together in one vectorized indicator pass
     
     # Strategy Configuration
     enabled_strategies: List[str] = field(default_factory=lambda: ['bull_trend_pullback'])
     min_confidence_score: int = 60
     max_candidates: int = 25
+    strategy_workers: int = 1  # Processes for strategy evaluation; 1 evaluates in the scanning process
+    strategy_batch_size: int = 200  # Symbols sent to the strategy worker pool at a time
     
     # <EOD Data Configuration - Begin>
     # Data Source Configuration
@@ -85,6 +92,24 @@ class ScannerConfig:
             'excluded_sectors': self.excluded_sectors,
             'included_exchanges': self.included_exchanges
         }
+    
+    # <Scan Cache Fingerprints - Begin>
+    # Settings the Tier 1 scanner (universe, history, technical data) depends on; the rest only affect strategies
+    TIER1_FIELDS = ('min_volume', 'min_market_cap', 'min_price', 'ema_short_term', 'ema_medium_term',
+                    'ema_long_term', 'max_pullback_distance_pct', 'max_symbols_to_scan', 'use_eod_data',
+                    'data_type', 'excluded_sectors', 'included_exchanges')
+    
+    def fingerprint(self, fields: Optional[Iterable[str]] = None) -> str:
+        """Stable hash of the given settings (all settings by default), used as a scan cache key"""
+        values = asdict(self)
+        if fields is not None:
+            values = {name: values[name] for name in fields}
+        encoded = json.dumps(values, sort_keys=True, default=str)
+        return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+    
+    def tier1_fingerprint(self) -> str:
+        return self.fingerprint(self.TIER1_FIELDS)
+    # <Scan Cache Fingerprints - End>
 
 # ADD THE MISSING ScanResult CLASS
 @dataclass
@@ -91,9 +91,73 @@ BASE_TRADING_CORE_CONFIG: Dict[str, Any] = {
         'close_day_positions': True,      # Close all DAY strategy positions
         'close_expired_hybrid': True,     # Close expired HYBRID positions
         'expire_planned_orders': True,    # Expire corresponding PlannedOrders
-        'leave_core_positions': True      # Leave CORE positions with bracket orders
-    }
+        'leave_core_positions': True,     # Leave CORE positions with bracket orders
+        'archive_old_orders': True        # Run the order archive once per trading day
+    },
     # <End of Day Configuration - End>
+    # <Archive Configuration - Begin>
+    'archive': {
+        'order_retention_days': 30,       # Terminal orders older than this leave the hot tables
+        'telemetry_retention_days': 14,   # Attempts, probability scores and snapshots older than this
+        'batch_size': 1000                # Rows moved per archive statement
+    },
+    # <Archive Configuration - End>
+    # <Historical Data Pacing Configuration - Begin>
+    'historical_data': {
+        'max_in_flight': 6,               # Concurrent historical requests kept open at IBKR
+        'pacing_window_requests': 60,     # IBKR: at most 60 requests ...
+        'pacing_window_seconds': 600,     # ... in any 10 minute window
+        'identical_request_seconds': 15,  # IBKR: no identical request within 15 seconds
+        'contract_burst_requests': 6,     # IBKR: at most 6 requests for one contract ...
+        'contract_burst_seconds': 2,      # ... within 2 seconds
+        'request_timeout_seconds': 15,    # Give up on a request that never completes
+        'max_retries': 3,                 # Retries after a pacing violation
+        'backoff_base_seconds': 10,       # First pacing backoff, doubled per retry
+        'backoff_max_seconds': 120,
+        'bar_log_sample_every': 0,        # Log every Nth historical bar for diagnostics (0 = summary only)
+        # <Historical Bar Cache Configuration - Begin>
+        'bar_cache': {
+            'enabled': True,
+            'directory': 'data/bar_cache',  # One file per (symbol, bar_size, what_to_show)
+            'format': 'parquet',             # 'parquet' or 'feather'
+            'max_age_seconds': 300,          # Serve without contacting IBKR while this fresh
+            'bar_sizes': ['1 day'],          # Bar sizes served from the cache
+            'restatement_tolerance': 1e-4    # Relative close change on an overlapping bar that rebuilds the entry
+        },
+        # <Historical Bar Cache Configuration - End>
+        'memory_cache': {
+            'ttl_seconds': 60,   # Results shared in memory by every historical data consumer
+            'max_entries': 512   # LRU bound on cached request results
+        },
+        # <EOD File Feed Configuration - Begin>
+        'eod_files': {
+            'data_folder': r"C:\Robin\Data\Daily",        # Written by scripts/eod_data.py
+            'ticker_file': r"C:\Robin\Data\ticker_list.txt",
+            'cache_directory': None,   # Binary copies of the text files (default: <data_folder>/.cache)
+            'cache_format': 'feather'  # 'feather' (memory-mapped reads) or 'parquet'
+        }
+        # <EOD File Feed Configuration - End>
+    },
+    # <Historical Data Pacing Configuration - End>
+
+    # <Contract Cache Configuration - Begin>
+    'contract_cache': {
+        'enabled': True,
+        'path': 'data/contract_cache.json',  # symbol -> conId, primaryExchange, minTick, tradingHours
+        'max_age_days': 7,                   # Re-resolve entries older than this
+        'request_timeout_seconds': 10,       # Per batch of reqContractDetails requests
+        'max_in_flight': 20,                 # reqContractDetails requests open at once
+        'miss_ttl_seconds': 3600             # Do not re-ask IBKR for a symbol it could not resolve
+    },
+    # <Contract Cache Configuration - End>
+    # <Indicator State Configuration - Begin>
+    'indicator_state': {
+        'enabled': True,
+        'path': 'data/indicator_state.json',  # (symbol, timeframe, indicator, period) -> value at last bar
+        'flush_interval_seconds': 60,         # Write changed state at most this often
+        'restatement_tolerance': 1e-4         # Relative close change on a stored bar that forces a recompute
+    }
+    # <Indicator State Configuration - End>
 }
 
 # Paper trading configuration - same as base but with explicit name
@@ -284,7 +348,7 @@ def validate_config(config: Dict[str, Any]) -> tuple[bool, str]:
         # Validate boolean flags
         boolean_flags = [
             'enabled', 'close_day_positions', 'close_expired_hybrid',
-            'expire_planned_orders', 'leave_core_positions'
+            'expire_planned_orders', 'leave_core_positions', 'archive_old_orders'
         ]
         
         for flag in boolean_flags:
@@ -13,6 +13,7 @@ from ibapi.client import EClient
 from ibapi.wrapper import EWrapper
 
 from src.core.context_aware_logger import get_context_logger, TradingEventType
+from src.brokers.ibkr.core.contract_cache import ContractResolutionCache, get_contract_cache
 from src.trading.risk.account_utils import is_paper_account, get_ibkr_port
 
 
@@ -43,6 +44,11 @@ class ConnectionManager(EClient, EWrapper):
         # Error tracking
         self.displayed_errors = set()
         
+        # This object is the EWrapper IBKR calls, so contract details callbacks are routed from here
+        self.contract_cache: ContractResolutionCache = get_contract_cache()
+        # Set by IbkrClient so historical request errors (e.g. 162 pacing) reach its MarketDataHandler
+        self.market_data_handler = None
+        
         # Initialize EClient
         EClient.__init__(self, self)
         
@@ -169,6 +175,9 @@ class ConnectionManager(EClient, EWrapper):
     
     def error(self, reqId, errorCode, errorString, advancedOrderRejectJson="", *args) -> None:
         """Callback: Handle errors from IBKR API."""
+        self.contract_cache.contract_details_error(reqId, errorCode, errorString)
+        if self.market_data_handler is not None:
+            self.market_data_handler.historical_data_error(reqId, errorCode, errorString)
         super().error(reqId, errorCode, errorString, advancedOrderRejectJson)
         
         error_key = (reqId, errorCode)
@@ -188,6 +197,14 @@ class ConnectionManager(EClient, EWrapper):
                 }
             )
     
+    def contractDetails(self, reqId: int, contractDetails) -> None:
+        """Callback: One contract match for a reqContractDetails request."""
+        self.contract_cache.contract_details(reqId, contractDetails)
+    
+    def contractDetailsEnd(self, reqId: int) -> None:
+        """Callback: All matches delivered for a reqContractDetails request."""
+        self.contract_cache.contract_details_end(reqId)
+    
     def get_connection_status(self) -> dict:
         """Get current connection status and health."""
         return {
@@ -0,0 +1,407 @@
+# src/brokers/ibkr/core/contract_cache.py
+
+"""
+Persistent contract resolution cache for IBKR.
+Symbols are resolved once with batched reqContractDetails requests and their conId,
+primary exchange, minimum tick and trading hours are kept on disk, so contract
+builders can send fully qualified contracts instead of bare SMART/USD ones.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from ibapi.contract import Contract
+
+from config.trading_core_config import get_config
+from src.core.context_aware_logger import get_context_logger, TradingEventType
+
+# Primary listing venues preferred when IBKR returns several matches for one symbol
+PREFERRED_PRIMARY_EXCHANGES = ('NYSE', 'NASDAQ', 'ARCA', 'AMEX', 'BATS')
+
+
+@dataclass
+class ResolvedContract:
+    """Contract details kept for one symbol."""
+    symbol: str
+    con_id: int
+    primary_exchange: str
+    min_tick: float
+    trading_hours: str = ""
+    time_zone: str = ""
+    long_name: str = ""
+    sec_type: str = "STK"
+    currency: str = "USD"
+    resolved_at: float = 0.0  # Epoch seconds
+
+
+class ContractResolutionCache:
+    """
+    Symbol -> ResolvedContract store backed by a JSON file.
+
+    resolve_many() sends reqContractDetails for every symbol that is missing or older than
+    max_age_days, keeping up to max_in_flight requests open at once, and persists the results.
+    prefetch() queues the same requests without waiting, for warming the cache off the order
+    path. Symbols IBKR could not resolve are not asked for again for miss_ttl_seconds.
+    Lookups never contact IBKR; unresolved symbols fall back to bare contracts.
+    """
+
+    def __init__(self, path: str = os.path.join('data', 'contract_cache.json'), max_age_days: float = 7,
+                 request_timeout_seconds: float = 10, max_in_flight: int = 20, enabled: bool = True,
+                 miss_ttl_seconds: float = 3600):
+        self.context_logger = get_context_logger()
+        self.path = path
+        self.max_age_seconds = max_age_days * 86400
+        self.request_timeout = request_timeout_seconds
+        self.max_in_flight = max(1, max_in_flight)
+        self.miss_ttl_seconds = miss_ttl_seconds
+        self.enabled = enabled
+        self._lock = threading.RLock()
+        self._contracts: Dict[str, ResolvedContract] = {}
+        self._pending: Dict[int, Dict[str, Any]] = {}  # req_id -> {'symbol', 'details', 'future'}
+        self._pending_symbols: Dict[str, Future] = {}  # symbol -> future of its open request
+        self._misses: Dict[str, float] = {}  # symbol -> monotonic time IBKR last failed to resolve it
+        self._queued: deque = deque()  # Symbols waiting for a prefetch request slot
+        self._next_req_id = 90000  # Clear of the historical data and scanner request id ranges
+        self._metrics = {'lookups': 0, 'hits': 0, 'requests': 0, 'resolved': 0, 'unresolved': 0,
+                         'miss_cache_hits': 0}
+        if enabled:
+            self._load()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict] = None) -> 'ContractResolutionCache':
+        """Build the cache from config['contract_cache']."""
+        settings = (config or get_config()).get('contract_cache', {})
+        return cls(
+            path=settings.get('path', os.path.join('data', 'contract_cache.json')),
+            max_age_days=settings.get('max_age_days', 7),
+            request_timeout_seconds=settings.get('request_timeout_seconds', 10),
+            max_in_flight=settings.get('max_in_flight', 20),
+            enabled=settings.get('enabled', True),
+            miss_ttl_seconds=settings.get('miss_ttl_seconds', 3600)
+        )
+
+    # <Contract Lookup - Begin>
+    def get(self, symbol: str) -> Optional[ResolvedContract]:
+        """Cached details for symbol, or None when unknown or expired."""
+        with self._lock:
+            self._metrics['lookups'] += 1
+            resolved = self._contracts.get(symbol)
+            if resolved is None or self._is_expired(resolved):
+                return None
+            self._metrics['hits'] += 1
+            return resolved
+
+    def min_tick(self, symbol: str) -> Optional[float]:
+        resolved = self.get(symbol)
+        return resolved.min_tick if resolved and resolved.min_tick > 0 else None
+
+    def build_contract(self, symbol: str, sec_type: str = "STK", exchange: str = "SMART",
+                       currency: str = "USD") -> Contract:
+        """A SMART-routed contract for symbol, qualified with conId and primary exchange when known."""
+        contract = Contract()
+        contract.symbol = symbol
+        contract.secType = sec_type
+        contract.exchange = exchange
+        contract.currency = currency
+        return self.apply(contract)
+
+    def apply(self, contract: Contract) -> Contract:
+        """Fill conId and primaryExchange on a bare contract in place if the cached entry matches it."""
+        if not self.enabled or getattr(contract, 'conId', 0):
+            return contract
+        resolved = self.get(contract.symbol)
+        if resolved is not None and resolved.sec_type == contract.secType and resolved.currency == contract.currency:
+            contract.conId = resolved.con_id
+            contract.primaryExchange = resolved.primary_exchange
+        return contract
+    # <Contract Lookup - End>
+
+    # <Batched Resolution - Begin>
+    def resolve_many(self, ibkr_client, symbols: Iterable[str],
+                     timeout: Optional[float] = None) -> Dict[str, Optional[ResolvedContract]]:
+        """
+        Resolve every symbol that is not cached yet and return symbol -> details (None if unresolved).
+        Requests go out max_in_flight at a time; the cache file is written once at the end.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        results = {symbol: self.get(symbol) for symbol in symbols}
+        with self._lock:
+            missing = [symbol for symbol, resolved in results.items()
+                       if resolved is None and not self._recently_missed(symbol)]
+        if (not missing or not self.enabled or ibkr_client is None
+                or not getattr(ibkr_client, 'connected', False)):
+            return results
+
+        timeout = self.request_timeout if timeout is None else timeout
+        for start in range(0, len(missing), self.max_in_flight):
+            wave = {symbol: self._request(ibkr_client, symbol) for symbol in missing[start:start + self.max_in_flight]}
+            deadline = time.monotonic() + timeout
+            for symbol, future in wave.items():
+                try:
+                    results[symbol] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except FutureTimeoutError:
+                    future.cancel()
+                    self._record_miss(symbol)
+                    results[symbol] = None
+                except Exception:
+                    results[symbol] = None
+
+        resolved_count = sum(1 for symbol in missing if results[symbol] is not None)
+        with self._lock:
+            self._metrics['resolved'] += resolved_count
+            self._metrics['unresolved'] += len(missing) - resolved_count
+        if resolved_count:
+            self._save()
+
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Contract details resolved",
+            context_provider={
+                "symbols_requested": len(symbols),
+                "already_cached": len(symbols) - len(missing),
+                "resolved": resolved_count,
+                "unresolved": [symbol for symbol in missing if results[symbol] is None][:10]
+            },
+            decision_reason="CONTRACT_DETAILS_RESOLVED"
+        )
+        return results
+
+    def prefetch(self, ibkr_client, symbols: Iterable[str]) -> int:
+        """
+        Queue resolution of symbols that are not cached and return at once.
+        Requests go out max_in_flight at a time as earlier ones complete, and the results land
+        in the cache through the IBKR callbacks. Returns the number of symbols queued.
+        """
+        if not self.enabled or ibkr_client is None or not getattr(ibkr_client, 'connected', False):
+            return 0
+        with self._lock:
+            queued = [symbol for symbol in dict.fromkeys(symbols)
+                      if symbol not in self._queued and self._needs_request(symbol)]
+            self._queued.extend(queued)
+        self._pump(ibkr_client)
+        return len(queued)
+
+    def _pump(self, ibkr_client) -> None:
+        """Send queued prefetch requests while request slots are free."""
+        while True:
+            with self._lock:
+                if not self._queued or len(self._pending) >= self.max_in_flight:
+                    return
+                symbol = self._queued.popleft()
+                if not self._needs_request(symbol):
+                    continue
+            future = self._request(ibkr_client, symbol)
+            future.add_done_callback(lambda _: self._pump(ibkr_client))
+
+    def _needs_request(self, symbol: str) -> bool:
+        """Caller holds the lock. True when symbol is neither cached, in flight nor a recent miss."""
+        resolved = self._contracts.get(symbol)
+        if resolved is not None and not self._is_expired(resolved):
+            return False
+        return symbol not in self._pending_symbols and not self._recently_missed(symbol)
+
+    def _recently_missed(self, symbol: str) -> bool:
+        """Caller holds the lock."""
+        missed_at = self._misses.get(symbol)
+        if missed_at is None:
+            return False
+        if time.monotonic() - missed_at > self.miss_ttl_seconds:
+            del self._misses[symbol]
+            return False
+        self._metrics['miss_cache_hits'] += 1
+        return True
+
+    def _record_miss(self, symbol: str) -> None:
+        with self._lock:
+            self._misses[symbol] = time.monotonic()
+
+    def _request(self, ibkr_client, symbol: str) -> Future:
+        with self._lock:
+            existing = self._pending_symbols.get(symbol)
+            if existing is not None:
+                return existing
+            future = Future()
+            req_id = self._next_req_id
+            self._next_req_id += 1
+            self._pending[req_id] = {'symbol': symbol, 'details': [], 'future': future}
+            self._pending_symbols[symbol] = future
+            self._metrics['requests'] += 1
+        future.add_done_callback(lambda _: self._forget(req_id))
+
+        contract = Contract()
+        contract.symbol = symbol
+        contract.secType = "STK"
+        contract.exchange = "SMART"
+        contract.currency = "USD"
+        try:
+            ibkr_client.reqContractDetails(req_id, contract)
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _forget(self, req_id: int) -> None:
+        with self._lock:
+            pending = self._pending.pop(req_id, None)
+            if pending is not None and self._pending_symbols.get(pending['symbol']) is pending['future']:
+                del self._pending_symbols[pending['symbol']]
+    # <Batched Resolution - End>
+
+    # <IBKR Callbacks - Begin>
+    def contract_details(self, req_id: int, details) -> None:
+        """contractDetails callback: collect one match for the request."""
+        with self._lock:
+            pending = self._pending.get(req_id)
+            if pending is not None:
+                pending['details'].append(details)
+
+    def contract_details_end(self, req_id: int) -> None:
+        """contractDetailsEnd callback: pick the best match, cache it and resolve the request."""
+        with self._lock:
+            pending = self._pending.get(req_id)
+            if pending is None:
+                return
+            resolved = self._select(pending['symbol'], pending['details'])
+            if resolved is not None:
+                self._contracts[resolved.symbol] = resolved
+                self._misses.pop(resolved.symbol, None)
+            else:
+                self._misses[pending['symbol']] = time.monotonic()
+        future = pending['future']
+        if future.set_running_or_notify_cancel():
+            future.set_result(resolved)
+
+    def contract_details_error(self, req_id: int, error_code: int, error_string: str) -> bool:
+        """Fail a pending resolution on an IBKR error (e.g. 200: no security definition). Returns True if it was ours."""
+        with self._lock:
+            pending = self._pending.get(req_id)
+        if pending is None:
+            return False
+
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Contract details request rejected by IBKR",
+            symbol=pending['symbol'],
+            context_provider={
+                "request_id": req_id,
+                "error_code": error_code,
+                "error_message": error_string
+            },
+            decision_reason="CONTRACT_DETAILS_ERROR"
+        )
+        self._record_miss(pending['symbol'])
+        future = pending['future']
+        if future.set_running_or_notify_cancel():
+            future.set_result(None)
+        return True
+
+    @staticmethod
+    def _select(symbol: str, details: List) -> Optional[ResolvedContract]:
+        """Choose among the matches, preferring a US primary listing."""
+        if not details:
+            return None
+        ranked = sorted(
+            details,
+            key=lambda d: (PREFERRED_PRIMARY_EXCHANGES.index(d.contract.primaryExchange)
+                           if d.contract.primaryExchange in PREFERRED_PRIMARY_EXCHANGES
+                           else len(PREFERRED_PRIMARY_EXCHANGES))
+        )
+        best = ranked[0]
+        return ResolvedContract(
+            symbol=symbol,
+            con_id=int(best.contract.conId),
+            primary_exchange=best.contract.primaryExchange or "",
+            min_tick=float(best.minTick or 0.0),
+            trading_hours=getattr(best, 'tradingHours', "") or "",
+            time_zone=getattr(best, 'timeZoneId', "") or "",
+            long_name=getattr(best, 'longName', "") or "",
+            sec_type=best.contract.secType or "STK",
+            currency=best.contract.currency or "USD",
+            resolved_at=time.time()
+        )
+    # <IBKR Callbacks - End>
+
+    # <Persistence - Begin>
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Forget one symbol (e.g. after a ticker change), or everything."""
+        with self._lock:
+            if symbol is None:
+                self._contracts.clear()
+            else:
+                self._contracts.pop(symbol, None)
+        self._save()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._metrics, 'cached_contracts': len(self._contracts), 'pending': len(self._pending),
+                    'queued': len(self._queued), 'known_misses': len(self._misses)}
+
+    def _is_expired(self, resolved: ResolvedContract) -> bool:
+        return time.time() - resolved.resolved_at > self.max_age_seconds
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            self._contracts = {symbol: ResolvedContract(**entry) for symbol, entry in entries.items()}
+        except Exception as e:
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Contract cache read failed - starting empty",
+                context_provider={
+                    "path": self.path,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                },
+                decision_reason="CONTRACT_CACHE_READ_FAILED"
+            )
+
+    def _save(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            entries = {symbol: asdict(resolved) for symbol, resolved in self._contracts.items()}
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Contract cache write failed",
+                context_provider={
+                    "path": self.path,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                },
+                decision_reason="CONTRACT_CACHE_WRITE_FAILED"
+            )
+    # <Persistence - End>
+
+
+# <Process-Wide Contract Cache - Begin>
+_contract_cache: Optional[ContractResolutionCache] = None
+_contract_cache_lock = threading.Lock()
+
+
+def get_contract_cache() -> ContractResolutionCache:
+    """Return the contract cache shared by every contract builder in the process."""
+    global _contract_cache
+    with _contract_cache_lock:
+        if _contract_cache is None:
+            _contract_cache = ContractResolutionCache.from_config()
+        return _contract_cache
+# <Process-Wide Contract Cache - End>
@@ -227,37 +227,25 @@ class MarketDataHandler:
     def historicalData(self, reqId: int, bar) -> None:
         """
         Callback: Receive historical data bar and forward to HistoricalDataManager if set.
+        
+        Called once per bar on the reader thread, so the manager reference is read without
+        taking the lock (the attribute swap in set_historical_data_manager is atomic).
         """
-        # Thread-safe access to historical data manager
-        with self._historical_manager_lock:
-            if self.historical_data_manager:
-                try:
-                    self.historical_data_manager.historical_data(reqId, bar)
-                    
-                    # Log first successful historical data for debugging
-                    if hasattr(self, '_first_historical_received') and not self._first_historical_received:
-                        self._first_historical_received = True
-                        self.context_logger.log_event(
-                            TradingEventType.MARKET_CONDITION,
-                            "First historical data bar processed",
-                            context_provider={
-                                'req_id': reqId,
-                                'bar_date': bar.date,
-                                'close_price': bar.close,
-                                'volume': bar.volume
-                            }
-                        )
-                        
-                except Exception as e:
-                    self.context_logger.log_event(
-                        TradingEventType.SYSTEM_HEALTH,
-                        "Historical data processing error",
-                        context_provider={
-                            'req_id': reqId,
-                            'error': str(e),
-                            'bar_date': bar.date
-                        }
-                    )
+        manager = self.historical_data_manager
+        if manager is None:
+            return
+        try:
+            manager.historical_data(reqId, bar)
+        except Exception as e:
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Historical data processing error",
+                context_provider={
+                    'req_id': reqId,
+                    'error': str(e),
+                    'bar_date': bar.date
+                }
+            )
     
     def historicalDataEnd(self, reqId: int, start: str, end: str) -> None:
         """
@@ -290,6 +278,26 @@ class MarketDataHandler:
                         }
                     )
     
+    def historical_data_error(self, reqId: int, errorCode: int, errorString: str) -> None:
+        """
+        Callback: Forward request errors so HistoricalDataManager can fail the matching request.
+        """
+        with self._historical_manager_lock:
+            manager = self.historical_data_manager
+        if manager and hasattr(manager, 'historical_data_error'):
+            try:
+                manager.historical_data_error(reqId, errorCode, errorString)
+            except Exception as e:
+                self.context_logger.log_event(
+                    TradingEventType.SYSTEM_HEALTH,
+                    "Historical data error processing failed",
+                    context_provider={
+                        'req_id': reqId,
+                        'error_code': errorCode,
+                        'error': str(e)
+                    }
+                )
+
     def scannerData(self, reqId, rank, contractDetails, distance, benchmark, projection, legsStr):
         """Callback: Receive scanner data results and route to appropriate provider."""
         symbol = contractDetails.contract.symbol if contractDetails and contractDetails.contract else "UNKNOWN"
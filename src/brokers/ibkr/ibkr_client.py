@@ -19,6 +19,7 @@ from src.brokers.ibkr.core.order_manager import OrderManager
 from src.brokers.ibkr.core.market_data_handler import MarketDataHandler
 from src.brokers.ibkr.core.account_manager import AccountManager
 from src.brokers.ibkr.core.historical_data_handler import HistoricalDataHandler
+from src.brokers.ibkr.core.contract_cache import ContractResolutionCache, ResolvedContract
 
 
 class IbkrClient(EClient, EWrapper):
@@ -36,8 +37,10 @@ class IbkrClient(EClient, EWrapper):
         self.connection_manager = ConnectionManager(host, port, client_id, mode)
         self.order_manager = OrderManager(self.connection_manager)
         self.market_data_handler = MarketDataHandler(self.connection_manager)
+        self.connection_manager.market_data_handler = self.market_data_handler
         self.account_manager = AccountManager(self.connection_manager)
         self.historical_data_handler = HistoricalDataHandler(self.connection_manager)
+        self.contract_cache: ContractResolutionCache = self.connection_manager.contract_cache
 
         # Initialize EClient first with self as wrapper
         EClient.__init__(self, wrapper=self)
@@ -132,6 +135,19 @@ class IbkrClient(EClient, EWrapper):
     def cancelHistoricalData(self, reqId: int) -> None:
         self.historical_data_handler.cancel_historical_data(reqId)
     
+    # ===== CONTRACT DETAILS DELEGATION =====
+    def reqContractDetails(self, reqId: int, contract: Contract) -> None:
+        if self.connection_manager.connected:
+            self.connection_manager.reqContractDetails(reqId, contract)
+    
+    def resolve_contracts(self, symbols: List[str], timeout: Optional[float] = None) -> Dict[str, Optional[ResolvedContract]]:
+        """Resolve conId, primary exchange and minTick for symbols not yet in the contract cache."""
+        return self.contract_cache.resolve_many(self, symbols, timeout)
+    
+    def prefetch_contracts(self, symbols: List[str]) -> int:
+        """Queue contract resolution for uncached symbols without waiting; returns how many were queued."""
+        return self.contract_cache.prefetch(self, symbols)
+    
     # ===== CALLBACK DELEGATION =====
     # These methods will be called by IBKR API and delegate to appropriate managers
     
@@ -1,8 +1,16 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, scoped_session
-from .models import Base, PositionStrategy
+from .models import Base, PositionStrategy, SetupPerformanceDailyDB
 import os
 
+
+@event.listens_for(Base.metadata, 'after_create')
+def _create_union_views(target, connection, **kw):
+    """Every schema gets the <table>_all views that span hot and archived rows."""
+    from src.trading.orders.order_archive_service import refresh_union_views
+    refresh_union_views(connection)
+
+
 class DatabaseManager:
     """Manage database connections and sessions"""
     
@@ -26,6 +34,9 @@ class DatabaseManager:
         # Initialize default data
         self._init_default_data()
         
+        # Trades closed before setup rollups existed are only reachable through a rebuild
+        self._backfill_setup_performance_rollups()
+        
         print(f"✅ Database initialized: {self.db_path}")
         return True
     
@@ -54,6 +65,19 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def _backfill_setup_performance_rollups(self):
+        """Rebuild setup_performance_daily from closed trades while the rollup table is still empty"""
+        from src.trading.orders.order_persistence_service import OrderPersistenceService
+        session = self.Session()
+        
+        try:
+            if session.query(SetupPerformanceDailyDB.id).first() is None:
+                rebuilt = OrderPersistenceService(session).rebuild_setup_performance_rollups()
+                if rebuilt:
+                    print(f"✅ Setup performance rollups backfilled from {rebuilt} closed trades")
+        finally:
+            session.close()
+    
     def get_session(self):
         """Get a new database session"""
         if not self.Session:
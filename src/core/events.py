@@ -84,4 +84,23 @@ class OrderExecutedEvent(TradingEvent):
             'order_id': self.order_id,
             'quantity': self.quantity,
             'price': self.price
-        })
\ No newline at end of file
+        })
+
+@dataclass
+class TradingSignalEvent(TradingEvent):
+    """Event for a symbol entering or leaving a scanner strategy."""
+    symbol: str = ""
+    strategy_name: str = ""
+    action: str = ""  # ENTER, EXIT
+    confidence: float = 0.0
+    price: float = 0.0
+
+    def __post_init__(self):
+        self.event_type = EventType.TRADING_SIGNAL
+        self.data.update({
+            'symbol': self.symbol,
+            'strategy_name': self.strategy_name,
+            'action': self.action,
+            'confidence': self.confidence,
+            'price': self.price
+        })
@@ -3,7 +3,7 @@ SQLAlchemy ORM models defining the database schema for the trading system.
 Contains tables for trading strategies, planned orders, executed orders, and their relationships.
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, Enum, JSON
+from sqlalchemy import create_engine, Column, Integer, String, Float, Date, DateTime, ForeignKey, Text, Boolean, Enum, JSON, UniqueConstraint
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 import datetime
@@ -184,6 +184,66 @@ class MarketSnapshotDB(Base):
     vwap = Column(Float, nullable=True)
     level2_snapshot = Column(JSON, nullable=True)
 
+class SetupPerformanceDailyDB(Base):
+    """Per-day rollup of closed trades by trading setup and account, maintained incrementally on close."""
+    __tablename__ = 'setup_performance_daily'
+    __table_args__ = (
+        UniqueConstraint('setup_name', 'account_number', 'trade_date', name='uq_setup_performance_daily'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    setup_name = Column(String(100), nullable=False, index=True)
+    account_number = Column(String(20), nullable=True, index=True)  # Rollups are per account
+    trade_date = Column(Date, nullable=False, index=True)
+
+    trade_count = Column(Integer, nullable=False, default=0)
+    winning_trades = Column(Integer, nullable=False, default=0)
+    losing_trades = Column(Integer, nullable=False, default=0)
+    total_profit = Column(Float, nullable=False, default=0.0)   # Sum of positive P&L
+    total_loss = Column(Float, nullable=False, default=0.0)     # Sum of |non-positive P&L|
+    holding_minutes = Column(Float, nullable=False, default=0.0)  # Sum of planned order created -> filled
+    holding_count = Column(Integer, nullable=False, default=0)  # Trades with a measurable holding period
+    updated_at = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
+
+    def __repr__(self):
+        return (f"<SetupPerformanceDailyDB(setup='{self.setup_name}', account='{self.account_number}', "
+                f"date={self.trade_date}, trades={self.trade_count})>")
+
+class RealizedPnlLedgerDB(Base):
+    """Append-only ledger of realized P&L events; never updated or deleted in place."""
+    __tablename__ = 'realized_pnl_ledger'
+
+    id = Column(Integer, primary_key=True)
+    account_number = Column(String(20), nullable=True, index=True)
+    # No foreign key: closed executed orders move to executed_orders_archive_YYYYMM while the ledger stays
+    executed_order_id = Column(Integer, nullable=True, index=True)
+    order_id = Column(Integer, nullable=True)           # Caller-supplied order reference (e.g. planned order id)
+    symbol = Column(String(20), nullable=True)
+    pnl = Column(Float, nullable=False)
+    realized_at = Column(DateTime, nullable=False, default=datetime.datetime.now)
+    trade_date = Column(Date, nullable=False, index=True)
+    source = Column(String(50), nullable=True)
+
+    def __repr__(self):
+        return f"<RealizedPnlLedgerDB(id={self.id}, account='{self.account_number}', pnl={self.pnl})>"
+
+class RealizedPnlDailyDB(Base):
+    """Running per-day realized P&L sums per account, updated with every ledger append."""
+    __tablename__ = 'realized_pnl_daily'
+    __table_args__ = (
+        UniqueConstraint('account_number', 'trade_date', name='uq_realized_pnl_daily'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    account_number = Column(String(20), nullable=True)
+    trade_date = Column(Date, nullable=False, index=True)
+    realized_pnl = Column(Float, nullable=False, default=0.0)
+    trade_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
+
+    def __repr__(self):
+        return f"<RealizedPnlDailyDB(account='{self.account_number}', date={self.trade_date}, pnl={self.realized_pnl})>"
+
 # Extend PlannedOrderDB - Begin
 PlannedOrderDB.core_timeframe = Column(String(50), nullable=True)
 # Extend PlannedOrderDB - End
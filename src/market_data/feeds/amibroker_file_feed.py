@@ -0,0 +1,321 @@
+"""
+File-backed EOD data source reading the per-ticker AmiBroker ASCII files kept by scripts/eod_data.py.
+Serves both the scanner's historical data interface and AbstractDataFeed, so scans and offline
+runs work with no broker connection.
+"""
+
+import glob
+import importlib.util
+import os
+import threading
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from ibapi.contract import Contract
+
+from config.trading_core_config import get_config
+from src.core.context_aware_logger import get_context_logger, TradingEventType
+from src.market_data.feeds.abstract_data_feed import AbstractDataFeed
+
+# Each line: TICKER,YYYY-MM-DD,open,high,low,close,volume (no header)
+FILE_COLUMNS = ['ticker', 'date', 'open', 'high', 'low', 'close', 'volume']
+BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+FILE_DATE_FORMAT = '%Y-%m-%d'
+# Timeframe labels the daily files can serve (MarketContextService and IBKR bar size spellings)
+DAILY_TIMEFRAMES = ('1D', '1 day')
+
+
+class AmiBrokerFileFeed(AbstractDataFeed):
+    """
+    EOD bars from AmiBroker ASCII files, one '<TICKER>.txt' per symbol in data_folder.
+
+    Each text file is parsed once and converted to a Feather/Parquet file in cache_directory;
+    later loads read the binary copy (memory-mapped for Feather) until the text file changes.
+    Parsed series are also kept in memory for the life of the feed.
+    """
+
+    CACHE_SUFFIXES = {'feather': '.feather', 'parquet': '.parquet'}
+
+    def __init__(self, data_folder: str, ticker_file: Optional[str] = None,
+                 cache_directory: Optional[str] = None, cache_format: str = 'feather'):
+        if cache_format not in self.CACHE_SUFFIXES:
+            raise ValueError(f"Unsupported EOD file cache format: {cache_format}. "
+                             f"Available: {list(self.CACHE_SUFFIXES.keys())}")
+        self.context_logger = get_context_logger()
+        self.data_folder = data_folder
+        self.ticker_file = ticker_file
+        self.cache_directory = cache_directory or os.path.join(data_folder, '.cache')
+        self.cache_format = cache_format
+        self.cache_enabled = importlib.util.find_spec('pyarrow') is not None
+        self._connected = False
+        self._lock = threading.RLock()
+        self._bars: Dict[str, pd.DataFrame] = {}
+        self._subscriptions: Dict[str, Contract] = {}
+        self._metrics = {'text_parses': 0, 'cache_loads': 0, 'memory_hits': 0, 'missing_files': 0}
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict] = None) -> 'AmiBrokerFileFeed':
+        """Build the feed from config['historical_data']['eod_files']."""
+        settings = (config or get_config()).get('historical_data', {}).get('eod_files', {})
+        return cls(
+            data_folder=settings.get('data_folder', os.path.join('data', 'eod')),
+            ticker_file=settings.get('ticker_file'),
+            cache_directory=settings.get('cache_directory'),
+            cache_format=settings.get('cache_format', 'feather')
+        )
+
+    # <AbstractDataFeed Interface - Begin>
+    def connect(self) -> bool:
+        """Mark the feed ready if the data folder exists; no broker is involved."""
+        self._connected = os.path.isdir(self.data_folder)
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "EOD file feed connected" if self._connected else "EOD file feed data folder not found",
+            context_provider={
+                "data_folder": self.data_folder,
+                "cache_directory": self.cache_directory,
+                "cache_format": self.cache_format if self.cache_enabled else None
+            },
+            decision_reason="EOD_FILE_FEED_READY" if self._connected else "EOD_FILE_FEED_MISSING_FOLDER"
+        )
+        return self._connected
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def subscribe(self, symbol: str, contract: Contract) -> bool:
+        """Load the symbol's bars; fails when the symbol has no EOD file."""
+        bars = self.load_bars(symbol)
+        if bars is None or bars.empty:
+            return False
+        with self._lock:
+            self._subscriptions[symbol] = contract
+        return True
+
+    def get_current_price(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Last close in the file; files are end-of-day, so this is the most recent session close."""
+        bars = self.load_bars(symbol)
+        if bars is None or bars.empty:
+            return None
+        return {
+            'price': float(bars['close'].iat[-1]),
+            'timestamp': bars.index[-1].to_pydatetime(),
+            'data_type': 'EOD_FILE',
+            'updates': len(bars),
+            'history': bars['close'].iloc[-100:].tolist()
+        }
+    # <AbstractDataFeed Interface - End>
+
+    # <Scanner Data Interface - Begin>
+    def get_symbol_universe(self) -> List[str]:
+        """Symbols from the ticker list file when configured, otherwise every EOD file in the data folder."""
+        if self.ticker_file and os.path.exists(self.ticker_file):
+            with open(self.ticker_file, 'r', encoding='utf-8') as f:
+                return list(dict.fromkeys(line.strip() for line in f if line.strip()))
+        paths = glob.glob(os.path.join(self.data_folder, '*.txt'))
+        return sorted(os.path.splitext(os.path.basename(path))[0] for path in paths
+                      if os.path.basename(path) != 'failed_tickers.txt')
+
+    def get_historical_data(self, symbol: str, days: Union[int, str] = 100,
+                            bars: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        OHLCV bars covering the last `days` calendar days of the file, or None if there is no data.
+        The window ends at the last bar in the file rather than today, so stale files still scan.
+
+        Also accepts the data feed form (symbol, timeframe, bars) used by MarketContextService,
+        returning the last `bars` daily bars. The files hold daily bars only, so any other
+        timeframe raises ValueError rather than returning daily bars under an intraday label.
+        """
+        if isinstance(days, str) and days not in DAILY_TIMEFRAMES:
+            raise ValueError(f"AmiBroker EOD files only provide daily bars, not '{days}' "
+                             f"(supported: {list(DAILY_TIMEFRAMES)})")
+
+        data = self.load_bars(symbol)
+        if data is None or data.empty:
+            return None
+        if isinstance(days, str):
+            window = data.tail(bars if bars is not None else 100).copy()
+        else:
+            window = data[data.index > data.index[-1] - timedelta(days=days)].copy()
+        window['symbol'] = symbol
+        return window
+
+    def get_historical_data_batch(self, symbols: List[str], days: int = 100) -> Dict[str, Optional[pd.DataFrame]]:
+        return {symbol: self.get_historical_data(symbol, days) for symbol in symbols}
+
+    def get_dynamic_universe(self, filters: Dict) -> List[Dict]:
+        """
+        Symbols whose last bar passes the price and volume filters.
+        The files carry no market cap, so min_market_cap is not applied and market_cap is reported as 0.
+        """
+        min_volume = filters.get('min_volume', 1_000_000)
+        min_price = filters.get('min_price', 10)
+        symbols = self.get_symbol_universe()
+
+        last_dates, last_rows = {}, {}
+        for symbol in symbols:
+            bars = self.load_bars(symbol)
+            if bars is not None and not bars.empty:
+                last_dates[symbol] = bars.index[-1]
+                last_rows[symbol] = bars.iloc[-1].to_numpy()
+        if not last_rows:
+            return []
+
+        latest = pd.DataFrame.from_dict(last_rows, orient='index', columns=BAR_COLUMNS)
+        latest['date'] = pd.Series(last_dates)
+        qualified = latest[(latest['close'] >= min_price) & (latest['volume'] >= min_volume)]
+
+        universe = [
+            {
+                'symbol': symbol,
+                'price': float(row['close']),
+                'volume': int(row['volume']),
+                'market_cap': 0,
+                'data_type': 'EOD_FILE',
+                'timestamp': row['date'].to_pydatetime(),
+                'source': 'AmiBroker EOD files'
+            }
+            for symbol, row in qualified.iterrows()
+        ]
+
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Universe built from EOD files",
+            context_provider={
+                "total_symbols": len(symbols),
+                "symbols_with_data": len(last_rows),
+                "qualified_stocks": len(universe),
+                "filter_criteria": {"min_volume": min_volume, "min_price": min_price},
+                "market_cap_filter_applied": False
+            },
+            decision_reason="EOD_FILE_UNIVERSE_BUILT"
+        )
+        return universe
+    # <Scanner Data Interface - End>
+
+    # <File Loading - Begin>
+    def load_bars(self, symbol: str) -> Optional[pd.DataFrame]:
+        """All bars for symbol indexed by date, from memory, the binary cache, or the text file in that order."""
+        with self._lock:
+            bars = self._bars.get(symbol)
+            if bars is not None:
+                self._metrics['memory_hits'] += 1
+                return bars
+
+        text_path = self._text_path(symbol)
+        if not os.path.exists(text_path):
+            with self._lock:
+                self._metrics['missing_files'] += 1
+            return None
+
+        bars = self._read_cache(symbol, text_path)
+        if bars is None:
+            bars = self.parse_file(text_path)
+            with self._lock:
+                self._metrics['text_parses'] += 1
+            self._write_cache(symbol, bars)
+        else:
+            with self._lock:
+                self._metrics['cache_loads'] += 1
+
+        with self._lock:
+            self._bars[symbol] = bars
+        return bars
+
+    @staticmethod
+    def parse_file(path: str) -> pd.DataFrame:
+        """Parse one AmiBroker ASCII file in a single vectorized pass; malformed lines are dropped."""
+        raw = pd.read_csv(
+            path, header=None, names=FILE_COLUMNS, usecols=range(1, len(FILE_COLUMNS)),
+            dtype={column: np.float64 for column in BAR_COLUMNS}, on_bad_lines='skip', engine='c'
+        )
+        index = pd.DatetimeIndex(pd.to_datetime(raw['date'], format=FILE_DATE_FORMAT, errors='coerce'), name='date')
+        bars = pd.DataFrame(raw[BAR_COLUMNS].to_numpy(), columns=BAR_COLUMNS, index=index)
+        bars = bars[index.notna()].dropna(subset=['close'])
+        # Incremental appends can overlap the previous tail; the later line wins
+        bars = bars[~bars.index.duplicated(keep='last')]
+        if not bars.index.is_monotonic_increasing:
+            bars = bars.sort_index(kind='stable')
+        return bars
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Forget in-memory bars so the next load rechecks the files (e.g. after eod_data.py runs)."""
+        with self._lock:
+            if symbol is None:
+                self._bars.clear()
+            else:
+                self._bars.pop(symbol, None)
+
+    def get_metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._metrics, 'symbols_loaded': len(self._bars)}
+    # <File Loading - End>
+
+    # <Binary Cache - Begin>
+    def _text_path(self, symbol: str) -> str:
+        return os.path.join(self.data_folder, f"{symbol}.txt")
+
+    def _cache_path(self, symbol: str) -> str:
+        return os.path.join(self.cache_directory, symbol + self.CACHE_SUFFIXES[self.cache_format])
+
+    def _read_cache(self, symbol: str, text_path: str) -> Optional[pd.DataFrame]:
+        """Binary copy of the text file, or None when missing or older than the text file."""
+        if not self.cache_enabled:
+            return None
+        cache_path = self._cache_path(symbol)
+        try:
+            if os.path.getmtime(cache_path) < os.path.getmtime(text_path):
+                return None
+            if self.cache_format == 'feather':
+                from pyarrow import feather
+                frame = feather.read_table(cache_path, memory_map=True).to_pandas()
+            else:
+                frame = pd.read_parquet(cache_path)
+            return frame.set_index('date')
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "EOD file cache read failed - reparsing text file",
+                symbol=symbol,
+                context_provider={
+                    "path": cache_path,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                },
+                decision_reason="EOD_FILE_CACHE_READ_FAILED"
+            )
+            return None
+
+    def _write_cache(self, symbol: str, bars: pd.DataFrame) -> None:
+        if not self.cache_enabled:
+            return
+        cache_path = self._cache_path(symbol)
+        tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            frame = bars.reset_index()
+            if self.cache_format == 'feather':
+                # Uncompressed so reads can memory-map the columns instead of decoding them
+                frame.to_feather(tmp_path, compression='uncompressed')
+            else:
+                frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "EOD file cache write failed",
+                symbol=symbol,
+                context_provider={
+                    "path": cache_path,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                },
+                decision_reason="EOD_FILE_CACHE_WRITE_FAILED"
+            )
+    # <Binary Cache - End>
@@ -14,6 +14,7 @@ from src.brokers.ibkr.ibkr_client import IbkrClient
 from src.core.event_bus import EventBus
 from src.core.context_aware_logger import get_context_logger, TradingEventType
 from src.market_data.managers.historical_data_manager import HistoricalDataManager
+from src.market_data.managers.historical_request_scheduler import get_historical_request_scheduler
 
 
 class IBKRDataFeed(AbstractDataFeed):
@@ -71,6 +72,8 @@ class IBKRDataFeed(AbstractDataFeed):
             # Connect HistoricalDataManager to IbkrClient for historical data callbacks
             if hasattr(self.ibkr_client, 'set_historical_data_manager'):
                 self.ibkr_client.set_historical_data_manager(self.historical_data_manager)
+                # Scheduled requests must go through the manager that receives the callbacks
+                get_historical_request_scheduler().set_historical_manager(self.historical_data_manager)
                 connection_results['historical_data_manager_connected'] = True
             
             # Determine overall connection status
@@ -0,0 +1,113 @@
+"""
+Columnar buffer for IBKR historical bars.
+Bars are written straight into preallocated NumPy columns as callbacks arrive, and the
+DataFrame is built once when the request ends.
+"""
+
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DAILY_DATE_FORMAT = '%Y%m%d'
+INTRADAY_DATE_FORMAT = '%Y%m%d %H:%M:%S'
+
+
+def parse_ibkr_bar_dates(dates) -> pd.DatetimeIndex:
+    """
+    Parse IBKR bar date strings in a single vectorized pass.
+
+    Daily bars arrive as 'YYYYMMDD'; intraday bars as 'YYYYMMDD  HH:MM:SS', optionally
+    followed by a time zone name, which is dropped (times stay in the exchange's local time).
+    Unparseable dates become NaT.
+    """
+    dates = np.asarray(dates, dtype=object)
+    if not len(dates):
+        return pd.DatetimeIndex([], name='date')
+
+    # One response always uses one layout, so the first bar decides how to parse
+    first = str(dates[0])
+    if len(first) == 8:
+        parsed = pd.to_datetime(dates, format=DAILY_DATE_FORMAT, errors='coerce')
+    else:
+        values = pd.Series(dates, dtype=object).str
+        if first[8:10] == '  ':
+            # Standard formatDate=1 layout: fixed-width slicing beats a regex pass
+            normalized = values.slice(0, 8) + ' ' + values.slice(10, 18)
+        else:
+            normalized = values.replace(r'\s+', ' ', regex=True).str.slice(0, 17)
+        parsed = pd.to_datetime(normalized, format=INTRADAY_DATE_FORMAT, errors='coerce')
+    return pd.DatetimeIndex(parsed, name='date')
+
+
+class HistoricalBarBuffer:
+    """Growable set of NumPy columns holding the bars received for one request."""
+
+    def __init__(self, capacity: int = 256):
+        capacity = max(1, capacity)
+        self._size = 0
+        self._dates = np.empty(capacity, dtype=object)
+        self._values = np.empty((5, capacity), dtype=np.float64)  # open, high, low, close, volume
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_bars(cls, bars: Iterable) -> 'HistoricalBarBuffer':
+        bars = list(bars)
+        buffer = cls(capacity=len(bars))
+        for bar in bars:
+            buffer.append(bar)
+        return buffer
+
+    def append(self, bar) -> None:
+        """Copy one BarData into the columns, doubling capacity when full."""
+        if self._size == self._dates.shape[0]:
+            self._grow()
+        i = self._size
+        self._dates[i] = bar.date
+        values = self._values
+        values[0, i] = bar.open
+        values[1, i] = bar.high
+        values[2, i] = bar.low
+        values[3, i] = bar.close
+        values[4, i] = bar.volume
+        self._size = i + 1
+
+    def date_range(self) -> Tuple[Optional[str], Optional[str]]:
+        """Raw date strings of the first and last bar received."""
+        if not self._size:
+            return None, None
+        return self._dates[0], self._dates[self._size - 1]
+
+    def to_frame(self, symbol: Optional[str] = None) -> pd.DataFrame:
+        """Build the OHLCV DataFrame (indexed by bar date, ascending) in one step; bars with bad dates are dropped."""
+        if not self._size:
+            return pd.DataFrame()
+        n = self._size
+        index = parse_ibkr_bar_dates(self._dates[:n])
+        frame = pd.DataFrame(
+            {
+                'open': self._values[0, :n].copy(),
+                'high': self._values[1, :n].copy(),
+                'low': self._values[2, :n].copy(),
+                'close': self._values[3, :n].copy(),
+                'volume': self._values[4, :n].copy()
+            },
+            index=index
+        )
+        if index.hasnans:
+            frame = frame[index.notna()]
+        if symbol is not None:
+            frame['symbol'] = symbol
+        if not frame.index.is_monotonic_increasing:
+            frame = frame.sort_index(kind='stable')
+        return frame
+
+    def _grow(self) -> None:
+        capacity = self._dates.shape[0] * 2
+        dates = np.empty(capacity, dtype=object)
+        dates[:self._size] = self._dates[:self._size]
+        values = np.empty((5, capacity), dtype=np.float64)
+        values[:, :self._size] = self._values[:, :self._size]
+        self._dates, self._values = dates, values
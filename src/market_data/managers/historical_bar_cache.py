@@ -0,0 +1,215 @@
+"""
+On-disk store for historical bars, one Parquet or Feather file per (symbol, bar_size, what_to_show).
+Lets HistoricalDataManager serve repeat requests locally and fetch only the missing tail from IBKR.
+"""
+
+import importlib.util
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from config.trading_core_config import get_config
+from src.core.context_aware_logger import get_context_logger, TradingEventType
+
+
+class HistoricalBarCache:
+    """
+    Local bar store keyed by (symbol, bar_size, what_to_show).
+
+    Bars are kept as a DataFrame indexed by bar date. A cached series covers a request when
+    it reaches back to the requested start; the caller then only needs the bars from a short
+    overlap window before the last cached date onward, which are merged in with store(). The
+    overlap is compared with the cached bars so a restated history (split, dividend adjustment
+    or data correction) is detected and rebuilt instead of being spliced onto stale bars.
+    """
+
+    FILE_SUFFIXES = {'parquet': '.parquet', 'feather': '.feather'}
+
+    # Weekends and exchange holidays mean the first bar can start a few days after the requested start
+    COVERAGE_SLACK_DAYS = 4
+
+    # Settled bars before the last cached bar that every tail fetch re-requests for comparison
+    OVERLAP_BARS = 3
+
+    def __init__(self, directory: str = os.path.join('data', 'bar_cache'), file_format: str = 'parquet',
+                 max_age_seconds: float = 300, bar_sizes: Iterable[str] = ('1 day',), enabled: bool = True,
+                 restatement_tolerance: float = 1e-4):
+        self.context_logger = get_context_logger()
+        if file_format not in self.FILE_SUFFIXES:
+            raise ValueError(f"Unsupported bar cache format: {file_format}. "
+                             f"Available: {list(self.FILE_SUFFIXES.keys())}")
+
+        self.directory = directory
+        self.file_format = file_format
+        self.max_age_seconds = max_age_seconds
+        self.restatement_tolerance = restatement_tolerance
+        self.bar_sizes = set([bar_sizes] if isinstance(bar_sizes, str) else bar_sizes)
+        self.enabled = enabled and importlib.util.find_spec('pyarrow') is not None
+        self._key_locks: Dict[Tuple[str, str, str], threading.Lock] = defaultdict(threading.Lock)
+        self._locks_guard = threading.Lock()
+
+        if enabled and not self.enabled:
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Historical bar cache disabled - pyarrow not installed",
+                context_provider={"directory": directory, "format": file_format},
+                decision_reason="BAR_CACHE_UNAVAILABLE"
+            )
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict] = None) -> 'HistoricalBarCache':
+        """Build the cache from config['historical_data']['bar_cache']."""
+        settings = (config or get_config()).get('historical_data', {}).get('bar_cache', {})
+        return cls(
+            directory=settings.get('directory', os.path.join('data', 'bar_cache')),
+            file_format=settings.get('format', 'parquet'),
+            max_age_seconds=settings.get('max_age_seconds', 300),
+            bar_sizes=settings.get('bar_sizes', ['1 day']),
+            enabled=settings.get('enabled', True),
+            restatement_tolerance=settings.get('restatement_tolerance', 1e-4)
+        )
+
+    def supports(self, bar_size: str) -> bool:
+        """Whether requests with this bar size are served from the cache."""
+        return self.enabled and bar_size in self.bar_sizes
+
+    # <Cache Lookup - Begin>
+    def load(self, symbol: str, bar_size: str, what_to_show: str = "TRADES") -> Optional[pd.DataFrame]:
+        """Read all cached bars for the key, or None if nothing is cached."""
+        path = self._path(symbol, bar_size, what_to_show)
+        if not os.path.exists(path):
+            return None
+        try:
+            with self._lock_for(symbol, bar_size, what_to_show):
+                if self.file_format == 'parquet':
+                    df = pd.read_parquet(path)
+                else:
+                    df = pd.read_feather(path)
+            return df.set_index('date') if 'date' in df.columns else df
+        except Exception as e:
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Historical bar cache read failed - refetching",
+                symbol=symbol,
+                context_provider={
+                    "path": path,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                },
+                decision_reason="BAR_CACHE_READ_FAILED"
+            )
+            return None
+
+    def is_fresh(self, symbol: str, bar_size: str, what_to_show: str = "TRADES") -> bool:
+        """True when the cache file was written within max_age_seconds."""
+        try:
+            age = time.time() - os.path.getmtime(self._path(symbol, bar_size, what_to_show))
+        except OSError:
+            return False
+        return age <= self.max_age_seconds
+
+    def covers(self, bars: Optional[pd.DataFrame], days: int, now: Optional[datetime] = None) -> bool:
+        """True when the cached bars reach back to the start of a `days` calendar-day request."""
+        if bars is None or bars.empty:
+            return False
+        requested_start = (now or datetime.now()) - timedelta(days=days)
+        return bars.index.min() <= requested_start + timedelta(days=self.COVERAGE_SLACK_DAYS)
+
+    @classmethod
+    def tail_days(cls, bars: pd.DataFrame, now: Optional[datetime] = None) -> int:
+        """
+        Calendar days to request so the fetch starts OVERLAP_BARS before the last cached bar.
+        The last bar is refetched because it may have been written before the session closed;
+        the settled bars before it are refetched so is_restated() has something to compare.
+        """
+        first = bars.index[max(0, len(bars) - 1 - cls.OVERLAP_BARS)]
+        return max(1, ((now or datetime.now()) - first).days + 1)
+
+    def is_restated(self, cached: pd.DataFrame, fetched: pd.DataFrame) -> bool:
+        """
+        True when freshly fetched bars disagree with settled cached bars on the dates both hold.
+        The last cached bar is skipped: it may have been stored mid-session.
+        """
+        if cached is None or fetched is None or len(cached) < 2 or fetched.empty:
+            return False
+        settled = cached.iloc[:-1]
+        try:
+            common = settled.index.intersection(fetched.index)
+        except TypeError:
+            return True  # Time zone awareness differs, so the series cannot be spliced
+        if common.empty:
+            return False
+        stored = settled.loc[common, 'close'].astype(float)
+        current = fetched.loc[common, 'close'].astype(float)
+        return bool(((stored - current).abs() > self.restatement_tolerance * stored.abs().clip(lower=1e-12)).any())
+
+    @staticmethod
+    def window(bars: pd.DataFrame, days: int, now: Optional[datetime] = None) -> pd.DataFrame:
+        """Slice cached bars to a `days` calendar-day request ending now."""
+        start = (now or datetime.now()) - timedelta(days=days)
+        return bars[bars.index >= start.replace(hour=0, minute=0, second=0, microsecond=0)]
+    # <Cache Lookup - End>
+
+    # <Cache Update - Begin>
+    def store(self, symbol: str, bar_size: str, new_bars: pd.DataFrame, what_to_show: str = "TRADES",
+              cached: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Merge freshly fetched bars into the cached series and persist the result.
+
+        Newer bars replace cached bars with the same date. Returns the merged series.
+        """
+        if cached is not None and not cached.empty:
+            merged = pd.concat([cached, new_bars])
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        else:
+            merged = new_bars.sort_index()
+
+        path = self._path(symbol, bar_size, what_to_show)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            frame = merged.rename_axis('date').reset_index()
+            with self._lock_for(symbol, bar_size, what_to_show):
+                if self.file_format == 'parquet':
+                    frame.to_parquet(tmp_path, index=False)
+                else:
+                    frame.to_feather(tmp_path)
+                os.replace(tmp_path, path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Historical bar cache write failed",
+                symbol=symbol,
+                context_provider={
+                    "path": path,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                },
+                decision_reason="BAR_CACHE_WRITE_FAILED"
+            )
+        return merged
+
+    def invalidate(self, symbol: str, bar_size: str, what_to_show: str = "TRADES") -> None:
+        """Drop the cached series for a key (e.g. after a restatement is detected)."""
+        path = self._path(symbol, bar_size, what_to_show)
+        with self._lock_for(symbol, bar_size, what_to_show):
+            if os.path.exists(path):
+                os.remove(path)
+    # <Cache Update - End>
+
+    def _path(self, symbol: str, bar_size: str, what_to_show: str) -> str:
+        key = "_".join(re.sub(r'[^A-Za-z0-9.]+', '-', part).strip('-')
+                       for part in (symbol.upper(), bar_size, what_to_show.upper()))
+        return os.path.join(self.directory, key + self.FILE_SUFFIXES[self.file_format])
+
+    def _lock_for(self, symbol: str, bar_size: str, what_to_show: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._key_locks[(symbol, bar_size, what_to_show)]
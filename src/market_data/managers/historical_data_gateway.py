@@ -0,0 +1,345 @@
+"""
+Process-wide gateway for historical data requests.
+Coalesces concurrent identical requests into one in-flight broker request (single-flight)
+and keeps recent results in a TTL + LRU memory cache shared by every consumer.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from config.trading_core_config import get_config
+from src.core.context_aware_logger import get_context_logger, TradingEventType
+
+
+def _own(value: Any) -> Any:
+    """Give each consumer its own copy so in-place edits (e.g. added indicator columns) stay local."""
+    copy = getattr(value, 'copy', None)
+    return copy() if callable(copy) else value
+
+
+def _is_cacheable(result: Any) -> bool:
+    """Failed (None) and empty results are not cached so the next caller retries."""
+    if result is None:
+        return False
+    return not getattr(result, 'empty', False)
+
+
+class HistoricalDataGateway:
+    """
+    Single-flight historical data gateway with a TTL + LRU memory cache.
+
+    Keys are tuples of the form (source, symbol, span, bar_size, what_to_show). A caller
+    that asks for a key already being fetched waits on the same Future instead of
+    sending its own request; completed results are served from memory for ttl_seconds.
+    Every shared request carries a deadline: synchronous waiters give up when it passes,
+    and the next caller for a key whose request outlived it evicts the stuck entry.
+    """
+
+    def __init__(self, ttl_seconds: float = 60, max_entries: int = 512, request_timeout: float = 15,
+                 clock: Callable[[], float] = time.monotonic):
+        self.context_logger = get_context_logger()
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.request_timeout = request_timeout
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._followers: Dict[Hashable, int] = {}
+        self._metrics = {
+            'requests': 0,
+            'cache_hits': 0,
+            'coalesced': 0,
+            'loads': 0,
+            'load_failures': 0,
+            'evictions': 0,
+            'expired_requests': 0
+        }
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict] = None) -> 'HistoricalDataGateway':
+        """Build the gateway from config['historical_data']['memory_cache']."""
+        historical = (config or get_config()).get('historical_data', {})
+        settings = historical.get('memory_cache', {})
+        return cls(
+            ttl_seconds=settings.get('ttl_seconds', 60),
+            max_entries=settings.get('max_entries', 512),
+            request_timeout=historical.get('request_timeout_seconds', 15)
+        )
+
+    # <Single-Flight Requests - Begin>
+    def get(self, key: Hashable, loader: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """
+        Return the value for key, loading it at most once across concurrent callers.
+
+        The first caller runs loader in its own thread; callers arriving while it runs
+        block on the same result until the shared request's deadline, then detach and
+        raise TimeoutError. Exceptions from loader are raised to every waiter.
+
+        Args:
+            key: Request identity
+            loader: Loads the value when nothing is cached or in flight
+            timeout: Deadline for a load this caller starts (defaults to request_timeout)
+        """
+        self._evict_if_expired(key)
+        with self._lock:
+            self._metrics['requests'] += 1
+            found, value = self._lookup(key)
+            if found:
+                return _own(value)
+            shared = self._in_flight.get(key)
+            if shared is not None:
+                self._metrics['coalesced'] += 1
+                follower = self._follow(key, shared)
+            else:
+                # The loading caller holds the request open like a follower would
+                shared = self._register(key, holders=1, timeout=timeout)
+                follower = None
+        if follower is not None:
+            return self._wait(key, shared, follower)
+
+        try:
+            value = loader()
+        except Exception as e:
+            self._finish(key, shared, error=e)
+            raise
+        self._finish(key, shared, value=value)
+        return value
+
+    def get_async(self, key: Hashable, submit: Callable[[], Future]) -> Future:
+        """
+        Future-returning variant of get(); submit is called only when nothing is cached or in flight.
+
+        Each caller receives its own Future. Cancelling it detaches that caller, and the shared
+        request is cancelled once every caller has detached, or once it outlives request_timeout
+        and another caller asks for the key.
+        """
+        self._evict_if_expired(key)
+        with self._lock:
+            self._metrics['requests'] += 1
+            found, value = self._lookup(key)
+            if found:
+                done = Future()
+                done.req_id = None
+                done.set_result(_own(value))
+                return done
+            shared = self._in_flight.get(key)
+            if shared is not None:
+                self._metrics['coalesced'] += 1
+                return self._follow(key, shared)
+            shared = self._register(key)
+
+        try:
+            request_future = submit()
+        except Exception as e:
+            self._finish(key, shared, error=e)
+            raise
+        shared.req_id = getattr(request_future, 'req_id', None)
+        shared.add_done_callback(lambda f: request_future.cancel() if f.cancelled() else None)
+        request_future.add_done_callback(lambda done: self._finish_from(key, shared, done))
+
+        with self._lock:
+            return self._follow(key, shared)
+    # <Single-Flight Requests - End>
+
+    # <Cache Access - Begin>
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Return a cached, unexpired value without loading or touching metrics."""
+        with self._lock:
+            found, value = self._lookup(key, count_hit=False)
+            return _own(value) if found else None
+
+    def latest(self, symbol: str, bar_size: str = "1 day") -> Optional[Any]:
+        """Most recently cached bars for a symbol and bar size, whatever span was requested."""
+        with self._lock:
+            now = self._clock()
+            for key in reversed(self._cache):
+                if len(key) >= 4 and key[1] == symbol and key[3] == bar_size:
+                    expires_at, value = self._cache[key]
+                    if expires_at > now:
+                        return _own(value)
+        return None
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop cached entries for one symbol, or everything when symbol is None."""
+        with self._lock:
+            for key in list(self._cache):
+                if symbol is None or (len(key) > 1 and key[1] == symbol):
+                    del self._cache[key]
+
+    def clear(self) -> None:
+        """Drop all cached values and metrics (in-flight requests are left to complete)."""
+        with self._lock:
+            self._cache.clear()
+            for name in self._metrics:
+                self._metrics[name] = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self._metrics['requests']
+            saved = self._metrics['cache_hits'] + self._metrics['coalesced']
+            return {
+                **self._metrics,
+                'cached_entries': len(self._cache),
+                'in_flight': len(self._in_flight),
+                'broker_requests_saved_percent': round(saved / requests * 100, 2) if requests else 0.0
+            }
+    # <Cache Access - End>
+
+    # <Internal Helpers - Begin>
+    def _lookup(self, key: Hashable, count_hit: bool = True):
+        """Caller holds the lock. Returns (found, value) and refreshes LRU order on a hit."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._cache[key]
+            return False, None
+        self._cache.move_to_end(key)
+        if count_hit:
+            self._metrics['cache_hits'] += 1
+        return True, value
+
+    def _register(self, key: Hashable, holders: int = 0, timeout: Optional[float] = None) -> Future:
+        """Caller holds the lock."""
+        shared = Future()
+        shared.req_id = None
+        shared.deadline = self._clock() + (timeout if timeout is not None else self.request_timeout)
+        self._in_flight[key] = shared
+        self._followers[key] = holders
+        self._metrics['loads'] += 1
+        return shared
+
+    def _follow(self, key: Hashable, shared: Future) -> Future:
+        """Caller holds the lock. Per-caller Future mirroring the shared request."""
+        follower = Future()
+        follower.req_id = shared.req_id
+        self._followers[key] = self._followers.get(key, 0) + 1
+
+        def _mirror(done: Future) -> None:
+            if done.cancelled():
+                follower.cancel()
+            elif follower.set_running_or_notify_cancel():
+                if done.exception() is not None:
+                    follower.set_exception(done.exception())
+                else:
+                    follower.set_result(_own(done.result()))
+
+        def _detach(f: Future) -> None:
+            if not f.cancelled():
+                return
+            with self._lock:
+                if self._in_flight.get(key) is not shared:
+                    return
+                self._followers[key] -= 1
+                abandoned = self._followers[key] <= 0
+            if abandoned:
+                shared.cancel()
+
+        follower.add_done_callback(_detach)
+        shared.add_done_callback(_mirror)
+        return follower
+
+    def _wait(self, key: Hashable, shared: Future, follower: Future) -> Any:
+        """Block a synchronous follower until the shared request's deadline, then detach it."""
+        try:
+            return follower.result(timeout=max(0.0, shared.deadline - self._clock()))
+        except FutureTimeoutError:
+            if not follower.cancel():
+                return follower.result()  # Completed just as the wait ran out
+            self._evict(key, shared)
+            raise FutureTimeoutError(f"Historical data request {key!r} exceeded its deadline")
+
+    def _evict_if_expired(self, key: Hashable) -> None:
+        with self._lock:
+            shared = self._in_flight.get(key)
+            if shared is None or shared.deadline > self._clock():
+                return
+        self._evict(key, shared)
+
+    def _evict(self, key: Hashable, shared: Future) -> None:
+        """Drop a shared request that outlived its deadline so the next caller starts afresh."""
+        with self._lock:
+            if self._in_flight.get(key) is not shared:
+                return
+            del self._in_flight[key]
+            self._followers.pop(key, None)
+            self._metrics['expired_requests'] += 1
+
+        # Cancels the broker request and every remaining follower
+        shared.cancel()
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Stuck historical data request evicted from gateway",
+            symbol=key[1] if isinstance(key, tuple) and len(key) > 1 else None,
+            context_provider={
+                "request_key": repr(key),
+                "req_id": shared.req_id
+            },
+            decision_reason="HISTORICAL_GATEWAY_REQUEST_EXPIRED"
+        )
+
+    def _finish_from(self, key: Hashable, shared: Future, done: Future) -> None:
+        if done.cancelled():
+            with self._lock:
+                if self._in_flight.get(key) is shared:
+                    del self._in_flight[key]
+                    self._followers.pop(key, None)
+            shared.cancel()
+        elif done.exception() is not None:
+            self._finish(key, shared, error=done.exception())
+        else:
+            self._finish(key, shared, value=done.result())
+
+    def _finish(self, key: Hashable, shared: Future, value: Any = None,
+                error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is shared:
+                del self._in_flight[key]
+                self._followers.pop(key, None)
+            if error is not None:
+                self._metrics['load_failures'] += 1
+            elif _is_cacheable(value):
+                self._cache[key] = (self._clock() + self.ttl_seconds, _own(value))
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+                    self._metrics['evictions'] += 1
+
+        if not shared.set_running_or_notify_cancel():
+            return
+        if error is not None:
+            shared.set_exception(error)
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Coalesced historical data request failed",
+                symbol=key[1] if isinstance(key, tuple) and len(key) > 1 else None,
+                context_provider={
+                    "request_key": repr(key),
+                    "error_type": type(error).__name__,
+                    "error_message": str(error)
+                },
+                decision_reason="HISTORICAL_GATEWAY_LOAD_FAILED"
+            )
+        else:
+            shared.set_result(value)
+    # <Internal Helpers - End>
+
+
+# <Process-Wide Gateway - Begin>
+_gateway: Optional[HistoricalDataGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_historical_data_gateway() -> HistoricalDataGateway:
+    """Return the gateway shared by every historical data consumer in the process."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = HistoricalDataGateway.from_config()
+        return _gateway
+# <Process-Wide Gateway - End>
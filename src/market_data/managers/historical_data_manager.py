@@ -5,12 +5,40 @@ Handles all historical data requests, callbacks, and retry logic separately from
 
 import threading
 import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 import pandas as pd
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, Callable
 from datetime import datetime
 from ibapi.contract import Contract
 
+from config.trading_core_config import get_config
+from src.brokers.ibkr.core.contract_cache import get_contract_cache
 from src.core.context_aware_logger import get_context_logger, TradingEventType
+from src.market_data.managers.historical_bar_buffer import HistoricalBarBuffer
+from src.market_data.managers.historical_bar_cache import HistoricalBarCache
+from src.market_data.managers.historical_data_gateway import HistoricalDataGateway, get_historical_data_gateway
+
+
+# Historical requests are always for trade bars; part of the bar cache key
+HISTORICAL_WHAT_TO_SHOW = "TRADES"
+
+# IBKR error codes that belong to a historical data request
+HISTORICAL_ERROR_CODES = {162, 165, 166, 200, 321, 322, 354, 366, 386}
+
+
+class HistoricalDataError(Exception):
+    """IBKR rejected or aborted a historical data request."""
+
+    def __init__(self, req_id: int, error_code: int, error_string: str):
+        super().__init__(f"IBKR error {error_code} for historical request {req_id}: {error_string}")
+        self.req_id = req_id
+        self.error_code = error_code
+        self.error_string = error_string
+
+    @property
+    def is_pacing_violation(self) -> bool:
+        """Error 162 is also used for 'no data'; only the pacing variant is retryable."""
+        return self.error_code == 162 and 'pacing violation' in self.error_string.lower()
 
 
 class HistoricalDataManager:
@@ -20,8 +48,9 @@ class HistoricalDataManager:
     Handles retry logic, error management, and data processing
     """
     
-    def __init__(self, ibkr_client=None):
-        """Initialize the historical data manager with connection to IBKR client."""
+    def __init__(self, ibkr_client=None, bar_cache: Optional[HistoricalBarCache] = None,
+                 gateway: Optional[HistoricalDataGateway] = None):
+        """Initialize the historical data manager with connection to IBKR client and local bar cache."""
         # <Context-Aware Logger Initialization - Begin>
         self.context_logger = get_context_logger()
         # <Context-Aware Logger Initialization - End>
@@ -49,12 +78,25 @@ class HistoricalDataManager:
         self._retry_delays = [2, 5, 10]  # Exponential backoff in seconds
         self._request_timeout = 15  # seconds
         
+        # Per-bar logging is off by default; set historical_data.bar_log_sample_every for diagnostics
+        self._bar_log_sample_every = get_config().get('historical_data', {}).get('bar_log_sample_every', 0)
+        
         # Performance tracking
         self._total_requests = 0
         self._successful_requests = 0
         self._failed_requests = 0
+        self._cancelled_requests = 0
         self._last_request_time = None
         
+        # Local bar store; requests only fetch bars newer than the cached series
+        self.bar_cache = bar_cache if bar_cache is not None else HistoricalBarCache.from_config()
+        self._cache_hits = 0
+        self._cache_tail_fetches = 0
+        self._cache_restatements = 0
+        
+        # Process-wide single-flight gateway shared with every other manager instance
+        self.gateway = gateway if gateway is not None else get_historical_data_gateway()
+        
         # <Manager Ready Logging - Begin>
         self.context_logger.log_event(
             TradingEventType.SYSTEM_HEALTH,
@@ -63,7 +105,8 @@ class HistoricalDataManager:
                 "ibkr_client_connected": ibkr_client is not None,
                 "max_retries": self._max_retries,
                 "request_timeout": self._request_timeout,
-                "starting_req_id": self._next_req_id
+                "starting_req_id": self._next_req_id,
+                "bar_cache_enabled": self.bar_cache.enabled
             },
             decision_reason="Historical data manager ready for requests"
         )
@@ -93,6 +136,28 @@ class HistoricalDataManager:
         """
         Request historical data for a symbol with retry logic and error handling.
         
+        Identical concurrent requests from any consumer in the process share a single
+        IBKR request via the historical data gateway; recent results come from memory.
+        
+        Args:
+            symbol: Stock symbol to request data for
+            days: Number of days of historical data to retrieve
+            bar_size: Bar size setting (e.g., "1 day", "1 hour", "5 mins")
+            
+        Returns:
+            DataFrame with OHLCV data or None if request fails
+        """
+        return self.gateway.get(
+            self._gateway_key(symbol, days, bar_size),
+            lambda: self._load_historical_data(symbol, days, bar_size),
+            # Every attempt may run to its timeout before the retry delays
+            timeout=self._max_retries * self._request_timeout + sum(self._retry_delays)
+        )
+    
+    def _load_historical_data(self, symbol: str, days: int, bar_size: str) -> Optional[pd.DataFrame]:
+        """
+        Load historical data from the bar cache or IBKR with retry logic and error handling.
+        
         Args:
             symbol: Stock symbol to request data for
             days: Number of days of historical data to retrieve
@@ -117,6 +182,10 @@ class HistoricalDataManager:
         
         print(f"📈 HistoricalDataManager: Requesting {days} days of {bar_size} data for {symbol}")
         
+        cached_data = self.get_cached_historical_data(symbol, days, bar_size)
+        if cached_data is not None:
+            return cached_data
+        
         if not self.ibkr_client or not hasattr(self.ibkr_client, 'connected') or not self.ibkr_client.connected:
             # <No Client Logging - Begin>
             self.context_logger.log_event(
@@ -139,8 +208,9 @@ class HistoricalDataManager:
             self._total_requests += 1
             self._last_request_time = datetime.now()
         
-        # Calculate duration string
-        duration_str = f"{days} D"
+        # Calculate duration string - only the missing tail when the cache covers the range
+        cached_bars, fetch_days = self._plan_cached_request(symbol, days, bar_size)
+        duration_str = f"{fetch_days} D"
         
         # Try with retry logic for IBKR error codes
         for attempt in range(self._max_retries):
@@ -162,6 +232,12 @@ class HistoricalDataManager:
                 print(f"🔄 {symbol}: Historical data attempt {attempt + 1}/{self._max_retries}")
                 
                 historical_data = self._send_historical_request(symbol, duration_str, bar_size)
+                if self.bar_cache.supports(bar_size) and self.bar_cache.is_restated(cached_bars, historical_data):
+                    # Never splice an adjusted tail onto stale bars: rebuild the entry from the full range
+                    refetch = self._refetch_restated(symbol, days, bar_size)
+                    cached_bars, duration_str = None, f"{days} D"
+                    historical_data = self._wait_for_historical_response(refetch, symbol)
+                historical_data = self._merge_with_cache(symbol, days, bar_size, cached_bars, historical_data)
                 
                 if historical_data is not None and not historical_data.empty:
                     # <Historical Data Success Logging - Begin>
@@ -259,14 +335,112 @@ class HistoricalDataManager:
         """Send historical data request to IBKR and wait for response."""
         if not self.ibkr_client:
             return None
-        
-        # Create contract
+
+        future = self._submit_historical_request(symbol, duration_str, bar_size)
+        return self._wait_for_historical_response(future, symbol)
+
+    # <Future-Based Historical Requests - Begin>
+    def request_historical_data_async(self, symbol: str, days: int = 100, bar_size: str = "1 day") -> Future:
+        """
+        Send a single historical data request and return immediately.
+
+        The returned Future resolves with a DataFrame (empty if IBKR sent no bars) as soon as
+        historical_data_end arrives for the request. No retries are attempted; cancelling the
+        Future or letting it time out via result(timeout) releases the request tracking.
+        Identical requests already in flight anywhere in the process are joined, not resent.
+
+        Args:
+            symbol: Stock symbol to request data for
+            days: Number of days of historical data to retrieve
+            bar_size: Bar size setting (e.g., "1 day", "1 hour", "5 mins")
+
+        Returns:
+            Future resolving to a DataFrame with OHLCV data; it carries the IBKR request id as req_id
+        """
+        if not self.ibkr_client or not getattr(self.ibkr_client, 'connected', False):
+            future = Future()
+            future.req_id = None
+            future.set_exception(ConnectionError(f"No IBKR client connection available for {symbol}"))
+            return future
+
+        return self.gateway.get_async(
+            self._gateway_key(symbol, days, bar_size),
+            lambda: self._submit_with_bar_cache(symbol, days, bar_size)
+        )
+
+    def _submit_with_bar_cache(self, symbol: str, days: int, bar_size: str) -> Future:
+        """Send the request for whatever the bar cache is missing; the Future yields the merged window."""
+        with self._lock:
+            self._total_requests += 1
+            self._last_request_time = datetime.now()
+
+        cached_bars, fetch_days = self._plan_cached_request(symbol, days, bar_size)
+        request_future = self._submit_historical_request(symbol, f"{fetch_days} D", bar_size)
+        if not self.bar_cache.supports(bar_size):
+            return request_future
+
+        # Merge the fetched tail into the cache before handing the bars to the caller
+        future = Future()
+        future.req_id = request_future.req_id
+        in_flight = [request_future]
+
+        def _complete(done: Future, cached: Optional[pd.DataFrame]) -> None:
+            if done.cancelled():
+                future.cancel()
+                return
+            if done.exception() is None and self.bar_cache.is_restated(cached, done.result()):
+                try:
+                    in_flight[0] = self._refetch_restated(symbol, days, bar_size)
+                except Exception as e:
+                    if future.set_running_or_notify_cancel():
+                        future.set_exception(e)
+                    return
+                if future.cancelled():
+                    in_flight[0].cancel()
+                    return
+                in_flight[0].add_done_callback(lambda refetched: _complete(refetched, None))
+                return
+
+            # The caller may have cancelled the outer future while IBKR was still answering
+            if not future.set_running_or_notify_cancel():
+                return
+            if done.exception() is not None:
+                future.set_exception(done.exception())
+                return
+            try:
+                future.set_result(self._merge_with_cache(symbol, days, bar_size, cached, done.result()))
+            except Exception as e:
+                future.set_exception(e)
+
+        future.add_done_callback(lambda f: in_flight[0].cancel() if f.cancelled() else None)
+        request_future.add_done_callback(lambda done: _complete(done, cached_bars))
+        return future
+
+    def _refetch_restated(self, symbol: str, days: int, bar_size: str) -> Future:
+        """Drop a cache entry whose overlap no longer matches IBKR and request the full range again."""
+        self.bar_cache.invalidate(symbol, bar_size, HISTORICAL_WHAT_TO_SHOW)
+        with self._lock:
+            self._cache_restatements += 1
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Cached historical bars restated - rebuilding cache entry",
+            symbol=symbol,
+            context_provider={
+                "days_requested": days,
+                "bar_size": bar_size,
+                "overlap_bars": self.bar_cache.OVERLAP_BARS
+            },
+            decision_reason="BAR_CACHE_RESTATEMENT"
+        )
+        return self._submit_historical_request(symbol, f"{days} D", bar_size)
+
+    def _submit_historical_request(self, symbol: str, duration_str: str, bar_size: str) -> Future:
+        """Register tracking for a new request, send it to IBKR and return its Future."""
         contract = self._create_contract(symbol)
-        
-        # Setup request tracking
         req_id = self._get_next_req_id()
         request_data = self._setup_request_tracking(req_id, symbol)
-        
+        future = request_data['future']
+
         try:
             # <Historical Request Detailed Logging - Begin>
             self.context_logger.log_event(
@@ -277,13 +451,13 @@ class HistoricalDataManager:
                     "request_id": req_id,
                     "duration": duration_str,
                     "bar_size": bar_size,
-                    "data_type": "TRADES",
+                    "data_type": HISTORICAL_WHAT_TO_SHOW,
                     "use_rth": 1,
                     "timeout_seconds": self._request_timeout
                 }
             )
             # <Historical Request Detailed Logging - End>
-            
+
             # Send historical data request
             self.ibkr_client.reqHistoricalData(
                 reqId=req_id,
@@ -291,57 +465,165 @@ class HistoricalDataManager:
                 endDateTime="",  # Current time
                 durationStr=duration_str,
                 barSizeSetting=bar_size,
-                whatToShow="TRADES",
+                whatToShow=HISTORICAL_WHAT_TO_SHOW,
                 useRTH=1,  # Regular trading hours only
                 formatDate=1,
                 keepUpToDate=False,
                 chartOptions=[]
             )
-            
-            # Wait for data with timeout
-            return self._wait_for_historical_response(req_id, symbol)
-            
-        except Exception as e:
+            return future
+
+        except Exception:
             # Clean up on error
             self._cleanup_request(req_id)
-            raise e
-    
+            raise
+    # <Future-Based Historical Requests - End>
+
+    # <Bar Cache Integration - Begin>
+    def get_cached_historical_data(self, symbol: str, days: int = 100, bar_size: str = "1 day") -> Optional[pd.DataFrame]:
+        """Return cached bars when the local series is fresh and covers the request; otherwise None."""
+        in_memory = self.gateway.peek(self._gateway_key(symbol, days, bar_size))
+        if in_memory is not None:
+            return in_memory
+        if not self.bar_cache.supports(bar_size) or not self.bar_cache.is_fresh(symbol, bar_size, HISTORICAL_WHAT_TO_SHOW):
+            return None
+        cached_bars = self.bar_cache.load(symbol, bar_size, HISTORICAL_WHAT_TO_SHOW)
+        if not self.bar_cache.covers(cached_bars, days):
+            return None
+
+        with self._lock:
+            self._cache_hits += 1
+        self.context_logger.log_event(
+            TradingEventType.MARKET_CONDITION,
+            "Historical data served from local bar cache",
+            symbol=symbol,
+            context_provider={
+                "days_requested": days,
+                "bar_size": bar_size,
+                "cached_bars": len(cached_bars),
+                "last_cached_bar": cached_bars.index.max().strftime('%Y-%m-%d')
+            },
+            decision_reason="BAR_CACHE_HIT"
+        )
+        return self.bar_cache.window(cached_bars, days)
+
+    def _plan_cached_request(self, symbol: str, days: int, bar_size: str):
+        """
+        Decide how much history to request from IBKR.
+
+        Returns:
+            (cached_bars, fetch_days) - cached_bars is None when the full range must be fetched
+        """
+        if not self.bar_cache.supports(bar_size):
+            return None, days
+        cached_bars = self.bar_cache.load(symbol, bar_size, HISTORICAL_WHAT_TO_SHOW)
+        if not self.bar_cache.covers(cached_bars, days):
+            return None, days
+
+        fetch_days = min(days, self.bar_cache.tail_days(cached_bars))
+        with self._lock:
+            self._cache_tail_fetches += 1
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Fetching missing tail for cached historical bars",
+            symbol=symbol,
+            context_provider={
+                "days_requested": days,
+                "tail_days": fetch_days,
+                "bar_size": bar_size,
+                "last_cached_bar": cached_bars.index.max().strftime('%Y-%m-%d')
+            },
+            decision_reason="BAR_CACHE_TAIL_FETCH"
+        )
+        return cached_bars, fetch_days
+
+    def _merge_with_cache(self, symbol: str, days: int, bar_size: str,
+                          cached_bars: Optional[pd.DataFrame], fetched: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """Persist newly fetched bars and return the requested window of the merged series."""
+        if fetched is None or not self.bar_cache.supports(bar_size):
+            return fetched
+        if fetched.empty:
+            # Nothing newer than the cache (e.g. over a weekend) - the cached series is still complete
+            return self.bar_cache.window(cached_bars, days) if cached_bars is not None else fetched
+        merged = self.bar_cache.store(symbol, bar_size, fetched, HISTORICAL_WHAT_TO_SHOW, cached=cached_bars)
+        return self.bar_cache.window(merged, days) if cached_bars is not None else fetched
+    # <Bar Cache Integration - End>
+
+    @staticmethod
+    def _gateway_key(symbol: str, days: int, bar_size: str) -> tuple:
+        """Request identity shared by every HistoricalDataManager in the process."""
+        return ('ibkr', symbol, days, bar_size, HISTORICAL_WHAT_TO_SHOW)
+
     def _setup_request_tracking(self, req_id: int, symbol: str) -> Dict[str, Any]:
         """Setup tracking for a historical data request."""
         with self._lock:
+            future = Future()
+            future.req_id = req_id
             request_data = {
                 'symbol': symbol,
-                'bars': [],
+                'bars': HistoricalBarBuffer(),
                 'completed': False,
                 'error': None,
                 'start_time': datetime.now(),
-                'timeout': self._request_timeout
+                'timeout': self._request_timeout,
+                'future': future
             }
             self._active_requests[req_id] = request_data
-            return request_data
+        # A cancelled or completed future no longer needs tracking
+        future.add_done_callback(lambda f: self._cancel_at_ibkr(req_id) if f.cancelled() else self._cleanup_request(req_id))
+        return request_data
+
+    def _cancel_at_ibkr(self, req_id: int) -> None:
+        """Release an abandoned request: stop tracking it and tell IBKR to stop sending bars."""
+        with self._lock:
+            request_data = self._active_requests.pop(req_id, None)
+            if request_data is None or request_data['completed']:
+                return
+            self._cancelled_requests += 1
+            client = self.ibkr_client
+
+        if client is None or not getattr(client, 'connected', False):
+            return
+        try:
+            client.cancelHistoricalData(req_id)
+        except Exception as e:
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Historical data cancellation failed",
+                symbol=request_data['symbol'],
+                context_provider={
+                    "request_id": req_id,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                },
+                decision_reason="HISTORICAL_CANCEL_FAILED"
+            )
+            return
+
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Historical data request cancelled at IBKR",
+            symbol=request_data['symbol'],
+            context_provider={
+                "request_id": req_id,
+                "bars_received": len(request_data['bars']),
+                "elapsed_seconds": round((datetime.now() - request_data['start_time']).total_seconds(), 3)
+            },
+            decision_reason="HISTORICAL_REQUEST_CANCELLED"
+        )
     
-    def _wait_for_historical_response(self, req_id: int, symbol: str) -> Optional[pd.DataFrame]:
+    def _wait_for_historical_response(self, future: Future, symbol: str) -> Optional[pd.DataFrame]:
         """Wait for historical data response with proper timeout handling."""
         start_time = time.time()
         timeout = self._request_timeout
-        
-        while time.time() - start_time < timeout:
-            with self._lock:
-                request_data = self._active_requests.get(req_id)
-                if not request_data:
-                    break
-                    
-                if request_data['completed']:
-                    bars = request_data['bars']
-                    self._cleanup_request(req_id)
-                    
-                    if bars:
-                        return self._process_historical_bars(bars, symbol)
-                    else:
-                        return pd.DataFrame()  # Empty but successful
-            
-            time.sleep(0.5)  # Polling interval
-        
+        req_id = future.req_id
+
+        try:
+            # Returns as soon as historical_data_end resolves the future
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+
         # Timeout - clean up
         self._cleanup_request(req_id)
         
@@ -362,56 +644,19 @@ class HistoricalDataManager:
         print(f"⏰ {symbol}: Historical data request timeout (req_id: {req_id})")
         return None
     
-    def _process_historical_bars(self, bars: List, symbol: str) -> pd.DataFrame:
-        """Process historical bars into DataFrame format."""
-        if not bars:
-            return pd.DataFrame()
-        
-        data = []
-        for bar in bars:
-            try:
-                # Parse date - IBKR format is typically 'YYYYMMDD' for daily bars
-                if hasattr(bar, 'date'):
-                    if ' ' in bar.date:
-                        # Timestamp format 'YYYYMMDD HH:MM:SS'
-                        date_str = bar.date.split(' ')[0]
-                        bar_date = datetime.strptime(date_str, '%Y%m%d')
-                    else:
-                        # Date-only format 'YYYYMMDD'
-                        bar_date = datetime.strptime(bar.date, '%Y%m%d')
-                else:
-                    bar_date = datetime.now()
-                
-                data.append({
-                    'date': bar_date,
-                    'open': bar.open,
-                    'high': bar.high,
-                    'low': bar.low,
-                    'close': bar.close,
-                    'volume': bar.volume,
-                    'symbol': symbol
-                })
-            except Exception as e:
-                print(f"⚠️ Error processing bar for {symbol}: {e}")
-                continue
-        
-        if not data:
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(data)
-        df.set_index('date', inplace=True)
-        df.sort_index(inplace=True)
+    def _process_historical_bars(self, bars, symbol: str) -> pd.DataFrame:
+        """Build the OHLCV DataFrame from a request's bar buffer (or a list of BarData) in one vectorized pass."""
+        if not isinstance(bars, HistoricalBarBuffer):
+            bars = HistoricalBarBuffer.from_bars(bars)
         
+        df = bars.to_frame(symbol)
+        if len(df) < len(bars):
+            print(f"⚠️ Dropped {len(bars) - len(df)} bars with unparseable dates for {symbol}")
         return df
     
     def _create_contract(self, symbol: str) -> Contract:
-        """Create IBKR contract for a symbol."""
-        contract = Contract()
-        contract.symbol = symbol
-        contract.secType = "STK"
-        contract.exchange = "SMART"
-        contract.currency = "USD"
-        return contract
+        """Create IBKR contract for a symbol, qualified with conId when the contract cache knows it."""
+        return get_contract_cache().build_contract(symbol)
     
     def _get_next_req_id(self) -> int:
         """Get next unique request ID (thread-safe)."""
@@ -428,54 +673,107 @@ class HistoricalDataManager:
     
     # --- IBKR Callback Methods ---
     def historical_data(self, req_id: int, bar) -> None:
-        """Callback when historical data bar is received."""
-        with self._lock:
-            if req_id in self._active_requests:
-                self._active_requests[req_id]['bars'].append(bar)
-                
-                # <Historical Bar Received Logging - Begin>
-                symbol = self._active_requests[req_id]['symbol']
-                bars_count = len(self._active_requests[req_id]['bars'])
-                self.context_logger.log_event(
-                    TradingEventType.MARKET_CONDITION,
-                    "Historical data bar received",
-                    symbol=symbol,
-                    context_provider={
-                        "request_id": req_id,
-                        "bar_date": bar.date,
-                        "close_price": bar.close,
-                        "volume": bar.volume,
-                        "total_bars_received": bars_count
-                    }
-                )
-                # <Historical Bar Received Logging - End>
+        """
+        Callback when historical data bar is received.
+        
+        Hot path on the IBKR reader thread: only the reader thread writes a request's buffer,
+        so the bar is appended without taking the manager lock and nothing is logged per bar.
+        """
+        request_data = self._active_requests.get(req_id)
+        if request_data is None:
+            return
+        bars = request_data['bars']
+        bars.append(bar)
+        
+        # <Historical Bar Sampled Logging - Begin>
+        if self._bar_log_sample_every and len(bars) % self._bar_log_sample_every == 0:
+            self.context_logger.log_event(
+                TradingEventType.MARKET_CONDITION,
+                "Historical data bar received (sampled)",
+                symbol=request_data['symbol'],
+                context_provider={
+                    "request_id": req_id,
+                    "bar_date": bar.date,
+                    "close_price": bar.close,
+                    "volume": bar.volume,
+                    "total_bars_received": len(bars),
+                    "sample_every": self._bar_log_sample_every
+                }
+            )
+        # <Historical Bar Sampled Logging - End>
     
     def historical_data_end(self, req_id: int, start: str, end: str) -> None:
-        """Callback when historical data request ends."""
+        """Callback when historical data request ends; resolves the request's future."""
         with self._lock:
-            if req_id in self._active_requests:
-                self._active_requests[req_id]['completed'] = True
-                
-                # <Historical Data End Logging - Begin>
-                symbol = self._active_requests[req_id]['symbol']
-                bars_count = len(self._active_requests[req_id]['bars'])
-                self.context_logger.log_event(
-                    TradingEventType.SYSTEM_HEALTH,
-                    "Historical data request completed",
-                    symbol=symbol,
-                    context_provider={
-                        "request_id": req_id,
-                        "start_date": start,
-                        "end_date": end,
-                        "bars_received": bars_count,
-                        "completion_status": "success" if bars_count > 0 else "no_data"
-                    },
-                    decision_reason=f"Historical data request completed with {bars_count} bars"
-                )
-                # <Historical Data End Logging - End>
-                
-                print(f"✅ Historical data completed for {symbol}: {bars_count} bars received")
-    
+            request_data = self._active_requests.get(req_id)
+            if not request_data:
+                return
+            request_data['completed'] = True
+            symbol = request_data['symbol']
+            bars = request_data['bars']
+            bars_count = len(bars)
+
+        # <Historical Data End Logging - Begin>
+        first_bar, last_bar = bars.date_range()
+        elapsed = (datetime.now() - request_data['start_time']).total_seconds()
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Historical data request completed",
+            symbol=symbol,
+            context_provider={
+                "request_id": req_id,
+                "start_date": start,
+                "end_date": end,
+                "bars_received": bars_count,
+                "first_bar": first_bar,
+                "last_bar": last_bar,
+                "elapsed_seconds": round(elapsed, 3),
+                "bars_per_second": round(bars_count / elapsed, 1) if elapsed > 0 else None,
+                "completion_status": "success" if bars_count > 0 else "no_data"
+            },
+            decision_reason=f"Historical data request completed with {bars_count} bars"
+        )
+        # <Historical Data End Logging - End>
+
+        print(f"✅ Historical data completed for {symbol}: {bars_count} bars received")
+
+        future = request_data['future']
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(self._process_historical_bars(bars, symbol))
+            except Exception as e:
+                future.set_exception(e)
+
+    def historical_data_error(self, req_id: int, error_code: int, error_string: str) -> bool:
+        """Callback for IBKR errors; fails the matching request's future. Returns True if it was ours."""
+        if error_code not in HISTORICAL_ERROR_CODES:
+            return False
+        with self._lock:
+            request_data = self._active_requests.get(req_id)
+            if not request_data:
+                return False
+            request_data['error'] = error_string
+            symbol = request_data['symbol']
+
+        error = HistoricalDataError(req_id, error_code, error_string)
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Historical data request rejected by IBKR",
+            symbol=symbol,
+            context_provider={
+                "request_id": req_id,
+                "error_code": error_code,
+                "error_message": error_string,
+                "pacing_violation": error.is_pacing_violation
+            },
+            decision_reason="HISTORICAL_PACING_VIOLATION" if error.is_pacing_violation else "HISTORICAL_REQUEST_ERROR"
+        )
+
+        future = request_data['future']
+        if future.set_running_or_notify_cancel():
+            future.set_exception(error)
+        return True
+
     # --- Health and Metrics Methods ---
     def get_health_status(self) -> Dict[str, Any]:
         """Get health metrics for historical data manager."""
@@ -489,10 +787,16 @@ class HistoricalDataManager:
                 'total_requests': self._total_requests,
                 'successful_requests': self._successful_requests,
                 'failed_requests': self._failed_requests,
+                'cancelled_requests': self._cancelled_requests,
                 'success_rate_percent': round(success_rate, 2),
                 'last_request_time': self._last_request_time.isoformat() if self._last_request_time else None,
                 'max_retries': self._max_retries,
-                'request_timeout': self._request_timeout
+                'request_timeout': self._request_timeout,
+                'bar_cache_enabled': self.bar_cache.enabled,
+                'bar_cache_hits': self._cache_hits,
+                'bar_cache_tail_fetches': self._cache_tail_fetches,
+                'bar_cache_restatements': self._cache_restatements,
+                'gateway': self.gateway.get_metrics()
             }
             
             return health
@@ -0,0 +1,498 @@
+"""
+Pacing-aware scheduler for IBKR historical data requests.
+Keeps several requests in flight through HistoricalDataManager while enforcing
+IBKR's historical pacing rules, retries pacing violations with backoff and
+exposes throughput and queue metrics. Requests carry a priority class so urgent
+live-path requests are served ahead of (and may preempt) scanner batch work.
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import CancelledError, Future, InvalidStateError, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from config.trading_core_config import get_config
+from src.core.context_aware_logger import get_context_logger, TradingEventType
+from src.market_data.managers.historical_data_manager import HistoricalDataError
+
+
+class HistoricalRequestPriority(IntEnum):
+    """Priority classes for historical requests; lower values are served first."""
+    EXECUTION_CRITICAL = 0  # Needed to place or validate a live order
+    INTERACTIVE = 1         # A user or service is waiting on the answer
+    BATCH = 2               # Scanner and other bulk work; may be preempted
+
+
+@dataclass
+class _HistoricalJob:
+    """A queued historical request and the future handed back to the caller."""
+    symbol: str
+    days: int
+    bar_size: str
+    what_to_show: str = "TRADES"
+    priority: HistoricalRequestPriority = HistoricalRequestPriority.INTERACTIVE
+    future: Future = field(default_factory=Future)
+    request_future: Optional[Future] = None
+    attempts: int = 0
+    not_before: float = 0.0
+    submitted_at: float = 0.0
+    dispatched_at: float = 0.0
+
+    @property
+    def request_key(self) -> Tuple:
+        """Identity IBKR uses for the 'identical request' rule."""
+        return (self.symbol, self.days, self.bar_size, self.what_to_show)
+
+    @property
+    def contract_key(self) -> Tuple:
+        """Identity IBKR uses for the per-contract burst rule."""
+        return (self.symbol, self.what_to_show)
+
+
+class HistoricalRequestScheduler:
+    """
+    Dispatches historical data requests concurrently within IBKR pacing limits.
+
+    Limits (from config['historical_data']): at most max_in_flight open requests,
+    pacing_window_requests per pacing_window_seconds, no identical request within
+    identical_request_seconds, and contract_burst_requests per contract within
+    contract_burst_seconds.
+
+    Queued jobs are dispatched in priority order. When every slot is busy, a waiting
+    non-batch job preempts the newest in-flight batch request, which is cancelled at
+    IBKR and requeued. Cancelling a caller's Future cancels its IBKR request as well.
+    """
+
+    def __init__(self, historical_manager, config: Optional[Dict] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.context_logger = get_context_logger()
+        self.historical_manager = historical_manager
+
+        pacing = (config or get_config()).get('historical_data', {})
+        self.max_in_flight = pacing.get('max_in_flight', 6)
+        self.window_requests = pacing.get('pacing_window_requests', 60)
+        self.window_seconds = pacing.get('pacing_window_seconds', 600)
+        self.identical_seconds = pacing.get('identical_request_seconds', 15)
+        self.burst_requests = pacing.get('contract_burst_requests', 6)
+        self.burst_seconds = pacing.get('contract_burst_seconds', 2)
+        self.request_timeout = pacing.get('request_timeout_seconds', 15)
+        self.max_retries = pacing.get('max_retries', 3)
+        self.backoff_base = pacing.get('backoff_base_seconds', 10)
+        self.backoff_max = pacing.get('backoff_max_seconds', 120)
+
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queues: Dict[HistoricalRequestPriority, Deque[_HistoricalJob]] = {
+            priority: deque() for priority in HistoricalRequestPriority
+        }
+        self._in_flight: Dict[Future, _HistoricalJob] = {}
+        self._dispatcher: Optional[threading.Thread] = None
+        self._running = False
+
+        # Pacing history (monotonic dispatch times)
+        self._window: Deque[float] = deque()
+        self._last_identical: Dict[Tuple, float] = {}
+        self._contract_history: Dict[Tuple, Deque[float]] = defaultdict(deque)
+
+        # Metrics
+        self._metrics = {
+            'submitted': 0,
+            'dispatched': 0,
+            'completed': 0,
+            'failed': 0,
+            'timed_out': 0,
+            'retried': 0,
+            'pacing_violations': 0,
+            'cache_hits': 0,
+            'preempted': 0,
+            'abandoned': 0
+        }
+        self._total_latency = 0.0
+        self._started_at: Optional[float] = None
+
+    # <Request Submission - Begin>
+    def submit(self, symbol: str, days: int = 100, bar_size: str = "1 day",
+               what_to_show: str = "TRADES",
+               priority: HistoricalRequestPriority = HistoricalRequestPriority.INTERACTIVE) -> Future:
+        """
+        Queue a historical request; the Future resolves with the manager's DataFrame.
+        Cancelling the Future drops the job, or cancels its IBKR request if already sent.
+        """
+        job = _HistoricalJob(symbol=symbol, days=days, bar_size=bar_size,
+                             what_to_show=what_to_show, priority=HistoricalRequestPriority(priority))
+
+        # Fresh cached bars never reach IBKR, so they must not use up pacing budget
+        cached = self._cached_result(job)
+        if cached is not None:
+            with self._cond:
+                self._metrics['submitted'] += 1
+                self._metrics['cache_hits'] += 1
+            job.future.set_result(cached)
+            return job.future
+
+        with self._cond:
+            job.submitted_at = self._clock()
+            if self._started_at is None:
+                self._started_at = job.submitted_at
+            self._metrics['submitted'] += 1
+            self._queues[job.priority].append(job)
+            self._ensure_dispatcher()
+            self._cond.notify_all()
+        job.future.add_done_callback(lambda f: self._abandon(job) if f.cancelled() else None)
+        return job.future
+
+    def _cached_result(self, job: _HistoricalJob) -> Optional[pd.DataFrame]:
+        get_cached = getattr(self.historical_manager, 'get_cached_historical_data', None)
+        if get_cached is None:
+            return None
+        try:
+            return get_cached(job.symbol, job.days, job.bar_size)
+        except Exception:
+            return None
+
+    def submit_many(self, symbols: Iterable[str], days: int = 100, bar_size: str = "1 day",
+                    priority: HistoricalRequestPriority = HistoricalRequestPriority.BATCH) -> Dict[str, Future]:
+        """Queue history for many symbols without waiting; returns symbol -> Future in submission order."""
+        return {symbol: self.submit(symbol, days, bar_size, priority=priority)
+                for symbol in dict.fromkeys(symbols)}
+
+    def fetch_many(self, symbols: Iterable[str], days: int = 100, bar_size: str = "1 day",
+                   timeout: Optional[float] = None,
+                   priority: HistoricalRequestPriority = HistoricalRequestPriority.BATCH) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Fetch history for many symbols concurrently and wait for all of them.
+        Requests still unanswered at the timeout are cancelled at IBKR.
+
+        Returns:
+            Dictionary of symbol -> DataFrame, or None for symbols that failed or timed out
+        """
+        futures = self.submit_many(symbols, days, bar_size, priority=priority)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        results: Dict[str, Optional[pd.DataFrame]] = {}
+        for symbol, future in futures.items():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                results[symbol] = future.result(timeout=remaining)
+            except (FutureTimeoutError, CancelledError):
+                future.cancel()
+                results[symbol] = None
+            except Exception as e:
+                self.context_logger.log_event(
+                    TradingEventType.SYSTEM_HEALTH,
+                    "Scheduled historical request failed",
+                    symbol=symbol,
+                    context_provider={
+                        "error_type": type(e).__name__,
+                        "error_message": str(e)
+                    },
+                    decision_reason="HISTORICAL_REQUEST_FAILED"
+                )
+                results[symbol] = None
+        return results
+    # <Request Submission - End>
+
+    def set_historical_manager(self, historical_manager) -> None:
+        """Dispatch through this manager from now on (the one receiving IBKR's historical callbacks)."""
+        with self._cond:
+            self.historical_manager = historical_manager
+
+    def cancel_pending(self, priority: HistoricalRequestPriority = HistoricalRequestPriority.BATCH) -> int:
+        """
+        Cancel every queued and in-flight job of one priority class (e.g. a superseded scan).
+        In-flight requests are cancelled at IBKR. Returns the number of jobs cancelled.
+        """
+        with self._cond:
+            jobs = list(self._queues[priority])
+            jobs += [job for job in self._in_flight.values() if job.priority == priority]
+        cancelled = sum(1 for job in jobs if job.future.cancel())
+
+        if cancelled:
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Historical requests cancelled by priority class",
+                context_provider={
+                    "priority": priority.name,
+                    "jobs_cancelled": cancelled
+                },
+                decision_reason="HISTORICAL_REQUESTS_CANCELLED"
+            )
+        return cancelled
+
+    def shutdown(self) -> None:
+        """Stop dispatching and cancel anything still queued."""
+        with self._cond:
+            self._running = False
+            pending = [job for queue in self._queues.values() for job in queue]
+            for queue in self._queues.values():
+                queue.clear()
+            self._cond.notify_all()
+        for job in pending:
+            job.future.cancel()
+
+    # <Pacing - Begin>
+    def _pacing_delay(self, job: _HistoricalJob, now: float) -> float:
+        """Seconds until the job may be dispatched without breaking a pacing rule (0 = now)."""
+        delays = [job.not_before - now]
+
+        while self._window and now - self._window[0] >= self.window_seconds:
+            self._window.popleft()
+        if len(self._window) >= self.window_requests:
+            delays.append(self._window[0] + self.window_seconds - now)
+
+        last_identical = self._last_identical.get(job.request_key)
+        if last_identical is not None:
+            delays.append(last_identical + self.identical_seconds - now)
+
+        history = self._contract_history[job.contract_key]
+        while history and now - history[0] >= self.burst_seconds:
+            history.popleft()
+        if len(history) >= self.burst_requests:
+            delays.append(history[0] + self.burst_seconds - now)
+
+        return max(delays + [0.0])
+
+    def _record_dispatch(self, job: _HistoricalJob, now: float) -> None:
+        self._window.append(now)
+        self._last_identical[job.request_key] = now
+        self._contract_history[job.contract_key].append(now)
+    # <Pacing - End>
+
+    # <Dispatcher - Begin>
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._running = True
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name="HistoricalRequestScheduler", daemon=True
+            )
+            self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                job, wait = self._next_dispatchable()
+                if job is None:
+                    if not self._running or (not self._queued_count() and not self._in_flight):
+                        self._dispatcher = None
+                        return
+                    self._cond.wait(timeout=wait)
+                    continue
+                self._record_dispatch(job, self._clock())
+
+            self._dispatch(job)
+
+    def _next_dispatchable(self) -> Tuple[Optional[_HistoricalJob], Optional[float]]:
+        """
+        Pop the highest-priority queued job that pacing allows now; otherwise return how long to wait.
+        Caller holds the lock.
+        """
+        now = self._clock()
+        self._expire_timed_out(now)
+        if not self._running:
+            return None, None
+
+        waits = [job.dispatched_at + self.request_timeout - now for job in self._in_flight.values()]
+        slots_free = len(self._in_flight) < self.max_in_flight
+        for priority, queue in self._queues.items():
+            for job in list(queue):
+                if job.future.cancelled():
+                    queue.remove(job)
+                    continue
+                delay = self._pacing_delay(job, now)
+                if delay > 0:
+                    waits.append(delay)
+                    continue
+                if not slots_free:
+                    if priority == HistoricalRequestPriority.BATCH or not self._preempt_batch(job):
+                        break
+                queue.remove(job)
+                return job, None
+
+        return None, (max(0.0, min(waits)) if waits else None)
+
+    def _queued_count(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _preempt_batch(self, urgent: _HistoricalJob) -> bool:
+        """
+        Free a slot for an urgent job by cancelling the newest in-flight batch request.
+        The batch job goes back to the front of its queue. Caller holds the lock.
+        """
+        batch = [(request_future, job) for request_future, job in self._in_flight.items()
+                 if job.priority == HistoricalRequestPriority.BATCH]
+        if not batch:
+            return False
+        request_future, job = max(batch, key=lambda item: item[1].dispatched_at)
+        self._in_flight.pop(request_future, None)
+        job.request_future = None
+        job.attempts -= 1  # A preempted request does not count against the job's retries
+        self._queues[HistoricalRequestPriority.BATCH].appendleft(job)
+        self._metrics['preempted'] += 1
+        request_future.cancel()
+
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Batch historical request preempted",
+            symbol=job.symbol,
+            context_provider={
+                "preempted_by": urgent.symbol,
+                "urgent_priority": urgent.priority.name,
+                "in_flight": len(self._in_flight)
+            },
+            decision_reason="HISTORICAL_BATCH_PREEMPTED"
+        )
+        return True
+
+    def _abandon(self, job: _HistoricalJob) -> None:
+        """The caller cancelled its Future; cancel the IBKR request if one is still open."""
+        with self._cond:
+            request_future = job.request_future
+            if request_future is None or self._in_flight.pop(request_future, None) is None:
+                return
+            job.request_future = None
+            self._metrics['abandoned'] += 1
+            self._cond.notify_all()
+        request_future.cancel()
+
+    def _dispatch(self, job: _HistoricalJob) -> None:
+        # The caller's future stays pending across pacing retries, so it can be cancelled until resolved
+        if job.future.cancelled():
+            return
+        job.attempts += 1
+        job.dispatched_at = self._clock()
+        try:
+            if self.historical_manager is None:
+                raise ConnectionError(f"No historical data manager available for {job.symbol}")
+            request_future = self.historical_manager.request_historical_data_async(
+                job.symbol, job.days, job.bar_size
+            )
+        except Exception as e:
+            with self._cond:
+                self._metrics['failed'] += 1
+            self._resolve(job, error=e)
+            return
+
+        with self._cond:
+            self._metrics['dispatched'] += 1
+            self._in_flight[request_future] = job
+            job.request_future = request_future
+        request_future.add_done_callback(self._on_request_done)
+        if job.future.cancelled():
+            # Abandoned while the request was being sent
+            self._abandon(job)
+
+    def _on_request_done(self, request_future: Future) -> None:
+        with self._cond:
+            job = self._in_flight.pop(request_future, None)
+            self._cond.notify_all()
+        if job is None:
+            return
+
+        if request_future.cancelled():
+            # Cancelled by _expire_timed_out, _preempt_batch or _abandon, which settled the job there
+            return
+
+        error = request_future.exception()
+        if isinstance(error, HistoricalDataError) and error.is_pacing_violation and job.attempts <= self.max_retries:
+            self._retry_after_pacing_violation(job, error)
+            return
+
+        with self._cond:
+            if error is None:
+                self._metrics['completed'] += 1
+                self._total_latency += self._clock() - job.submitted_at
+            else:
+                self._metrics['failed'] += 1
+        self._resolve(job, result=request_future.result() if error is None else None, error=error)
+
+    def _retry_after_pacing_violation(self, job: _HistoricalJob, error: Exception) -> None:
+        backoff = min(self.backoff_max, self.backoff_base * (2 ** (job.attempts - 1)))
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Historical pacing violation - backing off",
+            symbol=job.symbol,
+            context_provider={
+                "attempt": job.attempts,
+                "max_retries": self.max_retries,
+                "backoff_seconds": backoff,
+                "error_message": str(error)
+            },
+            decision_reason="HISTORICAL_PACING_BACKOFF"
+        )
+        with self._cond:
+            self._metrics['pacing_violations'] += 1
+            self._metrics['retried'] += 1
+            job.not_before = self._clock() + backoff
+            job.request_future = None
+            self._queues[job.priority].appendleft(job)
+            self._cond.notify_all()
+
+    def _expire_timed_out(self, now: float) -> None:
+        """Cancel in-flight requests that never completed. Caller holds the lock."""
+        for request_future, job in list(self._in_flight.items()):
+            if now - job.dispatched_at >= self.request_timeout:
+                self._in_flight.pop(request_future, None)
+                self._metrics['timed_out'] += 1
+                request_future.cancel()
+                self._resolve(job, error=FutureTimeoutError(
+                    f"Historical request for {job.symbol} timed out after {self.request_timeout}s"
+                ))
+
+    @staticmethod
+    def _resolve(job: _HistoricalJob, result=None, error: Optional[BaseException] = None) -> None:
+        """Complete the caller's future unless the caller already cancelled it."""
+        try:
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+        except InvalidStateError:
+            pass
+    # <Dispatcher - End>
+
+    # <Metrics - Begin>
+    def get_metrics(self) -> Dict[str, Any]:
+        """Throughput, queue and pacing metrics for monitoring."""
+        with self._cond:
+            now = self._clock()
+            elapsed = (now - self._started_at) if self._started_at is not None else 0.0
+            completed = self._metrics['completed']
+            window_used = sum(1 for t in self._window if now - t < self.window_seconds)
+            return {
+                **self._metrics,
+                'queued': self._queued_count(),
+                'queued_by_priority': {priority.name: len(queue) for priority, queue in self._queues.items()},
+                'in_flight': len(self._in_flight),
+                'max_in_flight': self.max_in_flight,
+                'pacing_window_used': window_used,
+                'pacing_window_limit': self.window_requests,
+                'throughput_per_minute': round(completed / elapsed * 60, 2) if elapsed > 0 else 0.0,
+                'average_latency_seconds': round(self._total_latency / completed, 3) if completed else 0.0
+            }
+    # <Metrics - End>
+
+
+# <Process-Wide Scheduler - Begin>
+_scheduler: Optional[HistoricalRequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_historical_request_scheduler(historical_manager=None) -> HistoricalRequestScheduler:
+    """
+    Return the scheduler shared by every historical data consumer in the process, so scanner
+    batches and live-path requests draw on one pacing budget and one priority queue.
+    A manager passed here is only adopted while the scheduler has none.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = HistoricalRequestScheduler(historical_manager)
+        elif historical_manager is not None and _scheduler.historical_manager is None:
+            _scheduler.set_historical_manager(historical_manager)
+        return _scheduler
+# <Process-Wide Scheduler - End>
@@ -0,0 +1,291 @@
+"""
+Persisted incremental indicator state, one record per (symbol, timeframe, indicator, period).
+A record holds the indicator value at its last bar, so a later run only folds in the bars
+that arrived since instead of recomputing from the whole history.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.trading_core_config import get_config
+from src.core.context_aware_logger import get_context_logger, TradingEventType
+
+
+@dataclass
+class IndicatorState:
+    """Indicator value as of one bar."""
+    timestamp: str        # ISO timestamp of the last bar folded in
+    value: float
+    last_close: float     # Close of that bar; a different close later means the history was restated
+    bars: int             # Bars folded in so far
+    weight: float = 0.0   # EMA: sum of decayed weights (pandas ewm adjust=True normalisation)
+    window: List[float] = field(default_factory=list)  # SMA: last `period` closes
+
+
+class IndicatorStateStore:
+    """
+    Incremental EMA/SMA values keyed by (symbol, timeframe, indicator, period), backed by a JSON file.
+
+    update_ema()/update_sma() take the latest close series. If the stored bar is still in the
+    series with the same close, only the bars after it are applied, one O(1) step each; if it is
+    missing (a gap) or its close changed (a split or restatement), the value is recomputed from
+    the series. EMAs follow pandas ewm(span, adjust=True), so an uninterrupted run matches a full
+    recompute over the same bars.
+    """
+
+    def __init__(self, path: str = os.path.join('data', 'indicator_state.json'), enabled: bool = True,
+                 flush_interval_seconds: float = 60, restatement_tolerance: float = 1e-4):
+        self.context_logger = get_context_logger()
+        self.path = path
+        self.enabled = enabled
+        self.flush_interval = flush_interval_seconds
+        self.restatement_tolerance = restatement_tolerance
+        self._lock = threading.RLock()
+        self._states: Dict[str, IndicatorState] = {}
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._metrics = {'incremental_updates': 0, 'bars_applied': 0, 'full_recomputes': 0,
+                         'gaps': 0, 'restatements': 0}
+        if enabled:
+            self._load()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict] = None) -> 'IndicatorStateStore':
+        """Build the store from config['indicator_state']."""
+        settings = (config or get_config()).get('indicator_state', {})
+        return cls(
+            path=settings.get('path', os.path.join('data', 'indicator_state.json')),
+            enabled=settings.get('enabled', True),
+            flush_interval_seconds=settings.get('flush_interval_seconds', 60),
+            restatement_tolerance=settings.get('restatement_tolerance', 1e-4)
+        )
+
+    @staticmethod
+    def key(symbol: str, timeframe: str, indicator: str, period: int) -> str:
+        return f"{symbol}|{timeframe}|{indicator}|{period}"
+
+    def get(self, symbol: str, timeframe: str, indicator: str, period: int) -> Optional[IndicatorState]:
+        with self._lock:
+            return self._states.get(self.key(symbol, timeframe, indicator, period))
+
+    # <Incremental Updates - Begin>
+    def update_ema(self, symbol: str, timeframe: str, period: int, closes: pd.Series,
+                   seed: Optional[float] = None, last_bar_final: bool = True) -> Optional[float]:
+        """
+        EMA(period) at the last bar of closes, or None with fewer than `period` bars.
+        seed is an already computed EMA over all of closes (e.g. from IndicatorEngine),
+        used instead of a recompute when the stored state cannot be continued.
+        With last_bar_final=False the last bar is still forming: state is kept up to the bar
+        before it and the last close is applied to the returned value only.
+        """
+        closes = self._valid_closes(closes)
+        if closes is None:
+            return seed
+        decay = 1.0 - 2.0 / (period + 1.0)
+
+        def recompute(committed: pd.Series) -> IndicatorState:
+            if seed is not None and last_bar_final:
+                value = seed
+            else:
+                value = float(committed.ewm(span=period).mean().iloc[-1])
+            # Closed form of the adjust=True weight after n bars: 1 + d + ... + d^(n-1)
+            weight = (1.0 - decay ** len(committed)) / (1.0 - decay)
+            return self._state_at(committed, value, len(committed), weight=weight)
+
+        def advance(state: IndicatorState, new_closes: np.ndarray) -> None:
+            value, weight = state.value, state.weight
+            for close in new_closes:
+                previous_weight = weight
+                weight = 1.0 + decay * previous_weight
+                value = (close + decay * previous_weight * value) / weight
+            state.value, state.weight = float(value), float(weight)
+
+        state = self._update_through(symbol, timeframe, 'ema', period, closes, recompute, advance, last_bar_final)
+        return state.value if state.bars >= period else None
+
+    def update_sma(self, symbol: str, timeframe: str, period: int, closes: pd.Series,
+                   last_bar_final: bool = True) -> Optional[float]:
+        """Simple moving average(period) at the last bar of closes, or None with fewer than `period` bars."""
+        closes = self._valid_closes(closes)
+        if closes is None:
+            return None
+
+        def recompute(committed: pd.Series) -> IndicatorState:
+            window = committed.iloc[-period:].astype(float).tolist()
+            return self._state_at(committed, float(np.mean(window)), len(committed), window=window)
+
+        def advance(state: IndicatorState, new_closes: np.ndarray) -> None:
+            window = state.window
+            total = state.value * len(window)
+            for close in new_closes:
+                window.append(float(close))
+                total += close
+                if len(window) > period:
+                    total -= window.pop(0)
+            state.value = float(total / len(window))
+
+        state = self._update_through(symbol, timeframe, 'sma', period, closes, recompute, advance, last_bar_final)
+        return state.value if state.bars >= period else None
+
+    def _update_through(self, symbol: str, timeframe: str, indicator: str, period: int, closes: pd.Series,
+                        recompute, advance, last_bar_final: bool) -> IndicatorState:
+        """Commit state through the last final bar; a forming last bar is applied to a copy only."""
+        if last_bar_final or len(closes) < 2:
+            return self._update(symbol, timeframe, indicator, period, closes, recompute, advance)
+        committed = self._update(symbol, timeframe, indicator, period, closes.iloc[:-1], recompute, advance)
+        provisional = IndicatorState(**{**asdict(committed), 'window': list(committed.window)})
+        advance(provisional, closes.iloc[-1:].to_numpy(dtype=np.float64))
+        provisional.bars += 1
+        return provisional
+
+    def _update(self, symbol: str, timeframe: str, indicator: str, period: int, closes: pd.Series,
+                recompute, advance) -> IndicatorState:
+        key = self.key(symbol, timeframe, indicator, period)
+        with self._lock:
+            state = self._states.get(key)
+            position, reason = self._continuation(state, closes)
+            if position is None:
+                state = recompute(closes)
+                self._metrics['full_recomputes'] += 1
+                if reason:
+                    self._metrics[reason] += 1
+            elif position < len(closes) - 1:
+                new_closes = closes.iloc[position + 1:]
+                advance(state, new_closes.to_numpy(dtype=np.float64))
+                state.bars += len(new_closes)
+                state.timestamp = pd.Timestamp(closes.index[-1]).isoformat()
+                state.last_close = float(closes.iloc[-1])
+                self._metrics['incremental_updates'] += 1
+                self._metrics['bars_applied'] += len(new_closes)
+            else:
+                return state  # No new bars
+            self._states[key] = state
+            self._dirty = True
+        self.flush()
+        return state
+
+    def _continuation(self, state: Optional[IndicatorState], closes: pd.Series) -> Tuple[Optional[int], Optional[str]]:
+        """Position of the state's bar in closes, or (None, reason) when it must be recomputed."""
+        if state is None:
+            return None, None
+        stored_at = pd.Timestamp(state.timestamp)
+        try:
+            position = int(closes.index.searchsorted(stored_at))
+        except TypeError:
+            return None, 'gaps'  # Time zone awareness differs from the stored bar
+        if position >= len(closes) or closes.index[position] != stored_at:
+            # The stored bar is gone: newer data than the series, or a hole between the two
+            return None, 'gaps'
+        close = float(closes.iloc[position])
+        if abs(close - state.last_close) > self.restatement_tolerance * max(abs(state.last_close), 1e-12):
+            return None, 'restatements'
+        return position, None
+
+    @staticmethod
+    def _valid_closes(closes: pd.Series) -> Optional[pd.Series]:
+        """Closes usable for stateful updates: a sorted DatetimeIndex without missing values."""
+        if closes is None or not isinstance(closes.index, pd.DatetimeIndex):
+            return None
+        closes = closes.dropna()
+        if closes.empty or not closes.index.is_monotonic_increasing:
+            return None
+        return closes
+
+    @staticmethod
+    def _state_at(closes: pd.Series, value: float, bars: int, weight: float = 0.0,
+                  window: Optional[List[float]] = None) -> IndicatorState:
+        return IndicatorState(timestamp=pd.Timestamp(closes.index[-1]).isoformat(), value=float(value),
+                              last_close=float(closes.iloc[-1]), bars=bars, weight=weight,
+                              window=window or [])
+    # <Incremental Updates - End>
+
+    # <Persistence - Begin>
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop the state of one symbol (e.g. after a corporate action), or everything."""
+        with self._lock:
+            if symbol is None:
+                self._states.clear()
+            else:
+                prefix = f"{symbol}|"
+                self._states = {key: state for key, state in self._states.items() if not key.startswith(prefix)}
+            self._dirty = True
+        self.flush(force=True)
+
+    def flush(self, force: bool = False) -> None:
+        """Write changed state to disk, at most once per flush interval unless forced."""
+        with self._lock:
+            if not self.enabled or not self._dirty:
+                return
+            if not force and time.monotonic() - self._last_flush < self.flush_interval:
+                return
+            entries = {key: asdict(state) for key, state in self._states.items()}
+            self._dirty = False
+            self._last_flush = time.monotonic()
+
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Indicator state write failed",
+                context_provider={
+                    "path": self.path,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                },
+                decision_reason="INDICATOR_STATE_WRITE_FAILED"
+            )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._metrics, 'states': len(self._states)}
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            self._states = {key: IndicatorState(**entry) for key, entry in entries.items()}
+        except Exception as e:
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Indicator state read failed - starting empty",
+                context_provider={
+                    "path": self.path,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                },
+                decision_reason="INDICATOR_STATE_READ_FAILED"
+            )
+    # <Persistence - End>
+
+
+# <Process-Wide Indicator State - Begin>
+_indicator_state_store: Optional[IndicatorStateStore] = None
+_indicator_state_lock = threading.Lock()
+
+
+def get_indicator_state_store() -> IndicatorStateStore:
+    """Return the indicator state store shared by the scanner and market context analysis."""
+    global _indicator_state_store
+    with _indicator_state_lock:
+        if _indicator_state_store is None:
+            _indicator_state_store = IndicatorStateStore.from_config()
+        return _indicator_state_store
+# <Process-Wide Indicator State - End>
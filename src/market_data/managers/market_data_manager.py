@@ -300,11 +300,12 @@ class MarketDataManager:
                     }
                 )
 
-    def add_monitored_symbol(self, symbol: str) -> None:
-        """Add a symbol to the monitored set."""
+    def add_monitored_symbol(self, symbol: str) -> bool:
+        """Add a symbol to the monitored set. Returns False if it was already monitored."""
         with self.lock:
             was_monitored = symbol in self.monitored_symbols
             self.monitored_symbols.add(symbol)
+            return not was_monitored
 
     def remove_monitored_symbol(self, symbol: str) -> None:
         """Remove a symbol from the monitored set."""
@@ -0,0 +1,193 @@
+"""
+Multi-timeframe bar service.
+Fetches one base series per symbol at the finest timeframe needed and derives coarser
+timeframes locally with vectorized resampling, instead of one data feed request per timeframe.
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from src.core.context_aware_logger import get_context_logger, TradingEventType
+from src.services.market_hours_service import MarketHoursService
+
+# Timeframe label -> (pandas resample rule, minutes of regular trading per bar)
+TIMEFRAMES: Dict[str, Tuple[str, int]] = {
+    '1min': ('1min', 1),
+    '5min': ('5min', 5),
+    '15min': ('15min', 15),
+    '30min': ('30min', 30),
+    '1H': ('1h', 60),
+    '4H': ('4h', 240),
+    '1D': ('1D', 390)  # One regular session
+}
+
+OHLCV_AGGREGATION = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+# Intraday bins start at the session open (09:30-10:30, 09:30-13:30), like the broker's own bars
+SESSION_OPEN_OFFSET = pd.Timedelta(hours=MarketHoursService.MARKET_OPEN.hour,
+                                   minutes=MarketHoursService.MARKET_OPEN.minute)
+
+
+class MultiTimeframeBarService:
+    """
+    Serves OHLCV bars for several timeframes from a single base series per symbol.
+
+    The base series is fetched through loader(symbol, base_timeframe, bars) with enough bars
+    for the coarsest timeframe requested so far. Derived frames are cached and reused until the
+    base series gains a new bar, either because a base bar period has elapsed and the base is
+    refetched, or because add_base_bar() appended one.
+    """
+
+    def __init__(self, loader: Callable[[str, str, int], Optional[pd.DataFrame]],
+                 base_timeframe: str = '15min', clock: Callable[[], float] = time.monotonic):
+        if base_timeframe not in TIMEFRAMES:
+            raise ValueError(f"Unsupported base timeframe: {base_timeframe}. "
+                             f"Available: {list(TIMEFRAMES.keys())}")
+        self.context_logger = get_context_logger()
+        self.loader = loader
+        self.base_timeframe = base_timeframe
+        self.base_minutes = TIMEFRAMES[base_timeframe][1]
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._base: Dict[str, Dict] = {}  # symbol -> {'bars', 'count', 'fetched_at', 'version'}
+        self._derived: Dict[Tuple[str, str], Tuple[int, pd.DataFrame]] = {}  # (symbol, timeframe) -> (base version, bars)
+        self._versions = 0
+        self._metrics = {'base_fetches': 0, 'derived_hits': 0, 'resamples': 0, 'direct_fetches': 0}
+
+    # <Bar Access - Begin>
+    def get_bars(self, symbol: str, timeframe: str, bars: int) -> pd.DataFrame:
+        """Return the last `bars` bars of `timeframe` for symbol (empty DataFrame if unavailable)."""
+        if not self._derivable(timeframe):
+            with self._lock:
+                self._metrics['direct_fetches'] += 1
+            return self._load(symbol, timeframe, bars)
+
+        base, version = self._ensure_base(symbol, self._base_bars_needed(timeframe, bars))
+        if base.empty:
+            return pd.DataFrame()
+        if timeframe == self.base_timeframe:
+            return base.tail(bars)
+        if not isinstance(base.index, pd.DatetimeIndex):
+            # Cannot resample without timestamps; ask the feed for this timeframe directly
+            with self._lock:
+                self._metrics['direct_fetches'] += 1
+            return self._load(symbol, timeframe, bars)
+
+        with self._lock:
+            cached = self._derived.get((symbol, timeframe))
+            if cached is not None and cached[0] == version:
+                self._metrics['derived_hits'] += 1
+                return cached[1].tail(bars)
+
+        derived = self.resample(base, timeframe)
+        with self._lock:
+            self._metrics['resamples'] += 1
+            self._derived[(symbol, timeframe)] = (version, derived)
+        return derived.tail(bars)
+
+    def prefetch(self, symbol: str, timeframes: Iterable[str], bars: int) -> None:
+        """Fetch the base series once with enough history for every requested timeframe."""
+        needed = [self._base_bars_needed(tf, bars) for tf in timeframes if self._derivable(tf)]
+        if needed:
+            self._ensure_base(symbol, max(needed))
+
+    def add_base_bar(self, symbol: str, bar: Dict) -> None:
+        """Append (or replace) one streaming base bar; derived frames rebuild on next access."""
+        timestamp = pd.Timestamp(bar['date'])
+        row = pd.DataFrame([{k: v for k, v in bar.items() if k != 'date'}], index=pd.DatetimeIndex([timestamp], name='date'))
+        with self._lock:
+            entry = self._base.get(symbol)
+            if entry is None:
+                return
+            merged = pd.concat([entry['bars'], row])
+            entry['bars'] = merged[~merged.index.duplicated(keep='last')].sort_index()
+            entry['fetched_at'] = self._clock()
+            entry['version'] = self._next_version()
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Forget base and derived series for one symbol, or for all symbols."""
+        with self._lock:
+            for key in list(self._base):
+                if symbol is None or key == symbol:
+                    del self._base[key]
+            for key in list(self._derived):
+                if symbol is None or key[0] == symbol:
+                    del self._derived[key]
+
+    def get_metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._metrics, 'symbols_cached': len(self._base)}
+    # <Bar Access - End>
+
+    # <Resampling - Begin>
+    @staticmethod
+    def resample(bars: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        """
+        Aggregate OHLCV bars to a coarser timeframe; empty periods (nights, weekends) are dropped.
+        Intraday periods are anchored at the session open, daily periods at midnight.
+        """
+        rule, minutes = TIMEFRAMES[timeframe]
+        aggregation = {column: how for column, how in OHLCV_AGGREGATION.items() if column in bars.columns}
+        anchor = {'origin': 'start_day', 'offset': SESSION_OPEN_OFFSET} if minutes < TIMEFRAMES['1D'][1] else {}
+        resampled = bars.resample(rule, label='left', closed='left', **anchor).agg(aggregation)
+        return resampled.dropna(subset=['close']) if 'close' in resampled.columns else resampled.dropna(how='all')
+    # <Resampling - End>
+
+    # <Base Series - Begin>
+    def _derivable(self, timeframe: str) -> bool:
+        return timeframe in TIMEFRAMES and TIMEFRAMES[timeframe][1] >= self.base_minutes
+
+    def _base_bars_needed(self, timeframe: str, bars: int) -> int:
+        # One extra coarse bar because the first resampled period is usually partial
+        return math.ceil((bars + 1) * TIMEFRAMES[timeframe][1] / self.base_minutes)
+
+    def _ensure_base(self, symbol: str, count: int) -> Tuple[pd.DataFrame, int]:
+        """
+        Return (base bars, version), refetching if the series is too short or a new base bar is due.
+        The version changes whenever the base series does, which invalidates derived frames.
+        """
+        with self._lock:
+            entry = self._base.get(symbol)
+            stale_after = self.base_minutes * 60
+            if (entry is not None and entry['count'] >= count
+                    and self._clock() - entry['fetched_at'] < stale_after):
+                return entry['bars'], entry['version']
+            count = max(count, entry['count'] if entry else 0)
+
+        bars = self._load(symbol, self.base_timeframe, count)
+        with self._lock:
+            self._metrics['base_fetches'] += 1
+            if bars.empty:
+                return bars, -1
+            if entry is not None and entry['bars'].equals(bars):
+                version = entry['version']  # Refetch returned no new bar - keep derived frames
+            else:
+                version = self._next_version()
+            self._base[symbol] = {'bars': bars, 'count': count, 'fetched_at': self._clock(), 'version': version}
+
+        self.context_logger.log_event(
+            TradingEventType.MARKET_CONDITION,
+            "Base bars fetched for multi-timeframe analysis",
+            symbol=symbol,
+            context_provider={
+                "base_timeframe": self.base_timeframe,
+                "bars_requested": count,
+                "bars_received": len(bars)
+            },
+            decision_reason="MULTI_TIMEFRAME_BASE_FETCHED"
+        )
+        return bars, version
+
+    def _next_version(self) -> int:
+        """Caller holds the lock."""
+        self._versions += 1
+        return self._versions
+
+    def _load(self, symbol: str, timeframe: str, bars: int) -> pd.DataFrame:
+        data = self.loader(symbol, timeframe, bars)
+        return data if data is not None else pd.DataFrame()
+    # <Base Series - End>
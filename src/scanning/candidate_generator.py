@@ -1,6 +1,7 @@
 # src/scanner/candidate_generator.py
+import heapq
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Sized
 from datetime import datetime
 import os
 import pandas as pd
@@ -39,27 +40,108 @@ class CandidateGenerator:
         self.strategy_orchestrator = strategy_orchestrator
         self.logger = logging.getLogger(__name__)
     
+    def iter_candidates(self,
+                        scan_results: Iterable[ScanResult],
+                        min_confidence: int = 60) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a candidate as soon as each scan result clears a strategy (OR logic), in arrival order.
+        scan_results may be a stream such as StockScanner.iter_scan(); candidates are not ranked.
+        A parallel orchestrator evaluates the stream in batches across its worker processes.
+        """
+        batched = isinstance(self.strategy_orchestrator, StrategyOrchestrator) and self.strategy_orchestrator.parallel
+        return self._iter_candidates(scan_results, min_confidence, batched)
+
+    def _iter_candidates(self, scan_results: Iterable[ScanResult], min_confidence: int,
+                         batched: bool) -> Iterator[Dict[str, Any]]:
+        """
+        Candidates in arrival order. Batched evaluation goes through evaluate_symbols(), which screens
+        each batch with the vectorized base criteria; otherwise every symbol is evaluated on arrival.
+        """
+        if batched:
+            for scan_result, strategy_matches in self.strategy_orchestrator.evaluate_symbols(scan_results):
+                for strategy_match in strategy_matches:
+                    if strategy_match.confidence >= min_confidence:
+                        yield self._format_candidate(scan_result, strategy_match)
+            return
+        
+        for scan_result in scan_results:
+            try:
+                # Use StrategyOrchestrator to evaluate with OR logic
+                strategy_matches = self.strategy_orchestrator.evaluate_symbol(scan_result)
+            except Exception as e:
+                # <Context-Aware Logging Integration - Begin>
+                self.context_logger.log_event(
+                    TradingEventType.SYSTEM_HEALTH,
+                    f"Error evaluating {scan_result.symbol}",
+                    symbol=scan_result.symbol,
+                    context_provider={
+                        "error_type": type(e).__name__,
+                        "error_message": str(e)
+                    },
+                    decision_reason="Symbol evaluation failed"
+                )
+                # <Context-Aware Logging Integration - End>
+                continue
+
+            # Create candidate for each strategy match (symbol can match multiple strategies)
+            for strategy_match in strategy_matches or []:
+                if strategy_match.confidence >= min_confidence:
+                    yield self._format_candidate(scan_result, strategy_match)
+
     def generate_candidates(self, 
-                          scan_results: List[ScanResult],
+                          scan_results: Iterable[ScanResult],
                           min_confidence: int = 60,
                           max_candidates: int = 25) -> List[Dict[str, Any]]:
         """
         Generate candidates using OR logic - symbols match if ANY strategy identifies them
         Each candidate includes strategy identification
+
+        scan_results is consumed as a stream and, with a StrategyOrchestrator, evaluated in batches
+        screened by the vectorized base criteria. Only the best max_candidates are held, in a
+        min-heap keyed by confidence, and returned highest first. Ties go to the symbol earlier
+        in the scanned universe (ScanResult.universe_index), not to whichever fetch finished first.
         """
         # <Context-Aware Logging Integration - Begin>
         self.context_logger.log_event(
             TradingEventType.SYSTEM_HEALTH,
             "Starting candidate generation with OR logic",
             context_provider={
-                "scan_results_count": len(scan_results),
+                "scan_results_count": len(scan_results) if isinstance(scan_results, Sized) else None,
                 "min_confidence": min_confidence,
                 "max_candidates": max_candidates
             }
         )
         # <Context-Aware Logging Integration - End>
         
-        if not scan_results:
+        evaluated = 0
+        universe_index: Dict[str, int] = {}
+
+        def counted(results):
+            nonlocal evaluated
+            for result in results:
+                evaluated += 1
+                if result.universe_index is not None:
+                    universe_index.setdefault(result.symbol, result.universe_index)
+                yield result
+
+        # (confidence, -universe index, -sequence) keys are unique, so candidate dicts are never compared;
+        # results without a universe index rank by arrival
+        top_candidates = []
+        generated = 0
+        batched = isinstance(self.strategy_orchestrator, StrategyOrchestrator)
+        candidates = self._iter_candidates(counted(scan_results), min_confidence, batched)
+        for sequence, candidate in enumerate(candidates):
+            generated += 1
+            if max_candidates <= 0:
+                continue
+            rank = universe_index.get(candidate['symbol'], sequence)
+            entry = ((candidate['confidence'], -rank, -sequence), candidate)
+            if len(top_candidates) < max_candidates:
+                heapq.heappush(top_candidates, entry)
+            elif entry[0] > top_candidates[0][0]:
+                heapq.heapreplace(top_candidates, entry)
+
+        if not evaluated:
             # <Context-Aware Logging Integration - Begin>
             self.context_logger.log_event(
                 TradingEventType.SYSTEM_HEALTH,
@@ -70,49 +152,8 @@ class CandidateGenerator:
             # <Context-Aware Logging Integration - End>
             return []
         
-        all_candidates = []
-        
-        # <Context-Aware Logging Integration - Begin>
-        self.context_logger.log_event(
-            TradingEventType.SYSTEM_HEALTH,
-            f"Applying OR logic strategy matching to {len(scan_results)} scan results",
-            context_provider={
-                "scan_results_count": len(scan_results),
-                "min_confidence_threshold": min_confidence
-            }
-        )
-        # <Context-Aware Logging Integration - End>
-        
-        for scan_result in scan_results:
-            try:
-                # Use StrategyOrchestrator to evaluate with OR logic
-                strategy_matches = self.strategy_orchestrator.evaluate_symbol(scan_result)
-                
-                if strategy_matches:
-                    # Create candidate for each strategy match (symbol can match multiple strategies)
-                    for strategy_match in strategy_matches:
-                        if strategy_match.confidence >= min_confidence:
-                            candidate = self._format_candidate(scan_result, strategy_match)
-                            all_candidates.append(candidate)
-                            
-            except Exception as e:
-                # <Context-Aware Logging Integration - Begin>
-                self.context_logger.log_event(
-                    TradingEventType.SYSTEM_HEALTH,
-                    f"Error evaluating {scan_result.symbol}",
-                    symbol=scan_result.symbol,
-                    context_provider={
-                        "error_type": type(e).__name__,
-                        "error_message": str(e)
-                    },
-                    decision_reason="Symbol evaluation failed"
-                )
-                # <Context-Aware Logging Integration - End>
-                continue
-        
-        # Sort by confidence and limit results
-        all_candidates.sort(key=lambda x: x['confidence'], reverse=True)
-        final_candidates = all_candidates[:max_candidates]
+        # Highest confidence first, ties in universe order
+        final_candidates = [candidate for _, candidate in sorted(top_candidates, key=lambda entry: entry[0], reverse=True)]
         
         # Log strategy distribution
         self._log_strategy_distribution(final_candidates)
@@ -122,9 +163,10 @@ class CandidateGenerator:
             TradingEventType.SYSTEM_HEALTH,
             "Candidate generation completed",
             context_provider={
+                "scan_results_evaluated": evaluated,
                 "total_candidates_generated": len(final_candidates),
                 "max_candidates_limit": max_candidates,
-                "original_candidates_count": len(all_candidates),
+                "original_candidates_count": generated,
                 "confidence_threshold_applied": min_confidence
             },
             decision_reason="Candidate generation process completed"
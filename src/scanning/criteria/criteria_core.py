@@ -4,6 +4,11 @@ from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
+import threading
+import time
+
+import numpy as np
+import pandas as pd
 
 class CriteriaType(Enum):
     FUNDAMENTAL = "fundamental"
@@ -20,6 +25,17 @@ class CriteriaConfig:
     enabled: bool = True
     weight: float = 1.0
     parameters: Dict[str, Any] = field(default_factory=dict)
+    required: bool = True  # A failed required criterion fails the evaluation; optional ones only affect the score
+    cost: Optional[float] = None  # Relative evaluation cost; defaults by criteria type
+
+# Relative cost of one evaluation by type: field comparisons vs. work over price history
+DEFAULT_CRITERIA_COSTS = {
+    CriteriaType.FUNDAMENTAL: 1.0,
+    CriteriaType.LIQUIDITY: 2.0,
+    CriteriaType.VOLATILITY: 10.0,
+    CriteriaType.TECHNICAL: 10.0,
+    CriteriaType.CUSTOM: 10.0
+}
 
 class BaseCriteria(ABC):
     """Base class for all criteria that strategies can use"""
@@ -28,6 +44,13 @@ class BaseCriteria(ABC):
         self.config = config
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def estimated_cost(self) -> float:
+        """Declared relative cost of one evaluation, used to order criteria before timings exist"""
+        if self.config.cost is not None:
+            return self.config.cost
+        return DEFAULT_CRITERIA_COSTS.get(self.config.criteria_type, 10.0)
+    
     @abstractmethod
     def evaluate(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -45,16 +68,59 @@ class BaseCriteria(ABC):
     def get_required_fields(self) -> List[str]:
         """List of data fields required for evaluation"""
         pass
+    
+    def evaluate_batch(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Evaluate criteria for a whole universe at once.
+        frame has one row per symbol: scalar fields ('price', 'volume', 'market_cap', ...) and the
+        scanner's IndicatorEngine columns ('rsi_14', 'ema_20', 'high_50', 'bars', ...).
+        Returns a frame with the same index and 'passed' (bool) and 'score' (float) columns.
+        This fallback calls evaluate() per row; built-in criteria override it with vectorized rules.
+        """
+        results = [self.evaluate({key: value for key, value in row.items() if not _is_missing(value)})
+                   for row in frame.to_dict('records')]
+        return self._batch_result(frame,
+                                  np.array([bool(r.get('passed', False)) for r in results], dtype=bool),
+                                  np.array([float(r.get('score', 0)) for r in results], dtype=np.float64))
+    
+    @staticmethod
+    def _batch_result(frame: pd.DataFrame, passed, score) -> pd.DataFrame:
+        passed = np.broadcast_to(np.asarray(passed, dtype=bool), (len(frame),))
+        score = np.broadcast_to(np.nan_to_num(np.asarray(score, dtype=np.float64)), (len(frame),))
+        return pd.DataFrame({'passed': passed, 'score': score}, index=frame.index)
+    
+    @staticmethod
+    def _column(frame: pd.DataFrame, name: str, default: float = np.nan) -> np.ndarray:
+        """A numeric column as float array, or the default for every row when the frame lacks it"""
+        if name not in frame:
+            return np.full(len(frame), default, dtype=np.float64)
+        return pd.to_numeric(frame[name], errors='coerce').to_numpy(dtype=np.float64, na_value=default)
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and np.isnan(value))
 
 class CriteriaRegistry:
-    """Registry to manage all available criteria"""
+    """
+    Registry to manage all available criteria.
+
+    evaluate_all() runs required criteria first, cheapest and most selective first, and stops at
+    the first required failure; optional criteria run only on symbols that passed every required
+    one. The order comes from each criterion's expected cost divided by its failure rate: declared
+    costs at first, then measured timings and pass rates once min_samples evaluations exist.
+    """
     
-    def __init__(self):
+    def __init__(self, min_samples: int = 20):
         self._criteria: Dict[str, BaseCriteria] = {}
+        self.min_samples = min_samples
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._stats_lock = threading.Lock()
     
     def register(self, criteria: BaseCriteria):
         """Register a criteria"""
         self._criteria[criteria.config.name] = criteria
+        with self._stats_lock:
+            self._stats[criteria.config.name] = {'evaluations': 0, 'passed': 0, 'skipped': 0, 'total_seconds': 0.0}
         logging.info(f"Registered criteria: {criteria.config.name}")
     
     def get_criteria(self, name: str) -> Optional[BaseCriteria]:
@@ -67,31 +133,58 @@ class CriteriaRegistry:
                 if c.config.criteria_type == criteria_type]
     
     def evaluate_all(self, stock_data: Dict[str, Any], 
-                    criteria_names: List[str] = None) -> Dict[str, Any]:
+                    criteria_names: List[str] = None,
+                    short_circuit: bool = True,
+                    shared_results: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
-        Evaluate multiple criteria against stock data
+        Evaluate multiple criteria against stock data.
+        With short_circuit, evaluation stops at the first failed required criterion and the
+        criteria not run are listed in skipped_criteria.
+        shared_results holds per-criterion results already computed for the same stock_data (e.g. by
+        another strategy); those are reused without re-running, and new results are added to it.
         """
         results = {}
         total_score = 0
         total_weight = 0
         passed_criteria = []
         failed_criteria = []
+        skipped_criteria = []
+        required_failed = False
         
-        criteria_to_evaluate = self._get_criteria_to_evaluate(criteria_names)
+        criteria_to_evaluate = self._order_by_cost([c for c in self._get_criteria_to_evaluate(criteria_names)
+                                                    if c.config.enabled])
+        if shared_results:
+            # Already known results cost nothing, so a known required failure short-circuits first
+            criteria_to_evaluate.sort(key=lambda c: c.config.name not in shared_results)
         
         for criteria in criteria_to_evaluate:
-            if not criteria.config.enabled:
+            name = criteria.config.name
+            if required_failed and short_circuit:
+                skipped_criteria.append(name)
                 continue
-                
-            result = criteria.evaluate(stock_data)
-            results[criteria.config.name] = result
+            
+            if shared_results is not None and name in shared_results:
+                result = shared_results[name]
+            else:
+                started = time.perf_counter()
+                result = criteria.evaluate(stock_data)
+                self._record(name, result['passed'], time.perf_counter() - started)
+                if shared_results is not None:
+                    shared_results[name] = result
+            results[name] = result
             
             if result['passed']:
-                passed_criteria.append(criteria.config.name)
+                passed_criteria.append(name)
                 total_score += result['score'] * criteria.config.weight
                 total_weight += criteria.config.weight
             else:
-                failed_criteria.append(criteria.config.name)
+                failed_criteria.append(name)
+                required_failed = required_failed or criteria.config.required
+        
+        if skipped_criteria:
+            with self._stats_lock:
+                for name in skipped_criteria:
+                    self._stats[name]['skipped'] += 1
         
         # Calculate weighted average score
         overall_score = total_score / total_weight if total_weight > 0 else 0
@@ -100,14 +193,129 @@ class CriteriaRegistry:
             'overall_score': overall_score,
             'passed_criteria': passed_criteria,
             'failed_criteria': failed_criteria,
+            'skipped_criteria': skipped_criteria,
             'detailed_results': results,
-            'meets_requirements': len(failed_criteria) == 0
+            'meets_requirements': not required_failed
         }
     
+    def evaluate_batch(self, frame: pd.DataFrame, criteria_names: List[str] = None) -> pd.DataFrame:
+        """
+        evaluate_all() for a whole universe: one vectorized pass per criterion, in the same cost
+        order, each over only the symbols that passed every required criterion before it.
+        Returns meets_requirements, overall_score and per-criterion '<name>_passed' columns
+        (NaN where a criterion was skipped for that symbol).
+        """
+        alive = np.ones(len(frame), dtype=bool)
+        weighted_score = np.zeros(len(frame))
+        passed_weight = np.zeros(len(frame))
+        columns = {}
+        
+        for criteria in self._order_by_cost([c for c in self._get_criteria_to_evaluate(criteria_names)
+                                             if c.config.enabled]):
+            name = criteria.config.name
+            rows = np.flatnonzero(alive)
+            outcome = np.full(len(frame), np.nan)
+            if len(rows):
+                started = time.perf_counter()
+                result = criteria.evaluate_batch(frame.iloc[rows])
+                passed = result['passed'].to_numpy(dtype=bool)
+                self._record(name, int(passed.sum()), time.perf_counter() - started, evaluations=len(rows))
+                
+                outcome[rows] = passed
+                weighted_score[rows] += np.where(passed, result['score'].to_numpy() * criteria.config.weight, 0.0)
+                passed_weight[rows] += np.where(passed, criteria.config.weight, 0.0)
+                if criteria.config.required:
+                    alive[rows[~passed]] = False
+            skipped = len(frame) - len(rows)
+            if skipped:
+                with self._stats_lock:
+                    self._stats[name]['skipped'] += skipped
+            columns[f'{name}_passed'] = outcome
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            overall_score = np.where(passed_weight > 0, weighted_score / passed_weight, 0.0)
+        return pd.DataFrame({'meets_requirements': alive, 'overall_score': overall_score, **columns},
+                            index=frame.index)
+    
     def _get_criteria_to_evaluate(self, criteria_names: List[str] = None) -> List[BaseCriteria]:
         """Get criteria based on names or all if None"""
         if criteria_names:
             return [self.get_criteria(name) for name in criteria_names 
                    if self.get_criteria(name)]
         else:
-            return list(self._criteria.values())
\ No newline at end of file
+            return list(self._criteria.values())
+    
+    # Cost-Ordered Evaluation - Begin
+    def _order_by_cost(self, criteria: List[BaseCriteria]) -> List[BaseCriteria]:
+        """
+        Required criteria by ascending expected cost per rejection (cost / failure rate), so cheap
+        selective filters run first; then optional criteria by ascending cost.
+        """
+        with self._stats_lock:
+            stats = {c.config.name: dict(self._stats.get(c.config.name, {})) for c in criteria}
+            seconds_per_unit = self._seconds_per_cost_unit()
+        
+        def expected_cost(c: BaseCriteria) -> float:
+            s = stats[c.config.name]
+            if s.get('evaluations', 0) >= self.min_samples:
+                return s['total_seconds'] / s['evaluations']
+            return c.estimated_cost * seconds_per_unit
+        
+        def rank(c: BaseCriteria) -> float:
+            s = stats[c.config.name]
+            # Laplace-smoothed failure rate: unknown criteria start at 50%
+            failure_rate = (s.get('evaluations', 0) - s.get('passed', 0) + 1) / (s.get('evaluations', 0) + 2)
+            return expected_cost(c) / failure_rate
+        
+        required = sorted((c for c in criteria if c.config.required), key=rank)
+        optional = sorted((c for c in criteria if not c.config.required), key=expected_cost)
+        return required + optional
+    
+    def _seconds_per_cost_unit(self) -> float:
+        """Measured seconds per unit of declared cost, to compare timed and not yet timed criteria"""
+        seconds = units = 0.0
+        for name, s in self._stats.items():
+            criteria = self._criteria.get(name)
+            if criteria is not None and s['evaluations'] >= self.min_samples:
+                seconds += s['total_seconds']
+                units += s['evaluations'] * criteria.estimated_cost
+        return seconds / units if units > 0 else 1e-6
+    
+    def _record(self, name: str, passed: int, seconds: float, evaluations: int = 1) -> None:
+        with self._stats_lock:
+            s = self._stats.setdefault(name, {'evaluations': 0, 'passed': 0, 'skipped': 0, 'total_seconds': 0.0})
+            s['evaluations'] += evaluations
+            s['passed'] += int(passed)
+            s['total_seconds'] += seconds
+    
+    def get_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-criterion evaluations, pass rate, mean evaluation time and skips from short-circuiting"""
+        with self._stats_lock:
+            return {
+                name: {
+                    'evaluations': s['evaluations'],
+                    'passed': s['passed'],
+                    'skipped': s['skipped'],
+                    'pass_rate': s['passed'] / s['evaluations'] if s['evaluations'] else None,
+                    'mean_ms': s['total_seconds'] / s['evaluations'] * 1000 if s['evaluations'] else None,
+                    'estimated_cost': self._criteria[name].estimated_cost if name in self._criteria else None
+                }
+                for name, s in self._stats.items()
+            }
+    
+    def reset_statistics(self) -> None:
+        with self._stats_lock:
+            for s in self._stats.values():
+                s.update({'evaluations': 0, 'passed': 0, 'skipped': 0, 'total_seconds': 0.0})
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Picklable for strategy worker processes; each copy keeps its own statistics
+        with self._stats_lock:
+            state = {**self.__dict__, '_stats': {name: dict(s) for name, s in self._stats.items()}}
+        del state['_stats_lock']
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._stats_lock = threading.Lock()
+    # Cost-Ordered Evaluation - End
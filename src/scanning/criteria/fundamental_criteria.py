@@ -1,6 +1,8 @@
 # src/scanner/criteria/fundamental_criteria.py
 from .criteria_core import BaseCriteria, CriteriaConfig, CriteriaType
 from typing import Dict, Any, List
+import numpy as np
+import pandas as pd
 
 class FundamentalCriteria(BaseCriteria):
     """Base fundamental criteria for high-quality, liquid stocks"""
@@ -17,6 +19,25 @@ class FundamentalCriteria(BaseCriteria):
         else:
             return {'passed': False, 'score': 0, 'message': 'Unknown criteria'}
     
+    def evaluate_batch(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Vectorized evaluate() over one row per symbol; same pass/score rules"""
+        name = self.config.name
+        if name in ("min_volume", "min_market_cap"):
+            column, default = ('volume', 1_000_000) if name == "min_volume" else ('market_cap', 10_000_000_000)
+            minimum = self.config.parameters.get(name, default)
+            values = self._column(frame, column, 0.0)
+            passed = values > minimum
+            return self._batch_result(frame, passed, np.where(passed, np.minimum(100, values / minimum * 100), 0))
+        elif name == "min_price":
+            passed = self._column(frame, 'price', 0.0) > self.config.parameters.get('min_price', 5.0)
+            return self._batch_result(frame, passed, np.where(passed, 100.0, 0.0))
+        elif name == "exchange_listed":
+            major_exchanges = self.config.parameters.get('major_exchanges', ['NYSE', 'NASDAQ'])
+            exchanges = frame['exchange'].fillna('').astype(str).str.upper() if 'exchange' in frame else pd.Series('', index=frame.index)
+            passed = exchanges.isin(major_exchanges).to_numpy()
+            return self._batch_result(frame, passed, np.where(passed, 100.0, 0.0))
+        return self._batch_result(frame, False, 0.0)
+    
     def get_required_fields(self) -> List[str]:
         if self.config.name == "min_volume":
             return ['volume']
@@ -1,6 +1,8 @@
 # src/scanner/criteria/liquidity_criteria.py
 from .criteria_core import BaseCriteria, CriteriaConfig, CriteriaType
 from typing import Dict, Any, List
+import numpy as np
+import pandas as pd
 
 class LiquidityCriteria(BaseCriteria):
     """Liquidity-focused criteria for stable trading"""
@@ -15,6 +17,36 @@ class LiquidityCriteria(BaseCriteria):
         else:
             return {'passed': False, 'score': 0, 'message': 'Unknown criteria'}
     
+    def evaluate_batch(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized evaluate() over one row per symbol; same pass/score rules.
+        volume_consistency reads the IndicatorEngine's 'volume_cv' and 'bars' columns.
+        """
+        name = self.config.name
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if name == "bid_ask_spread":
+                max_spread_pct = self.config.parameters.get('max_spread_pct', 0.02)
+                bid = self._column(frame, 'bid_price', 0.0)
+                ask = self._column(frame, 'ask_price', 0.0)
+                price = self._column(frame, 'price', 0.0)
+                quoted = (bid != 0) & (ask != 0) & (price != 0)
+                spread_pct = (ask - bid) / price
+                passed = quoted & (spread_pct <= max_spread_pct)
+                score = np.where(quoted, np.maximum(0, 100 - spread_pct / max_spread_pct * 100), 0)
+                return self._batch_result(frame, passed, score)
+            elif name == "average_dollar_volume":
+                min_dollar_volume = self.config.parameters.get('min_dollar_volume', 10_000_000)
+                dollar_volume = self._column(frame, 'volume', 0.0) * self._column(frame, 'price', 0.0)
+                passed = dollar_volume > min_dollar_volume
+                return self._batch_result(frame, passed, np.where(passed, np.minimum(100, dollar_volume / min_dollar_volume * 100), 0))
+            elif name == "volume_consistency":
+                max_cv = self.config.parameters.get('max_cv', 0.5)
+                cv = self._column(frame, 'volume_cv')
+                usable = (self._column(frame, 'bars', 0.0) >= 5) & np.isfinite(cv)
+                passed = usable & (cv <= max_cv)
+                return self._batch_result(frame, passed, np.where(usable, np.maximum(0, 100 - cv / max_cv * 100), 0))
+        return self._batch_result(frame, False, 0.0)
+    
     def get_required_fields(self) -> List[str]:
         if self.config.name == "bid_ask_spread":
             return ['bid_price', 'ask_price', 'price']
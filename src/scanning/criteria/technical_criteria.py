@@ -40,6 +40,126 @@ class TechnicalCriteria(BaseCriteria):
         }
         return field_map.get(self.config.name, [])
     
+    # Vectorized Batch Evaluation - Begin
+    def evaluate_batch(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized evaluate() over one row per symbol, reading IndicatorEngine columns
+        ('close', 'bars', 'ema_<p>', 'rsi_<p>', 'macd*', 'high_<n>'/'low_<n>', ...) instead of
+        price histories. Pass/score rules are those of the per-symbol methods; a symbol whose
+        indicator column is missing or NaN fails as it would with insufficient history.
+        """
+        rules = {
+            "ema_trend_alignment": self._batch_ema_trend_alignment,
+            "rsi_momentum": self._batch_rsi_momentum,
+            "macd_signal": self._batch_macd_signal,
+            "support_resistance": self._batch_support_resistance,
+            "volatility_range": self._batch_volatility_range,
+            "price_position": self._batch_price_position,
+            "volume_confirmation": self._batch_volume_confirmation,
+            "trend_strength": self._batch_trend_strength
+        }
+        rule = rules.get(self.config.name)
+        if rule is None:
+            return self._batch_result(frame, False, 0.0)
+        bars = self._column(frame, 'bars', 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            passed, score = rule(frame, bars)
+        return self._batch_result(frame, passed, score)
+    
+    def _batch_ema_trend_alignment(self, frame: pd.DataFrame, bars: np.ndarray):
+        close = self._column(frame, 'close')
+        ema_9, ema_20, ema_50 = (self._column(frame, f'ema_{period}') for period in (9, 20, 50))
+        usable = (bars >= 50) & ~np.isnan(ema_9) & ~np.isnan(ema_20) & ~np.isnan(ema_50)
+        met = (close > ema_9).astype(int) + (ema_9 > ema_20) + (ema_20 > ema_50)
+        return usable & (met >= 2), np.where(usable, met / 3 * 100, 0)
+    
+    def _batch_rsi_momentum(self, frame: pd.DataFrame, bars: np.ndarray):
+        period = self.config.parameters.get('rsi_period', 14)
+        overbought = self.config.parameters.get('overbought', 70)
+        oversold = self.config.parameters.get('oversold', 30)
+        ideal_min = self.config.parameters.get('ideal_min', 40)
+        ideal_max = self.config.parameters.get('ideal_max', 65)
+        rsi = self._column(frame, f'rsi_{period}')
+        usable = (bars >= period + 1) & ~np.isnan(rsi)
+        
+        ideal = (rsi >= ideal_min) & (rsi <= ideal_max)
+        neutral = ~ideal & (rsi > oversold) & (rsi < overbought)
+        neutral_score = np.maximum(0, 100 - np.minimum(np.abs(rsi - ideal_min), np.abs(rsi - ideal_max)) * 5)
+        score = np.where(ideal, 100, np.where(neutral, neutral_score, 0))
+        passed = ideal | (neutral & (neutral_score >= 50))
+        return usable & passed, np.where(usable, score, 0)
+    
+    def _batch_macd_signal(self, frame: pd.DataFrame, bars: np.ndarray):
+        macd, signal, histogram = (self._column(frame, key) for key in ('macd', 'macd_signal', 'macd_histogram'))
+        usable = (bars >= 26) & ~np.isnan(macd) & ~np.isnan(signal) & ~np.isnan(histogram)
+        met = (macd > signal).astype(int) + (macd > 0) + (histogram > 0)
+        return usable & (met >= 2), np.where(usable, met / 3 * 100, 0)
+    
+    def _batch_support_resistance(self, frame: pd.DataFrame, bars: np.ndarray):
+        close = self._column(frame, 'close')
+        recent_high, recent_low = self._column(frame, 'high_50'), self._column(frame, 'low_50')
+        resistance_1 = recent_low + (recent_high - recent_low) * 0.618
+        support_1 = recent_high - (recent_high - recent_low) * 0.618
+        near_support = np.abs(close - support_1) / support_1 <= self.config.parameters.get('min_distance_from_support', 0.02)
+        room_to_resistance = np.abs(close - resistance_1) / resistance_1 >= self.config.parameters.get('max_distance_from_resistance', 0.10)
+        usable = (bars >= 20) & ~np.isnan(recent_high) & ~np.isnan(recent_low)
+        met = near_support.astype(int) + room_to_resistance
+        return usable & (met >= 1), np.where(usable, met / 2 * 100, 0)
+    
+    def _batch_volatility_range(self, frame: pd.DataFrame, bars: np.ndarray):
+        min_volatility = self.config.parameters.get('min_volatility', 1.0)
+        max_volatility = self.config.parameters.get('max_volatility', 5.0)
+        volatility = self._column(frame, 'return_std_pct')
+        usable = (bars >= 20) & ~np.isnan(volatility)
+        
+        in_range = (volatility >= min_volatility) & (volatility <= max_volatility)
+        too_low = volatility < min_volatility
+        score = np.where(in_range, 100,
+                         np.where(too_low, volatility / min_volatility * 50,
+                                  np.maximum(0, 100 - (volatility - max_volatility) * 20)))
+        passed = in_range | (too_low & (score >= 30)) | (~in_range & ~too_low & (score >= 50))
+        return usable & passed, np.where(usable, score, 0)
+    
+    def _batch_price_position(self, frame: pd.DataFrame, bars: np.ndarray):
+        max_position = self.config.parameters.get('max_range_position', 80)
+        ideal_min = self.config.parameters.get('ideal_min_position', 30)
+        ideal_max = self.config.parameters.get('ideal_max_position', 70)
+        close = self._column(frame, 'close')
+        recent_high, recent_low = self._column(frame, 'high_20'), self._column(frame, 'low_20')
+        usable = (bars >= 20) & ~np.isnan(recent_high) & ~np.isnan(recent_low) & (recent_high != recent_low)
+        
+        range_position = (close - recent_low) / (recent_high - recent_low) * 100
+        ideal = (range_position >= ideal_min) & (range_position <= ideal_max)
+        acceptable = ~ideal & (range_position <= max_position)
+        acceptable_score = np.maximum(0, 80 - np.minimum(np.abs(range_position - ideal_min),
+                                                         np.abs(range_position - ideal_max)) * 2)
+        score = np.where(ideal, 100, np.where(acceptable, acceptable_score, 0))
+        passed = ideal | (acceptable & (acceptable_score >= 50))
+        return usable & passed, np.where(usable, score, 0)
+    
+    def _batch_volume_confirmation(self, frame: pd.DataFrame, bars: np.ndarray):
+        price_change = self._column(frame, 'price_change_pct_10')
+        volume_ratio = self._column(frame, 'volume_ratio_10')
+        usable = (bars >= 10) & ~np.isnan(price_change) & ~np.isnan(volume_ratio)
+        
+        confirmed_up = (price_change > 0) & (volume_ratio > 1.2)
+        quiet_pullback = ~confirmed_up & (price_change < 0) & (volume_ratio < 0.8)
+        small_move = ~confirmed_up & ~quiet_pullback & (np.abs(price_change) < 2)
+        score = np.select([confirmed_up, quiet_pullback, small_move], [100, 80, 60], default=30)
+        passed = confirmed_up | quiet_pullback | small_move | self.config.parameters.get('allow_volume_divergence', False)
+        return usable & passed, np.where(usable, score, 0)
+    
+    def _batch_trend_strength(self, frame: pd.DataFrame, bars: np.ndarray):
+        min_slope = self.config.parameters.get('min_slope_pct', 0.05)
+        min_r_squared = self.config.parameters.get('min_r_squared', 0.3)
+        slope_pct = self._column(frame, 'trend_slope_pct_20')
+        r_squared = self._column(frame, 'trend_r_squared_20')
+        usable = (bars >= 20) & ~np.isnan(slope_pct) & ~np.isnan(r_squared)
+        
+        total_score = np.minimum(100, np.abs(slope_pct) / min_slope * 50) + np.minimum(100, r_squared / min_r_squared * 50)
+        return usable & (total_score >= 60) & (slope_pct > 0), np.where(usable, total_score, 0)
+    # Vectorized Batch Evaluation - End
+    
     def _evaluate_ema_trend_alignment(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Evaluate EMA trend alignment - bullish when shorter EMAs > longer EMAs
@@ -50,7 +170,7 @@ class TechnicalCriteria(BaseCriteria):
         if not ema_values or len(price_history) < 50:
             return {'passed': False, 'score': 0, 'message': 'Insufficient EMA data'}
         
-        current_price = price_history[-1] if price_history else 0
+        current_price = price_history[-1] if len(price_history) else 0
         required_emas = [9, 20, 50]  # Common EMA periods
         
         # Check if we have all required EMAs
@@ -95,8 +215,10 @@ class TechnicalCriteria(BaseCriteria):
         if len(price_history) < period + 1:
             return {'passed': False, 'score': 0, 'message': 'Insufficient price history for RSI'}
         
-        # Calculate RSI
-        rsi = self._calculate_rsi(price_history, period)
+        # Use the scanner's precomputed RSI when it was calculated for this period
+        rsi = self._precomputed(stock_data, f'rsi_{period}')
+        if rsi is None:
+            rsi = self._calculate_rsi(price_history, period)
         
         # Parameters
         overbought = self.config.parameters.get('overbought', 70)
@@ -143,7 +265,11 @@ class TechnicalCriteria(BaseCriteria):
             return {'passed': False, 'score': 0, 'message': 'Insufficient data for MACD'}
         
         # Calculate MACD
-        macd, signal, histogram = self._calculate_macd(price_history)
+        indicators = stock_data.get('indicators') or {}
+        if all(indicators.get(key) is not None for key in ('macd', 'macd_signal', 'macd_histogram')):
+            macd, signal, histogram = indicators['macd'], indicators['macd_signal'], indicators['macd_histogram']
+        else:
+            macd, signal, histogram = self._calculate_macd(price_history)
         
         # Bullish conditions
         conditions = [
@@ -339,9 +465,13 @@ class TechnicalCriteria(BaseCriteria):
         recent_prices = price_history[-10:]
         recent_volumes = volume_history[-10:]
         
-        price_change = (recent_prices[-1] - recent_prices[0]) / recent_prices[0] * 100
+        price_change = self._precomputed(stock_data, 'price_change_pct_10')
+        if price_change is None:
+            price_change = (recent_prices[-1] - recent_prices[0]) / recent_prices[0] * 100
         avg_volume = np.mean(recent_volumes)
-        current_volume_ratio = recent_volumes[-1] / avg_volume if avg_volume > 0 else 1
+        current_volume_ratio = self._precomputed(stock_data, 'volume_ratio_10')
+        if current_volume_ratio is None:
+            current_volume_ratio = recent_volumes[-1] / avg_volume if avg_volume > 0 else 1
         
         # Bullish: Price up with increasing volume, or price down with decreasing volume
         if price_change > 0 and current_volume_ratio > 1.2:
@@ -385,27 +515,10 @@ class TechnicalCriteria(BaseCriteria):
             return {'passed': False, 'score': 0, 'message': 'Insufficient price history'}
         
         # Use last 20 periods for trend analysis
-        lookback = min(20, len(price_history))
-        recent_prices = price_history[-lookback:]
-        
-        # Calculate linear regression slope
-        x = np.arange(len(recent_prices))
-        y = np.array(recent_prices)
-        
-        if len(y) < 2:
-            return {'passed': False, 'score': 0, 'message': 'Not enough data points'}
-        
-        slope, intercept = np.polyfit(x, y, 1)
-        
-        # Normalize slope by average price to get percentage slope
-        avg_price = np.mean(y)
-        slope_pct = (slope / avg_price) * 100
-        
-        # Calculate R-squared for trend strength
-        y_pred = slope * x + intercept
-        ss_res = np.sum((y - y_pred) ** 2)
-        ss_tot = np.sum((y - np.mean(y)) ** 2)
-        r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
+        slope_pct = self._precomputed(stock_data, 'trend_slope_pct_20')
+        r_squared = self._precomputed(stock_data, 'trend_r_squared_20')
+        if slope_pct is None or r_squared is None:
+            slope_pct, r_squared = self._calculate_trend(price_history[-20:])
         
         # Score based on slope and R-squared
         min_slope = self.config.parameters.get('min_slope_pct', 0.05)  # 0.05% per period
@@ -431,6 +544,30 @@ class TechnicalCriteria(BaseCriteria):
     
     # Technical Indicator Calculations
     
+    @staticmethod
+    def _precomputed(stock_data: Dict[str, Any], key: str):
+        """Indicator value precomputed by the scanner's IndicatorEngine, or None when absent"""
+        return (stock_data.get('indicators') or {}).get(key)
+    
+    def _calculate_trend(self, prices: List[float]) -> tuple:
+        """Linear regression slope (% of average price per period) and R-squared"""
+        x = np.arange(len(prices))
+        y = np.array(prices)
+        
+        slope, intercept = np.polyfit(x, y, 1)
+        
+        # Normalize slope by average price to get percentage slope
+        avg_price = np.mean(y)
+        slope_pct = (slope / avg_price) * 100
+        
+        # Calculate R-squared for trend strength
+        y_pred = slope * x + intercept
+        ss_res = np.sum((y - y_pred) ** 2)
+        ss_tot = np.sum((y - np.mean(y)) ** 2)
+        r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
+        
+        return slope_pct, r_squared
+    
     def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
         """Calculate RSI indicator"""
         if len(prices) < period + 1:
@@ -459,11 +596,11 @@ class TechnicalCriteria(BaseCriteria):
         # Convert to pandas Series for easier EMA calculation
         series = pd.Series(prices)
         
-        ema_12 = series.ewm(span=12).mean().iloc[-1]
-        ema_26 = series.ewm(span=26).mean().iloc[-1]
+        macd_line = series.ewm(span=12).mean() - series.ewm(span=26).mean()
+        signal_line = macd_line.ewm(span=9).mean()  # Signal line is EMA of MACD
         
-        macd = ema_12 - ema_26
-        signal = series.ewm(span=9).mean().iloc[-1]  # Signal line is EMA of MACD
+        macd = macd_line.iloc[-1]
+        signal = signal_line.iloc[-1]
         histogram = macd - signal
         
         return macd, signal, histogram
\ No newline at end of file
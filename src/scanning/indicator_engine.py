@@ -0,0 +1,218 @@
+# src/scanner/indicator_engine.py
+from typing import Dict, Iterable, Optional, Tuple
+import warnings
+import numpy as np
+import pandas as pd
+
+
+class IndicatorEngine:
+    """
+    Universe-wide indicator calculation for the Tier 1 scanner.
+
+    Every symbol's history is right-aligned (last bar in the last column) into one
+    symbols x bars NumPy array per field, and each indicator is computed for the whole
+    universe in a few vectorized passes. Definitions match the per-symbol calculations
+    in TechnicalScorer and TechnicalCriteria, so criteria can read these values directly.
+    """
+
+    def __init__(self, ema_periods: Iterable[int] = (10, 20, 50, 100), rsi_period: int = 14,
+                 macd_periods: Tuple[int, int, int] = (12, 26, 9), atr_period: int = 14,
+                 trend_lookback: int = 20, volume_lookback: int = 10,
+                 range_lookbacks: Iterable[int] = (20, 50)):
+        self.ema_periods = sorted(set(ema_periods))
+        self.rsi_period = rsi_period
+        self.macd_fast, self.macd_slow, self.macd_signal = macd_periods
+        self.atr_period = atr_period
+        self.trend_lookback = trend_lookback
+        self.volume_lookback = volume_lookback
+        self.range_lookbacks = sorted(set(range_lookbacks))
+
+    def compute(self, histories: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Indicator columns for every symbol with close prices, indexed by symbol.
+        Values a symbol has too few bars for are NaN.
+        """
+        histories = {symbol: data for symbol, data in histories.items()
+                     if data is not None and not data.empty and 'close' in data}
+        if not histories:
+            return pd.DataFrame()
+
+        symbols = list(histories)
+        aligned, counts = self._align(histories)
+        closes, highs, lows, volumes = aligned['close'], aligned['high'], aligned['low'], aligned['volume']
+
+        columns = {}
+        for period in self.ema_periods:
+            columns[f'ema_{period}'] = self._last_where(self._ema(closes, period)[:, -1], counts >= period)
+
+        columns[f'rsi_{self.rsi_period}'] = self._rsi(closes, counts)
+        columns.update(self._macd(closes, counts))
+        columns[f'atr_{self.atr_period}'] = self._atr(highs, lows, closes, counts)
+        slope_pct, r_squared = self._trend(closes, counts)
+        columns[f'trend_slope_pct_{self.trend_lookback}'] = slope_pct
+        columns[f'trend_r_squared_{self.trend_lookback}'] = r_squared
+        price_change, volume_ratio = self._volume_confirmation(closes, volumes, counts)
+        columns[f'price_change_pct_{self.volume_lookback}'] = price_change
+        columns[f'volume_ratio_{self.volume_lookback}'] = volume_ratio
+        columns.update(self._ranges(highs, lows))
+        columns['return_std_pct'], columns['volume_cv'] = self._dispersion(closes, volumes)
+        columns['close'] = closes[:, -1]
+        columns['bars'] = counts
+
+        return pd.DataFrame(columns, index=pd.Index(symbols, name='symbol'))
+
+    @staticmethod
+    def to_records(frame: pd.DataFrame) -> Dict[str, Dict[str, Optional[float]]]:
+        """symbol -> {column: value} with NaN turned into None, the form ScanResult carries."""
+        if frame.empty:
+            return {}
+        cleaned = frame.astype(object).where(frame.notna(), None)
+        return cleaned.to_dict('index')
+
+    # <Alignment - Begin>
+    @staticmethod
+    def _align(histories: Dict[str, pd.DataFrame]) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        Right-aligned symbols x bars arrays of close/high/low/volume, NaN-padded on the left,
+        plus each symbol's bar count. Bars without a close are dropped first so every row is
+        contiguous up to its last bar; missing high/low columns fall back to the close.
+        """
+        rows = []
+        for data in histories.values():
+            close = data['close'].to_numpy(dtype=np.float64)
+            valid = ~np.isnan(close)
+            row = {'close': close[valid]}
+            for column in ('high', 'low', 'volume'):
+                if column in data:
+                    row[column] = data[column].to_numpy(dtype=np.float64)[valid]
+            rows.append(row)
+
+        counts = np.array([len(row['close']) for row in rows], dtype=np.int64)
+        width = int(counts.max())
+        aligned = {column: np.full((len(rows), width), np.nan) for column in ('close', 'high', 'low', 'volume')}
+        for i, row in enumerate(rows):
+            n = counts[i]
+            if not n:
+                continue
+            for column, array in aligned.items():
+                source = row.get(column, row['close'] if column != 'volume' else None)
+                if source is not None:
+                    array[i, width - n:] = source
+        return aligned, counts
+
+    @staticmethod
+    def _last_where(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        return np.where(mask, values, np.nan)
+    # <Alignment - End>
+
+    # <Indicator Passes - Begin>
+    @staticmethod
+    def _ema(values: np.ndarray, span: int) -> np.ndarray:
+        """
+        EMA along the bars axis with pandas ewm(span, adjust=True) weighting.
+        Leading NaNs are skipped, so each row starts from its own first bar.
+        """
+        decay = 1.0 - 2.0 / (span + 1.0)
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        numerator = np.zeros(values.shape[0])
+        denominator = np.zeros(values.shape[0])
+        result = np.full(values.shape, np.nan)
+        for t in range(values.shape[1]):
+            numerator = numerator * decay + filled[:, t]
+            denominator = denominator * decay + valid[:, t]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result[:, t] = numerator / denominator
+        return result
+
+    def _rsi(self, closes: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Simple-average RSI over the last rsi_period changes."""
+        period = self.rsi_period
+        if closes.shape[1] < period + 1:
+            return np.full(closes.shape[0], np.nan)
+        deltas = np.diff(closes[:, -(period + 1):], axis=1)
+        avg_gains = np.where(deltas > 0, deltas, 0.0).mean(axis=1)
+        avg_losses = np.where(deltas < 0, -deltas, 0.0).mean(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rsi = 100 - 100 / (1 + avg_gains / avg_losses)
+        rsi = np.where(avg_losses == 0, np.where(avg_gains > 0, 100.0, 50.0), rsi)
+        return self._last_where(rsi, counts >= period + 1)
+
+    def _macd(self, closes: np.ndarray, counts: np.ndarray) -> Dict[str, np.ndarray]:
+        """MACD line, its signal line (EMA of the MACD line) and the histogram."""
+        macd_line = self._ema(closes, self.macd_fast) - self._ema(closes, self.macd_slow)
+        signal_line = self._ema(macd_line, self.macd_signal)
+        enough = counts >= self.macd_slow
+        macd = self._last_where(macd_line[:, -1], enough)
+        signal = self._last_where(signal_line[:, -1], enough)
+        return {'macd': macd, 'macd_signal': signal, 'macd_histogram': macd - signal}
+
+    def _atr(self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Simple-average true range over the last atr_period bars."""
+        period = self.atr_period
+        previous_close = np.empty_like(closes)
+        previous_close[:, 0] = np.nan
+        previous_close[:, 1:] = closes[:, :-1]
+        true_range = np.fmax(highs - lows, np.fmax(np.abs(highs - previous_close), np.abs(lows - previous_close)))
+        if closes.shape[1] < period + 1:
+            return np.full(closes.shape[0], np.nan)
+        return self._last_where(true_range[:, -period:].mean(axis=1), counts >= period + 1)
+
+    def _trend(self, closes: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Least-squares slope (as % of the mean price per bar) and R² over the last trend_lookback closes."""
+        lookback = self.trend_lookback
+        if closes.shape[1] < lookback:
+            empty = np.full(closes.shape[0], np.nan)
+            return empty, empty.copy()
+        window = closes[:, -lookback:]
+        x = np.arange(lookback, dtype=np.float64)
+        x_centered = x - x.mean()
+        y_mean = window.mean(axis=1, keepdims=True)
+        y_centered = window - y_mean
+        sxx = (x_centered ** 2).sum()
+        sxy = (y_centered * x_centered).sum(axis=1)
+        syy = (y_centered ** 2).sum(axis=1)
+        slope = sxy / sxx
+        with np.errstate(invalid='ignore', divide='ignore'):
+            slope_pct = slope / y_mean[:, 0] * 100
+            r_squared = np.where(syy != 0, sxy ** 2 / (sxx * syy), 0.0)
+        enough = counts >= lookback
+        return self._last_where(slope_pct, enough), self._last_where(r_squared, enough)
+
+    def _volume_confirmation(self, closes: np.ndarray, volumes: np.ndarray,
+                             counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Price change % across the last volume_lookback bars and last volume / their average volume."""
+        lookback = self.volume_lookback
+        if closes.shape[1] < lookback:
+            empty = np.full(closes.shape[0], np.nan)
+            return empty, empty.copy()
+        recent = closes[:, -lookback:]
+        recent_volume = volumes[:, -lookback:]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            price_change = (recent[:, -1] - recent[:, 0]) / recent[:, 0] * 100
+            average_volume = recent_volume.mean(axis=1)
+            volume_ratio = np.where(average_volume > 0, recent_volume[:, -1] / average_volume, 1.0)
+        volume_ratio = np.where(np.isnan(average_volume), np.nan, volume_ratio)
+        enough = counts >= lookback
+        return self._last_where(price_change, enough), self._last_where(volume_ratio, enough)
+
+    def _ranges(self, highs: np.ndarray, lows: np.ndarray) -> Dict[str, np.ndarray]:
+        """Highest high and lowest low over the last n bars (all bars when fewer) for each range lookback"""
+        columns = {}
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN rows (no bars) stay NaN
+            for lookback in self.range_lookbacks:
+                columns[f'high_{lookback}'] = np.nanmax(highs[:, -lookback:], axis=1)
+                columns[f'low_{lookback}'] = np.nanmin(lows[:, -lookback:], axis=1)
+        return columns
+
+    @staticmethod
+    def _dispersion(closes: np.ndarray, volumes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Std of bar-to-bar returns in % and the coefficient of variation of volume, over each symbol's whole history"""
+        with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+            warnings.simplefilter('ignore', RuntimeWarning)
+            returns = np.diff(closes, axis=1) / closes[:, :-1]
+            return_std_pct = np.nanstd(returns, axis=1) * 100 if returns.shape[1] else np.full(closes.shape[0], np.nan)
+            volume_cv = np.nanstd(volumes, axis=1) / np.nanmean(volumes, axis=1)
+        return return_std_pct, volume_cv
+    # <Indicator Passes - End>
@@ -3,12 +3,16 @@ import pandas as pd
 from datetime import datetime, timedelta
 import time
 import threading
+from concurrent.futures import Future
 from ibapi.contract import Contract
 from ibapi.scanner import ScannerSubscription
 from ibapi.tag_value import TagValue
 
 # <Historical Data Manager Integration - Begin>
+from src.brokers.ibkr.core.contract_cache import get_contract_cache
 from src.market_data.managers.historical_data_manager import HistoricalDataManager
+from src.market_data.managers.historical_bar_buffer import parse_ibkr_bar_dates
+from src.market_data.managers.historical_request_scheduler import get_historical_request_scheduler
 # <Historical Data Manager Integration - End>
 
 # <Context-Aware Logger Integration - Begin>
@@ -49,6 +53,7 @@ class HistoricalEODProvider:
         # Scanner subscription tracking
         self._scanner_results = {}
         self._scanner_complete = False
+        self._scanner_done = threading.Event()
         
         # Execution flow tracking
         self._execution_flow = []
@@ -72,6 +77,9 @@ class HistoricalEODProvider:
         
         # CRITICAL: Connect HistoricalDataManager to this EOD provider for scanner callbacks
         self.historical_manager.eod_provider = self
+
+        # Process-wide pacing-aware scheduler keeps several historical requests in flight
+        self.request_scheduler = get_historical_request_scheduler(self.historical_manager)
         
         # Connect to IBKR client if available
         if ibkr_data_feed and hasattr(ibkr_data_feed, 'ibkr_client'):
@@ -120,17 +128,13 @@ class HistoricalEODProvider:
 
     def _wait_for_scanner_results(self, req_id: int, timeout: int) -> List[str]:
         """Wait for scanner results with timeout"""
-        start_time = time.time()
         symbols = []
-        
-        while time.time() - start_time < timeout:
+
+        # scanner_data_end_callback sets the event, so this returns as soon as the scan ends
+        if self._scanner_done.wait(timeout):
             with self._historical_lock:
-                if self._scanner_complete:
-                    symbols = list(self._scanner_results.keys())
-                    break
-            
-            time.sleep(0.5)
-        
+                symbols = list(self._scanner_results.keys())
+
         # Cancel scanner subscription
         if hasattr(self.ibkr_data_feed, 'ibkr_client'):
             self.ibkr_data_feed.ibkr_client.cancelScannerSubscription(req_id)
@@ -224,9 +228,8 @@ class HistoricalEODProvider:
             "Starting batch historical EOD data retrieval",
             context_provider={
                 "symbol_count": len(symbols),
-                "batch_size": 5,
-                "rate_limit_delay_seconds": 2,
-                "timeout_per_symbol": 10,
+                "max_in_flight": self.request_scheduler.max_in_flight,
+                "timeout_per_symbol": self.request_scheduler.request_timeout,
                 "execution_phase": "batch_eod_retrieval_start",
                 "symbol_source": "provided_by_caller"
             }
@@ -236,38 +239,10 @@ class HistoricalEODProvider:
         print(f"📊 Getting REAL IBKR historical EOD prices for {len(symbols)} symbols...")
         print(f"🔍 First 5 symbols: {symbols[:5]}")
         
-        results = {}
-        successful_symbols = 0
-        
-        # Process symbols in batches to avoid overwhelming IBKR
-        batch_size = 5  # Conservative batch size for historical data
-        for i in range(0, len(symbols), batch_size):
-            batch = symbols[i:i + batch_size]
-            
-            # <Batch Processing Logging - Begin>
-            self.context_logger.log_event(
-                TradingEventType.SYSTEM_HEALTH,
-                "Processing historical data batch",
-                context_provider={
-                    "batch_number": i//batch_size + 1,
-                    "batch_total": (len(symbols) + batch_size - 1) // batch_size,
-                    "batch_symbols": batch,
-                    "batch_start_index": i,
-                    "execution_phase": "batch_processing"
-                }
-            )
-            # <Batch Processing Logging - End>
-            
-            print(f"🔍 Processing historical data batch {i//batch_size + 1}: {batch}")
-            
-            batch_results = self._get_batch_historical_prices(batch)
-            results.update(batch_results)
-            successful_symbols += len(batch_results)
-            
-            # Rate limiting between batches
-            if i + batch_size < len(symbols):
-                time.sleep(2)  # Longer delay for historical data requests
-        
+        # The request scheduler paces and parallelizes the whole universe in one pass
+        results = self._get_batch_historical_prices(symbols)
+        successful_symbols = len(results)
+
         # <Execution Flow Tracking - Universe Prices Complete - Begin>
         self._track_execution_flow(
             "get_universe_prices_complete",
@@ -298,10 +273,10 @@ class HistoricalEODProvider:
     def _get_batch_historical_prices(self, symbols: List[str]) -> Dict[str, Dict]:
         """Get historical EOD prices for a batch of symbols"""
         batch_results = {}
-        
-        for symbol in symbols:
+
+        for symbol, bars in self.request_scheduler.fetch_many(symbols, days=1, bar_size="1 day").items():
             try:
-                price_data = self._get_single_eod_price(symbol)
+                price_data = self._eod_price_from_bars(bars)
                 if price_data and price_data.get('price', 0) > 0:
                     batch_results[symbol] = price_data
                     print(f"✅ {symbol}: HISTORICAL ${price_data['price']:.2f} (IBKR EOD)")
@@ -320,7 +295,7 @@ class HistoricalEODProvider:
                     )
                     # <Symbol No Data Logging - End>
                     print(f"❌ {symbol}: No historical EOD data available")
-                        
+
             except Exception as e:
                 # <Symbol Error Logging - Begin>
                 self.context_logger.log_event(
@@ -337,9 +312,27 @@ class HistoricalEODProvider:
                 # <Symbol Error Logging - End>
                 print(f"❌ {symbol}: Historical data error - {e}")
                 continue
-        
+
         return batch_results
-    
+
+    @staticmethod
+    def _eod_price_from_bars(bars: Optional[pd.DataFrame]) -> Optional[Dict]:
+        """Build the EOD price dict (same shape as historical_data_callback) from the latest bar."""
+        if bars is None or bars.empty:
+            return None
+        last = bars.iloc[-1]
+        return {
+            'price': float(last['close']),
+            'volume': float(last['volume']),
+            'timestamp': bars.index[-1].to_pydatetime() if hasattr(bars.index[-1], 'to_pydatetime') else datetime.now(),
+            'data_type': 'historical_eod',
+            'source': 'IBKR Historical',
+            'open': float(last['open']),
+            'high': float(last['high']),
+            'low': float(last['low']),
+            'close': float(last['close'])
+        }
+
     def _get_single_eod_price(self, symbol: str) -> Optional[Dict]:
         """
         Get single symbol EOD price using IBKR historical data
@@ -384,7 +377,8 @@ class HistoricalEODProvider:
                     'symbol': symbol,
                     'request_time': datetime.now(),
                     'completed': False,
-                    'data': None
+                    'data': None,
+                    'done': threading.Event()
                 }
             
             # <Historical Request Logging - Begin>
@@ -452,51 +446,51 @@ class HistoricalEODProvider:
     def _wait_for_historical_response(self, req_id: int, symbol: str, timeout: int) -> Optional[Dict]:
         """Wait for historical data response with proper timeout"""
         start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            with self._historical_lock:
-                if req_id in self._pending_requests and self._pending_requests[req_id]['completed']:
-                    result = self._pending_requests[req_id]['data']
-                    self._cleanup_request(req_id)
-                    
-                    if result and result.get('price', 0) > 0:
-                        # <Historical Success Logging - Begin>
-                        self.context_logger.log_event(
-                            TradingEventType.MARKET_CONDITION,
-                            "Historical EOD data received successfully",
-                            symbol=symbol,
-                            context_provider={
-                                "request_id": req_id,
-                                "price": result['price'],
-                                "volume": result['volume'],
-                                "response_time_seconds": time.time() - start_time,
-                                "data_type": result.get('data_type', 'historical_eod'),
-                                "execution_phase": "historical_data_success"
-                            },
-                            decision_reason=f"Retrieved EOD price ${result['price']:.2f} for {symbol}"
-                        )
-                        # <Historical Success Logging - End>
-                        return result
-                    else:
-                        # <Historical No Data Logging - Begin>
-                        self.context_logger.log_event(
-                            TradingEventType.SYSTEM_HEALTH,
-                            "Historical data request completed with no valid data",
-                            symbol=symbol,
-                            context_provider={
-                                "request_id": req_id,
-                                "response_time_seconds": time.time() - start_time,
-                                "result_available": result is not None,
-                                "price_value": result.get('price', 0) if result else 0,
-                                "execution_phase": "historical_data_no_valid_data"
-                            },
-                            decision_reason="Historical data completed but no valid price received"
-                        )
-                        # <Historical No Data Logging - End>
-                        return None
-            
-            time.sleep(0.5)
-        
+
+        with self._historical_lock:
+            request = self._pending_requests.get(req_id)
+
+        # The data/end callbacks set the request's event, so this returns on the first bar
+        if request and request['done'].wait(timeout):
+            self._cleanup_request(req_id)
+            result = request['data']
+
+            if result and result.get('price', 0) > 0:
+                # <Historical Success Logging - Begin>
+                self.context_logger.log_event(
+                    TradingEventType.MARKET_CONDITION,
+                    "Historical EOD data received successfully",
+                    symbol=symbol,
+                    context_provider={
+                        "request_id": req_id,
+                        "price": result['price'],
+                        "volume": result['volume'],
+                        "response_time_seconds": time.time() - start_time,
+                        "data_type": result.get('data_type', 'historical_eod'),
+                        "execution_phase": "historical_data_success"
+                    },
+                    decision_reason=f"Retrieved EOD price ${result['price']:.2f} for {symbol}"
+                )
+                # <Historical Success Logging - End>
+                return result
+            else:
+                # <Historical No Data Logging - Begin>
+                self.context_logger.log_event(
+                    TradingEventType.SYSTEM_HEALTH,
+                    "Historical data request completed with no valid data",
+                    symbol=symbol,
+                    context_provider={
+                        "request_id": req_id,
+                        "response_time_seconds": time.time() - start_time,
+                        "result_available": result is not None,
+                        "price_value": result.get('price', 0) if result else 0,
+                        "execution_phase": "historical_data_no_valid_data"
+                    },
+                    decision_reason="Historical data completed but no valid price received"
+                )
+                # <Historical No Data Logging - End>
+                return None
+
         # <Historical Timeout Logging - Begin>
         self.context_logger.log_event(
             TradingEventType.SYSTEM_HEALTH,
@@ -523,10 +517,11 @@ class HistoricalEODProvider:
                 symbol = self._pending_requests[req_id]['symbol']
                 
                 # Use close price as EOD price
+                bar_time = parse_ibkr_bar_dates([bar.date])[0] if bar.date else pd.NaT
                 price_data = {
                     'price': bar.close,
                     'volume': bar.volume,
-                    'timestamp': datetime.strptime(bar.date, '%Y%m%d %H:%M:%S') if bar.date else datetime.now(),
+                    'timestamp': bar_time.to_pydatetime() if not pd.isna(bar_time) else datetime.now(),
                     'data_type': 'historical_eod',
                     'source': 'IBKR Historical',
                     'open': bar.open,
@@ -537,6 +532,7 @@ class HistoricalEODProvider:
                 
                 self._pending_requests[req_id]['data'] = price_data
                 self._pending_requests[req_id]['completed'] = True
+                self._pending_requests[req_id]['done'].set()
                 
                 # <Historical Data Received Logging - Begin>
                 self.context_logger.log_event(
@@ -564,6 +560,7 @@ class HistoricalEODProvider:
             if req_id in self._pending_requests and not self._pending_requests[req_id]['completed']:
                 # If no data received, mark as completed with None
                 self._pending_requests[req_id]['completed'] = True
+                self._pending_requests[req_id]['done'].set()
                 
                 # <Historical Data End Logging - Begin>
                 symbol = self._pending_requests[req_id]['symbol']
@@ -585,13 +582,8 @@ class HistoricalEODProvider:
                 print(f"📊 Historical data ended for req {req_id}, no data received")
     
     def _create_contract(self, symbol: str) -> Contract:
-        """Create IBKR contract for a symbol"""
-        contract = Contract()
-        contract.symbol = symbol
-        contract.secType = "STK"
-        contract.exchange = "SMART"
-        contract.currency = "USD"
-        return contract
+        """Create IBKR contract for a symbol, qualified with conId when the contract cache knows it"""
+        return get_contract_cache().build_contract(symbol)
     
     def _get_next_req_id(self) -> int:
         """Get next unique request ID"""
@@ -689,6 +681,41 @@ class HistoricalEODProvider:
             
             print(f"❌ {symbol}: Historical data request failed via HistoricalDataManager")
             return None
+
+    def submit_historical_data_batch(self, symbols: List[str], days: int = 100) -> Dict[str, Future]:
+        """
+        Queue multi-day history for many symbols on the pacing scheduler without waiting.
+        Each Future resolves with the symbol's DataFrame as soon as its own request completes.
+        """
+        self._resolve_contracts(symbols)
+        return self.request_scheduler.submit_many(symbols, days=days, bar_size="1 day")
+
+    def _resolve_contracts(self, symbols: List[str]) -> None:
+        # Qualify every contract in one batch so the history requests carry conIds
+        client = self.historical_manager.ibkr_client
+        if hasattr(client, 'resolve_contracts'):
+            client.resolve_contracts(symbols)
+
+    def get_historical_data_batch(self, symbols: List[str], days: int = 100) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Get multi-day historical data for many symbols concurrently within IBKR pacing limits.
+        Returns a dict of symbol -> DataFrame (None where no data was available).
+        """
+        self._resolve_contracts(symbols)
+        results = self.request_scheduler.fetch_many(symbols, days=days, bar_size="1 day")
+
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Batch historical data retrieval completed",
+            context_provider={
+                "symbols_requested": len(results),
+                "symbols_with_data": sum(1 for df in results.values() if df is not None and not df.empty),
+                "days_requested": days,
+                "scheduler_metrics": self.request_scheduler.get_metrics()
+            },
+            decision_reason="BATCH_HISTORICAL_DATA_COMPLETED"
+        )
+        return results
     # <Historical Data Manager Integration - End>
 
     # Add to historical_data_manager.py - Scanner Callback Methods
@@ -698,10 +725,11 @@ class HistoricalEODProvider:
         """Callback when scanner data ends - process collected symbols and trigger historical data"""
         print(f"🎯 HISTORICAL EOD PROVIDER: Scanner data ended for req: {req_id}")
         
-        # Set scanner completion flag
+        # Set scanner completion flag and wake _wait_for_scanner_results
         with self._historical_lock:
             self._scanner_complete = True
             symbol_count = len(self._scanner_results)
+        self._scanner_done.set()
         
         # <Scanner Completion Logging - Begin>
         self.context_logger.log_event(
@@ -719,9 +747,12 @@ class HistoricalEODProvider:
         
         print(f"✅ Scanner completed: {symbol_count} symbols collected, ready for historical data processing")
         
-        # Process scanner results if we have symbols
+        # Process scanner results if we have symbols; off the IBKR reader thread so
+        # the historical callbacks it waits for can still be delivered
         if symbol_count > 0:
-            self._process_scanner_results()
+            threading.Thread(
+                target=self._process_scanner_results, name="ScannerResultsProcessor", daemon=True
+            ).start()
         else:
             print("⚠️ Scanner completed but no symbols collected")
     # scanner_data_end_callback - End
@@ -747,37 +778,17 @@ class HistoricalEODProvider:
         if self.historical_manager and symbol_count > 0:
             print(f"📊 Using HistoricalDataManager for {symbol_count} symbols")
             
-            # Process symbols in small batches
-            batch_size = 3  # Smaller batches to avoid overwhelming IBKR
+            # The request scheduler handles batching and IBKR pacing
+            results = self.get_historical_data_batch(scanner_symbols, days=100)
             successful_symbols = 0
-            
-            for i in range(0, len(scanner_symbols), batch_size):
-                batch = scanner_symbols[i:i + batch_size]
-                print(f"🔍 Processing batch {i//batch_size + 1}: {batch}")
-                
-                for symbol in batch:
-                    try:
-                        # Use HistoricalDataManager directly (bypasses the problematic routing)
-                        historical_data = self.historical_manager.request_historical_data(
-                            symbol=symbol, 
-                            days=100, 
-                            bar_size="1 day"
-                        )
-                        
-                        if historical_data is not None and not historical_data.empty:
-                            print(f"✅ {symbol}: Retrieved {len(historical_data)} bars via HistoricalDataManager")
-                            successful_symbols += 1
-                        else:
-                            print(f"❌ {symbol}: No data via HistoricalDataManager")
-                            
-                    except Exception as e:
-                        print(f"❌ {symbol}: HistoricalDataManager error - {e}")
-                
-                # Rate limiting between batches
-                if i + batch_size < len(scanner_symbols):
-                    print("⏳ Rate limiting between batches...")
-                    time.sleep(2)
-            
+
+            for symbol, historical_data in results.items():
+                if historical_data is not None and not historical_data.empty:
+                    print(f"✅ {symbol}: Retrieved {len(historical_data)} bars via HistoricalDataManager")
+                    successful_symbols += 1
+                else:
+                    print(f"❌ {symbol}: No data via HistoricalDataManager")
+
             print(f"🎯 Historical data via HistoricalDataManager: {successful_symbols}/{symbol_count} successful")
             
         else:
@@ -862,6 +873,7 @@ class HistoricalEODProvider:
             with self._historical_lock:
                 self._scanner_results = {}
                 self._scanner_complete = False
+                self._scanner_done.clear()
             
             # <Scanner Request Logging - Begin>
             self.context_logger.log_event(
@@ -1,6 +1,7 @@
 from typing import List, Dict, Optional
 import pandas as pd
 from datetime import datetime
+from concurrent.futures import Future
 
 # <Consolidated EOD Provider Integration - Begin>
 from .historical_eod_provider import HistoricalEODProvider
@@ -8,6 +9,7 @@ from .historical_eod_provider import HistoricalEODProvider
 
 # <Historical Data Manager Integration - Begin>
 from src.market_data.managers.historical_data_manager import HistoricalDataManager
+from src.market_data.managers.historical_request_scheduler import get_historical_request_scheduler
 # <Historical Data Manager Integration - End>
 
 # <Context-Aware Logger Integration - Begin>
@@ -88,6 +90,9 @@ class IBKRDataAdapter:
                 
                 # Ensure historical manager has IBKR client reference
                 historical_manager.set_ibkr_client(ibkr_client)
+
+                # Scheduled requests must go through the manager that receives the callbacks
+                get_historical_request_scheduler().set_historical_manager(historical_manager)
                 
                 self._historical_manager_connected = True
                 
@@ -301,6 +306,42 @@ class IBKRDataAdapter:
         
         return qualified_stocks
     
+    def get_historical_data_batch(self, symbols: List[str], days: int = 100) -> Dict[str, Optional[pd.DataFrame]]:
+        """Get historical data for many symbols concurrently via the EOD provider's pacing scheduler"""
+        try:
+            return self.eod_provider.get_historical_data_batch(symbols, days)
+        except Exception as e:
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Batch historical data request failed in adapter",
+                context_provider={
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                    "symbols_requested": len(symbols),
+                    "days_requested": days
+                },
+                decision_reason=f"Batch historical data adapter exception: {e}"
+            )
+            return {}
+
+    def submit_historical_data_batch(self, symbols: List[str], days: int = 100) -> Dict[str, Future]:
+        """Queue historical data for many symbols on the EOD provider's pacing scheduler; futures resolve as each completes"""
+        try:
+            return self.eod_provider.submit_historical_data_batch(symbols, days)
+        except Exception as e:
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Batch historical data submission failed in adapter",
+                context_provider={
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                    "symbols_requested": len(symbols),
+                    "days_requested": days
+                },
+                decision_reason=f"Batch historical data adapter exception: {e}"
+            )
+            return {}
+
     def get_historical_data(self, symbol: str, days: int = 100) -> Optional[pd.DataFrame]:
         """Get historical data via historical EOD provider with simplified error handling"""
         # <Historical Data Request Logging - Begin>
@@ -0,0 +1,356 @@
+# src/scanner/real_time_scanner.py
+from typing import List, Dict, Any, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+import threading
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from config.scanner_config import ScannerConfig
+from src.core.events import EventType, TradingSignalEvent
+from src.brokers.ibkr.core.contract_cache import get_contract_cache
+from .scanner_core import StockScanner, ScanResult
+from .indicator_engine import IndicatorEngine
+from .strategy.strategy_core import StrategyOrchestrator, StrategyMatch
+
+# Context-aware logging imports
+from src.core.context_aware_logger import (
+    get_context_logger,
+    TradingEventType,
+    SafeContext
+)
+
+
+class RealTimeScanner:
+    """
+    Continuous scanner for ScanMode.REAL_TIME, driven by live prices instead of batch EOD runs.
+
+    The watchlist (the first real_time_watchlist_size symbols) is subscribed through
+    MarketDataManager and PRICE_UPDATE events are coalesced per symbol: a tick only records the
+    symbol's latest price, and the worker re-evaluates each changed symbol once no matter how many
+    ticks arrived meanwhile. A re-evaluation writes the live price into today's forming daily bar,
+    advances the persisted EMAs by that one bar and runs the strategies for that symbol only, so
+    cost follows the symbols that moved, not the universe. The other indicators are computed once
+    per history refresh, every real_time_scan_interval seconds, in one vectorized pass.
+    A TRADING_SIGNAL event is published when a symbol enters (ENTER) or leaves (EXIT) a strategy.
+    """
+
+    def __init__(self, scanner: StockScanner, strategy_orchestrator: StrategyOrchestrator,
+                 market_data_manager, event_bus, config: Optional[ScannerConfig] = None):
+        self.context_logger = get_context_logger()
+        self.scanner = scanner
+        self.strategy_orchestrator = strategy_orchestrator
+        self.market_data_manager = market_data_manager
+        self.event_bus = event_bus
+        self.config = config or scanner.config
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+        self._stocks: Dict[str, Dict] = {}                 # symbol -> universe entry
+        self._histories: Dict[str, pd.DataFrame] = {}      # symbol -> daily bars
+        self._indicators: Dict[str, Dict[str, Any]] = {}   # symbol -> indicators as of the last refresh
+        self._live_bars: Dict[str, Tuple[Dict[str, np.ndarray], pd.Index, bool]] = {}  # symbol -> forming-bar arrays
+        self._monitored_by_scanner: Set[str] = set()       # symbols this scanner added to the monitored set
+        self._pending: Dict[str, float] = {}               # symbol -> latest unprocessed price
+        self._active: Dict[str, Dict[str, StrategyMatch]] = {}  # symbol -> strategy name -> match
+        self._history_loaded_at = 0.0
+        self._metrics = {'ticks_received': 0, 'ticks_coalesced': 0, 'evaluations': 0,
+                         'signals_published': 0, 'history_refreshes': 0, 'evaluation_errors': 0}
+
+    @classmethod
+    def from_tiered_scanner(cls, tiered_scanner, market_data_manager, event_bus) -> 'RealTimeScanner':
+        """Real-time scanning with the Tier 1 scanner and enabled strategies of a TieredScanner"""
+        return cls(tiered_scanner.scanner, tiered_scanner.strategy_orchestrator,
+                   market_data_manager, event_bus, tiered_scanner.scanner_config)
+
+    # Lifecycle - Begin
+    def start(self, watchlist: Optional[List[Dict]] = None, background: bool = True) -> int:
+        """
+        Load history for the watchlist (the Tier 1 universe by default), take the initial strategy
+        state, subscribe live prices and start the worker. Returns the number of symbols watched.
+        With background=False no worker is started and the caller drives process_pending().
+        """
+        stocks = watchlist if watchlist is not None else self.scanner._get_qualified_stocks()
+        stocks = stocks[:self.config.real_time_watchlist_size]
+        with self._lock:
+            self._stocks = {stock['symbol']: dict(stock) for stock in stocks if stock.get('symbol')}
+        self._refresh_histories()
+
+        # Initial membership is taken silently: only later transitions are signals
+        for symbol in list(self._histories):
+            self._evaluate(symbol, None, publish=False)
+
+        self.event_bus.subscribe(EventType.PRICE_UPDATE, self.on_price_update)
+        for symbol in self._histories:
+            if self.market_data_manager.add_monitored_symbol(symbol):
+                self._monitored_by_scanner.add(symbol)
+            self.market_data_manager.subscribe(symbol, get_contract_cache().build_contract(symbol))
+
+        if background:
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._run, name="RealTimeScanner", daemon=True)
+            self._worker.start()
+
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Real-time scanner started",
+            context_provider={
+                "watchlist_size": len(self._stocks),
+                "symbols_with_history": len(self._histories),
+                "symbols_in_strategies": len(self._active),
+                "history_refresh_seconds": self.config.real_time_scan_interval
+            },
+            decision_reason="ScanMode.REAL_TIME scanning active"
+        )
+        return len(self._histories)
+
+    def stop(self) -> None:
+        """
+        Stop reacting to prices and end the worker. Only symbols this scanner added are removed from
+        the monitored set; market data subscriptions stay with their manager.
+        """
+        self.event_bus.unsubscribe(EventType.PRICE_UPDATE, self.on_price_update)
+        for symbol in self._monitored_by_scanner:
+            self.market_data_manager.remove_monitored_symbol(symbol)
+        self._monitored_by_scanner = set()
+        self._stop.set()
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout=5)
+            self._worker = None
+        self.scanner.indicator_state.flush(force=True)
+
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Real-time scanner stopped",
+            context_provider=self.get_metrics()
+        )
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(timeout=1.0)
+            self._wakeup.clear()
+            if self._stop.is_set():
+                break
+            try:
+                if time.monotonic() - self._history_loaded_at >= self.config.real_time_scan_interval:
+                    self._refresh_histories()
+                self.process_pending()
+            except Exception as e:
+                self.context_logger.log_event(
+                    TradingEventType.SYSTEM_HEALTH,
+                    "Real-time scanner cycle failed",
+                    context_provider={
+                        "error_type": type(e).__name__,
+                        "error_message": str(e)
+                    },
+                    decision_reason="Continuing with next price update"
+                )
+    # Lifecycle - End
+
+    # Price Coalescing - Begin
+    def on_price_update(self, event) -> None:
+        """
+        EventBus PRICE_UPDATE callback. Runs on the market data thread, so it only records the
+        latest price; a symbol that already has an unprocessed price is not queued twice.
+        """
+        symbol = event.data.get('symbol')
+        price = event.data.get('price')
+        if symbol not in self._stocks or not price or price <= 0:
+            return
+        with self._lock:
+            self._metrics['ticks_received'] += 1
+            if symbol in self._pending:
+                self._metrics['ticks_coalesced'] += 1
+            self._pending[symbol] = price
+        self._wakeup.set()
+
+    def process_pending(self) -> int:
+        """Re-evaluate every symbol whose price changed since the last call; returns how many"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for symbol, price in pending.items():
+            self._evaluate(symbol, price)
+        self.scanner.indicator_state.flush()
+        return len(pending)
+    # Price Coalescing - End
+
+    # Symbol Evaluation - Begin
+    def _evaluate(self, symbol: str, price: Optional[float], publish: bool = True) -> None:
+        """Re-run the strategies for one symbol at its live price and signal membership changes"""
+        history = self._histories.get(symbol)
+        if history is None or history.empty:
+            return
+        try:
+            scan_result = self._scan_result(symbol, price)
+            matches = self.strategy_orchestrator.evaluate_symbol(scan_result) if scan_result else []
+        except Exception as e:
+            with self._lock:
+                self._metrics['evaluation_errors'] += 1
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                f"Real-time evaluation failed for {symbol}",
+                symbol=symbol,
+                context_provider={
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                },
+                decision_reason="Keeping previous strategy membership"
+            )
+            return
+
+        current = {match.strategy_name: match for match in matches or []
+                   if match.confidence >= self.config.min_confidence_score}
+        with self._lock:
+            self._metrics['evaluations'] += 1
+            previous = self._active.get(symbol, {})
+            if current:
+                self._active[symbol] = current
+            else:
+                self._active.pop(symbol, None)
+        if not publish:
+            return
+
+        last_price = scan_result.current_price
+        for name in current.keys() - previous.keys():
+            self._publish_signal(symbol, name, 'ENTER', current[name].confidence, last_price)
+        for name in previous.keys() - current.keys():
+            self._publish_signal(symbol, name, 'EXIT', previous[name].confidence, last_price)
+
+    def _scan_result(self, symbol: str, price: Optional[float]) -> Optional[ScanResult]:
+        """ScanResult at the live price, or at the last refreshed close when there is none yet"""
+        if price:
+            return self._live_scan_result(symbol, price)
+        stock_info = dict(self._stocks[symbol])
+        history = self._histories[symbol]
+        if not stock_info.get('price'):
+            stock_info['price'] = float(history['close'].iloc[-1])
+        return self.scanner._analyze_stock(stock_info, history, dict(self._indicators.get(symbol, {})))
+
+    def _live_scan_result(self, symbol: str, price: float) -> ScanResult:
+        """
+        Per-tick ScanResult: the price is written into today's forming bar in place and the EMAs
+        advance from persisted state by that bar; every other indicator is the one computed at the
+        last history refresh. The result's bars are views valid until the symbol's next tick.
+        """
+        bars, index, forming = self._live_bars[symbol]
+        indicators = dict(self._indicators.get(symbol, {}))
+        indicators['close'] = price
+        if forming:
+            if 'open' in bars and np.isnan(bars['open'][-1]):
+                bars['open'][-1] = price
+            bars['close'][-1] = price
+            if 'high' in bars:
+                bars['high'][-1] = np.fmax(bars['high'][-1], price)
+            if 'low' in bars:
+                bars['low'][-1] = np.fmin(bars['low'][-1], price)
+            closes = pd.Series(bars['close'], index=index, copy=False)
+            for period in self.scanner.technical_scorer.ema_periods:
+                if indicators.get(f'ema_{period}') is None:
+                    continue
+                ema = self.scanner.indicator_state.update_ema(symbol, '1 day', period, closes, last_bar_final=False)
+                if ema is not None:
+                    indicators[f'ema_{period}'] = ema
+
+        stock_info = self._stocks[symbol]
+        result = ScanResult(
+            symbol=symbol,
+            current_price=price,
+            volume=stock_info.get('volume', 0),
+            market_cap=stock_info.get('market_cap', 0),
+            ema_values={period: indicators.get(f'ema_{period}') for period in self.scanner.technical_scorer.ema_periods},
+            indicators=indicators,
+            average_volume=stock_info.get('average_volume', 0)
+        )
+        result.bars, result.bar_index = dict(bars), index
+        return result
+
+    @staticmethod
+    def _forming_bars(history: pd.DataFrame) -> Tuple[Dict[str, np.ndarray], pd.Index, bool]:
+        """
+        Column arrays of the daily bars with a slot for today's forming bar, built once per refresh:
+        the last bar when it is today's, otherwise an appended bar that the first tick opens.
+        The arrays are copies, so ticks never write into the cached history.
+        """
+        bars = {column: history[column].to_numpy(dtype=np.float64, copy=True)
+                for column in ScanResult.BAR_COLUMNS if column in history}
+        if not isinstance(history.index, pd.DatetimeIndex):
+            return bars, history.index, False
+        today = pd.Timestamp(datetime.now().date())
+        if history.index.tz is not None:
+            today = today.tz_localize(history.index.tz)
+        if history.index[-1].normalize() == today:
+            return bars, history.index, True
+        for column, array in bars.items():
+            # Intraday volume is not part of the price stream
+            bars[column] = np.append(array, 0.0 if column == 'volume' else np.nan)
+        return bars, history.index.append(pd.DatetimeIndex([today])), True
+
+    def _publish_signal(self, symbol: str, strategy_name: str, action: str, confidence: float, price: float) -> None:
+        self.event_bus.publish(TradingSignalEvent(
+            event_type=EventType.TRADING_SIGNAL,
+            symbol=symbol,
+            strategy_name=strategy_name,
+            action=action,
+            confidence=confidence,
+            price=price,
+            source="RealTimeScanner"
+        ))
+        with self._lock:
+            self._metrics['signals_published'] += 1
+        self.context_logger.log_event(
+            TradingEventType.MARKET_CONDITION,
+            f"Real-time signal: {symbol} {action} {strategy_name}",
+            symbol=symbol,
+            context_provider={
+                "strategy_name": strategy_name,
+                "action": action,
+                "confidence": confidence,
+                "price": price
+            },
+            decision_reason="Strategy membership changed on live price"
+        )
+    # Symbol Evaluation - End
+
+    def _refresh_histories(self) -> None:
+        """
+        Reload daily history for the watchlist through the scanner's (cached, paced) history path and
+        recompute its indicators in one vectorized pass; ticks only advance the EMAs from there
+        """
+        symbols = list(self._stocks)
+        if not symbols:
+            return
+        pool = ThreadPoolExecutor(max_workers=max(1, self.config.max_concurrency), thread_name_prefix="RealTimeHistory")
+        try:
+            futures = self.scanner._submit_historical_data(symbols, pool)
+            wait(futures)
+            loaded = {symbol: self.scanner._history_result(future) for future, symbol in futures.items()}
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        histories = {symbol: data for symbol, data in loaded.items() if data is not None}
+        indicators = IndicatorEngine.to_records(self.scanner.indicator_engine.compute(histories))
+        for symbol, records in indicators.items():
+            self.scanner._apply_indicator_state(symbol, histories[symbol], records)
+        live_bars = {symbol: self._forming_bars(data) for symbol, data in histories.items()}
+        with self._lock:
+            self._histories.update(histories)
+            self._indicators.update(indicators)
+            self._live_bars.update(live_bars)
+            self._history_loaded_at = time.monotonic()
+            self._metrics['history_refreshes'] += 1
+
+    def get_active_matches(self) -> Dict[str, Set[str]]:
+        """symbol -> names of the strategies it currently matches"""
+        with self._lock:
+            return {symbol: set(matches) for symbol, matches in self._active.items()}
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._metrics, 'watched_symbols': len(self._stocks), 'active_symbols': len(self._active)}
@@ -150,8 +150,9 @@ class ScanManager:
         # <Context-Aware Logging Integration - End>
         
     def generate_bull_trend_pullback_candidates(self, save_to_excel: bool = False, 
-                                            excel_output_dir: str = "scanner_results") -> List[Dict[str, Any]]:
-        """Generate candidates with option to save to Excel"""
+                                            excel_output_dir: str = "scanner_results",
+                                            force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """Generate candidates with option to save to Excel; results within cache_duration are reused unless force_refresh"""
         # <Context-Aware Logging Integration - Begin>
         self.context_logger.log_event(
             TradingEventType.SYSTEM_HEALTH,
@@ -164,7 +165,7 @@ class ScanManager:
         )
         # <Context-Aware Logging Integration - End>
         
-        candidates = self.tiered_scanner.run_scan()
+        candidates = self.tiered_scanner.run_scan(use_cache=not force_refresh)
         bull_trend_candidates = [
             candidate for candidate in candidates 
             if candidate.get('identified_by') == 'bull_trend_pullback'
@@ -229,8 +230,9 @@ class ScanManager:
         return bull_trend_candidates
 
     def generate_all_candidates(self, save_to_excel: bool = False,
-                            excel_output_dir: str = "scanner_results") -> List[Dict[str, Any]]:
-        """Generate all candidates with option to save to Excel"""
+                            excel_output_dir: str = "scanner_results",
+                            force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """Generate all candidates with option to save to Excel; results within cache_duration are reused unless force_refresh"""
         # <Context-Aware Logging Integration - Begin>
         self.context_logger.log_event(
             TradingEventType.SYSTEM_HEALTH,
@@ -243,7 +245,7 @@ class ScanManager:
         )
         # <Context-Aware Logging Integration - End>
         
-        candidates = self.tiered_scanner.run_scan()
+        candidates = self.tiered_scanner.run_scan(use_cache=not force_refresh)
         
         # <Context-Aware Logging Integration - Begin>
         strategy_breakdown = {}
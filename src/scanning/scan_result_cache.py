@@ -0,0 +1,48 @@
+# src/scanner/scan_result_cache.py
+from typing import Any, Dict, Hashable, Optional, Tuple
+import threading
+import time
+
+
+class ScanResultCache:
+    """
+    In-memory scan results keyed by (config fingerprint, data date).
+    An entry is served while it is younger than the ttl given at lookup, normally
+    ScannerConfig.cache_duration, so a changed duration applies to existing entries too.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0, 'expired': 0}
+
+    def get(self, key: Hashable, ttl_seconds: float) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._metrics['misses'] += 1
+                return None
+            stored_at, value = entry
+            if ttl_seconds <= 0 or self._clock() - stored_at >= ttl_seconds:
+                del self._entries[key]
+                self._metrics['expired'] += 1
+                return None
+            self._metrics['hits'] += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            # Only the latest entry per fingerprint is useful: a new data date supersedes older ones
+            fingerprint = key[0] if isinstance(key, tuple) else key
+            self._entries = {k: v for k, v in self._entries.items()
+                             if (k[0] if isinstance(k, tuple) else k) != fingerprint}
+            self._entries[key] = (self._clock(), value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._metrics, 'entries': len(self._entries)}
@@ -1,6 +1,9 @@
 # src/scanner/scanner_core.py
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterator, Tuple
+from concurrent.futures import (
+    ThreadPoolExecutor, Future, CancelledError, FIRST_COMPLETED, wait
+)
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import logging
@@ -8,6 +11,11 @@ import time
 
 from config.scanner_config import ScannerConfig
 from .technical_scorer import TechnicalScorer
+from .indicator_engine import IndicatorEngine
+from src.market_data.managers.indicator_state_store import get_indicator_state_store
+from src.market_data.managers.historical_request_scheduler import (
+    HistoricalRequestPriority, get_historical_request_scheduler
+)
 from src.scanning.integration.ibkr_data_adapter import IBKRDataAdapter
 
 # Context-aware logging imports
@@ -18,25 +26,78 @@ from src.core.context_aware_logger import (
 )
 
 # Tiered Architecture Integration - Begin
-@dataclass
 class ScanResult:
-    """Raw scan result for strategy processing (Tier 1 output)"""
-    symbol: str
-    current_price: float
-    volume: float
-    market_cap: float
-    ema_values: Dict[str, float]
-    historical_data: pd.DataFrame
-    last_updated: datetime
-    
-    # Raw technical data for strategy evaluation
-    price_data: Dict[str, Any] = field(default_factory=dict)
-    volume_data: Dict[str, Any] = field(default_factory=dict)
-    
-    # Remove strategy-specific scores - will be calculated by StrategyOrchestrator
-    # total_score: float = 0.0
-    # bull_trend_score: float = 0.0  
-    # bull_pullback_score: float = 0.0
+    """
+    Raw scan result for strategy processing (Tier 1 output).
+
+    Bars are kept as float64 NumPy arrays per column (close/high/low/open/volume) plus the
+    bar index, not as a DataFrame and list copies: float columns are views of the fetched
+    history, so a result costs little beyond the bars themselves. price_data, volume_data and
+    historical_data are assembled from those arrays on access.
+    """
+    __slots__ = ('symbol', 'current_price', 'volume', 'market_cap', 'ema_values', 'last_updated',
+                 'indicators', 'average_volume', 'bars', 'bar_index', 'universe_index')
+
+    BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, symbol: str, current_price: float, volume: float, market_cap: float,
+                 ema_values: Dict[str, float], historical_data: Optional[pd.DataFrame] = None,
+                 last_updated: Optional[datetime] = None, indicators: Optional[Dict[str, Any]] = None,
+                 average_volume: float = 0):
+        self.symbol = symbol
+        self.current_price = current_price
+        self.volume = volume
+        self.market_cap = market_cap
+        self.ema_values = ema_values
+        self.last_updated = last_updated or datetime.now()
+        # Precomputed indicator columns (IndicatorEngine), e.g. 'rsi_14', 'macd', 'atr_14'
+        self.indicators = indicators if indicators is not None else {}
+        self.average_volume = average_volume
+        self.bars: Dict[str, np.ndarray] = {}
+        self.bar_index: Optional[pd.Index] = None
+        # Position of the symbol in the qualified-stock universe, set by the scan that produced it
+        self.universe_index: Optional[int] = None
+        if historical_data is not None:
+            self.historical_data = historical_data
+
+    @property
+    def historical_data(self) -> pd.DataFrame:
+        """The bars as a DataFrame, built on access from the stored arrays"""
+        return pd.DataFrame(self.bars, index=self.bar_index, copy=False)
+
+    @historical_data.setter
+    def historical_data(self, data: pd.DataFrame) -> None:
+        self.bars = {column: data[column].to_numpy(dtype=np.float64, copy=False)
+                     for column in self.BAR_COLUMNS if column in data}
+        self.bar_index = data.index
+
+    @property
+    def bar_count(self) -> int:
+        return 0 if self.bar_index is None else len(self.bar_index)
+
+    # Raw technical data for strategy evaluation, as arrays
+    @property
+    def price_data(self) -> Dict[str, Any]:
+        empty = np.empty(0)
+        return {
+            'current': self.current_price,
+            'historical': self.bars.get('close', empty),
+            'highs': self.bars.get('high', empty),
+            'lows': self.bars.get('low', empty),
+            'opens': self.bars.get('open', empty)
+        }
+
+    @property
+    def volume_data(self) -> Dict[str, Any]:
+        return {
+            'current': self.volume,
+            'historical': self.bars.get('volume', np.empty(0)),
+            'average': self.average_volume
+        }
+
+    def __repr__(self) -> str:
+        return (f"ScanResult(symbol={self.symbol!r}, current_price={self.current_price!r}, "
+                f"bars={self.bar_count}, last_updated={self.last_updated!r})")
 # Tiered Architecture Integration - End
 
 class StockScanner:
@@ -64,12 +125,57 @@ class StockScanner:
             ema_periods=[self.config.ema_short_term, self.config.ema_medium_term, self.config.ema_long_term, 100],
             pullback_threshold=self.config.max_pullback_distance_pct / 100
         )
+        # Indicators for the whole universe are computed in one vectorized pass per scan
+        self.indicator_engine = IndicatorEngine(ema_periods=self.technical_scorer.ema_periods)
+        # Daily EMAs carried between scans, so a new bar costs one update step per EMA
+        self.indicator_state = get_indicator_state_store()
         self.logger = logging.getLogger(__name__)
         self.last_scan_time = None
+        # Scan generation currently owning the scheduler's batch queue (None when no scan is open)
+        self._scan_generation = 0
+        self._active_scan: Optional[int] = None
     
     def run_scan(self) -> List[ScanResult]:
-        """Execute Tier 1 scanning: basic screening and technical data collection"""
+        """
+        Execute Tier 1 scanning: basic screening and technical data collection.
+        Symbols are analyzed concurrently; results are returned in universe order.
+        """
         start_time = time.time()
+        qualified_stocks = self._get_qualified_stocks()
+
+        # Steps 2-3: Fetch history and collect technical data concurrently, then restore universe order
+        scan_results = sorted(self._stream_analysis(qualified_stocks), key=lambda result: result.universe_index)
+        
+        processing_time = time.time() - start_time
+        
+        # <Context-Aware Logging Integration - Begin>
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Tier 1 Scan completed",
+            context_provider={
+                "processing_time_seconds": processing_time,
+                "scan_results_count": len(scan_results),
+                "qualified_stocks_count": len(qualified_stocks),
+                "success_rate_percentage": (len(scan_results) / len(qualified_stocks) * 100) if qualified_stocks else 0,
+                "max_concurrency": self.config.max_concurrency,
+                "scan_end_time": datetime.now().isoformat()
+            },
+            decision_reason="Tier 1 scanning process completed"
+        )
+        # <Context-Aware Logging Integration - End>
+        
+        return scan_results
+
+    def iter_scan(self) -> Iterator[ScanResult]:
+        """
+        Execute Tier 1 scanning and yield each ScanResult as soon as its symbol is analyzed,
+        so the strategy tier can start before the whole universe is fetched.
+        Results arrive in completion order; run_scan() returns them in universe order.
+        """
+        yield from self._stream_analysis(self._get_qualified_stocks())
+
+    def _get_qualified_stocks(self) -> List[Dict]:
+        """Step 1: Get dynamic universe with basic filters"""
         self.last_scan_time = datetime.now()
         
         # <Context-Aware Logging Integration - Begin>
@@ -85,7 +191,6 @@ class StockScanner:
         )
         # <Context-Aware Logging Integration - End>
         
-        # Step 1: Get dynamic universe with basic filters
         filters = {
             'min_volume': self.config.min_volume,
             'min_market_cap': self.config.min_market_cap,
@@ -104,38 +209,154 @@ class StockScanner:
             }
         )
         # <Context-Aware Logging Integration - End>
-        
-        # Step 2: Collect technical data for each stock
-        scan_results = []
-        for stock_info in qualified_stocks:
-            result = self._analyze_stock(stock_info)
-            if result:
-                scan_results.append(result)
-            
-            # Small delay between stocks
-            time.sleep(0.05)
-        
-        processing_time = time.time() - start_time
-        
-        # <Context-Aware Logging Integration - Begin>
+        return qualified_stocks
+
+    # Concurrent Analysis Pipeline - Begin
+    def _stream_analysis(self, qualified_stocks: List[Dict]) -> Iterator[ScanResult]:
+        """
+        Fetch history for every qualified stock and analyze symbols as their data arrives.
+
+        History requests go through the adapter's pacing scheduler when it has one, otherwise
+        through the bounded worker pool. Whatever has arrived is analyzed together in chunks of
+        analysis_batch_size on the same pool, so fast (cached) data gets one vectorized pass and
+        slow data streams out symbol by symbol. Closing the generator, or starting a new scan
+        before this one finishes, cancels its outstanding batch requests on the scheduler.
+        Each result carries its symbol's universe_index, since results arrive in completion order.
+        """
+        stocks_by_symbol: Dict[str, Dict] = {}
+        universe_order: Dict[str, int] = {}
+        for i, stock in enumerate(qualified_stocks):
+            if stock.get('symbol'):
+                stocks_by_symbol.setdefault(stock['symbol'], stock)
+                universe_order.setdefault(stock['symbol'], i)
+        if not stocks_by_symbol:
+            return
+
+        batch_size = max(1, self.config.analysis_batch_size)
+        generation = self._begin_scan()
+        completed = False
+        pool = ThreadPoolExecutor(max_workers=max(1, self.config.max_concurrency), thread_name_prefix="ScanWorker")
+        history_futures: Dict[Future, str] = {}
+        try:
+            history_futures = self._submit_historical_data(list(stocks_by_symbol), pool)
+            pending_history = set(history_futures)
+            pending_analysis = set()
+            while pending_history or pending_analysis:
+                done, _ = wait(pending_history | pending_analysis, return_when=FIRST_COMPLETED)
+
+                arrived = done & pending_history
+                pending_history -= arrived
+                ready = [(stocks_by_symbol[history_futures[future]], self._history_result(future)) for future in arrived]
+                for start in range(0, len(ready), batch_size):
+                    pending_analysis.add(pool.submit(self._analyze_batch, ready[start:start + batch_size]))
+
+                finished = done & pending_analysis
+                pending_analysis -= finished
+                for future in finished:
+                    for result in future.result():
+                        result.universe_index = universe_order[result.symbol]
+                        yield result
+            completed = True
+        finally:
+            for future in history_futures:
+                future.cancel()
+            self._end_scan(generation, completed)
+            pool.shutdown(wait=False, cancel_futures=True)
+            self.indicator_state.flush(force=True)
+
+    def _begin_scan(self) -> int:
+        """Open a new scan generation; a scan still open is superseded and its batch requests dropped"""
+        if self._active_scan is not None:
+            self._cancel_batch_history("superseded")
+        self._scan_generation += 1
+        self._active_scan = self._scan_generation
+        return self._scan_generation
+
+    def _end_scan(self, generation: int, completed: bool) -> None:
+        # A newer scan owns the batch queue now; leave its requests alone
+        if self._active_scan != generation:
+            return
+        self._active_scan = None
+        if not completed:
+            self._cancel_batch_history("closed")
+
+    def _cancel_batch_history(self, reason: str) -> None:
+        cancelled = get_historical_request_scheduler().cancel_pending(HistoricalRequestPriority.BATCH)
         self.context_logger.log_event(
             TradingEventType.SYSTEM_HEALTH,
-            "Tier 1 Scan completed",
+            "Scan stopped - batch history requests cancelled",
             context_provider={
-                "processing_time_seconds": processing_time,
-                "scan_results_count": len(scan_results),
-                "qualified_stocks_count": len(qualified_stocks),
-                "success_rate_percentage": (len(scan_results) / len(qualified_stocks) * 100) if qualified_stocks else 0,
-                "scan_end_time": datetime.now().isoformat()
+                "reason": reason,
+                "jobs_cancelled": cancelled
             },
-            decision_reason="Tier 1 scanning process completed"
+            decision_reason="SCAN_BATCH_HISTORY_CANCELLED"
         )
-        # <Context-Aware Logging Integration - End>
-        
-        return scan_results
-    
+
+    def _submit_historical_data(self, symbols: List[str], pool: ThreadPoolExecutor) -> Dict[Future, str]:
+        """
+        Start history retrieval for every symbol and return Future -> symbol.
+        Prefers the adapter's paced per-symbol futures, then a synchronous batch fetch,
+        and fetches anything still missing one symbol per worker.
+        """
+        submitted = self.data_adapter.submit_historical_data_batch(symbols, 100)
+        futures: Dict[Future, str] = {future: symbol for symbol, future in submitted.items()}
+
+        if not futures:
+            prefetched = self.data_adapter.get_historical_data_batch(symbols, 100)
+            for symbol, data in prefetched.items():
+                if data is not None and not data.empty:
+                    future = Future()
+                    future.set_result(data)
+                    futures[future] = symbol
+
+        covered = set(futures.values())
+        for symbol in symbols:
+            if symbol not in covered:
+                futures[pool.submit(self.data_adapter.get_historical_data, symbol, 100)] = symbol
+        return futures
+
+    @staticmethod
+    def _history_result(future: Future) -> Optional[pd.DataFrame]:
+        """History from a finished fetch, or None so _analyze_stock falls back to a direct request"""
+        try:
+            data = future.result()
+        except (CancelledError, Exception):
+            return None
+        return data if data is not None and not data.empty else None
+
+    def _analyze_batch(self, items: List[Tuple[Dict, Optional[pd.DataFrame]]]) -> List[ScanResult]:
+        """Analyze a chunk of stocks with one vectorized indicator pass over the histories they came with"""
+        histories = {stock['symbol']: data for stock, data in items if data is not None}
+        indicators_by_symbol = IndicatorEngine.to_records(self.indicator_engine.compute(histories))
+        for symbol, indicators in indicators_by_symbol.items():
+            self._apply_indicator_state(symbol, histories[symbol], indicators)
+        results = []
+        for stock_info, historical_data in items:
+            result = self._analyze_stock(stock_info, historical_data, indicators_by_symbol.get(stock_info['symbol']))
+            if result:
+                results.append(result)
+        return results
+
+    def _apply_indicator_state(self, symbol: str, historical_data: pd.DataFrame, indicators: Dict[str, Any]) -> None:
+        """
+        Replace the EMAs computed over this history window with the persisted incremental EMAs,
+        which continue from the previous scan (the window's values seed the state when it has to restart).
+        A bar dated today is still forming, so it is not folded into the carried state.
+        """
+        last_bar_final = pd.Timestamp(historical_data.index[-1]).date() < datetime.now().date()
+        for period in self.technical_scorer.ema_periods:
+            key = f'ema_{period}'
+            if indicators.get(key) is None:
+                continue
+            ema = self.indicator_state.update_ema(symbol, '1 day', period, historical_data['close'],
+                                                  seed=indicators[key], last_bar_final=last_bar_final)
+            if ema is not None:
+                indicators[key] = ema
+    # Concurrent Analysis Pipeline - End
+
     # Enhanced Analysis Method - Begin
-    def _analyze_stock(self, stock_info: Dict) -> Optional[ScanResult]:
+    def _analyze_stock(self, stock_info: Dict, historical_data: Optional[pd.DataFrame] = None,
+                       indicators: Optional[Dict[str, Any]] = None) -> Optional[ScanResult]:
         """Analyze a single stock and return raw technical data for strategy processing"""
         symbol = stock_info.get('symbol', 'unknown')
         
@@ -153,8 +374,9 @@ class StockScanner:
         # <Context-Aware Logging Integration - End>
         
         try:
-            # Get historical data
-            historical_data = self.data_adapter.get_historical_data(symbol, 100)
+            # Get historical data unless it was prefetched for the whole universe
+            if historical_data is None:
+                historical_data = self.data_adapter.get_historical_data(symbol, 100)
             if historical_data is None or historical_data.empty:
                 # <Context-Aware Logging Integration - Begin>
                 self.context_logger.log_event(
@@ -171,27 +393,14 @@ class StockScanner:
                 return None
             
             current_price = stock_info['price']
-            prices = historical_data['close']
-            volumes = historical_data['volume'] if 'volume' in historical_data else None
             
-            # Calculate raw technical indicators (no strategy scoring)
-            emas = self.technical_scorer.calculate_emas(prices)
-            
-            # Prepare price and volume data for strategy evaluation
-            price_data = {
-                'current': current_price,
-                'historical': prices.tolist(),
-                'highs': historical_data['high'].tolist() if 'high' in historical_data else [],
-                'lows': historical_data['low'].tolist() if 'low' in historical_data else [],
-                'opens': historical_data['open'].tolist() if 'open' in historical_data else []
-            }
-            
-            volume_data = {
-                'current': stock_info.get('volume', 0),
-                'historical': volumes.tolist() if volumes is not None else [],
-                'average': stock_info.get('average_volume', 0)
-            }
+            # Raw technical indicators (no strategy scoring), precomputed for the universe when prefetched
+            if indicators is None:
+                indicators = IndicatorEngine.to_records(
+                    self.indicator_engine.compute({symbol: historical_data})).get(symbol, {})
+            emas = {period: indicators.get(f'ema_{period}') for period in self.technical_scorer.ema_periods}
             
+            # Bars are held as column arrays; price/volume data for strategies are views of them
             result = ScanResult(
                 symbol=symbol,
                 current_price=current_price,
@@ -200,8 +409,8 @@ class StockScanner:
                 ema_values=emas,
                 historical_data=historical_data,
                 last_updated=datetime.now(),
-                price_data=price_data,
-                volume_data=volume_data
+                indicators=indicators,
+                average_volume=stock_info.get('average_volume', 0)
             )
             
             # <Context-Aware Logging Integration - Begin>
@@ -214,9 +423,7 @@ class StockScanner:
                     "volume": stock_info.get('volume', 0),
                     "market_cap": stock_info.get('market_cap', 0),
                     "ema_values_count": len(emas),
-                    "historical_data_points": len(historical_data),
-                    "price_data_points": len(price_data['historical']),
-                    "volume_data_points": len(volume_data['historical'])
+                    "historical_data_points": result.bar_count
                 },
                 decision_reason="Stock analysis completed successfully"
             )
@@ -1,9 +1,14 @@
 # src/scanner/strategy/strategy_core.py
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import islice
 import logging
+import math
+import numpy as np
+import pandas as pd
 
 # Add criteria imports - FIXED IMPORT
 from src.scanning.criteria.criteria_core import CriteriaRegistry, CriteriaType
@@ -31,9 +36,15 @@ class StrategyMatch:
     strategy_confidence: float = 0.0
 
 class StrategyOrchestrator:
-    """Coordinates multiple strategies with OR logic"""
+    """
+    Coordinates multiple strategies with OR logic.
+    Each symbol's stock data is built once and criteria results are shared across strategies, so a
+    criterion used by several strategies runs at most once per symbol. evaluate_symbols() screens
+    each batch of symbols with the vectorized base criteria first and, with max_workers > 1,
+    spreads the detailed evaluation of the survivors over a process pool.
+    """
     
-    def __init__(self, strategies: List['Strategy']):
+    def __init__(self, strategies: List['Strategy'], max_workers: int = 1, batch_size: int = 200):
         # <Context-Aware Logging Integration - Begin>
         self.context_logger = get_context_logger()
         self.context_logger.log_event(
@@ -42,26 +53,39 @@ class StrategyOrchestrator:
             context_provider={
                 "strategies_count": len(strategies),
                 "strategy_names": [strategy.config.name for strategy in strategies],
-                "logic_type": "OR logic - symbols match if ANY strategy identifies them"
+                "logic_type": "OR logic - symbols match if ANY strategy identifies them",
+                "max_workers": max_workers
             }
         )
         # <Context-Aware Logging Integration - End>
         
         self.strategies = strategies
+        self.max_workers = max_workers
+        self.batch_size = max(1, batch_size)
         self.logger = logging.getLogger(__name__)
     
-    def evaluate_symbol(self, scan_result) -> List[StrategyMatch]:
+    @property
+    def parallel(self) -> bool:
+        """Whether evaluate_symbols() uses a process pool"""
+        return self.max_workers > 1 and len(self.strategies) > 0
+    
+    def evaluate_symbol(self, scan_result, strategy_names: Optional[Iterable[str]] = None) -> List[StrategyMatch]:
         """
-        Evaluate symbol against all strategies using OR logic
+        Evaluate symbol against all strategies (or only strategy_names) using OR logic
         Returns all strategy matches (empty list if no matches)
         """
+        strategies = self.strategies
+        if strategy_names is not None:
+            strategy_names = set(strategy_names)
+            strategies = [strategy for strategy in self.strategies if strategy.config.name in strategy_names]
+        
         # <Context-Aware Logging Integration - Begin>
         self.context_logger.log_event(
             TradingEventType.SYSTEM_HEALTH,
             f"Evaluating symbol {scan_result.symbol} against all strategies",
             symbol=scan_result.symbol,
             context_provider={
-                "strategies_count": len(self.strategies),
+                "strategies_count": len(strategies),
                 "current_price": scan_result.current_price,
                 "symbol": scan_result.symbol
             }
@@ -69,10 +93,14 @@ class StrategyOrchestrator:
         # <Context-Aware Logging Integration - End>
         
         matches = []
+        # Shared across strategies: features are extracted once and each criterion runs at most once
+        stock_data = scan_result_to_stock_data(scan_result)
+        shared_results: Dict[str, Dict[str, Any]] = {}
         
-        for strategy in self.strategies:
+        for strategy in strategies:
             try:
-                match = strategy.evaluate_with_details(scan_result)
+                match = strategy.evaluate_with_details(scan_result, stock_data=stock_data,
+                                                       shared_results=shared_results)
                 if match:
                     matches.append(match)
                     # <Context-Aware Logging Integration - Begin>
@@ -113,7 +141,7 @@ class StrategyOrchestrator:
             context_provider={
                 "total_matches_found": len(matches),
                 "matching_strategies": [match.strategy_name for match in matches],
-                "strategies_evaluated": len(self.strategies)
+                "strategies_evaluated": len(strategies)
             },
             decision_reason="Multi-strategy evaluation completed"
         )
@@ -121,6 +149,110 @@ class StrategyOrchestrator:
         
         return matches
     
+    # Parallel Evaluation - Begin
+    def evaluate_symbols(self, scan_results: Iterable[Any]) -> Iterator[Tuple[Any, List[StrategyMatch]]]:
+        """
+        Yield (scan_result, matches) in input order. scan_results may be a stream; it is read
+        batch_size symbols at a time. Each batch's base criteria are evaluated for every strategy in
+        one vectorized pass, and only the strategies whose base requirements a symbol meets get the
+        detailed per-symbol evaluation - across the pool when parallel. Criteria statistics gathered
+        in worker processes stay in those processes.
+        """
+        stream = iter(scan_results)
+        pool = None
+        try:
+            if self.parallel:
+                pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_strategy_worker,
+                                           initargs=(self.strategies,))
+            while True:
+                batch = list(islice(stream, self.batch_size))
+                if not batch:
+                    return
+                eligible = self._screen_base_criteria(batch)
+                work = [(scan_result, names) for scan_result, names in zip(batch, eligible) if names]
+                work_matches = None
+                if pool is not None and work:
+                    chunksize = max(1, math.ceil(len(work) / (self.max_workers * 4)))
+                    try:
+                        work_matches = list(pool.map(_evaluate_in_worker, work, chunksize=chunksize))
+                    except Exception as e:
+                        # A broken or unusable pool must not lose symbols: finish in this process
+                        self._log_pool_failure(e, len(work))
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = None
+                if work_matches is None:
+                    work_matches = [self._evaluate_safely(scan_result, names) for scan_result, names in work]
+                matches = iter(work_matches)
+                for scan_result, names in zip(batch, eligible):
+                    yield scan_result, next(matches) if names else []
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+    
+    def _screen_base_criteria(self, batch: List[Any]) -> List[List[str]]:
+        """
+        Per scan result, the names of the strategies whose base requirements it meets, from one
+        CriteriaRegistry.evaluate_batch() pass per strategy over the whole batch. If the batch
+        evaluation fails, every strategy is kept and the per-symbol evaluation decides.
+        """
+        all_names = [strategy.config.name for strategy in self.strategies]
+        try:
+            frame = Strategy.scan_results_to_frame(batch)
+            eligible: List[List[str]] = [[] for _ in batch]
+            for strategy in self.strategies:
+                meets = strategy.evaluate_base_criteria_batch(frame)['meets_requirements'].to_numpy(dtype=bool)
+                for position in np.flatnonzero(meets):
+                    eligible[position].append(strategy.config.name)
+            return eligible
+        except Exception as e:
+            # <Context-Aware Logging Integration - Begin>
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                "Batch base criteria screening failed - evaluating per symbol",
+                context_provider={
+                    "batch_size": len(batch),
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                },
+                decision_reason="BATCH_SCREENING_FALLBACK"
+            )
+            # <Context-Aware Logging Integration - End>
+            return [list(all_names) for _ in batch]
+    
+    def _evaluate_safely(self, scan_result, strategy_names: Optional[Iterable[str]] = None) -> List[StrategyMatch]:
+        try:
+            return self.evaluate_symbol(scan_result, strategy_names)
+        except Exception as e:
+            # <Context-Aware Logging Integration - Begin>
+            self.context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                f"Error evaluating {scan_result.symbol}",
+                symbol=scan_result.symbol,
+                context_provider={
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                },
+                decision_reason="Symbol evaluation failed"
+            )
+            # <Context-Aware Logging Integration - End>
+            return []
+    
+    def _log_pool_failure(self, error: Exception, batch_size: int) -> None:
+        # <Context-Aware Logging Integration - Begin>
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Strategy worker pool failed - evaluating in process",
+            context_provider={
+                "max_workers": self.max_workers,
+                "batch_size": batch_size,
+                "error_type": type(error).__name__,
+                "error_message": str(error)
+            },
+            decision_reason="STRATEGY_POOL_FALLBACK"
+        )
+        # <Context-Aware Logging Integration - End>
+    # Parallel Evaluation - End
+    
     def get_matching_strategies(self, scan_result) -> List[str]:
         """Get list of strategy names that match this symbol"""
         # <Context-Aware Logging Integration - Begin>
@@ -149,8 +281,41 @@ class StrategyOrchestrator:
         # <Context-Aware Logging Integration - End>
         
         return matching_strategies
+
+
+# Worker process state: the strategies are sent once per worker, not once per symbol
+_worker_orchestrator: Optional[StrategyOrchestrator] = None
+
+
+def _init_strategy_worker(strategies: List['Strategy']) -> None:
+    global _worker_orchestrator
+    _worker_orchestrator = StrategyOrchestrator(strategies)
+
+
+def _evaluate_in_worker(item: Tuple[Any, List[str]]) -> List[StrategyMatch]:
+    scan_result, strategy_names = item
+    return _worker_orchestrator._evaluate_safely(scan_result, strategy_names)
 # Strategy Matching System - End
 
+def scan_result_to_stock_data(scan_result) -> Dict[str, Any]:
+    """Stock data for criteria from a scan result, built once per symbol and shared by all strategies"""
+    price_data = getattr(scan_result, 'price_data', {})
+    volume_data = getattr(scan_result, 'volume_data', {})
+    return {
+        'symbol': scan_result.symbol,
+        'price': scan_result.current_price,
+        'volume': getattr(scan_result, 'volume', 1_500_000),  # Mock for now
+        'market_cap': getattr(scan_result, 'market_cap', 15_000_000_000),  # Mock
+        'exchange': 'NASDAQ',  # Mock - you'd get this from your data
+        # Histories and precomputed indicators for technical criteria
+        'price_history': price_data.get('historical', []),
+        'high_history': price_data.get('highs', []),
+        'low_history': price_data.get('lows', []),
+        'volume_history': volume_data.get('historical', []),
+        'ema_values': getattr(scan_result, 'ema_values', {}),
+        'indicators': getattr(scan_result, 'indicators', {}),
+    }
+
 class StrategyType(Enum):
     BULL_TREND = "bull_trend"
     BULL_PULLBACK = "bull_pullback" 
@@ -197,74 +362,25 @@ class Strategy(ABC):
         self.criteria_registry = criteria_registry
         self.logger = logging.getLogger(__name__)
     
-    def evaluate_base_criteria(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
+    def evaluate_base_criteria(self, stock_data: Dict[str, Any],
+                               shared_results: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
-        Evaluate all base criteria that every strategy must pass
+        Evaluate all base criteria that every strategy must pass.
+        The registry runs cheap filters first and stops at the first required failure;
+        per-criterion outcomes are in its statistics rather than logged per symbol.
+        shared_results lets strategies evaluating the same symbol reuse each other's criteria results.
         """
-        # <Context-Aware Logging Integration - Begin>
-        self.context_logger.log_event(
-            TradingEventType.SYSTEM_HEALTH,
-            f"Evaluating base criteria for {stock_data.get('symbol', 'unknown')}",
-            symbol=stock_data.get('symbol'),
-            context_provider={
-                "strategy_name": self.config.name,
-                "required_criteria": self.config.required_criteria,
-                "additional_criteria": self.config.additional_criteria
-            }
-        )
-        # <Context-Aware Logging Integration - End>
-        
         all_criteria = self.config.required_criteria + self.config.additional_criteria
-        criteria_result = self.criteria_registry.evaluate_all(stock_data, all_criteria)
-        
-        # <Context-Aware Logging Integration - Begin>
-        self.context_logger.log_event(
-            TradingEventType.SYSTEM_HEALTH,
-            f"Base criteria evaluation completed for {stock_data.get('symbol', 'unknown')}",
-            symbol=stock_data.get('symbol'),
-            context_provider={
-                "strategy_name": self.config.name,
-                "meets_requirements": criteria_result['meets_requirements'],
-                "overall_score": criteria_result['overall_score'],
-                "passed_criteria_count": len(criteria_result['passed_criteria']),
-                "failed_criteria_count": len(criteria_result['failed_criteria'])
-            },
-            decision_reason="Base criteria evaluation completed"
-        )
-        # <Context-Aware Logging Integration - End>
-        
-        return criteria_result
+        return self.criteria_registry.evaluate_all(stock_data, all_criteria, shared_results=shared_results)
+    
+    def evaluate_base_criteria_batch(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """evaluate_base_criteria() for a universe frame (see scan_results_to_frame), one row per symbol"""
+        all_criteria = self.config.required_criteria + self.config.additional_criteria
+        return self.criteria_registry.evaluate_batch(frame, all_criteria)
     
     def passes_base_requirements(self, stock_data: Dict[str, Any]) -> bool:
         """Quick check if stock passes all base criteria"""
-        # <Context-Aware Logging Integration - Begin>
-        self.context_logger.log_event(
-            TradingEventType.SYSTEM_HEALTH,
-            f"Quick base requirements check for {stock_data.get('symbol', 'unknown')}",
-            symbol=stock_data.get('symbol'),
-            context_provider={
-                "strategy_name": self.config.name
-            }
-        )
-        # <Context-Aware Logging Integration - End>
-        
-        criteria_result = self.evaluate_base_criteria(stock_data)
-        passes = criteria_result['meets_requirements']
-        
-        # <Context-Aware Logging Integration - Begin>
-        self.context_logger.log_event(
-            TradingEventType.SYSTEM_HEALTH,
-            f"Base requirements check result for {stock_data.get('symbol', 'unknown')}: {passes}",
-            symbol=stock_data.get('symbol'),
-            context_provider={
-                "strategy_name": self.config.name,
-                "passes_base_requirements": passes
-            },
-            decision_reason="Base requirements check completed"
-        )
-        # <Context-Aware Logging Integration - End>
-        
-        return passes
+        return self.evaluate_base_criteria(stock_data)['meets_requirements']
     
     @abstractmethod
     def evaluate_strategy_specific(self, scan_result, stock_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -277,8 +393,13 @@ class Strategy(ABC):
         pass
     
     # Enhanced Evaluation Methods - Begin
-    def evaluate_with_details(self, scan_result) -> Optional[StrategyMatch]:
-        """Complete evaluation returning detailed StrategyMatch object"""
+    def evaluate_with_details(self, scan_result, stock_data: Optional[Dict[str, Any]] = None,
+                              shared_results: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[StrategyMatch]:
+        """
+        Complete evaluation returning detailed StrategyMatch object.
+        stock_data and shared_results are passed by StrategyOrchestrator so features and criteria
+        results are computed once per symbol for all strategies.
+        """
         symbol = scan_result.symbol
         
         # <Context-Aware Logging Integration - Begin>
@@ -294,10 +415,12 @@ class Strategy(ABC):
         # <Context-Aware Logging Integration - End>
         
         # Convert scan_result to stock_data format for criteria
-        stock_data = self._scan_result_to_stock_data(scan_result)
+        if stock_data is None:
+            stock_data = self._scan_result_to_stock_data(scan_result)
         
-        # First, check base criteria
-        if not self.passes_base_requirements(stock_data):
+        # First, check base criteria (evaluated once; the result also feeds confidence and metadata below)
+        base_criteria_result = self.evaluate_base_criteria(stock_data, shared_results)
+        if not base_criteria_result['meets_requirements']:
             # <Context-Aware Logging Integration - Begin>
             self.context_logger.log_event(
                 TradingEventType.SYSTEM_HEALTH,
@@ -328,7 +451,6 @@ class Strategy(ABC):
             return None
         
         # Calculate overall confidence
-        base_criteria_result = self.evaluate_base_criteria(stock_data)
         strategy_confidence = self.calculate_strategy_confidence(scan_result, stock_data)
         
         # Combine base criteria score with strategy confidence
@@ -345,7 +467,7 @@ class Strategy(ABC):
                 confidence=overall_confidence,
                 current_price=scan_result.current_price,
                 total_score=scan_result.total_score,
-                metadata=self._generate_metadata(scan_result, stock_data),
+                metadata=self._generate_metadata(scan_result, stock_data, base_criteria_result),
                 criteria_details=base_criteria_result,
                 base_criteria_score=base_criteria_result['overall_score'],
                 strategy_confidence=strategy_confidence
@@ -448,15 +570,27 @@ class Strategy(ABC):
     
     def _scan_result_to_stock_data(self, scan_result) -> Dict[str, Any]:
         """Convert scan result to stock data format for criteria"""
-        stock_data = {
-            'symbol': scan_result.symbol,
-            'price': scan_result.current_price,
-            'volume': getattr(scan_result, 'volume', 1_500_000),  # Mock for now
-            'market_cap': getattr(scan_result, 'market_cap', 15_000_000_000),  # Mock
-            'exchange': 'NASDAQ',  # Mock - you'd get this from your data
-            # Add other required fields as needed
-        }
-        return stock_data
+        return scan_result_to_stock_data(scan_result)
+    
+    @staticmethod
+    def scan_results_to_frame(scan_results: List[Any]) -> pd.DataFrame:
+        """
+        Columnar form of _scan_result_to_stock_data() for a whole universe: one row per symbol with
+        the scalar fields and the IndicatorEngine columns already carried by each ScanResult
+        """
+        rows = []
+        for scan_result in scan_results:
+            rows.append({
+                **(getattr(scan_result, 'indicators', None) or {}),
+                'symbol': scan_result.symbol,
+                'price': scan_result.current_price,
+                'volume': getattr(scan_result, 'volume', 1_500_000),
+                'market_cap': getattr(scan_result, 'market_cap', 15_000_000_000),
+                'exchange': 'NASDAQ'  # Mock, as in _scan_result_to_stock_data
+            })
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame.from_records(rows).set_index('symbol')
     
     def _combine_confidence(self, base_score: float, strategy_score: float) -> float:
         """Combine base criteria score with strategy confidence"""
@@ -511,11 +645,14 @@ class Strategy(ABC):
         
         return signal
     
-    def _generate_metadata(self, scan_result, stock_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_metadata(self, scan_result, stock_data: Dict[str, Any],
+                           base_criteria_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Generate strategy-specific metadata"""
+        if base_criteria_result is None:
+            base_criteria_result = self.evaluate_base_criteria(stock_data)
         metadata = {
             'ema_values': scan_result.ema_values,
-            'base_criteria_passed': self.evaluate_base_criteria(stock_data)['passed_criteria'],
+            'base_criteria_passed': base_criteria_result['passed_criteria'],
             'setup_quality': self._assess_setup_quality(scan_result)
         }
         return metadata
@@ -1,10 +1,13 @@
 # src/scanner/tiered_scanner.py
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Iterable
+import copy
 import logging
-from datetime import datetime
+from datetime import datetime, date
 
 from src.scanning.scanner_core import StockScanner
 from src.scanning.candidate_generator import CandidateGenerator
+from src.scanning.real_time_scanner import RealTimeScanner
+from src.scanning.scan_result_cache import ScanResultCache
 from src.scanning.criteria_setup import create_configurable_criteria_registry
 from src.scanning.strategy.configurable_strategies import create_configurable_bull_trend_pullback_config
 from src.scanning.strategy.bull_trend_pullback_strategy import BullTrendPullbackStrategy
@@ -23,6 +26,9 @@ class TieredScanner:
         self.data_adapter = ibkr_data_adapter
         self.scanner_config = scanner_config or ScannerConfig()  # Default config
         self.logger = logging.getLogger(__name__)
+        # Kept across update_config(): a strategy-only change reuses the Tier 1 results
+        self.tier1_cache = ScanResultCache()
+        self.candidate_cache = ScanResultCache()
         self._setup_tiered_architecture()
     
     def _setup_tiered_architecture(self):
@@ -68,7 +74,11 @@ class TieredScanner:
         #     self.logger.info(f"Registered enabled strategy: momentum_breakout")
         
         # Create StrategyOrchestrator only with enabled strategies
-        self.strategy_orchestrator = StrategyOrchestrator(enabled_strategies)
+        self.strategy_orchestrator = StrategyOrchestrator(
+            enabled_strategies,
+            max_workers=self.scanner_config.strategy_workers,
+            batch_size=self.scanner_config.strategy_batch_size
+        )
         
         self.logger.info(f"Tier 2: {len(enabled_strategies)} strategies enabled: {[s.config.name for s in enabled_strategies]}")
     
@@ -78,28 +88,98 @@ class TieredScanner:
         self._setup_tiered_architecture()  # Re-initialize with new config
         self.logger.info(f"Tiered Scanner configuration updated: {new_config}")
     
-    def run_scan(self) -> List[Dict[str, Any]]:
-        """Run scanning process - returns Tier 1 results if no strategies enabled"""
+    def run_scan(self, use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Run scanning process - returns Tier 1 results if no strategies enabled.
+        Within cache_duration, an unchanged config is served from the candidate cache and a
+        config that differs only in strategy settings re-runs Tier 2 over cached Tier 1 results.
+        Cached candidates are deep-copied in and out, so callers may modify what they get.
+        """
         self.logger.info(f"🚀 Starting scan with {len(self.scanner_config.enabled_strategies)} enabled strategies")
         
-        # Tier 1: Basic screening - get scan results
-        scan_results = self.scanner.run_scan()
-        self.logger.info(f"📊 Tier 1: {len(scan_results)} symbols passed basic screening")
-        
         # If no strategies enabled, return Tier 1 results only
         if not self.scanner_config.enabled_strategies:
+            scan_results = self._universe_order(self._tier1_results(use_cache))
+            self.logger.info(f"📊 Tier 1: {len(scan_results)} symbols passed basic screening")
             self.logger.info("🔄 No strategies enabled - returning Tier 1 results only")
             return self._format_tier1_results(scan_results)
         
-        # Tier 2: Strategy matching with OR logic
+        candidate_key = (self.scanner_config.fingerprint(), self._data_date())
+        if use_cache:
+            cached = self.candidate_cache.get(candidate_key, self.scanner_config.cache_duration)
+            if cached is not None:
+                self.logger.info(f"⚡ Scan served from cache: {len(cached)} candidates")
+                return copy.deepcopy(cached)
+        
+        # Tier 1 -> Tier 2 streaming: each symbol is strategy-matched as soon as it is analyzed,
+        # and only the best max_candidates are kept
         candidates = self.candidate_generator.generate_candidates(
-            scan_results=scan_results,
+            scan_results=self._tier1_results(use_cache),
             min_confidence=self.scanner_config.min_confidence_score,
             max_candidates=self.scanner_config.max_candidates
         )
+        self.candidate_cache.put(candidate_key, copy.deepcopy(candidates))
         
         self.logger.info(f"🎉 Scan Complete: {len(candidates)} candidates found ({len(self.scanner_config.enabled_strategies)} strategies)")
         return candidates
+
+    def iter_candidates(self, use_cache: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Yield candidates as each symbol clears the strategy tier, unranked and in arrival order,
+        so callers can act on or write the first candidates before the universe is fully fetched.
+        """
+        return self.candidate_generator.iter_candidates(
+            self._tier1_results(use_cache),
+            min_confidence=self.scanner_config.min_confidence_score
+        )
+    
+    # Scan Result Cache - Begin
+    def _tier1_results(self, use_cache: bool = True) -> Iterable[Any]:
+        """
+        Tier 1 results for the current config: the cached list when still fresh, otherwise
+        the live iter_scan() stream, which is cached once it has been read to the end
+        """
+        key = (self.scanner_config.tier1_fingerprint(), self._data_date())
+        if use_cache:
+            cached = self.tier1_cache.get(key, self.scanner_config.cache_duration)
+            if cached is not None:
+                self.logger.info(f"⚡ Tier 1: reusing {len(cached)} cached scan results")
+                return cached
+        return self._record_tier1(key, self.scanner.iter_scan())
+    
+    def _record_tier1(self, key, stream: Iterator[Any]) -> Iterator[Any]:
+        results = []
+        for result in stream:
+            results.append(result)
+            yield result
+        self.tier1_cache.put(key, self._universe_order(results))  # Only complete scans are cached
+    
+    @staticmethod
+    def _universe_order(scan_results: Iterable[Any]) -> List[Any]:
+        """Tier 1 results arrive in completion order; reports and the cache use universe order"""
+        return sorted(scan_results, key=lambda result: result.universe_index)
+    
+    @staticmethod
+    def _data_date() -> date:
+        """EOD bars change at most once per session, so the data date is part of every cache key"""
+        return date.today()
+    
+    def invalidate_cache(self) -> None:
+        """Drop cached Tier 1 results and candidates, e.g. after a data refresh"""
+        self.tier1_cache.clear()
+        self.candidate_cache.clear()
+    # Scan Result Cache - End
+    
+    def start_real_time(self, market_data_manager, event_bus,
+                        watchlist: Optional[List[Dict]] = None) -> RealTimeScanner:
+        """
+        Start ScanMode.REAL_TIME scanning with the enabled strategies: live prices re-evaluate
+        only the symbols that moved, and strategy entries/exits are published as TRADING_SIGNAL events
+        """
+        real_time_scanner = RealTimeScanner.from_tiered_scanner(self, market_data_manager, event_bus)
+        real_time_scanner.start(watchlist)
+        self.logger.info(f"📡 Real-time scanning started for {real_time_scanner.get_metrics()['watched_symbols']} symbols")
+        return real_time_scanner
     
     def _format_tier1_results(self, scan_results: List[Any]) -> List[Dict[str, Any]]:
         """Return Tier 1 results when no strategies are enabled"""
@@ -122,7 +202,7 @@ class TieredScanner:
                     'price_ok': result.current_price >= self.scanner_config.min_price
                 },
                 'metadata': {
-                    'historical_data_points': len(result.historical_data),
+                    'historical_data_points': result.bar_count,
                     'ema_calculated': len(result.ema_values) > 0
                 }
             })
@@ -0,0 +1,308 @@
+"""
+Columnar export of market snapshots and ML training data.
+Streams query results in fixed-size chunks into Parquet or Arrow IPC files
+with explicit dtypes, so consumers can memory-map exports without loading
+the whole table and memory stays bounded by the chunk size.
+"""
+
+import datetime
+import json
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from src.core.models import MarketSnapshotDB, OrderLabelDB, ProbabilityScoreDB
+from src.trading.orders.order_archive_service import OrderArchiveService
+from src.core.context_aware_logger import get_context_logger, TradingEventType
+
+context_logger = get_context_logger()
+
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_LABEL_TYPES = ['filled_binary', 'time_to_fill', 'slippage', 'profitability']
+
+# Output suffixes handled by the columnar writers
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+ARROW_SUFFIXES = ('.arrow', '.ipc', '.feather')
+
+
+def is_columnar_path(output_path: str) -> bool:
+    """True if the output path names a Parquet or Arrow IPC file."""
+    return output_path.lower().endswith(PARQUET_SUFFIXES + ARROW_SUFFIXES)
+
+
+def _import_pyarrow():
+    """Import pyarrow lazily; it is only needed for columnar exports."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Columnar export requires pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def _feature_kind(value) -> Optional[str]:
+    """Classify a JSON feature value as 'bool', 'number' or 'string' (None for null)."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, (int, float)):
+        return 'number'
+    return 'string'
+
+
+def _merge_feature_kind(current: Optional[str], new: Optional[str]) -> Optional[str]:
+    """Widen two feature kinds: bools and numbers meet at number, anything else at string."""
+    if current is None or current == new:
+        return new or current
+    if new is None:
+        return current
+    if {current, new} == {'bool', 'number'}:
+        return 'number'
+    return 'string'
+
+
+def _coerce_feature(value, kind: Optional[str]):
+    """Convert a feature value to the column kind settled by the schema pass."""
+    if value is None:
+        return None
+    if kind == 'number':
+        return float(value)
+    if kind == 'string' and not isinstance(value, str):
+        return json.dumps(value)
+    return value
+
+
+class _ChunkWriter:
+    """Writes record batches to a Parquet or Arrow IPC file chosen by suffix."""
+
+    def __init__(self, pa, output_path: str, schema):
+        self.pa = pa
+        if output_path.lower().endswith(PARQUET_SUFFIXES):
+            self._writer = pa.parquet.ParquetWriter(output_path, schema, compression='snappy')
+        else:
+            self._writer = pa.ipc.new_file(output_path, schema)
+        self.schema = schema
+
+    def write(self, columns: Dict[str, list]) -> None:
+        batch = self.pa.RecordBatch.from_arrays(
+            [self.pa.array(columns[field.name], type=field.type) for field in self.schema],
+            schema=self.schema
+        )
+        if isinstance(self._writer, self.pa.parquet.ParquetWriter):
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write(batch)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class ColumnarExportService:
+    """
+    Streams market snapshots and labeled training data to columnar files.
+    Reads go through the <table>_all views, so archived rows are exported too.
+    """
+
+    def __init__(self, db_session: Session, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.db_session = db_session
+        self.chunk_size = chunk_size
+        self._archive_service = OrderArchiveService(db_session)
+
+    def _iter_chunks(self, statement) -> Iterator[List]:
+        """Yield lists of result rows, fetching at most chunk_size rows at a time."""
+        result = self.db_session.execute(statement.execution_options(yield_per=self.chunk_size))
+        for partition in result.partitions():
+            yield partition
+
+    # <Market Snapshot Export - Begin>
+    def export_market_snapshots(self, output_path: str, symbol: Optional[str] = None,
+                                start: Optional[datetime.datetime] = None,
+                                end: Optional[datetime.datetime] = None) -> int:
+        """
+        Export market snapshots to Parquet/Arrow in chunks.
+
+        The level2_snapshot JSON column is written as a JSON-encoded string column.
+
+        Args:
+            output_path: Destination file (.parquet/.pq or .arrow/.ipc/.feather)
+            symbol: Optional symbol filter
+            start: Optional inclusive lower bound on snapshot timestamp
+            end: Optional exclusive upper bound on snapshot timestamp
+
+        Returns:
+            Number of rows written
+        """
+        pa = _import_pyarrow()
+        schema = pa.schema([
+            ('id', pa.int64()),
+            ('symbol', pa.string()),
+            ('timestamp', pa.timestamp('us')),
+            ('bid', pa.float64()),
+            ('ask', pa.float64()),
+            ('bid_size', pa.float64()),
+            ('ask_size', pa.float64()),
+            ('last', pa.float64()),
+            ('volume', pa.float64()),
+            ('vwap', pa.float64()),
+            ('level2_snapshot', pa.large_string()),
+        ])
+
+        table = self._archive_service.union_table(MarketSnapshotDB)
+        statement = select(*[table.c[name] for name in schema.names]).order_by(table.c.timestamp, table.c.id)
+        if symbol:
+            statement = statement.where(table.c.symbol == symbol)
+        if start:
+            statement = statement.where(table.c.timestamp >= start)
+        if end:
+            statement = statement.where(table.c.timestamp < end)
+
+        writer = _ChunkWriter(pa, output_path, schema)
+        total_rows = 0
+        try:
+            for rows in self._iter_chunks(statement):
+                columns = dict(zip(schema.names, (list(column) for column in zip(*rows))))
+                columns['level2_snapshot'] = [
+                    json.dumps(value) if value is not None else None for value in columns['level2_snapshot']
+                ]
+                writer.write(columns)
+                total_rows += len(rows)
+        finally:
+            writer.close()
+
+        context_logger.log_event(
+            TradingEventType.DATABASE_STATE,
+            f"Exported {total_rows} market snapshots to {output_path}",
+            symbol=symbol,
+            context_provider={
+                "output_path": output_path,
+                "rows_written": total_rows,
+                "chunk_size": self.chunk_size
+            },
+            decision_reason="MARKET_SNAPSHOT_EXPORT_COMPLETED"
+        )
+        return total_rows
+    # <Market Snapshot Export - End>
+
+    # <Training Data Export - Begin>
+    def export_training_data(self, output_path: str, label_types: Optional[Sequence[str]] = None,
+                             hours_back: int = 168) -> int:
+        """
+        Export labels joined with their latest probability-score features in one streamed query.
+
+        A features-only pass over the same query settles the feature columns before any
+        rows are written: every feature key seen becomes a column (in first-seen order)
+        typed across all rows, and keys absent from a row are null. An export with no
+        rows still writes a file carrying the label columns.
+
+        Args:
+            output_path: Destination file (.parquet/.pq or .arrow/.ipc/.feather)
+            label_types: Label types to export (None for the default training set)
+            hours_back: How far back to look for labels (default 1 week)
+
+        Returns:
+            Number of rows written
+        """
+        pa = _import_pyarrow()
+        label_types = list(label_types or DEFAULT_LABEL_TYPES)
+        cutoff_time = datetime.datetime.now() - datetime.timedelta(hours=hours_back)
+
+        labels = self._archive_service.union_table(OrderLabelDB)
+        scores = self._archive_service.union_table(ProbabilityScoreDB)
+        # One score per order even when several share the latest timestamp
+        ranked_scores = select(
+            scores.c.planned_order_id,
+            scores.c.features,
+            func.row_number().over(
+                partition_by=scores.c.planned_order_id,
+                order_by=(scores.c.timestamp.desc(), scores.c.id.desc())
+            ).label('score_rank')
+        ).subquery()
+
+        statement = select(
+            labels.c.label_type,
+            labels.c.label_value,
+            labels.c.planned_order_id,
+            labels.c.computed_at,
+            labels.c.notes,
+            ranked_scores.c.features
+        ).join(
+            ranked_scores, and_(
+                ranked_scores.c.planned_order_id == labels.c.planned_order_id,
+                ranked_scores.c.score_rank == 1
+            )
+        ).where(
+            labels.c.label_type.in_(label_types),
+            labels.c.computed_at >= cutoff_time,
+            ranked_scores.c.features.isnot(None)
+        ).order_by(labels.c.label_type, labels.c.id)
+
+        feature_kinds = self._scan_feature_kinds(statement.with_only_columns(ranked_scores.c.features))
+        feature_names = list(feature_kinds)
+        writer = _ChunkWriter(pa, output_path, self._training_schema(pa, feature_kinds))
+        total_rows = 0
+        try:
+            for rows in self._iter_chunks(statement):
+                rows = [row for row in rows if row.features]
+                if not rows:
+                    continue
+
+                columns = {
+                    'label_type': [row.label_type for row in rows],
+                    'label_value': [row.label_value for row in rows],
+                    'planned_order_id': [row.planned_order_id for row in rows],
+                    'computed_at': [row.computed_at for row in rows],
+                    'notes': [row.notes for row in rows],
+                }
+                for name, kind in feature_kinds.items():
+                    columns[name] = [_coerce_feature(row.features.get(name), kind) for row in rows]
+                writer.write(columns)
+                total_rows += len(rows)
+        finally:
+            writer.close()
+
+        context_logger.log_event(
+            TradingEventType.DATABASE_STATE,
+            f"Exported {total_rows} training rows to {output_path}",
+            context_provider={
+                "output_path": output_path,
+                "rows_written": total_rows,
+                "label_types": label_types,
+                "feature_columns": len(feature_names),
+                "chunk_size": self.chunk_size
+            },
+            decision_reason="TRAINING_DATA_EXPORT_COMPLETED" if total_rows else "TRAINING_DATA_EXPORT_EMPTY"
+        )
+        return total_rows
+
+    def _scan_feature_kinds(self, features_statement) -> Dict[str, str]:
+        """Stream the feature dicts once and settle one kind per key across every row."""
+        kinds: Dict[str, str] = {}
+        for rows in self._iter_chunks(features_statement):
+            for (features,) in rows:
+                for name, value in (features or {}).items():
+                    kinds[name] = _merge_feature_kind(kinds.get(name), _feature_kind(value))
+        return kinds
+
+    @staticmethod
+    def _training_schema(pa, feature_kinds: Dict[str, str]):
+        """Fixed label columns plus one typed column per feature key."""
+        fields = [
+            ('label_type', pa.string()),
+            ('label_value', pa.float64()),
+            ('planned_order_id', pa.int64()),
+            ('computed_at', pa.timestamp('us')),
+            ('notes', pa.string()),
+        ]
+        feature_types = {
+            'bool': pa.bool_(),
+            'number': pa.float64(),
+            'string': pa.string(),
+        }
+        for name, kind in feature_kinds.items():
+            # Keys that are only ever null still get a float column so readers see them
+            fields.append((name, feature_types.get(kind, pa.float64())))
+        return pa.schema(fields)
+    # <Training Data Export - End>
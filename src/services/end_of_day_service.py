@@ -16,6 +16,7 @@ from src.trading.orders.planned_order import PositionStrategy
 # Fix PositionStrategy import - End
 from src.services.market_hours_service import MarketHoursService
 from src.services.state_service import StateService
+from src.trading.orders.order_archive_service import OrderArchiveService
 
 
 @dataclass
@@ -26,6 +27,7 @@ class EODConfig:
     pre_market_start_minutes: int = 30  # Minutes before market open to start program
     post_market_end_minutes: int = 30  # Minutes after market close to stop program
     max_close_attempts: int = 3  # Maximum attempts to close a position
+    archive_old_orders: bool = True  # Run the order archive once per trading day
 
 
 class EndOfDayService:
@@ -44,6 +46,7 @@ class EndOfDayService:
         
         # Track close attempts to prevent infinite loops
         self._close_attempts: Dict[int, int] = {}  # executed_order_id -> attempt_count
+        self._last_archive_date: Optional[datetime.date] = None
         
         self.context_logger.log_event(
             event_type=TradingEventType.SYSTEM_HEALTH,
@@ -170,6 +173,7 @@ class EndOfDayService:
         - Close expired HYBRID positions
         - Expire corresponding PlannedOrders
         - Cancel bracket orders for closed positions
+        - Archive old terminal orders (once per day)
         """
         if not self.should_run_eod_process():
             return {"status": "skipped", "reason": "Not in EOD window"}
@@ -190,6 +194,7 @@ class EndOfDayService:
             "day_positions_closed": 0,
             "hybrid_positions_closed": 0,
             "orders_expired": 0,
+            "rows_archived": 0,
             "errors": []
         }
 
@@ -222,6 +227,10 @@ class EndOfDayService:
             results["orders_expired"] = expire_results["expired"]
             results["errors"].extend(expire_results["errors"])
 
+            # Archive after expiry so today's terminal orders are settled; EOD itself
+            # reads only open positions and live planned orders, which never archive
+            results["rows_archived"] = self._archive_old_orders()
+
             # Log comprehensive EOD results
             self.context_logger.log_event(
                 event_type=TradingEventType.POSITION_MANAGEMENT,
@@ -230,6 +239,7 @@ class EndOfDayService:
                     'day_positions_closed': lambda: results["day_positions_closed"],
                     'hybrid_positions_closed': lambda: results["hybrid_positions_closed"],
                     'orders_expired': lambda: results["orders_expired"],
+                    'rows_archived': lambda: results["rows_archived"],
                     'error_count': lambda: len(results["errors"]),
                     'total_processed_positions': lambda: len(open_positions)
                 },
@@ -514,6 +524,16 @@ class EndOfDayService:
             )
             return {"expired": 0, "errors": [f"Error expiring orders: {str(e)}"]}
 
+    def _archive_old_orders(self) -> int:
+        """Move aged terminal orders and telemetry to archive tables at most once per day."""
+        today = datetime.date.today()
+        if not self.config.archive_old_orders or self._last_archive_date == today:
+            return 0
+
+        moved = OrderArchiveService(self.state_service.db_session).archive()
+        self._last_archive_date = today
+        return sum(moved.values())
+
     # _is_day_order_expired - NEW
     def _is_day_order_expired(self, order: PlannedOrderDB) -> bool:
         """Check if DAY order should expire based on creation time and market hours."""
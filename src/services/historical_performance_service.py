@@ -49,19 +49,21 @@ class HistoricalPerformanceService:
     # Initialize service with order persistence dependency - End
 
     # Get performance metrics for specific trading setup - Begin
-    def get_setup_performance(self, setup_name: str, days_back: int = 90) -> Optional[Dict]:
+    def get_setup_performance(self, setup_name: str, days_back: int = 90,
+                              account_number: Optional[str] = None) -> Optional[Dict]:
         # <Context-Aware Logging Integration - Begin>
         self.context_logger.log_event(
             TradingEventType.SYSTEM_HEALTH,
             f"Getting performance for setup: {setup_name}",
             context_provider={
                 "setup_name": setup_name,
-                "days_back": days_back
+                "days_back": days_back,
+                "account_number": account_number
             }
         )
         # <Context-Aware Logging Integration - End>
         
-        cache_key = f"{setup_name}_{days_back}"
+        cache_key = self._setup_cache_key(setup_name, days_back, account_number)
         if self._is_cache_valid(cache_key):
             # <Context-Aware Logging Integration - Begin>
             self.context_logger.log_event(
@@ -76,9 +78,12 @@ class HistoricalPerformanceService:
             return self._cache[cache_key]['value']
             
         try:
-            trades = self.order_persistence.get_trades_by_setup(setup_name, days_back)
+            rollups = self.order_persistence.get_setup_performance_rollups(
+                days_back=days_back, account_number=account_number, setup_name=setup_name
+            )
+            totals = rollups.get(setup_name)
             
-            if not trades:
+            if not totals or not totals['total_trades']:
                 self._cache[cache_key] = {'value': None, 'expiry': self._get_cache_expiry()}
                 # <Context-Aware Logging Integration - Begin>
                 self.context_logger.log_event(
@@ -94,7 +99,7 @@ class HistoricalPerformanceService:
                 # <Context-Aware Logging Integration - End>
                 return None
             
-            performance = self._calculate_performance_metrics(trades)
+            performance = self._metrics_from_totals(totals, days_back)
             
             self._cache[cache_key] = {
                 'value': performance,
@@ -137,18 +142,20 @@ class HistoricalPerformanceService:
     # Get performance metrics for specific trading setup - End
 
     # Get performance metrics for all trading setups - Begin
-    def get_all_setups_performance(self, days_back: int = 90) -> Dict[str, Dict]:
+    def get_all_setups_performance(self, days_back: int = 90,
+                                   account_number: Optional[str] = None) -> Dict[str, Dict]:
         # <Context-Aware Logging Integration - Begin>
         self.context_logger.log_event(
             TradingEventType.SYSTEM_HEALTH,
             "Getting performance for all trading setups",
             context_provider={
-                "days_back": days_back
+                "days_back": days_back,
+                "account_number": account_number
             }
         )
         # <Context-Aware Logging Integration - End>
         
-        cache_key = f"all_setups_{days_back}"
+        cache_key = self._setup_cache_key("all_setups", days_back, account_number)
         if self._is_cache_valid(cache_key):
             # <Context-Aware Logging Integration - Begin>
             self.context_logger.log_event(
@@ -163,24 +170,32 @@ class HistoricalPerformanceService:
             return self._cache[cache_key]['value']
             
         try:
-            setups = self.order_persistence.get_all_trading_setups(days_back)
+            # One grouped query over the daily rollups covers every setup
+            rollups = self.order_persistence.get_setup_performance_rollups(
+                days_back=days_back, account_number=account_number
+            )
             performance_data = {}
             
             # <Context-Aware Logging Integration - Begin>
             self.context_logger.log_event(
                 TradingEventType.SYSTEM_HEALTH,
-                f"Found {len(setups)} trading setups to analyze",
+                f"Found {len(rollups)} trading setups to analyze",
                 context_provider={
-                    "total_setups_found": len(setups),
-                    "setups_list": setups
+                    "total_setups_found": len(rollups),
+                    "setups_list": list(rollups.keys())
                 }
             )
             # <Context-Aware Logging Integration - End>
             
-            for setup in setups:
-                perf = self.get_setup_performance(setup, days_back)
-                if perf:
-                    performance_data[setup] = perf
+            for setup, totals in rollups.items():
+                if not totals['total_trades']:
+                    continue
+                perf = self._metrics_from_totals(totals, days_back)
+                performance_data[setup] = perf
+                self._cache[self._setup_cache_key(setup, days_back, account_number)] = {
+                    'value': perf,
+                    'expiry': self._get_cache_expiry()
+                }
             
             self._cache[cache_key] = {
                 'value': performance_data,
@@ -221,7 +236,8 @@ class HistoricalPerformanceService:
     # Calculate bias score based on historical performance - Begin
     def get_setup_bias_score(self, setup_name: str, days_back: int = 90, 
                            min_trades: int = 10, min_win_rate: float = 0.4,
-                           min_profit_factor: float = 1.2) -> float:
+                           min_profit_factor: float = 1.2,
+                           account_number: Optional[str] = None) -> float:
         # <Context-Aware Logging Integration - Begin>
         self.context_logger.log_event(
             TradingEventType.RISK_EVALUATION,
@@ -237,7 +253,7 @@ class HistoricalPerformanceService:
         # <Context-Aware Logging Integration - End>
         
         try:
-            performance = self.get_setup_performance(setup_name, days_back)
+            performance = self.get_setup_performance(setup_name, days_back, account_number)
             
             if not performance:
                 # <Context-Aware Logging Integration - Begin>
@@ -498,31 +514,57 @@ class HistoricalPerformanceService:
         winning_trades = [t for t in trades if t.get('pnl', 0) > 0]
         losing_trades = [t for t in trades if t.get('pnl', 0) <= 0]
         
-        total_trades = len(trades)
-        winning_trades_count = len(winning_trades)
-        losing_trades_count = len(losing_trades)
+        holding_periods = []
+        for trade in trades:
+            if trade.get('entry_time') and trade.get('exit_time'):
+                holding_period = (trade['exit_time'] - trade['entry_time']).total_seconds() / 60
+                holding_periods.append(holding_period)
         
-        win_rate = winning_trades_count / total_trades if total_trades > 0 else 0
+        totals = {
+            'total_trades': len(trades),
+            'winning_trades': len(winning_trades),
+            'losing_trades': len(losing_trades),
+            'total_profit': sum(t.get('pnl', 0) for t in winning_trades),
+            'total_loss': abs(sum(t.get('pnl', 0) for t in losing_trades)),
+            'holding_minutes': sum(holding_periods),
+            'holding_count': len(holding_periods)
+        }
+        
+        performance_metrics = self._metrics_from_totals(totals, 90)
+        
+        # <Context-Aware Logging Integration - Begin>
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Performance metrics calculation completed",
+            context_provider=performance_metrics,
+            decision_reason="Performance metrics calculation finished"
+        )
+        # <Context-Aware Logging Integration - End>
+        
+        return performance_metrics
+    # Calculate comprehensive performance metrics - End
+
+    # Derive performance metrics from summed trade counters - Begin
+    def _metrics_from_totals(self, totals: Dict, days_back: int) -> Dict:
+        total_trades = totals['total_trades']
+        winning_trades_count = totals['winning_trades']
+        losing_trades_count = totals['losing_trades']
+        total_profit = totals['total_profit']
+        total_loss = totals['total_loss']
         
-        total_profit = sum(t.get('pnl', 0) for t in winning_trades)
-        total_loss = abs(sum(t.get('pnl', 0) for t in losing_trades))
+        win_rate = winning_trades_count / total_trades if total_trades > 0 else 0
         
         profit_factor = total_profit / total_loss if total_loss > 0 else float('inf')
-        avg_pnl = sum(t.get('pnl', 0) for t in trades) / total_trades if total_trades > 0 else 0
+        avg_pnl = (total_profit - total_loss) / total_trades if total_trades > 0 else 0
         
         avg_win = total_profit / winning_trades_count if winning_trades_count > 0 else 0
         avg_loss = total_loss / losing_trades_count if losing_trades_count > 0 else 0
         risk_reward_ratio = avg_win / avg_loss if avg_loss > 0 else float('inf')
         
-        holding_periods = []
-        for trade in trades:
-            if trade.get('entry_time') and trade.get('exit_time'):
-                holding_period = (trade['exit_time'] - trade['entry_time']).total_seconds() / 60
-                holding_periods.append(holding_period)
-        
-        avg_holding_period = sum(holding_periods) / len(holding_periods) if holding_periods else 0
+        holding_count = totals.get('holding_count', 0)
+        avg_holding_period = totals.get('holding_minutes', 0) / holding_count if holding_count else 0
         
-        performance_metrics = {
+        return {
             'total_trades': total_trades,
             'winning_trades': winning_trades_count,
             'losing_trades': losing_trades_count,
@@ -535,20 +577,15 @@ class HistoricalPerformanceService:
             'avg_loss': round(avg_loss, 2),
             'risk_reward_ratio': round(min(risk_reward_ratio, 10.0), 2),
             'avg_holding_period': round(avg_holding_period, 1),
-            'analysis_period_days': 90
+            'analysis_period_days': days_back
         }
-        
-        # <Context-Aware Logging Integration - Begin>
-        self.context_logger.log_event(
-            TradingEventType.SYSTEM_HEALTH,
-            "Performance metrics calculation completed",
-            context_provider=performance_metrics,
-            decision_reason="Performance metrics calculation finished"
-        )
-        # <Context-Aware Logging Integration - End>
-        
-        return performance_metrics
-    # Calculate comprehensive performance metrics - End
+    # Derive performance metrics from summed trade counters - End
+
+    # Cache key per setup, window and account (None covers all accounts) - Begin
+    @staticmethod
+    def _setup_cache_key(setup_name: str, days_back: int, account_number: Optional[str]) -> str:
+        return f"{setup_name}_{days_back}_{account_number or 'all_accounts'}"
+    # Cache key per setup, window and account (None covers all accounts) - End
 
     # Check if cached value is still valid - Begin
     def _is_cache_valid(self, cache_key: str) -> bool:
@@ -3,25 +3,51 @@ Market Context Service for Phase B - Analyzes market conditions for intelligent
 Provides real-time market regime detection and dominant timeframe analysis for prioritization.
 """
 
+import math
 import pandas as pd
 import numpy as np
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
 # Context-aware logging import - replacing standard logging
 from src.core.context_aware_logger import get_context_logger, TradingEventType
+from src.market_data.managers.historical_data_gateway import get_historical_data_gateway
+from src.market_data.managers.historical_data_manager import HistoricalDataManager
+from src.market_data.managers.historical_request_scheduler import (
+    HistoricalRequestPriority, get_historical_request_scheduler
+)
+from src.market_data.managers.multi_timeframe_bar_service import MultiTimeframeBarService, TIMEFRAMES
+from src.market_data.managers.indicator_state_store import get_indicator_state_store
 
 # Initialize context-aware logger
 context_logger = get_context_logger()
 
+# Timeframe label -> IBKR bar size, for feeds backed by a HistoricalDataManager
+IBKR_BAR_SIZES = {
+    '1min': '1 min',
+    '5min': '5 mins',
+    '15min': '15 mins',
+    '30min': '30 mins',
+    '1H': '1 hour',
+    '4H': '4 hours',
+    '1D': '1 day'
+}
+
 # Market Context Service - Main class definition - Begin
 class MarketContextService:
     """Service for analyzing market context and providing timeframe matching intelligence."""
     
     # Initialize service with data feed and analytics dependencies - Begin
-    def __init__(self, data_feed, analytics_service=None):
+    def __init__(self, data_feed, analytics_service=None, historical_gateway=None, bar_service=None):
         self.data_feed = data_feed
         self.analytics_service = analytics_service
+        # Shared with scanner and order components so the same history is only requested once
+        self.historical_gateway = historical_gateway or get_historical_data_gateway()
+        # Coarser timeframes are resampled from one finest-granularity series per symbol
+        self.bar_service = bar_service or MultiTimeframeBarService(self._fetch_from_data_feed, base_timeframe='15min')
+        # Moving averages carried between calls, updated per new bar instead of re-rolled over the window
+        self.indicator_state = get_indicator_state_store()
         self._cache = {}
         self._cache_expiry = timedelta(minutes=15)
         
@@ -57,6 +83,23 @@ class MarketContextService:
             timeframes = ['15min', '1H', '4H', '1D']
             scores = {}
             
+            # One base request covers all four timeframes; feed errors surface per timeframe below
+            if self._has_historical_source():
+                try:
+                    self.bar_service.prefetch(symbol, timeframes, 20)
+                except Exception as e:
+                    context_logger.log_event(
+                        TradingEventType.SYSTEM_HEALTH,
+                        "Multi-timeframe prefetch failed - timeframes will fetch individually",
+                        symbol=symbol,
+                        context_provider={
+                            "error_type": type(e).__name__,
+                            "error_details": str(e),
+                            "timeframes": timeframes
+                        },
+                        decision_reason="TIME_FRAME_PREFETCH_FAILED"
+                    )
+            
             for timeframe in timeframes:
                 scores[timeframe] = self._analyze_timeframe_strength(symbol, timeframe)
             
@@ -132,7 +175,7 @@ class MarketContextService:
                 return 'ranging'
                 
             volatility = self._calculate_volatility(prices)
-            trend_strength = self._calculate_trend_strength(prices)
+            trend_strength = self._calculate_trend_strength(prices, symbol, '1H')
             adx = self._calculate_adx(prices) if self.analytics_service else 0.5
             
             if trend_strength > 0.7 and adx > 25:
@@ -294,8 +337,8 @@ class MarketContextService:
     # Retrieve historical price data from data feed - Begin
     def _get_historical_prices(self, symbol: str, timeframe: str, bars: int) -> pd.DataFrame:
         try:
-            if hasattr(self.data_feed, 'get_historical_data'):
-                data = self.data_feed.get_historical_data(symbol, timeframe, bars)
+            if self._has_historical_source():
+                data = self.bar_service.get_bars(symbol, timeframe, bars)
                 context_logger.log_event(
                     TradingEventType.MARKET_CONDITION,
                     "Historical data retrieved",
@@ -339,6 +382,38 @@ class MarketContextService:
             return pd.DataFrame()
     # Retrieve historical price data from data feed - End
 
+    # Fetch bars from the data feed through the shared gateway - Begin
+    def _fetch_from_data_feed(self, symbol: str, timeframe: str, bars: int) -> pd.DataFrame:
+        manager = self._broker_history_manager()
+        if manager is not None and timeframe in IBKR_BAR_SIZES:
+            return self._fetch_scheduled(manager, symbol, timeframe, bars)
+        return self.historical_gateway.get(
+            (type(self.data_feed).__name__, symbol, bars, timeframe, 'TRADES'),
+            lambda: self.data_feed.get_historical_data(symbol, timeframe, bars)
+        )
+
+    def _fetch_scheduled(self, manager: HistoricalDataManager, symbol: str, timeframe: str, bars: int) -> pd.DataFrame:
+        # Broker history goes through the process-wide scheduler, ahead of queued scanner batches
+        scheduler = get_historical_request_scheduler(manager)
+        sessions = math.ceil(bars * TIMEFRAMES[timeframe][1] / TIMEFRAMES['1D'][1])
+        days = math.ceil(sessions * 7 / 5) + 2  # Calendar days: weekends plus a holiday
+        future = scheduler.submit(symbol, days, IBKR_BAR_SIZES[timeframe],
+                                  priority=HistoricalRequestPriority.EXECUTION_CRITICAL)
+        try:
+            data = future.result(timeout=scheduler.request_timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+        return data.tail(bars) if data is not None else pd.DataFrame()
+
+    def _broker_history_manager(self) -> Optional[HistoricalDataManager]:
+        manager = getattr(self.data_feed, 'historical_data_manager', None)
+        return manager if isinstance(manager, HistoricalDataManager) else None
+
+    def _has_historical_source(self) -> bool:
+        return hasattr(self.data_feed, 'get_historical_data') or self._broker_history_manager() is not None
+    # Fetch bars from the data feed through the shared gateway - End
+
     # Calculate normalized volatility metric - Begin
     def _calculate_volatility(self, prices: pd.DataFrame) -> float:
         if len(prices) < 2:
@@ -505,7 +580,8 @@ class MarketContextService:
     # Measure trend consistency - End
 
     # Calculate trend strength using moving averages - Begin
-    def _calculate_trend_strength(self, prices: pd.DataFrame) -> float:
+    def _calculate_trend_strength(self, prices: pd.DataFrame, symbol: Optional[str] = None,
+                                  timeframe: Optional[str] = None) -> float:
         if len(prices) < 20:
             context_logger.log_event(
                 TradingEventType.MARKET_CONDITION,
@@ -519,23 +595,22 @@ class MarketContextService:
             return 0.5
             
         try:
-            short_ma = prices['close'].rolling(10).mean()
-            long_ma = prices['close'].rolling(20).mean()
+            short_ma, long_ma = self._moving_averages(prices['close'], symbol, timeframe)
             
-            if pd.isna(short_ma.iloc[-1]) or pd.isna(long_ma.iloc[-1]):
+            if pd.isna(short_ma) or pd.isna(long_ma):
                 context_logger.log_event(
                     TradingEventType.MARKET_CONDITION,
                     "Incomplete moving averages for trend strength",
                     context_provider={
-                        "short_ma_value": short_ma.iloc[-1],
-                        "long_ma_value": long_ma.iloc[-1],
+                        "short_ma_value": short_ma,
+                        "long_ma_value": long_ma,
                         "calculation_result": "incomplete_moving_averages"
                     }
                 )
                 return 0.5
                 
-            price_diff = abs(short_ma.iloc[-1] - long_ma.iloc[-1])
-            trend_strength = price_diff / long_ma.iloc[-1]
+            price_diff = abs(short_ma - long_ma)
+            trend_strength = price_diff / long_ma
             normalized_strength = min(trend_strength * 10, 1.0)
             
             context_logger.log_event(
@@ -567,6 +642,17 @@ class MarketContextService:
             return 0.5
     # Calculate trend strength using moving averages - End
 
+    # Latest 10/20-bar moving averages, incremental when the bars are timestamped - Begin
+    def _moving_averages(self, closes: pd.Series, symbol: Optional[str], timeframe: Optional[str]):
+        if symbol and timeframe and isinstance(closes.index, pd.DatetimeIndex):
+            # The last intraday bar is still forming, so it is never committed to the stored state
+            short_ma = self.indicator_state.update_sma(symbol, timeframe, 10, closes, last_bar_final=False)
+            long_ma = self.indicator_state.update_sma(symbol, timeframe, 20, closes, last_bar_final=False)
+            if short_ma is not None and long_ma is not None:
+                return short_ma, long_ma
+        return closes.rolling(10).mean().iloc[-1], closes.rolling(20).mean().iloc[-1]
+    # Latest 10/20-bar moving averages, incremental when the bars are timestamped - End
+
     # Calculate ADX using analytics service - Begin
     def _calculate_adx(self, prices: pd.DataFrame) -> float:
         if not self.analytics_service or not hasattr(self.analytics_service, 'calculate_adx'):
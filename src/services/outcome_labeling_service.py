@@ -5,8 +5,11 @@ Creates labeled datasets for fill probability and trade outcome models.
 
 import datetime
 from typing import List, Dict, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from src.core.models import OrderLabelDB, ExecutedOrderDB, PlannedOrderDB, ProbabilityScoreDB
+from src.trading.orders.order_archive_service import OrderArchiveService
+from src.services.columnar_export_service import ColumnarExportService, is_columnar_path
 
 # Context-aware logging imports
 from src.core.context_aware_logger import (
@@ -45,6 +48,8 @@ class OutcomeLabelingService:
     def label_completed_orders(self, hours_back: int = 24) -> Dict:
         """
         Label all completed orders from the specified time period.
+        Reads the hot tables only: labels belong next to their order, and orders are archived
+        (archive.order_retention_days) long after the default labeling window has passed.
         
         Args:
             hours_back: Number of hours to look back for completed orders
@@ -462,10 +467,14 @@ class OutcomeLabelingService:
         
         cutoff_time = datetime.datetime.now() - datetime.timedelta(hours=hours_back)
         
-        labels = self.db_session.query(OrderLabelDB).filter(
-            OrderLabelDB.label_type == label_type,
-            OrderLabelDB.computed_at >= cutoff_time
-        ).all()
+        # Labels and scores of archived orders stay available through the <table>_all views
+        archive_service = OrderArchiveService(self.db_session)
+        label_rows = archive_service.union_table(OrderLabelDB)
+        score_rows = archive_service.union_table(ProbabilityScoreDB)
+        labels = self.db_session.execute(select(label_rows).where(
+            label_rows.c.label_type == label_type,
+            label_rows.c.computed_at >= cutoff_time
+        )).all()
         
         # <Context-Aware Logging Integration - Begin>
         self.context_logger.log_event(
@@ -483,9 +492,9 @@ class OutcomeLabelingService:
         
         for label in labels:
             # Get the probability score features for this order
-            probability_score = self.db_session.query(ProbabilityScoreDB).filter_by(
-                planned_order_id=label.planned_order_id
-            ).order_by(ProbabilityScoreDB.timestamp.desc()).first()
+            probability_score = self.db_session.execute(select(score_rows.c.features).where(
+                score_rows.c.planned_order_id == label.planned_order_id
+            ).order_by(score_rows.c.timestamp.desc()).limit(1)).first()
             
             if probability_score and probability_score.features:
                 data_point = {
@@ -515,12 +524,15 @@ class OutcomeLabelingService:
     
     def export_training_data(self, output_path: str, label_types: List[str] = None) -> bool:
         """
-        Export labeled data to CSV for model training.
-        
+        Export labeled data for model training.
+
+        Paths ending in .parquet/.pq or .arrow/.ipc/.feather are streamed in chunks
+        through ColumnarExportService; any other path is written as CSV.
+
         Args:
-            output_path: Path to save the CSV file
+            output_path: Path to save the export file
             label_types: List of label types to export (None for all)
-            
+
         Returns:
             True if successful, False otherwise
         """
@@ -537,8 +549,16 @@ class OutcomeLabelingService:
         # <Context-Aware Logging Integration - End>
         
         try:
+            # <Columnar Export Integration - Begin>
+            if is_columnar_path(output_path):
+                rows_written = ColumnarExportService(self.db_session).export_training_data(
+                    output_path, label_types
+                )
+                return rows_written > 0
+            # <Columnar Export Integration - End>
+
             import csv
-            
+
             if label_types is None:
                 label_types = ['filled_binary', 'time_to_fill', 'slippage', 'profitability']
             
@@ -9,6 +9,8 @@ from datetime import datetime
 from dataclasses import asdict
 import threading
 
+from sqlalchemy.orm import joinedload
+
 from src.core.events import OrderState, OrderEvent
 from src.core.database import get_db_session
 from src.core.models import PlannedOrderDB, ExecutedOrderDB
@@ -279,7 +281,11 @@ class StateService:
 
     def get_open_positions(self, symbol: Optional[str] = None) -> List[ExecutedOrderDB]:
         """Retrieve all open positions from the database, optionally filtered by symbol."""
-        query = self.db_session.query(ExecutedOrderDB).filter_by(is_open=True)
+        # Eager-load planned_order in the same SELECT; callers (EOD, monitoring)
+        # read symbol/strategy/expiration off every position
+        query = self.db_session.query(ExecutedOrderDB).options(
+            joinedload(ExecutedOrderDB.planned_order)
+        ).filter_by(is_open=True)
         if symbol:
             query = query.join(PlannedOrderDB).filter(PlannedOrderDB.symbol == symbol)
         positions = query.all()
@@ -329,39 +335,29 @@ class StateService:
     def close_position(self, executed_order_id: int, close_price: float,
                       close_quantity: float, commission: float = 0.0) -> bool:
         """Close a position, calculate its P&L, and update its status in the database."""
-        # Safe symbol access for logging - Begin
-        def get_position_symbol():
-            try:
-                position = self.db_session.query(ExecutedOrderDB).filter_by(id=executed_order_id).first()
-                if position and position.planned_order:
-                    return position.planned_order.symbol
-                return 'UNKNOWN'
-            except Exception:
-                return 'ERROR'
-        # Safe symbol access for logging - End
-        
-        self.context_logger.log_event(
-            event_type=TradingEventType.POSITION_MANAGEMENT,
-            message="Starting position closure",
-            symbol=get_position_symbol(),
-            context_provider={
-                'executed_order_id': lambda: executed_order_id,
-                'close_price': lambda: close_price,
-                'close_quantity': lambda: close_quantity,
-                'commission': lambda: commission
-            },
-            decision_reason="Begin position close process"
-        )
-            
         with self._lock:
             position = self.db_session.query(ExecutedOrderDB).filter_by(id=executed_order_id).first()
+            # Safe symbol access for logging - Begin
+            # Read off the position loaded for the close rather than a separate lookup query
+            position_symbol = 'UNKNOWN'
+            if position and position.planned_order:
+                position_symbol = position.planned_order.symbol
+            # Safe symbol access for logging - End
+            
+            self.context_logger.log_event(
+                event_type=TradingEventType.POSITION_MANAGEMENT,
+                message="Starting position closure",
+                symbol=position_symbol,
+                context_provider={
+                    'executed_order_id': lambda: executed_order_id,
+                    'close_price': lambda: close_price,
+                    'close_quantity': lambda: close_quantity,
+                    'commission': lambda: commission
+                },
+                decision_reason="Begin position close process"
+            )
+            
             if not position or not position.is_open:
-                # Safe symbol access for logging - Begin
-                position_symbol = 'UNKNOWN'
-                if position and position.planned_order:
-                    position_symbol = position.planned_order.symbol
-                # Safe symbol access for logging - End
-                
                 self.context_logger.log_event(
                     event_type=TradingEventType.POSITION_MANAGEMENT,
                     message="Position not found or already closed",
@@ -375,19 +371,28 @@ class StateService:
                 )
                 return False
 
+            # Capture logging fields before commit expires the loaded instance
+            filled_price = position.filled_price
+
             pnl = (close_price - position.filled_price) * close_quantity - commission - position.commission
             position.pnl = pnl
             position.is_open = False
             position.closed_at = datetime.now()
             position.status = 'CLOSED'
 
+            self._update_setup_performance_rollup(position, position_symbol)
+
             try:
+                # Ledger entry commits atomically with the close so halt checks never see a gap
+                self.persistence_service.append_realized_pnl(
+                    pnl=pnl,
+                    exit_date=position.closed_at,
+                    account_number=position.account_number,
+                    symbol=position_symbol,
+                    executed_order_id=position.id,
+                    source="close_position"
+                )
                 self.db_session.commit()
-                # Safe symbol access for logging - Begin
-                position_symbol = 'UNKNOWN'
-                if position.planned_order:
-                    position_symbol = position.planned_order.symbol
-                # Safe symbol access for logging - End
                 
                 self.context_logger.log_event(
                     event_type=TradingEventType.POSITION_MANAGEMENT,
@@ -397,7 +402,7 @@ class StateService:
                         'executed_order_id': lambda: executed_order_id,
                         'pnl': lambda: round(pnl, 2),
                         'close_price': lambda: close_price,
-                        'filled_price': lambda: position.filled_price,
+                        'filled_price': lambda: filled_price,
                         'quantity': lambda: close_quantity
                     },
                     decision_reason="Position closure completed"
@@ -405,11 +410,6 @@ class StateService:
                 return True
             except Exception as e:
                 self.db_session.rollback()
-                # Safe symbol access for logging - Begin
-                position_symbol = 'UNKNOWN'
-                if position.planned_order:
-                    position_symbol = position.planned_order.symbol
-                # Safe symbol access for logging - End
                 
                 self.context_logger.log_event(
                     event_type=TradingEventType.SYSTEM_HEALTH,
@@ -424,6 +424,24 @@ class StateService:
                 )
                 return False
 
+    def _update_setup_performance_rollup(self, position: ExecutedOrderDB, position_symbol: str) -> None:
+        """Fold a closing position into the daily setup rollup within the close transaction."""
+        try:
+            self.persistence_service.update_setup_performance_rollup(position)
+        except Exception as e:
+            # Rollups are derived data; a failure here must not block the close itself
+            self.context_logger.log_event(
+                event_type=TradingEventType.SYSTEM_HEALTH,
+                message="Setup performance rollup update failed",
+                symbol=position_symbol,
+                context_provider={
+                    'executed_order_id': lambda: position.id,
+                    'error_type': lambda: type(e).__name__,
+                    'error_message': lambda: str(e)
+                },
+                decision_reason="Rollup maintenance failure"
+            )
+
     def retire_planned_order(self, planned_order_id: int, source: str) -> bool:
         """Retire a planned order by setting its state to CANCELLED."""
         self.context_logger.log_event(
@@ -437,6 +437,9 @@ class OrderExecutionService:
                     account_number
                 )
                 
+                # Contracts are resolved when plans load; a symbol still missing is queued for later
+                # orders without holding up this one, which goes out as a bare SMART contract
+                self._ibkr_client.prefetch_contracts([order.symbol])
                 contract = order.to_ib_contract()
                 
                 # Enhanced bracket order call with transmission verification
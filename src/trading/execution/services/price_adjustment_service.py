@@ -5,6 +5,7 @@ Price adjustment and validation service for order execution.
 import math
 from typing import Optional
 from src.core.context_aware_logger import get_context_logger, TradingEventType
+from src.brokers.ibkr.core.contract_cache import get_contract_cache
 
 
 class PriceAdjustmentService:
@@ -39,6 +40,11 @@ class PriceAdjustmentService:
                 else:
                     increment = 0.01    # Regular stocks: $0.01 increments
                 
+                # A coarser minTick from the resolved contract details takes precedence
+                min_tick = get_contract_cache().min_tick(symbol)
+                if min_tick and min_tick > increment:
+                    increment = min_tick
+                
                 # For profit targets, round UP to the next valid increment for better R/R
                 if is_profit_target:
                     # Round UP to the next valid increment
@@ -62,6 +68,7 @@ class PriceAdjustmentService:
                             'rounded_price': rounded_price,
                             'security_type': security_type,
                             'price_increment': increment,
+                            'contract_min_tick': min_tick,
                             'rounding_direction': rounding_direction,
                             'is_profit_target': is_profit_target,
                             'improvement': improvement,
@@ -205,7 +205,7 @@ class TradingInitializer:
         """Initialize advanced feature services if enabled."""
         try:
             self.tm.market_context_service = MarketContextService(self.tm.data_feed)
-            self.tm.historical_performance_service = HistoricalPerformanceService(self.tm.db_session)
+            self.tm.historical_performance_service = HistoricalPerformanceService(self.tm.order_persistence_service)
             
             self.context_logger.log_event(
                 TradingEventType.SYSTEM_HEALTH,
@@ -297,7 +297,8 @@ class TradingInitializer:
                 close_buffer_minutes=eod_config_section.get('close_buffer_minutes', 15),
                 pre_market_start_minutes=eod_config_section.get('pre_market_start_minutes', 30),
                 post_market_end_minutes=eod_config_section.get('post_market_end_minutes', 30),
-                max_close_attempts=eod_config_section.get('max_close_attempts', 3)
+                max_close_attempts=eod_config_section.get('max_close_attempts', 3),
+                archive_old_orders=eod_config_section.get('archive_old_orders', True)
             )
             
             self.tm.end_of_day_service = EndOfDayService(
@@ -190,9 +190,25 @@ class TradingManager:
 
         # Update monitored symbols after loading orders
         self._update_monitored_symbols()
+        self._warm_contract_cache()
         
         return self.planned_orders
 
+    def _warm_contract_cache(self) -> None:
+        """Queue contract details for every planned symbol so order placement never waits on IBKR."""
+        if not self.ibkr_client or not self.ibkr_client.connected or not self.planned_orders:
+            return
+        queued = self.ibkr_client.prefetch_contracts([order.symbol for order in self.planned_orders])
+        self.context_logger.log_event(
+            TradingEventType.SYSTEM_HEALTH,
+            "Contract cache warm-up queued for planned orders",
+            context_provider={
+                'planned_symbols': len({order.symbol for order in self.planned_orders}),
+                'symbols_queued': queued
+            },
+            decision_reason="CONTRACT_CACHE_WARMUP"
+        )
+
     def start_monitoring(self, interval_seconds: Optional[int] = None) -> bool:
         """Start the continuous monitoring loop with automatic initialization."""
         return self.monitor.start_monitoring(interval_seconds)
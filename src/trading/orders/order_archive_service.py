@@ -0,0 +1,256 @@
+"""
+Service for archiving terminal orders and old telemetry out of the hot tables.
+Moves rows into per-month archive tables (<table>_archive_YYYYMM) and maintains
+UNION ALL views (<table>_all) so reporting can still see the full history.
+"""
+
+import datetime
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from sqlalchemy import Column, MetaData, Table, delete, exists, insert, inspect, select, text
+from sqlalchemy.orm import Session
+
+from config.trading_core_config import get_config
+from src.core.database import get_db_session
+from src.core.models import (
+    ExecutedOrderDB, MarketSnapshotDB, OrderAttemptDB, OrderLabelDB, PlannedOrderDB, ProbabilityScoreDB
+)
+from src.core.shared_enums import OrderState as SharedOrderState
+from src.core.context_aware_logger import get_context_logger, TradingEventType
+
+context_logger = get_context_logger()
+
+# Planned orders in these states never change again and can leave the hot table
+ARCHIVABLE_ORDER_STATES = [
+    SharedOrderState.FILLED.value,
+    SharedOrderState.CANCELLED.value,
+    SharedOrderState.EXPIRED.value,
+    SharedOrderState.LIQUIDATED.value,
+    SharedOrderState.LIQUIDATED_EXTERNALLY.value,
+    SharedOrderState.REPLACED.value,
+    SharedOrderState.AON_REJECTED.value,
+]
+
+# Rows that reference planned_orders move together with their parent order,
+# bucketed by their own timestamp column
+ORDER_CHILD_MODELS = {
+    ExecutedOrderDB: 'executed_at',
+    OrderAttemptDB: 'attempt_ts',
+    ProbabilityScoreDB: 'timestamp',
+    OrderLabelDB: 'computed_at',
+}
+
+# Telemetry tables archived purely by age, independent of order state
+TELEMETRY_MODELS = {
+    OrderAttemptDB: 'attempt_ts',
+    ProbabilityScoreDB: 'timestamp',
+    MarketSnapshotDB: 'timestamp',
+}
+
+ARCHIVED_MODELS = (PlannedOrderDB, ExecutedOrderDB, OrderAttemptDB, ProbabilityScoreDB,
+                   OrderLabelDB, MarketSnapshotDB)
+
+
+class OrderArchiveService:
+    """Moves historical rows into per-month archive tables and exposes archive-aware queries."""
+
+    def __init__(self, db_session: Optional[Session] = None, config: Optional[Dict] = None):
+        """Initialize with a database session and the 'archive' configuration section."""
+        self.db_session = db_session or get_db_session()
+        archive_config = (config or get_config()).get('archive', {})
+        self.order_retention_days = archive_config.get('order_retention_days', 30)
+        self.telemetry_retention_days = archive_config.get('telemetry_retention_days', 14)
+        self.batch_size = archive_config.get('batch_size', 1000)
+
+        self._metadata = MetaData()
+        self._archive_tables: Dict[str, Table] = {}
+        self._union_tables: Dict[str, Table] = {}
+
+    # <Archiving - Begin>
+    def archive(self, now: Optional[datetime.datetime] = None) -> Dict[str, int]:
+        """
+        Archive terminal orders and old telemetry, then refresh the union views.
+
+        Args:
+            now: Reference time for the retention windows (defaults to current time)
+
+        Returns:
+            Dictionary of table name -> rows moved to archive tables
+        """
+        now = now or datetime.datetime.now()
+        context_logger.log_event(
+            TradingEventType.DATABASE_STATE,
+            "Starting order archive run",
+            context_provider={
+                "order_retention_days": self.order_retention_days,
+                "telemetry_retention_days": self.telemetry_retention_days,
+                "batch_size": self.batch_size
+            }
+        )
+
+        try:
+            moved: Dict[str, int] = defaultdict(int)
+            order_cutoff = now - datetime.timedelta(days=self.order_retention_days)
+            telemetry_cutoff = now - datetime.timedelta(days=self.telemetry_retention_days)
+
+            for table_name, count in self.archive_terminal_orders(order_cutoff).items():
+                moved[table_name] += count
+            for table_name, count in self.archive_telemetry(telemetry_cutoff).items():
+                moved[table_name] += count
+
+            self.db_session.commit()
+            self.db_session.expire_all()
+            self.refresh_union_views()
+
+            context_logger.log_event(
+                TradingEventType.DATABASE_STATE,
+                "Order archive run completed",
+                context_provider={
+                    "rows_moved": dict(moved),
+                    "total_rows_moved": sum(moved.values())
+                },
+                decision_reason="ARCHIVE_RUN_COMPLETED"
+            )
+            return dict(moved)
+
+        except Exception as e:
+            self.db_session.rollback()
+            context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                f"Order archive run failed: {e}",
+                context_provider={
+                    "error_type": type(e).__name__,
+                    "error_details": str(e),
+                    "operation": "archive"
+                },
+                decision_reason="ARCHIVE_RUN_FAILED"
+            )
+            return {}
+
+    def archive_terminal_orders(self, cutoff: datetime.datetime) -> Dict[str, int]:
+        """Move terminal planned orders last updated before cutoff, with their child rows. Caller commits."""
+        planned = PlannedOrderDB.__table__
+        executed = ExecutedOrderDB.__table__
+        has_open_position = exists().where(
+            executed.c.planned_order_id == planned.c.id,
+            executed.c.is_open == True
+        )
+        candidates = select(planned.c.id).where(
+            planned.c.status.in_(ARCHIVABLE_ORDER_STATES),
+            planned.c.updated_at < cutoff,
+            ~has_open_position
+        ).limit(self.batch_size)
+
+        moved: Dict[str, int] = defaultdict(int)
+        while True:
+            order_ids = list(self.db_session.execute(candidates).scalars())
+            if not order_ids:
+                break
+            for model, month_column in ORDER_CHILD_MODELS.items():
+                table = model.__table__
+                moved[table.name] += self._move_rows(
+                    table, table.c.planned_order_id.in_(order_ids), month_column
+                )
+            moved[planned.name] += self._move_rows(planned, planned.c.id.in_(order_ids), 'created_at')
+        return dict(moved)
+
+    def archive_telemetry(self, cutoff: datetime.datetime) -> Dict[str, int]:
+        """Move telemetry rows recorded before cutoff. Caller commits."""
+        moved: Dict[str, int] = {}
+        for model, month_column in TELEMETRY_MODELS.items():
+            table = model.__table__
+            moved[table.name] = self._move_rows(table, table.c[month_column] < cutoff, month_column)
+        return moved
+
+    def _move_rows(self, table: Table, criterion, month_column: str) -> int:
+        """Copy matching rows into their month's archive table and delete them from the hot table."""
+        moved = 0
+        while True:
+            rows = self.db_session.execute(
+                select(table).where(criterion).order_by(table.c.id).limit(self.batch_size)
+            ).mappings().all()
+            if not rows:
+                return moved
+
+            by_month: Dict[str, List[Dict]] = defaultdict(list)
+            for row in rows:
+                by_month[self._month_key(row[month_column])].append(dict(row))
+            for month, month_rows in by_month.items():
+                self.db_session.execute(insert(self._get_archive_table(table, month)), month_rows)
+
+            self.db_session.execute(
+                delete(table).where(table.c.id.in_([row['id'] for row in rows]))
+            )
+            moved += len(rows)
+
+    @staticmethod
+    def _month_key(timestamp: Optional[datetime.datetime]) -> str:
+        """Archive partition for a row; rows without a timestamp land in the current month."""
+        return (timestamp or datetime.datetime.now()).strftime('%Y%m')
+
+    def _get_archive_table(self, table: Table, month: str) -> Table:
+        """Get (creating if needed) the archive table for a hot table and YYYYMM month."""
+        name = f"{table.name}_archive_{month}"
+        if name not in self._archive_tables:
+            archive_table = Table(
+                name, self._metadata,
+                *[Column(column.name, column.type.copy(), primary_key=column.primary_key) for column in table.columns]
+            )
+            archive_table.create(bind=self.db_session.connection(), checkfirst=True)
+            self._archive_tables[name] = archive_table
+        return self._archive_tables[name]
+    # <Archiving - End>
+
+    # <Archive-Aware Queries - Begin>
+    def list_archive_tables(self, model) -> List[str]:
+        """Names of all existing month archive tables for a model, oldest first."""
+        return _archive_table_names(inspect(self.db_session.connection()), model)
+
+    def refresh_union_views(self) -> None:
+        """(Re)create <table>_all views spanning the hot table and every archive month."""
+        refresh_union_views(self.db_session.connection())
+        self.db_session.commit()
+
+    def union_table(self, model) -> Table:
+        """
+        Table object for a model's <table>_all view, usable in select() like the model's own table.
+        The views are created with the schema (see src.core.database) and refreshed after each archive run.
+        """
+        view_name = f"{model.__table__.name}_all"
+        if view_name not in self._union_tables:
+            self._union_tables[view_name] = Table(
+                view_name, self._metadata,
+                *[Column(column.name, column.type.copy()) for column in model.__table__.columns]
+            )
+        return self._union_tables[view_name]
+
+    def select_all(self, model, *criteria):
+        """Select rows of a model across hot and archived data, e.g. select_all(PlannedOrderDB, ...)."""
+        return select(self.union_table(model)).where(*criteria)
+    # <Archive-Aware Queries - End>
+
+
+# <Union Views - Begin>
+def _archive_table_names(inspector, model) -> List[str]:
+    prefix = f"{model.__table__.name}_archive_"
+    return sorted(name for name in inspector.get_table_names() if name.startswith(prefix))
+
+
+def refresh_union_views(connection) -> None:
+    """(Re)create the <table>_all view of every archived model on a connection; the caller commits."""
+    inspector = inspect(connection)
+    for model in ARCHIVED_MODELS:
+        table = model.__table__
+        column_names = [column.name for column in table.columns]
+        selects = [f"SELECT {', '.join(column_names)} FROM {table.name}"]
+        for archive_name in _archive_table_names(inspector, model):
+            archive_columns = {column['name'] for column in inspector.get_columns(archive_name)}
+            # Archives created before a column was added expose it as NULL
+            projected = [name if name in archive_columns else f"NULL AS {name}" for name in column_names]
+            selects.append(f"SELECT {', '.join(projected)} FROM {archive_name}")
+
+        view_name = f"{table.name}_all"
+        connection.execute(text(f"DROP VIEW IF EXISTS {view_name}"))
+        connection.execute(text(f"CREATE VIEW {view_name} AS " + " UNION ALL ".join(selects)))
+# <Union Views - End>
@@ -6,12 +6,14 @@ Provides comprehensive order management with database integration.
 
 import datetime
 from typing import List, Optional, Dict, Tuple
+import pandas as pd
 from sqlalchemy.orm import Session
 from src.trading.orders.planned_order import PlannedOrder
 from src.core.models import PlannedOrderDB
 from src.core.events import OrderState
 from src.trading.orders.order_loading_service import OrderLoadingService
 from src.trading.orders.order_persistence_service import OrderPersistenceService
+from src.trading.orders.order_archive_service import OrderArchiveService
 from src.services.state_service import StateService
 
 # <Order Loading Orchestrator Integration - Begin>
@@ -21,6 +23,10 @@ from src.trading.orders.order_loading_orchestrator import OrderLoadingOrchestrat
 # <AON Configuration Integration - Begin>
 from config.trading_core_config import get_config
 from src.core.shared_enums import OrderState as SharedOrderState
+from src.market_data.managers.historical_data_gateway import get_historical_data_gateway
+from src.market_data.managers.historical_request_scheduler import (
+    HistoricalRequestPriority, get_historical_request_scheduler
+)
 # <AON Configuration Integration - End>
 
 # Context-aware logging import - Begin
@@ -676,9 +682,12 @@ class OrderLifecycleManager:
                 
     def _get_daily_volume(self, symbol: str) -> Optional[float]:
         """
-        Get daily volume for a symbol. Placeholder implementation.
+        Get daily volume for a symbol.
         
-        In practice, this would fetch from IBKR data feed or cache.
+        Uses daily bars already fetched by another component (via the shared historical
+        data gateway) when available; otherwise requests them through the process-wide
+        scheduler as execution-critical, ahead of queued scanner work. Falls back to
+        placeholder volumes when no bars can be fetched.
         
         Args:
             symbol: Trading symbol
@@ -686,6 +695,14 @@ class OrderLifecycleManager:
         Returns:
             Daily volume in shares, or None if unavailable
         """
+        daily_bars = get_historical_data_gateway().latest(symbol, "1 day")
+        if daily_bars is None:
+            daily_bars = self._fetch_daily_bars(symbol)
+        if daily_bars is not None and 'volume' in getattr(daily_bars, 'columns', []):
+            recent_volume = daily_bars['volume'].tail(20)
+            if not recent_volume.empty:
+                return float(recent_volume.mean())
+        
         mock_volumes = {
             'SPY': 50000000,
             'QQQ': 30000000,
@@ -696,6 +713,27 @@ class OrderLifecycleManager:
         
         volume = mock_volumes.get(symbol, 10000000)
         return volume
+
+    def _fetch_daily_bars(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Request the last month of daily bars on the live path; None if the broker cannot supply them."""
+        scheduler = get_historical_request_scheduler()
+        future = scheduler.submit(symbol, days=30, bar_size="1 day",
+                                  priority=HistoricalRequestPriority.EXECUTION_CRITICAL)
+        try:
+            return future.result(timeout=scheduler.request_timeout)
+        except Exception as e:
+            future.cancel()
+            self.context_logger.log_event(
+                event_type=TradingEventType.SYSTEM_HEALTH,
+                message="Daily bars for AON volume unavailable",
+                symbol=symbol,
+                context_provider={
+                    'error_type': lambda: type(e).__name__,
+                    'error_message': lambda: str(e)
+                },
+                decision_reason="AON volume history request failed"
+            )
+            return None
     # <AON Validation Methods - End>
         
     def find_existing_order(self, order: PlannedOrder) -> Optional[PlannedOrderDB]:
@@ -903,7 +941,21 @@ class OrderLifecycleManager:
                 decision_reason="Order cleanup exception"
             )
             return 0
-            
+
+    # <Order Archiving - Begin>
+    def archive_old_orders(self, days_old: Optional[int] = None) -> Dict[str, int]:
+        """
+        Move terminal orders and old telemetry into per-month archive tables.
+        Unlike cleanup_old_orders, rows stay queryable through the <table>_all views.
+        """
+        archive_config = dict(self.config.get('archive', {}))
+        if days_old is not None:
+            archive_config['order_retention_days'] = days_old
+
+        archiver = OrderArchiveService(self.db_session, {'archive': archive_config})
+        return archiver.archive()
+    # <Order Archiving - End>
+
     def get_order_statistics(self) -> Dict[str, any]:
         """Get statistics about orders in the system."""
         self.context_logger.log_event(
@@ -6,12 +6,14 @@ Provides comprehensive order loading capabilities for production trading systems
 
 import datetime
 from typing import List, Optional, Dict, Any
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.trading.orders.planned_order import PlannedOrder
 from src.core.models import PlannedOrderDB
 from src.trading.orders.order_loading_service import OrderLoadingService
 from src.trading.orders.order_persistence_service import OrderPersistenceService
+from src.trading.orders.order_archive_service import OrderArchiveService
 from src.services.state_service import StateService
 
 # <IBKR Integration - Begin>
@@ -72,6 +74,7 @@ class OrderLoadingOrchestrator:
         self.persistence_service = persistence_service
         self.state_service = state_service
         self.db_session = db_session
+        self._archive_service: Optional[OrderArchiveService] = None
         # <IBKR Integration - Begin>
         self.ibkr_client = ibkr_client
         # <IBKR Integration - End>
@@ -959,11 +962,16 @@ class OrderLoadingOrchestrator:
             )
             return False
             
-        # Check if order is already in our database to avoid duplicates
-        existing_db_order = self.db_session.query(PlannedOrderDB).filter_by(
-            symbol=planned_order.symbol,
-            action=planned_order.action.value,
-            entry_price=planned_order.entry_price
+        # Check if order is already in our database to avoid duplicates, archived orders included
+        if self._archive_service is None:
+            self._archive_service = OrderArchiveService(self.db_session)
+        orders = self._archive_service.union_table(PlannedOrderDB)
+        existing_db_order = self.db_session.execute(
+            select(orders).where(
+                orders.c.symbol == planned_order.symbol,
+                orders.c.action == planned_order.action.value,
+                orders.c.entry_price == planned_order.entry_price
+            ).limit(1)
         ).first()
         
         if existing_db_order:
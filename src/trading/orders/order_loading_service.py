@@ -5,7 +5,9 @@ Handles parsing, validation, duplicate detection (in-file and in-database), and
 
 import datetime
 from typing import Any, Dict, Optional
+from sqlalchemy import select
 from src.core.models import PlannedOrderDB
+from src.trading.orders.order_archive_service import OrderArchiveService
 from src.trading.orders.planned_order import PlannedOrderManager
 from src.core.shared_enums import OrderState as SharedOrderState
 
@@ -35,6 +37,7 @@ class OrderLoadingService:
         self._trading_manager = trading_manager
         self._db_session = db_session
         self.config = config or {}  # <-- STORE CONFIGURATION
+        self._archive_service: Optional[OrderArchiveService] = None
         
         context_logger.log_event(
             TradingEventType.SYSTEM_HEALTH,
@@ -46,11 +49,13 @@ class OrderLoadingService:
         )
 
     # _find_existing_planned_order - Begin (UPDATED)
-    def _find_existing_planned_order(self, order) -> Optional[PlannedOrderDB]:
+    def _find_existing_planned_order(self, order):
         """Check if an ACTIVE order with identical parameters exists in the database.
         
         UPDATED: Only returns orders with active statuses (PENDING, LIVE, LIVE_WORKING, FILLED).
         Returns None for terminal status orders (CANCELLED, FAILED, EXPIRED) to allow re-execution.
+        Filled orders the end-of-day job has archived still count, so the check reads the
+        planned_orders_all view; the match is a row with the PlannedOrderDB columns.
         """
         context_logger.log_event(
             TradingEventType.DATABASE_STATE,
@@ -70,18 +75,20 @@ class OrderLoadingService:
         try:
             # UPDATED: Only consider orders with ACTIVE statuses as duplicates
             # Terminal status orders (CANCELLED/FAILED) can be re-executed
-            existing_order = self._db_session.query(PlannedOrderDB).filter_by(
-                symbol=order.symbol,
-                entry_price=order.entry_price,
-                stop_loss=order.stop_loss,
-                action=order.action.value
-            ).filter(
-                PlannedOrderDB.status.in_([
-                    SharedOrderState.PENDING.value,
-                    SharedOrderState.LIVE.value, 
-                    SharedOrderState.LIVE_WORKING.value,
-                    SharedOrderState.FILLED.value
-                ])
+            orders = self._all_planned_orders()
+            existing_order = self._db_session.execute(
+                select(orders).where(
+                    orders.c.symbol == order.symbol,
+                    orders.c.entry_price == order.entry_price,
+                    orders.c.stop_loss == order.stop_loss,
+                    orders.c.action == order.action.value,
+                    orders.c.status.in_([
+                        SharedOrderState.PENDING.value,
+                        SharedOrderState.LIVE.value,
+                        SharedOrderState.LIVE_WORKING.value,
+                        SharedOrderState.FILLED.value
+                    ])
+                ).limit(1)
             ).first()
             
             context_logger.log_event(
@@ -113,6 +120,12 @@ class OrderLoadingService:
                 decision_reason="ACTIVE_DUPLICATE_CHECK_FAILED"
             )
             return None
+
+    def _all_planned_orders(self):
+        """The planned_orders_all view: hot planned orders plus those moved to the archive tables."""
+        if self._archive_service is None:
+            self._archive_service = OrderArchiveService(self._db_session)
+        return self._archive_service.union_table(PlannedOrderDB)
     # _find_existing_planned_order - End
 
     # load_and_validate_orders - Begin (UPDATED - terminal status handling)
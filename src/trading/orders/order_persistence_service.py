@@ -8,13 +8,17 @@ from decimal import Decimal
 import datetime
 import threading
 from typing import Optional, Tuple, List, Dict
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy import func, case, select
+from sqlalchemy.orm import Session, joinedload
 
 from src.core.events import OrderState
 from src.core.database import get_db_session
-from src.core.models import ExecutedOrderDB, PlannedOrderDB, PositionStrategy
+from src.core.models import (
+    ExecutedOrderDB, PlannedOrderDB, PositionStrategy, TradingSetup, SetupPerformanceDailyDB,
+    RealizedPnlLedgerDB, RealizedPnlDailyDB
+)
 from src.core.shared_enums import OrderState as SharedOrderState
+from src.trading.orders.order_archive_service import OrderArchiveService
 from src.trading.orders.planned_order import PlannedOrder, Action, OrderType, SecurityType, PositionStrategy as PositionStrategyEnum
 
 # Context-aware logging import - replacing simple_logger
@@ -39,6 +43,7 @@ class OrderPersistenceService:
         )
             
         self.db_session = db_session or get_db_session()
+        self._archive_service: Optional[OrderArchiveService] = None
         
         context_logger.log_event(
             TradingEventType.SYSTEM_HEALTH,
@@ -294,48 +299,94 @@ class OrderPersistenceService:
             )
             return None
 
-    def get_realized_pnl_period(self, account_number: str, days: int) -> Decimal:
-        """Get realized P&L for specific account for the last N calendar days."""
-        context_logger.log_event(
-            TradingEventType.RISK_EVALUATION,
-            f"Querying realized P&L for account",
-            context_provider={
-                "account_number": account_number,
-                "days_period": days,
-                "start_date": (datetime.datetime.now() - datetime.timedelta(days=days)).isoformat()
-            }
-        )
-            
-        start_date = datetime.datetime.now() - datetime.timedelta(days=days)
-        
-        result = self.db_session.execute(
-            text("""
-                SELECT COALESCE(SUM(realized_pnl), 0) 
-                FROM executed_orders 
-                WHERE exit_time >= :start_date AND account_number = :account_number
-            """),
-            {'start_date': start_date, 'account_number': account_number}
-        ).scalar()
-        
-        pnl = Decimal(str(result or '0'))
+    def get_realized_pnl_period(self, account_number: Optional[str] = None, days: int = 1) -> Decimal:
+        """Get realized P&L for the last N calendar days (today counts as day 1) from the daily ledger sums."""
+        return self.get_realized_pnl_windows(account_number, (days,))[days]
+
+    def get_realized_pnl_windows(self, account_number: Optional[str] = None,
+                                 windows: Tuple[int, ...] = (1, 7, 30)) -> Dict[int, Decimal]:
+        """
+        Get realized P&L for several look-back windows with one query over realized_pnl_daily.
+        Reads at most max(windows) pre-summed rows, so cost does not grow with trade history.
         
+        Args:
+            account_number: Account to filter by (all accounts when None)
+            windows: Look-back windows in calendar days
+            
+        Returns:
+            Dictionary mapping each window to its realized P&L
+        """
+        today = datetime.date.today()
+        columns = [
+            func.coalesce(func.sum(case(
+                (RealizedPnlDailyDB.trade_date > today - datetime.timedelta(days=days),
+                 RealizedPnlDailyDB.realized_pnl),
+                else_=0.0
+            )), 0.0)
+            for days in windows
+        ]
+        query = self.db_session.query(*columns).filter(
+            RealizedPnlDailyDB.trade_date > today - datetime.timedelta(days=max(windows))
+        )
+        if account_number is not None:
+            query = query.filter(RealizedPnlDailyDB.account_number == account_number)
+
+        row = query.one()
+        pnl_by_window = {days: Decimal(str(value or 0)) for days, value in zip(windows, row)}
+
         context_logger.log_event(
             TradingEventType.RISK_EVALUATION,
             f"Realized P&L query completed",
             context_provider={
                 "account_number": account_number,
-                "realized_pnl": float(pnl),
-                "days_period": days,
+                "realized_pnl": {days: float(pnl) for days, pnl in pnl_by_window.items()},
                 "query_execution_time": datetime.datetime.now().isoformat()
             },
             decision_reason="PNL_QUERY_COMPLETED"
         )
             
-        return pnl
+        return pnl_by_window
+
+    def append_realized_pnl(self, pnl: float, exit_date: datetime.datetime,
+                            account_number: Optional[str] = None, symbol: Optional[str] = None,
+                            executed_order_id: Optional[int] = None, order_id: Optional[int] = None,
+                            source: str = "") -> RealizedPnlLedgerDB:
+        """
+        Append a ledger entry and add it to that day's running sum.
+        Runs inside the caller's transaction; the caller commits.
+        """
+        trade_date = exit_date.date()
+        entry = RealizedPnlLedgerDB(
+            account_number=account_number,
+            executed_order_id=executed_order_id,
+            order_id=order_id,
+            symbol=symbol,
+            pnl=float(pnl),
+            realized_at=exit_date,
+            trade_date=trade_date,
+            source=source
+        )
+        self.db_session.add(entry)
+
+        daily = self.db_session.query(RealizedPnlDailyDB).filter_by(
+            account_number=account_number,
+            trade_date=trade_date
+        ).first()
+        if daily is None:
+            daily = RealizedPnlDailyDB(
+                account_number=account_number,
+                trade_date=trade_date,
+                realized_pnl=0.0,
+                trade_count=0
+            )
+            self.db_session.add(daily)
+        daily.realized_pnl += float(pnl)
+        daily.trade_count += 1
+        return entry
 
     def record_realized_pnl(self, order_id: int, symbol: str, pnl: Decimal, 
-                          exit_date: datetime, account_number: str):
-        """Record realized P&L for a closed trade with account context."""
+                          exit_date: datetime, account_number: Optional[str] = None):
+        """Record realized P&L for a trade closed outside StateService.close_position with account context."""
         context_logger.log_event(
             TradingEventType.RISK_EVALUATION,
             f"Recording realized P&L for trade",
@@ -350,18 +401,13 @@ class OrderPersistenceService:
         )
             
         try:
-            self.db_session.execute(
-                text("""
-                    INSERT INTO executed_orders (order_id, symbol, realized_pnl, exit_time, account_number)
-                    VALUES (:order_id, :symbol, :pnl, :exit_time, :account_number)
-                """),
-                {
-                    'order_id': order_id,
-                    'symbol': symbol,
-                    'pnl': float(pnl),
-                    'exit_time': exit_date,
-                    'account_number': account_number
-                }
+            self.append_realized_pnl(
+                pnl=pnl,
+                exit_date=exit_date,
+                account_number=account_number,
+                symbol=symbol,
+                order_id=order_id,
+                source="record_realized_pnl"
             )
             self.db_session.commit()
             context_logger.log_event(
@@ -376,6 +422,7 @@ class OrderPersistenceService:
                 decision_reason="PNL_RECORDED"
             )
         except Exception as e:
+            self.db_session.rollback()
             context_logger.log_event(
                 TradingEventType.SYSTEM_HEALTH,
                 f"Failed to record P&L: {e}",
@@ -893,60 +940,69 @@ class OrderPersistenceService:
         try:
             cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days_back)
             
-            # Join PlannedOrderDB with ExecutedOrderDB to get setup information
-            query = self.db_session.query(
-                ExecutedOrderDB,
-                PlannedOrderDB.trading_setup,
-                PlannedOrderDB.timeframe,
-                PlannedOrderDB.risk_reward_ratio
+            # Select only the planned-order columns the trade dict needs; the <table>_all
+            # views include orders already moved to the monthly archive tables
+            executed, planned = self._all_rows(ExecutedOrderDB), self._all_rows(PlannedOrderDB)
+            query = select(
+                executed.c.id,
+                executed.c.filled_price,
+                executed.c.filled_quantity,
+                executed.c.pnl,
+                executed.c.commission,
+                executed.c.executed_at,
+                executed.c.account_number,
+                planned.c.symbol,
+                planned.c.entry_price,
+                planned.c.action,
+                planned.c.created_at,
+                planned.c.core_timeframe,
+                planned.c.risk_reward_ratio,
+                TradingSetup.name
             ).join(
-                PlannedOrderDB, ExecutedOrderDB.planned_order_id == PlannedOrderDB.id
-            ).filter(
-                PlannedOrderDB.trading_setup == setup_name,
-                ExecutedOrderDB.executed_at >= cutoff_date,
-                ExecutedOrderDB.status == 'FILLED',
-                ExecutedOrderDB.filled_price.isnot(None),
-                ExecutedOrderDB.filled_quantity.isnot(None),
-                ExecutedOrderDB.account_number == account_number  # Account-specific filter
+                planned, executed.c.planned_order_id == planned.c.id
+            ).join(
+                TradingSetup, planned.c.setup_id == TradingSetup.id
+            ).where(
+                TradingSetup.name == setup_name,
+                executed.c.executed_at >= cutoff_date,
+                executed.c.status == 'FILLED',
+                executed.c.filled_price.isnot(None),
+                executed.c.filled_quantity.isnot(None),
+                executed.c.account_number == account_number  # Account-specific filter
             )
             
-            results = query.all()
+            results = self.db_session.execute(query).all()
             
             trades = []
-            for executed_order, trading_setup, timeframe, risk_reward_ratio in results:
+            for row in results:
                 # Calculate PnL if not already stored
-                pnl = executed_order.pnl
-                if pnl is None and executed_order.filled_price and executed_order.filled_quantity:
+                pnl = row.pnl
+                if pnl is None and row.filled_price and row.filled_quantity:
                     # Simple PnL calculation (can be enhanced based on your actual logic)
-                    pnl = executed_order.filled_quantity * (executed_order.filled_price - 
-                                                          executed_order.planned_order.entry_price)
+                    pnl = row.filled_quantity * (row.filled_price - row.entry_price)
                 
                 trade_data = {
-                    'order_id': executed_order.id,
-                    'symbol': executed_order.planned_order.symbol,
-                    'entry_price': executed_order.planned_order.entry_price,
-                    'exit_price': executed_order.filled_price,
-                    'quantity': executed_order.filled_quantity,
+                    'order_id': row.id,
+                    'symbol': row.symbol,
+                    'entry_price': row.entry_price,
+                    'exit_price': row.filled_price,
+                    'quantity': row.filled_quantity,
                     'pnl': pnl,
-                    'commission': executed_order.commission or 0.0,
-                    'entry_time': executed_order.planned_order.created_at,
-                    'exit_time': executed_order.executed_at,
-                    'trading_setup': trading_setup,
-                    'timeframe': timeframe,
-                    'risk_reward_ratio': risk_reward_ratio,
-                    'account_number': executed_order.account_number  # Include account info
+                    'commission': row.commission or 0.0,
+                    'entry_time': row.created_at,
+                    'exit_time': row.executed_at,
+                    'trading_setup': row.name,
+                    'timeframe': row.core_timeframe,
+                    'risk_reward_ratio': row.risk_reward_ratio,
+                    'account_number': row.account_number  # Include account info
                 }
                 
                 # Calculate PnL percentage if possible
-                if (executed_order.planned_order.entry_price and 
-                    executed_order.filled_price and 
-                    executed_order.planned_order.entry_price > 0):
-                    if executed_order.planned_order.action.value == 'BUY':
-                        pnl_percentage = ((executed_order.filled_price - executed_order.planned_order.entry_price) / 
-                                        executed_order.planned_order.entry_price) * 100
+                if row.entry_price and row.filled_price and row.entry_price > 0:
+                    if row.action == 'BUY':
+                        pnl_percentage = ((row.filled_price - row.entry_price) / row.entry_price) * 100
                     else:  # SELL
-                        pnl_percentage = ((executed_order.planned_order.entry_price - executed_order.filled_price) / 
-                                        executed_order.planned_order.entry_price) * 100
+                        pnl_percentage = ((row.entry_price - row.filled_price) / row.entry_price) * 100
                     trade_data['pnl_percentage'] = pnl_percentage
                 
                 trades.append(trade_data)
@@ -1003,19 +1059,21 @@ class OrderPersistenceService:
         try:
             cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days_back)
             
-            query = self.db_session.query(
-                PlannedOrderDB.trading_setup
+            executed, planned = self._all_rows(ExecutedOrderDB), self._all_rows(PlannedOrderDB)
+            query = select(
+                TradingSetup.name
             ).join(
-                ExecutedOrderDB, PlannedOrderDB.id == ExecutedOrderDB.planned_order_id
-            ).filter(
-                ExecutedOrderDB.executed_at >= cutoff_date,
-                ExecutedOrderDB.status == 'FILLED',
-                ExecutedOrderDB.account_number == account_number,  # Account-specific filter
-                PlannedOrderDB.trading_setup.isnot(None),
-                PlannedOrderDB.trading_setup != ''
+                planned, planned.c.setup_id == TradingSetup.id
+            ).join(
+                executed, planned.c.id == executed.c.planned_order_id
+            ).where(
+                executed.c.executed_at >= cutoff_date,
+                executed.c.status == 'FILLED',
+                executed.c.account_number == account_number,  # Account-specific filter
+                TradingSetup.name != ''
             ).distinct()
             
-            results = query.all()
+            results = self.db_session.execute(query).all()
             setups = [result[0] for result in results if result[0]]
             
             context_logger.log_event(
@@ -1101,6 +1159,224 @@ class OrderPersistenceService:
                 decision_reason="SETUP_PERFORMANCE_SUMMARY_FAILED"
             )
             return {}
+
+    # <Setup Performance Rollups - Begin>
+    def update_setup_performance_rollup(self, executed_order: ExecutedOrderDB) -> bool:
+        """
+        Fold one closed executed order into its setup_performance_daily row.
+        Runs inside the caller's transaction; the caller commits.
+        
+        Args:
+            executed_order: Closed ExecutedOrderDB with pnl and closed_at set
+            
+        Returns:
+            True if a rollup row was updated, False if the order has no trading setup
+        """
+        planned_order = executed_order.planned_order
+        if not planned_order or not planned_order.trading_setup:
+            return False
+
+        self._fold_into_setup_rollup(
+            setup_name=planned_order.trading_setup.name,
+            account_number=executed_order.account_number,
+            symbol=planned_order.symbol,
+            pnl=executed_order.pnl,
+            closed_at=executed_order.closed_at,
+            created_at=planned_order.created_at,
+            executed_at=executed_order.executed_at
+        )
+        return True
+
+    def _fold_into_setup_rollup(self, setup_name: str, account_number: Optional[str], symbol: str,
+                                pnl: Optional[float], closed_at: Optional[datetime.datetime],
+                                created_at: Optional[datetime.datetime],
+                                executed_at: Optional[datetime.datetime]) -> None:
+        """Add one closed trade to its (setup, account, close date) rollup row."""
+        closed_at = closed_at or datetime.datetime.now()
+        trade_date = closed_at.date()
+
+        rollup = self.db_session.query(SetupPerformanceDailyDB).filter_by(
+            setup_name=setup_name,
+            account_number=account_number,
+            trade_date=trade_date
+        ).first()
+        if rollup is None:
+            rollup = SetupPerformanceDailyDB(
+                setup_name=setup_name,
+                account_number=account_number,
+                trade_date=trade_date,
+                trade_count=0, winning_trades=0, losing_trades=0,
+                total_profit=0.0, total_loss=0.0,
+                holding_minutes=0.0, holding_count=0
+            )
+            self.db_session.add(rollup)
+
+        pnl = pnl or 0.0
+        rollup.trade_count += 1
+        if pnl > 0:
+            rollup.winning_trades += 1
+            rollup.total_profit += pnl
+        else:
+            rollup.losing_trades += 1
+            rollup.total_loss += abs(pnl)
+
+        # Holding period as the per-trade metrics define it: planned order created -> filled
+        if created_at and executed_at:
+            rollup.holding_minutes += (executed_at - created_at).total_seconds() / 60
+            rollup.holding_count += 1
+
+        context_logger.log_event(
+            TradingEventType.DATABASE_STATE,
+            f"Setup performance rollup updated",
+            symbol=symbol,
+            context_provider={
+                "setup_name": setup_name,
+                "account_number": account_number,
+                "trade_date": trade_date.isoformat(),
+                "pnl": pnl,
+                "day_trade_count": rollup.trade_count
+            },
+            decision_reason="SETUP_ROLLUP_UPDATED"
+        )
+
+    def get_setup_performance_rollups(self, days_back: int = 90, account_number: Optional[str] = None,
+                                      setup_name: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Sum setup_performance_daily rows over a window with one grouped query.
+        
+        Args:
+            days_back: Number of calendar days to include (today counts as day 1)
+            account_number: Optional account filter (all accounts when None)
+            setup_name: Optional single-setup filter
+            
+        Returns:
+            Dictionary with setup names as keys and summed counters as values
+        """
+        try:
+            cutoff_date = datetime.date.today() - datetime.timedelta(days=days_back)
+
+            query = self.db_session.query(
+                SetupPerformanceDailyDB.setup_name,
+                func.sum(SetupPerformanceDailyDB.trade_count),
+                func.sum(SetupPerformanceDailyDB.winning_trades),
+                func.sum(SetupPerformanceDailyDB.losing_trades),
+                func.sum(SetupPerformanceDailyDB.total_profit),
+                func.sum(SetupPerformanceDailyDB.total_loss),
+                func.sum(SetupPerformanceDailyDB.holding_minutes),
+                func.sum(SetupPerformanceDailyDB.holding_count)
+            ).filter(
+                SetupPerformanceDailyDB.trade_date > cutoff_date
+            )
+            if account_number is not None:
+                query = query.filter(SetupPerformanceDailyDB.account_number == account_number)
+            if setup_name is not None:
+                query = query.filter(SetupPerformanceDailyDB.setup_name == setup_name)
+
+            rollups = {}
+            for (name, trade_count, winning, losing, profit, loss,
+                 holding_minutes, holding_count) in query.group_by(SetupPerformanceDailyDB.setup_name).all():
+                rollups[name] = {
+                    'total_trades': int(trade_count or 0),
+                    'winning_trades': int(winning or 0),
+                    'losing_trades': int(losing or 0),
+                    'total_profit': float(profit or 0.0),
+                    'total_loss': float(loss or 0.0),
+                    'holding_minutes': float(holding_minutes or 0.0),
+                    'holding_count': int(holding_count or 0)
+                }
+
+            context_logger.log_event(
+                TradingEventType.DATABASE_STATE,
+                f"Setup performance rollup query completed",
+                context_provider={
+                    "days_back": days_back,
+                    "account_number": account_number,
+                    "setup_filter": setup_name,
+                    "setups_found": len(rollups)
+                },
+                decision_reason="SETUP_ROLLUP_QUERY_COMPLETED"
+            )
+            return rollups
+
+        except Exception as e:
+            context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                f"Error querying setup performance rollups: {e}",
+                context_provider={
+                    "days_back": days_back,
+                    "account_number": account_number,
+                    "error_type": type(e).__name__,
+                    "error_details": str(e),
+                    "operation": "get_setup_performance_rollups"
+                },
+                decision_reason="SETUP_ROLLUP_QUERY_FAILED"
+            )
+            raise
+
+    def rebuild_setup_performance_rollups(self) -> int:
+        """
+        Recompute setup_performance_daily from all closed executed orders, archived ones included.
+        Used to backfill history recorded before rollups existed; DatabaseManager.init_db runs it
+        at startup while the rollup table is empty.
+        
+        Returns:
+            Number of closed trades folded into the rebuilt rollups
+        """
+        try:
+            executed, planned = self._all_rows(ExecutedOrderDB), self._all_rows(PlannedOrderDB)
+            closed_trades = self.db_session.execute(select(
+                TradingSetup.name.label('setup_name'),
+                executed.c.account_number,
+                planned.c.symbol,
+                executed.c.pnl,
+                executed.c.closed_at,
+                planned.c.created_at,
+                executed.c.executed_at
+            ).join(
+                planned, executed.c.planned_order_id == planned.c.id
+            ).join(
+                TradingSetup, planned.c.setup_id == TradingSetup.id
+            ).where(
+                executed.c.is_open == False,
+                executed.c.closed_at.isnot(None)
+            )).mappings().all()
+
+            self.db_session.query(SetupPerformanceDailyDB).delete()
+            for trade in closed_trades:
+                self._fold_into_setup_rollup(**trade)
+            rebuilt = len(closed_trades)
+            self.db_session.commit()
+
+            context_logger.log_event(
+                TradingEventType.DATABASE_STATE,
+                f"Setup performance rollups rebuilt",
+                context_provider={
+                    "trades_folded": rebuilt
+                },
+                decision_reason="SETUP_ROLLUP_REBUILT"
+            )
+            return rebuilt
+
+        except Exception as e:
+            self.db_session.rollback()
+            context_logger.log_event(
+                TradingEventType.SYSTEM_HEALTH,
+                f"Failed to rebuild setup performance rollups: {e}",
+                context_provider={
+                    "error_type": type(e).__name__,
+                    "error_details": str(e),
+                    "operation": "rebuild_setup_performance_rollups"
+                },
+                decision_reason="SETUP_ROLLUP_REBUILD_FAILED"
+            )
+            return 0
+    # <Setup Performance Rollups - End>
+
+    def _all_rows(self, model):
+        """The model's <table>_all view: hot rows plus rows moved to the monthly archive tables."""
+        if self._archive_service is None:
+            self._archive_service = OrderArchiveService(self.db_session)
+        return self._archive_service.union_table(model)
     # <Advanced Feature Integration - End>
 
     # <Database to Domain Conversion - Begin>
@@ -19,6 +19,7 @@ from config.trading_core_config import get_config
 
 # <Context-Aware Logger Integration - Begin>
 from src.core.context_aware_logger import get_context_logger, TradingEventType
+from src.brokers.ibkr.core.contract_cache import get_contract_cache
 # <Context-Aware Logger Integration - End>
 
 # Market Hours Utility Functions - Begin
@@ -579,6 +580,7 @@ class PlannedOrder:
         contract.secType = self.security_type.value
         contract.exchange = self.exchange
         contract.currency = self.currency
+        get_contract_cache().apply(contract)  # Adds conId/primaryExchange once resolved
         
         # <Context-Aware Logging - IB Contract Creation - Begin>
         self.context_logger.log_event(
@@ -589,7 +591,8 @@ class PlannedOrder:
                 "contract_symbol": contract.symbol,
                 "security_type": contract.secType,
                 "exchange": contract.exchange,
-                "currency": contract.currency
+                "currency": contract.currency,
+                "con_id": contract.conId
             }
         )
         # <Context-Aware Logging - IB Contract Creation - End>
@@ -67,7 +67,7 @@ class RiskManagementService:
         simulation_config = self.config.get('simulation', {})
         self.simulation_equity = simulation_config.get('default_equity', Decimal('100000'))
         
-        # Cache for performance
+        # Halt state from the most recent check (re-evaluated on every order)
         self._last_trading_halt_check = None
         self._trading_halted = False
         self._halt_reason = ""
@@ -474,28 +474,17 @@ class RiskManagementService:
         )
         return total_exposure
     
+    def _get_account_number(self) -> Optional[str]:
+        """Account whose realized P&L drives halts; None aggregates all accounts."""
+        return getattr(self.ibkr_client, 'account_number', None)
+
     def _check_trading_halts(self) -> bool:
         """
         Check if trading is halted due to loss limits.
-        Uses realized P&L from closed trades only.
+        Uses realized P&L from the per-day ledger sums, so it is cheap enough
+        to run on every order check and always reflects the latest closes.
         """
-        # Cache check for performance (check every 5 minutes)
-        current_time = datetime.now()
-        if (self._last_trading_halt_check and 
-            (current_time - self._last_trading_halt_check).total_seconds() < 300):
-            context_logger.log_event(
-                TradingEventType.RISK_EVALUATION,
-                "Using cached trading halt status",
-                context_provider={
-                    "cached_halted": self._trading_halted,
-                    "cached_reason": self._halt_reason,
-                    "cache_valid_seconds": 300,
-                    "time_since_last_check_seconds": (current_time - self._last_trading_halt_check).total_seconds()
-                }
-            )
-            return not self._trading_halted
-            
-        self._last_trading_halt_check = current_time
+        self._last_trading_halt_check = datetime.now()
         
         try:
             total_equity = self._get_total_equity()
@@ -515,9 +504,10 @@ class RiskManagementService:
                 return False
             
             # Get realized P&L for different time periods
-            daily_pnl = self.persistence.get_realized_pnl_period(days=1)
-            weekly_pnl = self.persistence.get_realized_pnl_period(days=7)
-            monthly_pnl = self.persistence.get_realized_pnl_period(days=30)
+            pnl_windows = self.persistence.get_realized_pnl_windows(self._get_account_number(), (1, 7, 30))
+            daily_pnl = pnl_windows[1]
+            weekly_pnl = pnl_windows[7]
+            monthly_pnl = pnl_windows[30]
             
             # Convert to percentage loss (only consider losses)
             daily_loss_pct = abs(min(daily_pnl, Decimal('0'))) / total_equity
@@ -689,20 +679,20 @@ class RiskManagementService:
             TradingEventType.RISK_EVALUATION,
             "Getting risk status",
             context_provider={
-                "cache_used": self._last_trading_halt_check is not None,
                 "last_check_time": self._last_trading_halt_check.isoformat() if self._last_trading_halt_check else None
             }
         )
             
         total_equity = self._get_total_equity()
+        pnl_windows = self.persistence.get_realized_pnl_windows(self._get_account_number(), (1, 7, 30))
         
         status = {
             'trading_halted': self._trading_halted,
             'halt_reason': self._halt_reason,
             'total_equity': float(total_equity),
-            'daily_pnl': float(self.persistence.get_realized_pnl_period(days=1)),
-            'weekly_pnl': float(self.persistence.get_realized_pnl_period(days=7)),
-            'monthly_pnl': float(self.persistence.get_realized_pnl_period(days=30)),
+            'daily_pnl': float(pnl_windows[1]),
+            'weekly_pnl': float(pnl_windows[7]),
+            'monthly_pnl': float(pnl_windows[30]),
             'last_check': self._last_trading_halt_check
         }
         
@@ -720,12 +710,10 @@ class RiskManagementService:
             TradingEventType.SYSTEM_HEALTH,
             "Forcing immediate risk check",
             context_provider={
-                "previous_check_time": self._last_trading_halt_check.isoformat() if self._last_trading_halt_check else None,
-                "cache_reset": True
+                "previous_check_time": self._last_trading_halt_check.isoformat() if self._last_trading_halt_check else None
             },
             decision_reason="FORCED_RISK_CHECK_TRIGGERED"
         )
-        self._last_trading_halt_check = None
         self._check_trading_halts()
 
 # TradingHaltedError - Begin (UPDATED)
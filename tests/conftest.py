@@ -14,7 +14,7 @@ import pytest
 from unittest.mock import Mock, MagicMock, patch
 
 # Database Testing - Begin
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, scoped_session
 from src.core.database import DatabaseManager, init_database
 from src.core.models import Base, PlannedOrderDB, PositionStrategy
@@ -48,6 +48,45 @@ def initialize_test_database():
     _test_db_manager.Session.remove()
     _test_db_manager.engine.dispose()
 
+@pytest.fixture(autouse=True)
+def isolated_bar_cache(tmp_path, monkeypatch):
+    """Keep historical bar caches (on-disk and in-memory) private to each test"""
+    from src.market_data.managers.historical_bar_cache import HistoricalBarCache
+    from src.market_data.managers.historical_data_gateway import get_historical_data_gateway
+    monkeypatch.setattr(
+        HistoricalBarCache, "from_config",
+        classmethod(lambda cls, config=None: cls(directory=str(tmp_path / "bar_cache")))
+    )
+    # The process-wide in-memory gateway must not leak results between tests
+    get_historical_data_gateway().clear()
+
+@pytest.fixture(autouse=True)
+def isolated_contract_cache(tmp_path, monkeypatch):
+    """Give each test an empty, private contract resolution cache"""
+    from src.brokers.ibkr.core import contract_cache
+    monkeypatch.setattr(
+        contract_cache, "_contract_cache",
+        contract_cache.ContractResolutionCache(path=str(tmp_path / "contract_cache.json"))
+    )
+
+@pytest.fixture(autouse=True)
+def isolated_indicator_state(tmp_path, monkeypatch):
+    """Give each test an empty, private incremental indicator state store"""
+    from src.market_data.managers import indicator_state_store
+    monkeypatch.setattr(
+        indicator_state_store, "_indicator_state_store",
+        indicator_state_store.IndicatorStateStore(path=str(tmp_path / "indicator_state.json"))
+    )
+
+@pytest.fixture(autouse=True)
+def isolated_request_scheduler(monkeypatch):
+    """Give each test its own process-wide historical request scheduler"""
+    from src.market_data.managers import historical_request_scheduler
+    monkeypatch.setattr(historical_request_scheduler, "_scheduler", None)
+    yield
+    if historical_request_scheduler._scheduler is not None:
+        historical_request_scheduler._scheduler.shutdown()
+
 @pytest.fixture
 def mock_data_feed():
     """Fixture for mocking AbstractDataFeed"""
@@ -132,6 +171,41 @@ def db_session(test_db):
     session.rollback()
     session.close()
 
+class QueryCounter:
+    """Count SQL statements issued on an engine and enforce a query budget."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return False
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def assert_within_budget(self, budget: int):
+        """Fail when the wrapped code path issued more statements than its budget."""
+        assert self.count <= budget, (
+            f"Query budget exceeded: {self.count} > {budget}\n" + "\n---\n".join(self.statements)
+        )
+
+
+@pytest.fixture
+def query_counter(test_db):
+    """Factory fixture: ``with query_counter() as qc: ...; qc.assert_within_budget(n)``"""
+    return lambda: QueryCounter(test_db.engine)
+
 @pytest.fixture
 def position_strategies(db_session):
     """Fixture providing access to position strategies"""
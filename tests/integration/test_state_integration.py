@@ -1,12 +1,17 @@
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
+from decimal import Decimal
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from unittest.mock import Mock
 
 from src.core.events import OrderState
 from src.services.state_service import StateService
-from src.core.models import Base, PlannedOrderDB, ExecutedOrderDB, PositionStrategy
+from src.core.models import (
+    Base, PlannedOrderDB, ExecutedOrderDB, PositionStrategy, TradingSetup, SetupPerformanceDailyDB,
+    RealizedPnlLedgerDB
+)
+from src.services.historical_performance_service import HistoricalPerformanceService
 
 
 @pytest.fixture(scope="function")
@@ -109,4 +114,167 @@ class TestStateServiceIntegration:
         # Verify position is closed
         closed_position = test_db_session.query(ExecutedOrderDB).filter_by(id=executed_order.id).first()
         assert closed_position.is_open is False
-        assert closed_position.pnl == (155.0 - 150.0) * 10 - 1.0 - 1.0
\ No newline at end of file
+        assert closed_position.pnl == (155.0 - 150.0) * 10 - 1.0 - 1.0
+
+    def test_close_position_updates_setup_rollup(self, test_db_session):
+        """Closing positions folds them into setup_performance_daily for grouped reporting."""
+        strategy = test_db_session.query(PositionStrategy).first()
+        setup = TradingSetup(name="Breakout")
+        test_db_session.add(setup)
+        test_db_session.commit()
+
+        executed_ids = []
+        for symbol, fill in (("AAPL", 150.0), ("MSFT", 300.0)):
+            planned_order = PlannedOrderDB(
+                symbol=symbol,
+                entry_price=fill,
+                stop_loss=fill * 0.95,
+                action="BUY",
+                order_type="LMT",
+                security_type="STK",
+                risk_per_trade=0.01,
+                risk_reward_ratio=2.0,
+                priority=3,
+                setup_id=setup.id,
+                position_strategy_id=strategy.id,
+                status='FILLED'
+            )
+            test_db_session.add(planned_order)
+            test_db_session.commit()
+            executed_order = ExecutedOrderDB(
+                planned_order_id=planned_order.id,
+                filled_price=fill,
+                filled_quantity=10,
+                commission=0.0,
+                status="FILLED",
+                is_open=True,
+                account_number="DU123"
+            )
+            test_db_session.add(executed_order)
+            test_db_session.commit()
+            executed_ids.append(executed_order.id)
+
+        state_service = StateService(test_db_session)
+        assert state_service.close_position(executed_ids[0], 160.0, 10) is True  # +100
+        assert state_service.close_position(executed_ids[1], 295.0, 10) is True  # -50
+
+        rollup = test_db_session.query(SetupPerformanceDailyDB).one()
+        assert rollup.setup_name == "Breakout"
+        assert rollup.trade_count == 2
+        assert rollup.winning_trades == 1
+        assert rollup.losing_trades == 1
+        assert rollup.total_profit == pytest.approx(100.0)
+        assert rollup.total_loss == pytest.approx(50.0)
+
+        performance_service = HistoricalPerformanceService(state_service.persistence_service)
+        performance = performance_service.get_all_setups_performance(days_back=30)
+        assert performance["Breakout"]["win_rate"] == 0.5
+        assert performance["Breakout"]["profit_factor"] == 2.0
+
+        # A rebuild from executed orders reproduces the incrementally maintained rollup
+        assert state_service.persistence_service.rebuild_setup_performance_rollups() == 2
+        rebuilt = test_db_session.query(SetupPerformanceDailyDB).one()
+        assert rebuilt.trade_count == 2
+        assert rebuilt.total_profit == pytest.approx(100.0)
+
+        # Rollups are kept per account; an account filter excludes other accounts' trades
+        assert performance_service.get_all_setups_performance(days_back=30, account_number="DU999") == {}
+        assert performance_service.get_setup_performance(
+            "Breakout", days_back=30, account_number="DU123")["total_trades"] == 2
+
+    def test_init_db_backfills_rollups_for_trades_closed_before_deploy(self, tmp_path):
+        """Starting on a database whose rollup table is empty rebuilds it from closed trades."""
+        from src.core.database import DatabaseManager
+        from src.trading.orders.order_persistence_service import OrderPersistenceService
+
+        db_path = str(tmp_path / "trading.db")
+        manager = DatabaseManager(db_path)
+        manager.init_db()
+        session = manager.get_session()
+        strategy = session.query(PositionStrategy).first()
+        closed_at = datetime.now() - timedelta(days=2)
+        # Closed directly in the table, as trades closed before incremental rollups were recorded
+        for setup_name, symbol, pnl in (("Breakout", "AAPL", 100.0), ("Breakout", "MSFT", -50.0),
+                                        ("Pullback", "NVDA", 30.0)):
+            setup = session.query(TradingSetup).filter_by(name=setup_name).first()
+            if setup is None:
+                setup = TradingSetup(name=setup_name)
+                session.add(setup)
+                session.flush()
+            planned_order = PlannedOrderDB(
+                symbol=symbol, entry_price=100.0, stop_loss=95.0, action="BUY", order_type="LMT",
+                security_type="STK", risk_per_trade=0.01, risk_reward_ratio=2.0, setup_id=setup.id,
+                position_strategy_id=strategy.id, status='FILLED'
+            )
+            session.add(planned_order)
+            session.flush()
+            session.add(ExecutedOrderDB(
+                planned_order_id=planned_order.id, filled_price=100.0, filled_quantity=10, commission=0.0,
+                status="FILLED", is_open=False, pnl=pnl, closed_at=closed_at, account_number="DU123"
+            ))
+        session.commit()
+        session.close()
+        manager.close()
+
+        restarted = DatabaseManager(db_path)
+        restarted.init_db()
+        session = restarted.get_session()
+        rollups = OrderPersistenceService(session).get_setup_performance_rollups(days_back=30)
+        session.close()
+        restarted.close()
+
+        assert rollups["Breakout"]["total_trades"] == 2
+        assert rollups["Breakout"]["winning_trades"] == 1
+        assert rollups["Breakout"]["losing_trades"] == 1
+        assert rollups["Breakout"]["total_profit"] == pytest.approx(100.0)
+        assert rollups["Breakout"]["total_loss"] == pytest.approx(50.0)
+        assert rollups["Pullback"]["total_trades"] == 1
+        assert rollups["Pullback"]["total_profit"] == pytest.approx(30.0)
+
+    def test_close_position_appends_realized_pnl_ledger(self, test_db_session):
+        """Closing a position appends to the P&L ledger and the per-day running sum."""
+        strategy = test_db_session.query(PositionStrategy).first()
+        planned_order = PlannedOrderDB(
+            symbol="AAPL",
+            entry_price=150.0,
+            stop_loss=145.0,
+            action="BUY",
+            order_type="LMT",
+            security_type="STK",
+            risk_per_trade=0.01,
+            risk_reward_ratio=2.0,
+            priority=3,
+            position_strategy_id=strategy.id,
+            status='FILLED'
+        )
+        test_db_session.add(planned_order)
+        test_db_session.commit()
+        executed_order = ExecutedOrderDB(
+            planned_order_id=planned_order.id,
+            filled_price=150.0,
+            filled_quantity=10,
+            commission=0.0,
+            status="FILLED",
+            is_open=True,
+            account_number="DU123"
+        )
+        test_db_session.add(executed_order)
+        test_db_session.commit()
+
+        state_service = StateService(test_db_session)
+        assert state_service.close_position(executed_order.id, 140.0, 10) is True  # -100
+
+        persistence = state_service.persistence_service
+        persistence.record_realized_pnl(
+            order_id=planned_order.id, symbol="AAPL", pnl=Decimal('-25'),
+            exit_date=datetime.now() - timedelta(days=3), account_number="DU123"
+        )
+
+        entries = test_db_session.query(RealizedPnlLedgerDB).order_by(RealizedPnlLedgerDB.id).all()
+        assert [e.source for e in entries] == ["close_position", "record_realized_pnl"]
+        assert entries[0].executed_order_id == executed_order.id
+
+        windows = persistence.get_realized_pnl_windows("DU123", (1, 7, 30))
+        assert windows == {1: Decimal('-100.0'), 7: Decimal('-125.0'), 30: Decimal('-125.0')}
+        assert persistence.get_realized_pnl_period("DU123", 1) == Decimal('-100.0')
+        assert persistence.get_realized_pnl_period("OTHER", 30) == Decimal('0')
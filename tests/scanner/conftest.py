@@ -11,6 +11,8 @@ import os
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
 sys.path.insert(0, project_root)
 
+from src.scanning.integration.ibkr_data_adapter import IBKRDataAdapter  # noqa: E402
+
 @pytest.fixture
 def mock_historical_data():
     """Generate realistic mock historical data for tests"""
@@ -39,7 +41,7 @@ def scanner_config():
 @pytest.fixture
 def mock_ibkr_adapter(mock_historical_data):
     """Mock IBKR adapter for tests"""
-    adapter = Mock()
+    adapter = Mock(spec=IBKRDataAdapter)
     
     # Mock universe data
     adapter.get_dynamic_universe.return_value = [
@@ -65,6 +67,9 @@ def mock_ibkr_adapter(mock_historical_data):
     
     # Mock historical data
     adapter.get_historical_data.return_value = mock_historical_data
+    # No paced scheduler or batch prefetch by default, so history comes per symbol
+    adapter.submit_historical_data_batch.return_value = {}
+    adapter.get_historical_data_batch.return_value = {}
     
     return adapter
 
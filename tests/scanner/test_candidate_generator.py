@@ -0,0 +1,61 @@
+# tests/scanner/test_candidate_generator.py
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from src.scanning.candidate_generator import CandidateGenerator
+from src.scanning.strategy.strategy_core import StrategyMatch, StrategyType
+
+
+def _scan_result(symbol, universe_index=None):
+    return SimpleNamespace(symbol=symbol, current_price=100.0, volume=2_000_000,
+                           market_cap=20_000_000_000, ema_values={}, universe_index=universe_index)
+
+
+def _orchestrator(confidences):
+    """Orchestrator whose single strategy matches each symbol with the given confidence"""
+    orchestrator = Mock()
+    orchestrator.evaluate_symbol.side_effect = lambda scan_result: [StrategyMatch(
+        symbol=scan_result.symbol, strategy_name='bull_trend_pullback', strategy_type=StrategyType.BULL_PULLBACK,
+        confidence=confidences[scan_result.symbol], current_price=scan_result.current_price,
+        total_score=confidences[scan_result.symbol], metadata={}
+    )]
+    return orchestrator
+
+
+class TestCandidateGenerator:
+    """Streaming Tier 2 candidate generation"""
+
+    def test_keeps_top_candidates_from_a_stream(self):
+        confidences = {'A': 70, 'B': 95, 'C': 80, 'D': 95, 'E': 50, 'F': 90}
+        generator = CandidateGenerator(_orchestrator(confidences))
+
+        stream = (_scan_result(symbol) for symbol in confidences)
+        candidates = generator.generate_candidates(stream, min_confidence=60, max_candidates=3)
+
+        # Highest confidence first; equal confidence keeps arrival order
+        assert [candidate['symbol'] for candidate in candidates] == ['B', 'D', 'F']
+
+    def test_ties_follow_universe_order_not_completion_order(self):
+        confidences = {'A': 90, 'B': 90, 'C': 90, 'D': 80}
+        generator = CandidateGenerator(_orchestrator(confidences))
+
+        # Fetches finished in reverse universe order
+        stream = (_scan_result(symbol, index) for index, symbol in reversed(list(enumerate(confidences))))
+        candidates = generator.generate_candidates(stream, min_confidence=60, max_candidates=2)
+
+        assert [candidate['symbol'] for candidate in candidates] == ['A', 'B']
+
+    def test_iter_candidates_emits_before_input_is_exhausted(self):
+        generator = CandidateGenerator(_orchestrator({'A': 90, 'B': 40, 'C': 75}))
+        consumed = []
+
+        def scan_stream():
+            for symbol in ['A', 'B', 'C']:
+                consumed.append(symbol)
+                yield _scan_result(symbol)
+
+        candidates = generator.iter_candidates(scan_stream(), min_confidence=60)
+
+        assert next(candidates)['symbol'] == 'A'
+        assert consumed == ['A']
+        assert [candidate['symbol'] for candidate in candidates] == ['C']
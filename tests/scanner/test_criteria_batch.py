@@ -0,0 +1,98 @@
+# tests/scanner/test_criteria_batch.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.scanning.indicator_engine import IndicatorEngine
+from src.scanning.criteria.criteria_core import CriteriaConfig, CriteriaRegistry, CriteriaType
+from src.scanning.criteria.fundamental_criteria import FundamentalCriteria
+from src.scanning.criteria.liquidity_criteria import LiquidityCriteria
+from src.scanning.criteria.technical_criteria import TechnicalCriteria
+
+TECHNICAL = ["ema_trend_alignment", "rsi_momentum", "macd_signal", "support_resistance",
+             "volatility_range", "price_position", "volume_confirmation", "trend_strength"]
+FUNDAMENTAL = ["min_volume", "min_price", "min_market_cap", "exchange_listed"]
+LIQUIDITY = ["bid_ask_spread", "average_dollar_volume", "volume_consistency"]
+
+
+def _universe(symbols=60, seed=11):
+    """Histories of mixed length, drift and volatility, plus per-symbol scalar fields"""
+    rng = np.random.default_rng(seed)
+    histories, scalars = {}, {}
+    for i in range(symbols):
+        bars = int(rng.integers(12, 130))
+        close = 50 * np.exp(np.cumsum(rng.normal(rng.uniform(-0.01, 0.01), rng.uniform(0.003, 0.06), bars)))
+        histories[f'S{i}'] = pd.DataFrame({
+            'high': close * (1 + rng.uniform(0, 0.02, bars)),
+            'low': close * (1 - rng.uniform(0, 0.02, bars)),
+            'close': close,
+            'volume': rng.uniform(1e5, 5e6, bars) * rng.choice([0.2, 1.0], bars)
+        }, index=pd.bdate_range('2024-01-01', periods=bars))
+        price = float(close[-1])
+        scalars[f'S{i}'] = {
+            'price': price * rng.choice([0.05, 1.0]),
+            'volume': float(rng.uniform(2e5, 3e6)),
+            'market_cap': float(rng.uniform(1e9, 2e10)),
+            'exchange': str(rng.choice(['nasdaq', 'NYSE', 'OTC'])),
+            'bid_price': price * 0.995,
+            'ask_price': price * (1 + rng.uniform(0, 0.03))
+        }
+    return histories, scalars
+
+
+def _criteria():
+    criteria = [TechnicalCriteria(CriteriaConfig(name=name, criteria_type=CriteriaType.TECHNICAL)) for name in TECHNICAL]
+    criteria += [FundamentalCriteria(CriteriaConfig(name=name, criteria_type=CriteriaType.FUNDAMENTAL)) for name in FUNDAMENTAL]
+    criteria += [LiquidityCriteria(CriteriaConfig(name=name, criteria_type=CriteriaType.LIQUIDITY)) for name in LIQUIDITY]
+    return criteria
+
+
+@pytest.fixture(scope='module')
+def universe():
+    histories, scalars = _universe()
+    indicators = IndicatorEngine(ema_periods=(9, 20, 50)).compute(histories)
+    frame = indicators.join(pd.DataFrame.from_dict(scalars, orient='index'))
+    records = IndicatorEngine.to_records(indicators)
+    stock_data = {}
+    for symbol, data in histories.items():
+        stock_data[symbol] = {
+            **scalars[symbol],
+            'price_history': data['close'].tolist(),
+            'high_history': data['high'].tolist(),
+            'low_history': data['low'].tolist(),
+            'volume_history': data['volume'].tolist(),
+            'ema_values': {p: records[symbol][f'ema_{p}'] for p in (9, 20, 50) if records[symbol][f'ema_{p}'] is not None},
+            'indicators': records[symbol]
+        }
+    return frame, stock_data
+
+
+class TestBatchCriteria:
+    """evaluate_batch() must give evaluate()'s pass/score for every symbol"""
+
+    @pytest.mark.parametrize('criteria', _criteria(), ids=lambda c: c.config.name)
+    def test_batch_matches_per_symbol(self, universe, criteria):
+        frame, stock_data = universe
+
+        batch = criteria.evaluate_batch(frame)
+
+        for symbol, data in stock_data.items():
+            expected = criteria.evaluate(data)
+            assert batch.loc[symbol, 'passed'] == expected['passed'], symbol
+            assert batch.loc[symbol, 'score'] == pytest.approx(expected['score'], abs=1e-6), symbol
+
+    def test_registry_batch_matches_evaluate_all(self, universe):
+        frame, stock_data = universe
+        registry = CriteriaRegistry()
+        for criteria in _criteria():
+            registry.register(criteria)
+        names = ["min_price", "min_volume", "volatility_range", "macd_signal", "trend_strength"]
+
+        batch = registry.evaluate_batch(frame, names)
+
+        for symbol, data in stock_data.items():
+            expected = registry.evaluate_all(data, names)
+            assert batch.loc[symbol, 'meets_requirements'] == expected['meets_requirements'], symbol
+            if expected['meets_requirements']:  # A rejected symbol's score depends on what ran before the rejection
+                assert batch.loc[symbol, 'overall_score'] == pytest.approx(expected['overall_score']), symbol
+        assert 0 < batch['meets_requirements'].sum() < len(frame)
@@ -0,0 +1,64 @@
+# tests/scanner/test_criteria_registry.py
+from src.scanning.criteria.criteria_core import BaseCriteria, CriteriaConfig, CriteriaRegistry, CriteriaType
+
+
+class _Threshold(BaseCriteria):
+    """Passes when stock_data[field] exceeds the threshold; records every evaluation"""
+
+    def __init__(self, name, field, threshold, criteria_type=CriteriaType.FUNDAMENTAL, calls=None, **config):
+        super().__init__(CriteriaConfig(name=name, criteria_type=criteria_type, **config))
+        self.field, self.threshold = field, threshold
+        self.calls = calls if calls is not None else []
+
+    def evaluate(self, stock_data):
+        self.calls.append(self.config.name)
+        passed = stock_data.get(self.field, 0) > self.threshold
+        return {'passed': passed, 'score': 100 if passed else 0, 'message': '', 'metadata': {}}
+
+    def get_required_fields(self):
+        return [self.field]
+
+
+class TestCriteriaRegistry:
+    """Cost-ordered, short-circuiting criteria evaluation"""
+
+    def test_cheap_required_failure_skips_expensive_criteria(self):
+        calls = []
+        registry = CriteriaRegistry()
+        # Registered expensive-first: ordering comes from cost, not registration
+        registry.register(_Threshold("ema_alignment", 'trend', 0, CriteriaType.TECHNICAL, calls))
+        registry.register(_Threshold("min_price", 'price', 5, calls=calls))
+
+        result = registry.evaluate_all({'price': 2.0, 'trend': 1})
+
+        assert calls == ['min_price']
+        assert result['meets_requirements'] is False
+        assert result['skipped_criteria'] == ['ema_alignment']
+        assert registry.get_statistics()['ema_alignment']['skipped'] == 1
+
+    def test_optional_criteria_run_last_and_only_affect_score(self):
+        calls = []
+        registry = CriteriaRegistry()
+        registry.register(_Threshold("volume_spike", 'volume_ratio', 1.2, calls=calls, required=False))
+        registry.register(_Threshold("min_volume", 'volume', 1_000_000, CriteriaType.TECHNICAL, calls))
+
+        result = registry.evaluate_all({'volume': 2_000_000, 'volume_ratio': 1.0})
+
+        assert calls == ['min_volume', 'volume_spike']
+        assert result['meets_requirements'] is True
+        assert result['failed_criteria'] == ['volume_spike']
+
+    def test_order_adapts_to_measured_pass_rates(self):
+        calls = []
+        registry = CriteriaRegistry(min_samples=1000)  # Keep declared (equal) costs: only pass rates differ
+        registry.register(_Threshold("min_market_cap", 'market_cap', 0, calls=calls))  # Almost never rejects
+        registry.register(_Threshold("min_volume", 'volume', 1_000_000, calls=calls))   # Rejects most symbols
+
+        for volume in [500_000] * 8 + [2_000_000] * 2:
+            registry.evaluate_all({'market_cap': 1, 'volume': volume})
+        calls.clear()
+        registry.evaluate_all({'market_cap': 1, 'volume': 500_000})
+
+        assert calls == ['min_volume']
+        stats = registry.get_statistics()
+        assert stats['min_volume']['pass_rate'] < stats['min_market_cap']['pass_rate'] == 1.0
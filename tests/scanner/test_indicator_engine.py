@@ -0,0 +1,83 @@
+# tests/scanner/test_indicator_engine.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.scanning.indicator_engine import IndicatorEngine
+from src.scanning.technical_scorer import TechnicalScorer
+from src.scanning.criteria.technical_criteria import TechnicalCriteria
+from src.scanning.criteria.criteria_core import CriteriaConfig, CriteriaType
+
+
+def _history(bars, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0.2, 1.5, bars))
+    return pd.DataFrame({
+        'open': close - 0.5,
+        'high': close + rng.uniform(0.1, 2.0, bars),
+        'low': close - rng.uniform(0.1, 2.0, bars),
+        'close': close,
+        'volume': rng.integers(1_000_000, 3_000_000, bars).astype(float)
+    }, index=pd.bdate_range('2024-01-01', periods=bars))
+
+
+def _criteria(name):
+    return TechnicalCriteria(CriteriaConfig(name=name, criteria_type=CriteriaType.TECHNICAL))
+
+
+class TestIndicatorEngine:
+    """Universe-wide indicators must match the per-symbol calculations they replace"""
+
+    @pytest.fixture
+    def histories(self):
+        # Different lengths exercise the right-alignment padding
+        return {'LONG': _history(120, 1), 'MID': _history(60, 2), 'SHORT': _history(30, 3)}
+
+    def test_emas_match_technical_scorer(self, histories):
+        frame = IndicatorEngine().compute(histories)
+        scorer = TechnicalScorer()
+
+        for symbol, data in histories.items():
+            expected = scorer.calculate_emas(data['close'])
+            for period, value in expected.items():
+                if value is None:
+                    assert np.isnan(frame.loc[symbol, f'ema_{period}'])
+                else:
+                    assert frame.loc[symbol, f'ema_{period}'] == pytest.approx(value, rel=1e-10)
+
+    def test_oscillators_and_trend_match_criteria_calculations(self, histories):
+        frame = IndicatorEngine().compute(histories)
+        criteria = _criteria("trend_strength")
+
+        for symbol, data in histories.items():
+            prices = data['close'].tolist()
+            macd, signal, histogram = criteria._calculate_macd(prices)
+            slope_pct, r_squared = criteria._calculate_trend(prices[-20:])
+
+            assert frame.loc[symbol, 'rsi_14'] == pytest.approx(criteria._calculate_rsi(prices, 14))
+            assert frame.loc[symbol, 'macd'] == pytest.approx(macd)
+            assert frame.loc[symbol, 'macd_signal'] == pytest.approx(signal)
+            assert frame.loc[symbol, 'macd_histogram'] == pytest.approx(histogram, abs=1e-9)
+            assert frame.loc[symbol, 'trend_slope_pct_20'] == pytest.approx(slope_pct)
+            assert frame.loc[symbol, 'trend_r_squared_20'] == pytest.approx(r_squared)
+            volumes = data['volume'].to_numpy()[-10:]
+            assert frame.loc[symbol, 'volume_ratio_10'] == pytest.approx(volumes[-1] / volumes.mean())
+
+    def test_atr_uses_true_range(self):
+        data = _history(40, 4)
+        frame = IndicatorEngine().compute({'ATR': data})
+
+        previous_close = data['close'].shift(1)
+        true_range = pd.concat([data['high'] - data['low'],
+                                (data['high'] - previous_close).abs(),
+                                (data['low'] - previous_close).abs()], axis=1).max(axis=1)
+        assert frame.loc['ATR', 'atr_14'] == pytest.approx(true_range.iloc[-14:].mean())
+
+    def test_criteria_read_precomputed_indicators(self):
+        records = IndicatorEngine.to_records(IndicatorEngine().compute({'X': _history(60, 5)}))
+        stock_data = {'price_history': [1.0] * 60, 'indicators': dict(records['X'], rsi_14=55.0)}
+
+        result = _criteria("rsi_momentum").evaluate(stock_data)
+
+        assert result['metadata']['rsi_value'] == 55.0
+        assert records['X']['ema_100'] is None  # Too few bars is reported as None, not NaN
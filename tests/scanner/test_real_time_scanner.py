@@ -0,0 +1,114 @@
+# tests/scanner/test_real_time_scanner.py
+from unittest.mock import Mock
+
+import pytest
+
+from src.core.event_bus import EventBus
+from src.core.events import EventType, PriceUpdateEvent
+from src.scanning.real_time_scanner import RealTimeScanner
+from src.scanning.scanner_core import StockScanner
+from src.scanning.strategy.strategy_core import StrategyMatch, StrategyType
+
+
+def _orchestrator(threshold):
+    """Single strategy that matches while the live price is above threshold"""
+    orchestrator = Mock()
+    orchestrator.evaluate_symbol.side_effect = lambda scan_result: [StrategyMatch(
+        symbol=scan_result.symbol, strategy_name='bull_trend_pullback', strategy_type=StrategyType.BULL_PULLBACK,
+        confidence=80, current_price=scan_result.current_price, total_score=80, metadata={}
+    )] if scan_result.current_price > threshold else []
+    return orchestrator
+
+
+def _tick(symbol, price):
+    return PriceUpdateEvent(event_type=EventType.PRICE_UPDATE, symbol=symbol, price=price,
+                            price_type='LAST', source="MarketDataManager")
+
+
+class TestRealTimeScanner:
+    """Live-price scanning re-evaluates only the symbols that moved"""
+
+    @pytest.fixture
+    def setup(self, mock_ibkr_adapter, scanner_config):
+        event_bus = EventBus()
+        signals = []
+        event_bus.subscribe(EventType.TRADING_SIGNAL, signals.append)
+        threshold = 400.0  # Above every universe price, so nothing matches initially
+        orchestrator = _orchestrator(threshold)
+        market_data_manager = Mock()
+        scanner = RealTimeScanner(StockScanner(mock_ibkr_adapter, scanner_config), orchestrator,
+                                  market_data_manager, event_bus)
+        scanner.start(background=False)
+        orchestrator.evaluate_symbol.reset_mock()
+        return scanner, event_bus, orchestrator, market_data_manager, signals, threshold
+
+    def test_ticks_are_coalesced_per_symbol(self, setup):
+        scanner, event_bus, orchestrator, market_data_manager, signals, threshold = setup
+
+        assert market_data_manager.subscribe.call_count == 3
+        for price in (100.0, 101.0, 102.0):
+            event_bus.publish(_tick('AAPL', price))
+        event_bus.publish(_tick('MSFT', 200.0))
+        event_bus.publish(_tick('NOT_WATCHED', 50.0))
+
+        assert scanner.process_pending() == 2
+        evaluated = [call.args[0] for call in orchestrator.evaluate_symbol.call_args_list]
+        assert sorted(result.symbol for result in evaluated) == ['AAPL', 'MSFT']
+        assert next(r for r in evaluated if r.symbol == 'AAPL').current_price == 102.0
+        assert scanner.get_metrics()['ticks_coalesced'] == 2
+        assert scanner.process_pending() == 0
+
+    def test_signals_on_strategy_entry_and_exit_only(self, setup):
+        scanner, event_bus, orchestrator, market_data_manager, signals, threshold = setup
+
+        event_bus.publish(_tick('AAPL', threshold + 1))
+        scanner.process_pending()
+        event_bus.publish(_tick('AAPL', threshold + 2))  # Still matching: no new signal
+        scanner.process_pending()
+        event_bus.publish(_tick('AAPL', threshold - 1))
+        scanner.process_pending()
+
+        assert [(s.data['symbol'], s.data['action']) for s in signals] == [('AAPL', 'ENTER'), ('AAPL', 'EXIT')]
+        assert signals[0].data['strategy_name'] == 'bull_trend_pullback'
+        assert signals[0].source == "RealTimeScanner"
+        assert scanner.get_active_matches() == {}
+
+    def test_live_price_is_the_forming_daily_bar(self, setup, mock_historical_data):
+        scanner, event_bus, orchestrator, market_data_manager, signals, threshold = setup
+
+        event_bus.publish(_tick('AAPL', 190.0))
+        scanner.process_pending()
+
+        scan_result = orchestrator.evaluate_symbol.call_args.args[0]
+        closes = mock_historical_data['close'].copy()
+        closes.iloc[-1] = 190.0  # The fixture's last bar is today's
+        assert scan_result.historical_data['close'].iloc[-1] == 190.0
+        assert scan_result.ema_values[10] == pytest.approx(closes.ewm(span=10).mean().iloc[-1])
+        # The forming bar is not committed to the persisted state
+        assert scanner.scanner.indicator_state.get('AAPL', '1 day', 'ema', 10).timestamp == \
+            mock_historical_data.index[-2].isoformat()
+
+    def test_ticks_only_advance_the_emas(self, setup):
+        scanner, event_bus, orchestrator, market_data_manager, signals, threshold = setup
+        scanner.scanner.indicator_engine.compute = Mock(side_effect=AssertionError("full indicator pass on a tick"))
+
+        for price in (190.0, 195.0):
+            event_bus.publish(_tick('AAPL', price))
+            scanner.process_pending()
+
+        scan_result = orchestrator.evaluate_symbol.call_args.args[0]
+        assert scan_result.indicators['close'] == 195.0
+        assert scan_result.price_data['highs'][-1] >= 195.0  # The forming bar keeps the session high
+
+    def test_stop_leaves_symbols_monitored_before_start(self, mock_ibkr_adapter, scanner_config):
+        market_data_manager = Mock()
+        market_data_manager.add_monitored_symbol.side_effect = lambda symbol: symbol != 'AAPL'  # Already an order symbol
+        scanner_config.real_time_watchlist_size = 2
+        scanner = RealTimeScanner(StockScanner(mock_ibkr_adapter, scanner_config), _orchestrator(400.0),
+                                  market_data_manager, EventBus())
+
+        assert scanner.start(background=False) == 2
+        scanner.stop()
+
+        removed = [call.args[0] for call in market_data_manager.remove_monitored_symbol.call_args_list]
+        assert removed == ['MSFT']
@@ -2,6 +2,8 @@
 import pytest
 from unittest.mock import Mock, patch
 
+from src.scanning.integration.ibkr_data_adapter import IBKRDataAdapter
+
 class TestScanManager:
     """Test the high-level scan manager - Updated for TieredScanner architecture"""
     
@@ -148,12 +150,9 @@ class TestScanManager:
 @pytest.fixture
 def mock_ibkr_adapter():
     """Fixture providing a mocked IBKR adapter"""
-    mock_adapter = Mock()
-    mock_adapter.get_market_data.return_value = {
-        'price': 150.0,
-        'volume': 1000000,
-        'change': 1.5
-    }
+    mock_adapter = Mock(spec=IBKRDataAdapter)
+    mock_adapter.submit_historical_data_batch.return_value = {}
+    mock_adapter.get_historical_data_batch.return_value = {}
     return mock_adapter
 
 
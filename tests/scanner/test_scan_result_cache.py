@@ -0,0 +1,77 @@
+# tests/scanner/test_scan_result_cache.py
+from dataclasses import replace
+
+from config.scanner_config import ScannerConfig
+from src.scanning.scan_manager import ScanManager
+from src.scanning.scan_result_cache import ScanResultCache
+
+
+class TestScanResultCache:
+    """Repeated scans within cache_duration reuse earlier results"""
+
+    def test_unchanged_config_is_served_from_cache(self, mock_ibkr_adapter):
+        manager = ScanManager(mock_ibkr_adapter, ScannerConfig(cache_duration=300))
+
+        first = manager.generate_all_candidates()
+        second = manager.generate_all_candidates()
+
+        assert second == first
+        assert mock_ibkr_adapter.get_dynamic_universe.call_count == 1
+        assert manager.tiered_scanner.candidate_cache.get_metrics()['hits'] == 1
+
+        manager.generate_all_candidates(force_refresh=True)
+        assert mock_ibkr_adapter.get_dynamic_universe.call_count == 2
+
+    def test_strategy_only_change_reuses_tier1_results(self, mock_ibkr_adapter):
+        config = ScannerConfig(cache_duration=300)
+        manager = ScanManager(mock_ibkr_adapter, config)
+        manager.generate_all_candidates()
+        orchestrator_before = manager.tiered_scanner.strategy_orchestrator
+
+        manager.update_configuration(replace(config, min_confidence_score=75, max_candidates=5))
+        manager.generate_all_candidates()
+
+        # Strategy tier re-ran (new orchestrator, candidate cache miss) over the cached Tier 1 results
+        assert manager.tiered_scanner.strategy_orchestrator is not orchestrator_before
+        assert mock_ibkr_adapter.get_dynamic_universe.call_count == 1
+        assert manager.tiered_scanner.tier1_cache.get_metrics()['hits'] == 1
+
+        manager.update_configuration(replace(config, min_price=10.0))  # Tier 1 setting
+        manager.generate_all_candidates()
+        assert mock_ibkr_adapter.get_dynamic_universe.call_count == 2
+
+    def test_entries_expire_after_ttl(self):
+        now = [0.0]
+        cache = ScanResultCache(clock=lambda: now[0])
+        cache.put(('config', 'day'), ['AAPL'])
+
+        assert cache.get(('config', 'day'), ttl_seconds=300) == ['AAPL']
+        now[0] = 300.0
+        assert cache.get(('config', 'day'), ttl_seconds=300) is None
+        assert cache.get_metrics() == {'hits': 1, 'misses': 0, 'expired': 1, 'entries': 0}
+
+    def test_cached_candidates_are_not_shared_with_callers(self, mock_ibkr_adapter):
+        manager = ScanManager(mock_ibkr_adapter, ScannerConfig(cache_duration=300))
+        scanner = manager.tiered_scanner
+        scanner.candidate_generator.generate_candidates = lambda **kwargs: [{'symbol': 'AAPL', 'metadata': {'tag': 'a'}}]
+
+        first = scanner.run_scan()
+        first[0]['metadata']['tag'] = 'changed'
+
+        assert scanner.run_scan() == [{'symbol': 'AAPL', 'metadata': {'tag': 'a'}}]
+
+    def test_tier1_only_results_are_in_universe_order(self, mock_ibkr_adapter):
+        from src.scanning.scanner_core import ScanResult
+        from src.scanning.tiered_scanner import TieredScanner
+
+        scanner = TieredScanner(mock_ibkr_adapter, ScannerConfig(enabled_strategies=[], cache_duration=300))
+        completed = []
+        for index, symbol in [(2, 'GOOGL'), (0, 'AAPL'), (1, 'MSFT')]:  # Completion order
+            result = ScanResult(symbol, 100.0, 2_000_000, 2e10, {})
+            result.universe_index = index
+            completed.append(result)
+        scanner.scanner.iter_scan = lambda: iter(completed)
+
+        assert [result['symbol'] for result in scanner.run_scan()] == ['AAPL', 'MSFT', 'GOOGL']
+        cached = scanner.tier1_cache.get((scanner.scanner_config.tier1_fingerprint(), scanner._data_date()), 300)
+        assert [result.symbol for result in cached] == ['AAPL', 'MSFT', 'GOOGL']
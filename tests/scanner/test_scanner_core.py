@@ -111,4 +111,111 @@ class TestScannerCore:
                 assert 'current' in result.price_data
                 assert 'historical' in result.price_data
                 assert len(result.price_data['historical']) > 0
-    # Updated Test Methods - End
\ No newline at end of file
+    # Updated Test Methods - End
+    # Concurrent Analysis Pipeline Tests - Begin
+    def test_iter_scan_streams_in_completion_order(self, mock_ibkr_adapter, mock_historical_data, scanner_config):
+        """Results stream as paced history futures resolve; run_scan restores universe order"""
+        from concurrent.futures import Future
+        from src.scanning.scanner_core import StockScanner
+
+        futures = {symbol: Future() for symbol in ['AAPL', 'MSFT', 'GOOGL']}
+        mock_ibkr_adapter.submit_historical_data_batch.return_value = futures
+        scanner = StockScanner(mock_ibkr_adapter, scanner_config)
+
+        stream = scanner.iter_scan()
+        futures['GOOGL'].set_result(mock_historical_data)
+        assert next(stream).symbol == 'GOOGL'
+        futures['MSFT'].set_result(mock_historical_data)
+        assert next(stream).symbol == 'MSFT'
+        futures['AAPL'].set_result(mock_historical_data)
+        assert next(stream).symbol == 'AAPL'
+        mock_ibkr_adapter.get_historical_data.assert_not_called()
+
+        assert [result.symbol for result in scanner.run_scan()] == ['AAPL', 'MSFT', 'GOOGL']
+
+    def test_closing_stream_cancels_outstanding_history(self, mock_ibkr_adapter, mock_historical_data, scanner_config):
+        from concurrent.futures import Future
+        from src.scanning.scanner_core import StockScanner
+
+        futures = {symbol: Future() for symbol in ['AAPL', 'MSFT', 'GOOGL']}
+        mock_ibkr_adapter.submit_historical_data_batch.return_value = futures
+        stream = StockScanner(mock_ibkr_adapter, scanner_config).iter_scan()
+
+        futures['AAPL'].set_result(mock_historical_data)
+        assert next(stream).symbol == 'AAPL'
+        stream.close()
+
+        assert futures['MSFT'].cancelled() and futures['GOOGL'].cancelled()
+
+    def test_closed_or_superseded_scan_cancels_batch_history(self, mock_ibkr_adapter, mock_historical_data,
+                                                              scanner_config, monkeypatch):
+        from concurrent.futures import Future
+        from unittest.mock import Mock
+        from src.market_data.managers.historical_request_scheduler import (
+            HistoricalRequestPriority, get_historical_request_scheduler
+        )
+        from src.scanning.scanner_core import StockScanner
+
+        cancel_pending = Mock(return_value=0)
+        monkeypatch.setattr(get_historical_request_scheduler(), "cancel_pending", cancel_pending)
+        scanner = StockScanner(mock_ibkr_adapter, scanner_config)
+
+        first_futures = {symbol: Future() for symbol in ['AAPL', 'MSFT', 'GOOGL']}
+        mock_ibkr_adapter.submit_historical_data_batch.return_value = first_futures
+        first = scanner.iter_scan()
+        first_futures['AAPL'].set_result(mock_historical_data)
+        assert next(first).symbol == 'AAPL'
+        cancel_pending.assert_not_called()
+
+        # A new scan supersedes the open one; closing the old stream must not touch the new scan's requests
+        second_futures = {symbol: Future() for symbol in ['AAPL', 'MSFT', 'GOOGL']}
+        mock_ibkr_adapter.submit_historical_data_batch.return_value = second_futures
+        second = scanner.iter_scan()
+        second_futures['MSFT'].set_result(mock_historical_data)
+        assert next(second).symbol == 'MSFT'
+        cancel_pending.assert_called_once_with(HistoricalRequestPriority.BATCH)
+        first.close()
+        assert cancel_pending.call_count == 1
+
+        second.close()
+        assert cancel_pending.call_count == 2
+
+        # A scan read to the end leaves the batch queue alone
+        done = {symbol: Future() for symbol in ['AAPL', 'MSFT', 'GOOGL']}
+        for future in done.values():
+            future.set_result(mock_historical_data)
+        mock_ibkr_adapter.submit_historical_data_batch.return_value = done
+        assert len(scanner.run_scan()) == 3
+        assert cancel_pending.call_count == 2
+    # Concurrent Analysis Pipeline Tests - End
+
+    def test_scan_result_holds_bar_arrays_not_copies(self, mock_ibkr_adapter, mock_historical_data, scanner_config):
+        import numpy as np
+        from src.scanning.scanner_core import StockScanner
+
+        history = mock_historical_data.astype(float)
+        result = StockScanner(mock_ibkr_adapter, scanner_config)._analyze_stock(
+            {'symbol': 'AAPL', 'price': 182.5, 'volume': 25_000_000, 'market_cap': 2.8e12}, history)
+
+        assert not hasattr(result, '__dict__')
+        closes = result.price_data['historical']
+        assert isinstance(closes, np.ndarray)
+        assert np.shares_memory(closes, history['close'].to_numpy())
+        pd.testing.assert_frame_equal(result.historical_data, history[['open', 'high', 'low', 'close', 'volume']])
+        assert result.bar_count == len(history)
+
+    def test_todays_forming_bar_is_not_folded_into_ema_state(self, mock_ibkr_adapter, mock_historical_data, scanner_config):
+        from unittest.mock import Mock
+        from src.scanning.scanner_core import StockScanner
+
+        scanner = StockScanner(mock_ibkr_adapter, scanner_config)
+        scanner.indicator_state = Mock()
+        scanner.indicator_state.update_ema.return_value = None
+        indicators = {f'ema_{period}': 1.0 for period in scanner.technical_scorer.ema_periods}
+
+        scanner._apply_indicator_state('AAPL', mock_historical_data, dict(indicators))  # Last bar dated today
+        assert all(not call.kwargs['last_bar_final'] for call in scanner.indicator_state.update_ema.call_args_list)
+
+        scanner.indicator_state.update_ema.reset_mock()
+        scanner._apply_indicator_state('AAPL', mock_historical_data.iloc[:-1], dict(indicators))
+        assert all(call.kwargs['last_bar_final'] for call in scanner.indicator_state.update_ema.call_args_list)
@@ -0,0 +1,108 @@
+# tests/scanner/test_strategy_orchestrator.py
+from types import SimpleNamespace
+
+from src.scanning.criteria.criteria_core import BaseCriteria, CriteriaConfig, CriteriaRegistry, CriteriaType
+from src.scanning.strategy.strategy_core import Strategy, StrategyConfig, StrategyOrchestrator, StrategyType
+
+
+class _Threshold(BaseCriteria):
+    """Passes when stock_data[field] exceeds the threshold; counts evaluations"""
+
+    def __init__(self, name, field, threshold):
+        super().__init__(CriteriaConfig(name=name, criteria_type=CriteriaType.FUNDAMENTAL))
+        self.field, self.threshold = field, threshold
+        self.calls = 0
+
+    def evaluate(self, stock_data):
+        self.calls += 1
+        passed = stock_data.get(self.field, 0) > self.threshold
+        return {'passed': passed, 'score': 100 if passed else 0, 'message': '', 'metadata': {}}
+
+    def get_required_fields(self):
+        return [self.field]
+
+
+class _PriceAbove(Strategy):
+    """Matches when the base criteria pass and the price is above parameters['price']"""
+
+    def evaluate_strategy_specific(self, scan_result, stock_data):
+        return {'ok': True} if stock_data['price'] > self.config.parameters['price'] else None
+
+    def calculate_strategy_confidence(self, scan_result, stock_data):
+        return 80.0
+
+
+def _registry():
+    registry = CriteriaRegistry()
+    registry.register(_Threshold('min_price', 'price', 5))
+    registry.register(_Threshold('min_volume', 'volume', 1_000_000))
+    registry.register(_Threshold('min_market_cap', 'market_cap', 1_000_000_000))
+    return registry
+
+
+def _strategy(name, registry, price, criteria):
+    config = StrategyConfig(name=name, strategy_type=StrategyType.CUSTOM, required_criteria=criteria,
+                            parameters={'price': price})
+    return _PriceAbove(config, registry)
+
+
+def _scan_result(symbol, price):
+    return SimpleNamespace(symbol=symbol, current_price=price, volume=2_000_000, market_cap=20_000_000_000,
+                           ema_values={}, indicators={}, total_score=75)
+
+
+class TestStrategyOrchestrator:
+    """Multi-strategy evaluation with shared features and criteria results"""
+
+    def test_overlapping_criteria_run_once_per_symbol(self):
+        registry = _registry()
+        orchestrator = StrategyOrchestrator([
+            _strategy('cheap', registry, 10, ['min_price', 'min_volume']),
+            _strategy('pricey', registry, 100, ['min_price', 'min_volume', 'min_market_cap'])
+        ])
+
+        matches = orchestrator.evaluate_symbol(_scan_result('AAPL', 50.0))
+
+        assert [match.strategy_name for match in matches] == ['cheap']
+        assert {name: registry.get_criteria(name).calls for name in ('min_price', 'min_volume', 'min_market_cap')} == \
+            {'min_price': 1, 'min_volume': 1, 'min_market_cap': 1}
+        assert matches[0].metadata['base_criteria_passed'] == ['min_price', 'min_volume']
+
+    def test_process_pool_matches_in_process_results(self):
+        def build(max_workers):
+            registry = _registry()
+            return StrategyOrchestrator([
+                _strategy('cheap', registry, 10, ['min_price', 'min_volume']),
+                _strategy('pricey', registry, 100, ['min_price', 'min_market_cap'])
+            ], max_workers=max_workers, batch_size=4)
+
+        scan_results = [_scan_result(f'S{i}', float(i * 15)) for i in range(10)]
+        expected = [(result.symbol, [(m.strategy_name, m.confidence) for m in matches])
+                    for result, matches in build(1).evaluate_symbols(scan_results)]
+
+        parallel = build(2)
+        assert parallel.parallel
+        actual = [(result.symbol, [(m.strategy_name, m.confidence) for m in matches])
+                  for result, matches in parallel.evaluate_symbols(iter(scan_results))]
+
+        assert actual == expected
+        assert [symbol for symbol, _ in actual] == [result.symbol for result in scan_results]
+        assert any(len(matches) == 2 for _, matches in actual)
+
+    def test_batch_screening_skips_symbols_failing_base_criteria(self):
+        from unittest.mock import Mock
+        from src.scanning.criteria.fundamental_criteria import FundamentalCriteria
+
+        registry = CriteriaRegistry()
+        registry.register(FundamentalCriteria(CriteriaConfig(name='min_price', criteria_type=CriteriaType.FUNDAMENTAL,
+                                                             parameters={'min_price': 20})))
+        orchestrator = StrategyOrchestrator([_strategy('cheap', registry, 10, ['min_price'])], batch_size=4)
+        orchestrator.evaluate_symbol = Mock(wraps=orchestrator.evaluate_symbol)
+
+        scan_results = [_scan_result(f'S{i}', float(i * 10)) for i in range(6)]
+        results = [(result.symbol, [m.strategy_name for m in matches])
+                   for result, matches in orchestrator.evaluate_symbols(scan_results)]
+
+        assert results == [('S0', []), ('S1', []), ('S2', []), ('S3', ['cheap']), ('S4', ['cheap']), ('S5', ['cheap'])]
+        evaluated = [call.args[0].symbol for call in orchestrator.evaluate_symbol.call_args_list]
+        assert evaluated == ['S3', 'S4', 'S5']
@@ -0,0 +1,114 @@
+"""
+Tests for the file-backed EOD feed reading AmiBroker ASCII files.
+"""
+
+import os
+import time
+
+import pandas as pd
+import pytest
+from ibapi.contract import Contract
+
+from src.market_data.feeds.amibroker_file_feed import AmiBrokerFileFeed
+
+
+def _write_eod_file(folder, ticker, closes, volume=2_000_000, start='2024-01-01'):
+    dates = pd.bdate_range(start, periods=len(closes))
+    lines = [f"{ticker},{date:%Y-%m-%d},{close - 1:.6f},{close + 1:.6f},{close - 2:.6f},{close:.6f},{volume}"
+             for date, close in zip(dates, closes)]
+    path = os.path.join(folder, f"{ticker}.txt")
+    with open(path, 'w', encoding='ascii') as f:
+        f.write('\n'.join(lines))
+    return path
+
+
+@pytest.fixture
+def eod_folder(tmp_path):
+    folder = tmp_path / "Daily"
+    folder.mkdir()
+    _write_eod_file(str(folder), "AAPL", [150.0 + i for i in range(60)])
+    _write_eod_file(str(folder), "PENNY", [2.0] * 60)
+    _write_eod_file(str(folder), "THIN", [50.0] * 60, volume=1000)
+    return str(folder)
+
+
+def test_parse_file_reads_ohlcv_and_skips_bad_lines(tmp_path):
+    path = tmp_path / "MSFT.txt"
+    path.write_text("MSFT,2024-01-03,1,2,0.5,1.5,100\n"
+                    "MSFT,not-a-date,1,2,0.5,1.5,100\n"
+                    "\n"
+                    "MSFT,2024-01-02,1,2,0.5,1.4,90\n"
+                    "MSFT,2024-01-03,1,2,0.5,1.6,110\n", encoding='ascii')
+
+    bars = AmiBrokerFileFeed.parse_file(str(path))
+
+    assert list(bars.columns) == ['open', 'high', 'low', 'close', 'volume']
+    assert list(bars.index) == [pd.Timestamp('2024-01-02'), pd.Timestamp('2024-01-03')]
+    assert bars.loc['2024-01-03', 'close'] == 1.6  # Later duplicate line wins
+
+
+def test_historical_data_window_ends_at_last_bar(eod_folder):
+    feed = AmiBrokerFileFeed(eod_folder)
+
+    bars = feed.get_historical_data("AAPL", days=14)
+
+    assert bars.index.max() == pd.bdate_range('2024-01-01', periods=60)[-1]
+    assert len(bars) == 10
+    assert (bars['symbol'] == "AAPL").all()
+    assert feed.get_historical_data("MISSING", days=14) is None
+
+
+def test_data_feed_form_serves_daily_bars_only(eod_folder):
+    feed = AmiBrokerFileFeed(eod_folder)
+
+    bars = feed.get_historical_data("AAPL", '1D', 20)
+
+    assert len(bars) == 20
+    assert bars.index.max() == pd.bdate_range('2024-01-01', periods=60)[-1]
+    with pytest.raises(ValueError):
+        feed.get_historical_data("AAPL", '15min', 20)
+
+
+def test_binary_cache_is_reused_until_text_file_changes(eod_folder):
+    pytest.importorskip("pyarrow")
+    AmiBrokerFileFeed(eod_folder).load_bars("AAPL")
+
+    reader = AmiBrokerFileFeed(eod_folder)
+    first = reader.load_bars("AAPL")
+    assert reader.get_metrics()['cache_loads'] == 1
+    assert reader.get_metrics()['text_parses'] == 0
+
+    time.sleep(0.01)
+    path = _write_eod_file(eod_folder, "AAPL", [200.0] * 5)
+    os.utime(path, (time.time() + 5, time.time() + 5))
+    refreshed = AmiBrokerFileFeed(eod_folder)
+    bars = refreshed.load_bars("AAPL")
+
+    assert refreshed.get_metrics()['text_parses'] == 1
+    assert len(bars) == 5 and len(first) == 60
+
+
+def test_dynamic_universe_applies_price_and_volume_filters(eod_folder):
+    feed = AmiBrokerFileFeed(eod_folder)
+
+    universe = feed.get_dynamic_universe({'min_price': 10, 'min_volume': 1_000_000, 'min_market_cap': 10**12})
+
+    assert [stock['symbol'] for stock in universe] == ["AAPL"]
+    assert universe[0]['price'] == 209.0
+    assert universe[0]['data_type'] == 'EOD_FILE'
+
+
+def test_abstract_feed_interface_serves_last_close(eod_folder, tmp_path):
+    ticker_file = tmp_path / "ticker_list.txt"
+    ticker_file.write_text("THIN\nAAPL\nTHIN\n")
+    feed = AmiBrokerFileFeed(eod_folder, ticker_file=str(ticker_file))
+    contract = Contract()
+    contract.symbol = "AAPL"
+
+    assert feed.connect() and feed.is_connected()
+    assert feed.get_symbol_universe() == ["THIN", "AAPL"]
+    assert feed.subscribe("AAPL", contract)
+    assert not feed.subscribe("MISSING", contract)
+    price = feed.get_current_price("AAPL")
+    assert price['price'] == 209.0
+    assert price['data_type'] == 'EOD_FILE'
@@ -0,0 +1,147 @@
+"""
+Tests for ColumnarExportService chunked Parquet/Arrow exports.
+"""
+
+import datetime
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.ipc  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+from src.core.models import MarketSnapshotDB, OrderLabelDB, PlannedOrderDB, ProbabilityScoreDB  # noqa: E402
+from src.services.columnar_export_service import ColumnarExportService  # noqa: E402
+from src.services.outcome_labeling_service import OutcomeLabelingService  # noqa: E402
+
+
+@pytest.fixture
+def snapshot_session(db_session):
+    base = datetime.datetime(2024, 5, 1, 9, 30)
+    for i in range(25):
+        db_session.add(MarketSnapshotDB(
+            symbol="AAPL" if i % 2 == 0 else "MSFT",
+            timestamp=base + datetime.timedelta(seconds=i),
+            bid=100.0 + i, ask=100.1 + i, last=100.05 + i, volume=1000 + i,
+            level2_snapshot={"bids": [[100.0 + i, 5]]} if i % 5 == 0 else None
+        ))
+    db_session.commit()
+    return db_session
+
+
+@pytest.fixture
+def labeled_session(db_session, position_strategies):
+    now = datetime.datetime.now()
+    for i in range(7):
+        order = PlannedOrderDB(
+            symbol=f"SYM{i}", security_type="STK", action="BUY", order_type="LMT",
+            entry_price=100.0, stop_loss=95.0, risk_per_trade=0.01, risk_reward_ratio=2.0,
+            priority=3, position_strategy_id=position_strategies["DAY"].id, status="FILLED"
+        )
+        db_session.add(order)
+        db_session.flush()
+        # An older score whose features must not be exported
+        db_session.add(ProbabilityScoreDB(
+            planned_order_id=order.id, symbol=order.symbol, fill_probability=0.1,
+            timestamp=now - datetime.timedelta(hours=2), features={"spread": -1.0, "volume_ratio": -1}
+        ))
+        db_session.add(ProbabilityScoreDB(
+            planned_order_id=order.id, symbol=order.symbol, fill_probability=0.8,
+            timestamp=now - datetime.timedelta(hours=1), features={"spread": 0.01 * i, "volume_ratio": i}
+        ))
+        db_session.add(OrderLabelDB(
+            planned_order_id=order.id, label_type="filled_binary", label_value=1.0, computed_at=now
+        ))
+    db_session.commit()
+    return db_session
+
+
+class TestColumnarExportService:
+
+    def test_market_snapshots_parquet_export_in_chunks(self, snapshot_session, tmp_path):
+        output = str(tmp_path / "snapshots.parquet")
+        rows = ColumnarExportService(snapshot_session, chunk_size=4).export_market_snapshots(output)
+
+        assert rows == 25
+        parquet_file = pq.ParquetFile(output)
+        assert parquet_file.metadata.num_row_groups == 7
+        table = parquet_file.read()
+        assert table.schema.field("timestamp").type == pa.timestamp("us")
+        assert table.schema.field("bid").type == pa.float64()
+        assert table.column("level2_snapshot").null_count == 20
+        assert table.column("level2_snapshot")[0].as_py() == '{"bids": [[100.0, 5]]}'
+
+    def test_market_snapshots_arrow_export_with_filter(self, snapshot_session, tmp_path):
+        output = str(tmp_path / "snapshots.arrow")
+        rows = ColumnarExportService(snapshot_session, chunk_size=4).export_market_snapshots(output, symbol="MSFT")
+
+        assert rows == 12
+        with pa.memory_map(output) as source:
+            table = pa.ipc.open_file(source).read_all()
+        assert set(table.column("symbol").to_pylist()) == {"MSFT"}
+
+    def test_training_export_uses_latest_score_features(self, labeled_session, tmp_path):
+        output = str(tmp_path / "training.parquet")
+        rows = ColumnarExportService(labeled_session, chunk_size=3).export_training_data(output)
+
+        assert rows == 7
+        table = pq.read_table(output)
+        assert table.column_names == [
+            "label_type", "label_value", "planned_order_id", "computed_at", "notes", "spread", "volume_ratio"
+        ]
+        assert table.schema.field("volume_ratio").type == pa.float64()
+        assert sorted(table.column("volume_ratio").to_pylist()) == [float(i) for i in range(7)]
+
+    def test_training_export_with_no_labels_writes_empty_file(self, db_session, tmp_path):
+        output = tmp_path / "training.parquet"
+        rows = ColumnarExportService(db_session).export_training_data(str(output))
+
+        assert rows == 0
+        table = pq.read_table(str(output))
+        assert table.num_rows == 0
+        assert table.column_names == ["label_type", "label_value", "planned_order_id", "computed_at", "notes"]
+
+    def test_training_export_unifies_feature_types_across_chunks(self, labeled_session, tmp_path):
+        orders = labeled_session.query(PlannedOrderDB).order_by(PlannedOrderDB.id).all()
+        late = datetime.datetime.now()
+        # Later chunks introduce a new key and change a key's type
+        labeled_session.add(ProbabilityScoreDB(
+            planned_order_id=orders[-1].id, symbol=orders[-1].symbol, fill_probability=0.9,
+            timestamp=late, features={"spread": "wide", "volume_ratio": True, "regime": "trend"}
+        ))
+        labeled_session.commit()
+
+        output = str(tmp_path / "training.arrow")
+        rows = ColumnarExportService(labeled_session, chunk_size=3).export_training_data(output)
+
+        assert rows == 7
+        with pa.memory_map(output) as source:
+            table = pa.ipc.open_file(source).read_all()
+        assert table.schema.field("spread").type == pa.string()
+        assert table.schema.field("volume_ratio").type == pa.float64()
+        assert table.schema.field("regime").type == pa.string()
+        assert table.column("regime").null_count == 6
+        assert table.column("spread").to_pylist()[-1] == "wide"
+
+    def test_training_export_keeps_one_score_per_order_on_timestamp_ties(self, labeled_session, tmp_path):
+        order = labeled_session.query(PlannedOrderDB).order_by(PlannedOrderDB.id).first()
+        latest = labeled_session.query(ProbabilityScoreDB).filter_by(
+            planned_order_id=order.id
+        ).order_by(ProbabilityScoreDB.timestamp.desc()).first()
+        labeled_session.add(ProbabilityScoreDB(
+            planned_order_id=order.id, symbol=order.symbol, fill_probability=0.7,
+            timestamp=latest.timestamp, features={"spread": 0.5, "volume_ratio": 9}
+        ))
+        labeled_session.commit()
+
+        output = str(tmp_path / "training.parquet")
+        rows = ColumnarExportService(labeled_session).export_training_data(output)
+
+        assert rows == 7
+        table = pq.read_table(output)
+        assert table.column("planned_order_id").to_pylist().count(order.id) == 1
+
+    def test_labeling_service_dispatches_columnar_suffix(self, labeled_session, tmp_path):
+        output = tmp_path / "training.arrow"
+        assert OutcomeLabelingService(labeled_session).export_training_data(str(output)) is True
+        assert output.exists()
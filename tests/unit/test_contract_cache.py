@@ -0,0 +1,153 @@
+"""
+Tests for the persistent contract resolution cache and the contract builders that use it.
+"""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from ibapi.wrapper import EWrapper
+
+from src.brokers.ibkr.core.connection_manager import ConnectionManager
+from src.brokers.ibkr.core.contract_cache import ContractResolutionCache, get_contract_cache
+from src.trading.execution.services.price_adjustment_service import PriceAdjustmentService
+
+
+def _details(symbol, con_id, primary_exchange="NASDAQ", min_tick=0.01):
+    contract = SimpleNamespace(symbol=symbol, conId=con_id, primaryExchange=primary_exchange,
+                               secType="STK", currency="USD")
+    return SimpleNamespace(contract=contract, minTick=min_tick, tradingHours="20240102:0930-20240102:1600",
+                           timeZoneId="US/Eastern", longName=f"{symbol} Inc")
+
+
+class FakeContractClient:
+    """Answers reqContractDetails from a background thread; unknown symbols get IBKR error 200."""
+
+    def __init__(self, cache, known):
+        self.connected = True
+        self.cache = cache
+        self.known = known
+        self.requested = []
+
+    def reqContractDetails(self, reqId, contract):
+        self.requested.append(contract.symbol)
+        threading.Thread(target=self._answer, args=(reqId, contract.symbol), daemon=True).start()
+
+    def _answer(self, req_id, symbol):
+        time.sleep(0.01)
+        if symbol not in self.known:
+            self.cache.contract_details_error(req_id, 200, "No security definition has been found")
+            return
+        for details in self.known[symbol]:
+            self.cache.contract_details(req_id, details)
+        self.cache.contract_details_end(req_id)
+
+
+class TestContractResolutionCache:
+
+    def test_resolve_many_batches_and_persists(self, tmp_path):
+        path = tmp_path / "contracts.json"
+        cache = ContractResolutionCache(path=str(path), max_in_flight=2)
+        client = FakeContractClient(cache, {
+            "AAPL": [_details("AAPL", 265598)],
+            "SPY": [_details("SPY", 756733, primary_exchange="ARCA")]
+        })
+
+        results = cache.resolve_many(client, ["AAPL", "SPY", "NOPE", "AAPL"], timeout=2)
+
+        assert results["AAPL"].con_id == 265598
+        assert results["SPY"].primary_exchange == "ARCA"
+        assert results["NOPE"] is None
+        assert sorted(client.requested) == ["AAPL", "NOPE", "SPY"]
+        assert set(json.loads(path.read_text())) == {"AAPL", "SPY"}
+
+        # A new process reads the file and never contacts IBKR for known symbols
+        reloaded = ContractResolutionCache(path=str(path))
+        client.requested.clear()
+        reloaded.resolve_many(client, ["AAPL"])
+        assert client.requested == []
+        assert reloaded.min_tick("AAPL") == 0.01
+
+    def test_prefers_us_primary_listing(self, tmp_path):
+        cache = ContractResolutionCache(path=str(tmp_path / "contracts.json"))
+        client = FakeContractClient(cache, {
+            "SHOP": [_details("SHOP", 1, primary_exchange="TSE"), _details("SHOP", 2, primary_exchange="NYSE")]
+        })
+
+        assert cache.resolve_many(client, ["SHOP"], timeout=2)["SHOP"].con_id == 2
+
+    def test_build_contract_is_qualified_once_resolved(self, tmp_path):
+        cache = ContractResolutionCache(path=str(tmp_path / "contracts.json"))
+        assert cache.build_contract("AAPL").conId == 0
+
+        cache.resolve_many(FakeContractClient(cache, {"AAPL": [_details("AAPL", 265598)]}), ["AAPL"], timeout=2)
+        contract = cache.build_contract("AAPL")
+
+        assert contract.conId == 265598
+        assert contract.primaryExchange == "NASDAQ"
+        assert contract.exchange == "SMART"
+
+    def test_expired_entries_are_resolved_again(self, tmp_path):
+        cache = ContractResolutionCache(path=str(tmp_path / "contracts.json"), max_age_days=0)
+        client = FakeContractClient(cache, {"AAPL": [_details("AAPL", 265598)]})
+        cache.resolve_many(client, ["AAPL"], timeout=2)
+        time.sleep(0.01)
+
+        cache.resolve_many(client, ["AAPL"], timeout=2)
+
+        assert client.requested == ["AAPL", "AAPL"]
+
+    def test_prefetch_returns_at_once_and_keeps_requests_bounded(self, tmp_path):
+        cache = ContractResolutionCache(path=str(tmp_path / "contracts.json"), max_in_flight=2)
+        known = {symbol: [_details(symbol, index + 1)] for index, symbol in enumerate(["A", "B", "C", "D", "E"])}
+        client = FakeContractClient(cache, known)
+
+        assert cache.prefetch(client, list(known)) == 5
+        assert len(client.requested) == 2  # Later symbols wait for a free request slot
+
+        deadline = time.monotonic() + 2
+        while cache.get_metrics()['cached_contracts'] < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cache.get("E").con_id == 5
+        assert sorted(client.requested) == ["A", "B", "C", "D", "E"]
+
+    def test_unresolved_symbols_are_not_requested_again_within_miss_ttl(self, tmp_path):
+        cache = ContractResolutionCache(path=str(tmp_path / "contracts.json"), miss_ttl_seconds=60)
+        client = FakeContractClient(cache, {})
+
+        assert cache.resolve_many(client, ["NOPE"], timeout=2)["NOPE"] is None
+        assert cache.resolve_many(client, ["NOPE"], timeout=2)["NOPE"] is None
+        assert cache.prefetch(client, ["NOPE"]) == 0
+
+        assert client.requested == ["NOPE"]
+
+    def test_connection_manager_routes_contract_details_callbacks(self, monkeypatch):
+        # The base EWrapper.error signature differs between ibapi releases
+        monkeypatch.setattr(EWrapper, "error", lambda self, *args: None)
+        manager = ConnectionManager()
+        manager.connected = True
+        sent = []
+        manager.reqContractDetails = lambda req_id, contract: sent.append(req_id)
+
+        cache = manager.contract_cache
+        assert cache is get_contract_cache()
+        future = cache._request(manager, "AAPL")
+        manager.contractDetails(sent[0], _details("AAPL", 265598))
+        manager.contractDetailsEnd(sent[0])
+
+        assert future.result(timeout=1).con_id == 265598
+
+        missing = cache._request(manager, "NOPE")
+        manager.error(sent[1], 200, "No security definition has been found")
+        assert missing.result(timeout=1) is None
+
+    def test_price_rounding_uses_coarser_contract_min_tick(self):
+        cache = get_contract_cache()
+        cache.resolve_many(FakeContractClient(cache, {"XYZ": [_details("XYZ", 7, min_tick=0.05)]}), ["XYZ"], timeout=2)
+        service = PriceAdjustmentService(Mock())
+
+        assert service._validate_and_round_price(12.33, "STK", "XYZ") == pytest.approx(12.35)
+        assert service._validate_and_round_price(12.333, "STK", "OTHER") == pytest.approx(12.33)
@@ -40,7 +40,8 @@ class TestEndOfDayService:
             close_buffer_minutes=15,
             pre_market_start_minutes=30,
             post_market_end_minutes=30,
-            max_close_attempts=3
+            max_close_attempts=3,
+            archive_old_orders=False
         )
         
         # Mock market hours methods with proper time objects
@@ -339,6 +340,24 @@ class TestEndOfDayService:
                 assert "status" in result
                 # The service may or may not close positions based on its internal logic
 
+    def test_archive_runs_once_per_day(self):
+        """Test the order archive runs on the first EOD pass of the day only."""
+        self.service.config.archive_old_orders = True
+        self.mock_state_service.db_session = Mock()
+
+        with patch('src.services.end_of_day_service.OrderArchiveService') as mock_archive_cls, \
+                patch.object(self.service, 'should_run_eod_process', return_value=True):
+            mock_archive_cls.return_value.archive.return_value = {
+                'executed_orders': 3, 'order_attempts': 2
+            }
+
+            first = self.service.run_eod_process()
+            second = self.service.run_eod_process()
+
+        assert first["rows_archived"] == 5
+        assert second["rows_archived"] == 0
+        mock_archive_cls.assert_called_once_with(self.mock_state_service.db_session)
+
     def _create_mock_position(self, symbol: str, strategy: str, quantity: int) -> Mock:
         """Helper to create mock position."""
         position = Mock(spec=ExecutedOrderDB)
@@ -370,6 +389,7 @@ class TestEODConfig:
         assert config.pre_market_start_minutes == 30
         assert config.post_market_end_minutes == 30
         assert config.max_close_attempts == 3
+        assert config.archive_old_orders is True
     
     def test_custom_values(self):
         """Test custom configuration values."""
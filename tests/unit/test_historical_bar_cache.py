@@ -0,0 +1,182 @@
+"""
+Tests for the on-disk historical bar cache and its use by HistoricalDataManager.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.market_data.managers.historical_bar_cache import HistoricalBarCache
+from src.market_data.managers.historical_data_manager import HistoricalDataManager
+
+
+def _bars(days, end=None, scale=1.0):
+    end = end or datetime.now()
+    return [
+        SimpleNamespace(date=(end - timedelta(days=offset)).strftime('%Y%m%d'),
+                        open=(100.0 + offset) * scale, high=(101.0 + offset) * scale, low=(99.0 + offset) * scale,
+                        close=(100.5 + offset) * scale, volume=1000 + offset)
+        for offset in range(days, -1, -1)
+    ]
+
+
+class RecordingClient:
+    """Answers reqHistoricalData with the last N daily bars of durationStr, recording each request."""
+
+    def __init__(self, manager):
+        self.connected = True
+        self.manager = manager
+        self.durations = []
+        self.scale = 1.0  # Changing it restates every bar, like a split adjustment
+
+    def reqHistoricalData(self, reqId, durationStr, **kwargs):
+        self.durations.append(durationStr)
+        days = int(durationStr.split()[0])
+        threading.Thread(target=self._deliver, args=(reqId, days), daemon=True).start()
+
+    def _deliver(self, req_id, days):
+        for bar in _bars(days - 1, scale=self.scale):
+            self.manager.historical_data(req_id, bar)
+        self.manager.historical_data_end(req_id, "", "")
+
+
+class TestHistoricalBarCache:
+
+    @pytest.mark.parametrize("file_format", ["parquet", "feather"])
+    def test_store_merges_and_round_trips(self, tmp_path, file_format):
+        cache = HistoricalBarCache(directory=str(tmp_path), file_format=file_format)
+        index = pd.to_datetime(["2024-01-02", "2024-01-03"])
+        cache.store("AAPL", "1 day", pd.DataFrame({'close': [1.0, 2.0]}, index=index))
+
+        update = pd.DataFrame({'close': [2.5, 3.0]}, index=pd.to_datetime(["2024-01-03", "2024-01-04"]))
+        cache.store("AAPL", "1 day", update, cached=cache.load("AAPL", "1 day"))
+
+        loaded = cache.load("AAPL", "1 day")
+        assert list(loaded['close']) == [1.0, 2.5, 3.0]
+        assert loaded.index.name == 'date'
+        assert cache.load("MSFT", "1 day") is None
+
+    def test_coverage_and_tail(self, tmp_path):
+        cache = HistoricalBarCache(directory=str(tmp_path))
+        now = datetime(2024, 3, 1, 12)
+        bars = pd.DataFrame({'close': range(60)},
+                            index=pd.date_range(end="2024-02-28", periods=60, freq="D"))
+
+        assert cache.covers(bars, 30, now)
+        assert not cache.covers(bars, 90, now)
+        # Refetch starts OVERLAP_BARS before the last cached bar (2024-02-25)
+        assert cache.tail_days(bars, now) == 6
+        assert len(cache.window(bars, 10, now)) == 9
+
+    def test_restatement_compares_settled_overlap_only(self, tmp_path):
+        cache = HistoricalBarCache(directory=str(tmp_path))
+        index = pd.date_range(end="2024-02-28", periods=5, freq="D")
+        cached = pd.DataFrame({'close': [10.0, 11.0, 12.0, 13.0, 14.0]}, index=index)
+
+        intraday_last_bar = pd.DataFrame({'close': [12.0, 13.0, 14.7, 15.0]}, index=index[2:].append(
+            pd.DatetimeIndex(["2024-02-29"])))
+        split_adjusted = pd.DataFrame({'close': [6.0, 6.5, 7.0]}, index=index[2:])
+
+        assert not cache.is_restated(cached, intraday_last_bar)
+        assert cache.is_restated(cached, split_adjusted)
+
+    def test_only_configured_bar_sizes_are_cached(self, tmp_path):
+        cache = HistoricalBarCache(directory=str(tmp_path), bar_sizes=['1 day'])
+        assert cache.supports("1 day")
+        assert not cache.supports("5 mins")
+
+
+class TestHistoricalDataManagerBarCache:
+
+    def setup_method(self):
+        self.manager = HistoricalDataManager()
+        self.client = RecordingClient(self.manager)
+        self.manager.set_ibkr_client(self.client)
+
+    def test_repeat_request_is_served_from_cache(self):
+        first = self.manager.request_historical_data("AAPL", days=100)
+        second = self.manager.request_historical_data("AAPL", days=50)
+
+        assert self.client.durations == ["100 D"]
+        assert len(second) < len(first)
+        assert second.index.max() == first.index.max()
+        assert self.manager.get_health_status()['bar_cache_hits'] == 1
+
+    def test_stale_cache_fetches_only_the_tail(self):
+        self.manager.request_historical_data("AAPL", days=100)
+        path = self.manager.bar_cache._path("AAPL", "1 day", "TRADES")
+        stale = time.time() - 3600
+        os.utime(path, (stale, stale))
+        self.manager.gateway.clear()
+
+        df = self.manager.request_historical_data("AAPL", days=100)
+
+        assert self.client.durations == ["100 D", "4 D"]
+        assert len(df) == 100
+        assert self.manager.get_health_status()['bar_cache_tail_fetches'] == 1
+
+    def test_async_request_merges_tail_into_cache(self):
+        self.manager.request_historical_data_async("MSFT", days=30).result(timeout=2)
+        assert self.manager.get_cached_historical_data("MSFT", days=30) is not None
+
+        path = self.manager.bar_cache._path("MSFT", "1 day", "TRADES")
+        os.utime(path, (0, 0))
+        self.manager.gateway.clear()
+        df = self.manager.request_historical_data_async("MSFT", days=30).result(timeout=2)
+
+        assert self.client.durations == ["30 D", "4 D"]
+        assert len(df) == 30
+
+    def test_restated_history_rebuilds_cache_entry(self):
+        self.manager.request_historical_data("AAPL", days=100)
+        path = self.manager.bar_cache._path("AAPL", "1 day", "TRADES")
+        os.utime(path, (0, 0))
+        self.manager.gateway.clear()
+        self.client.scale = 0.5
+
+        df = self.manager.request_historical_data_async("AAPL", days=100).result(timeout=2)
+
+        assert self.client.durations == ["100 D", "4 D", "100 D"]
+        assert len(df) == 100
+        cached = self.manager.bar_cache.load("AAPL", "1 day")
+        assert list(cached['close']) == list(df['close'])
+        assert cached['close'].iloc[-1] == pytest.approx(100.5 * 0.5)
+        assert self.manager.get_health_status()['bar_cache_restatements'] == 1
+
+    def test_restated_history_rebuilds_cache_entry_sync(self):
+        self.manager.request_historical_data("AAPL", days=100)
+        path = self.manager.bar_cache._path("AAPL", "1 day", "TRADES")
+        os.utime(path, (0, 0))
+        self.manager.gateway.clear()
+        self.client.scale = 0.5
+
+        df = self.manager.request_historical_data("AAPL", days=100)
+
+        assert self.client.durations == ["100 D", "4 D", "100 D"]
+        assert len(df) == 100
+        assert df['close'].iloc[0] == pytest.approx((100.5 + 99) * 0.5)  # Old bars adjusted too, not spliced
+        cached = self.manager.bar_cache.load("AAPL", "1 day")
+        assert list(cached['close']) == list(df['close'])
+        assert cached['close'].iloc[-1] == pytest.approx(100.5 * 0.5)
+        assert self.manager.get_health_status()['bar_cache_restatements'] == 1
+
+    def test_cancelled_caller_ignores_late_error(self, caplog):
+        self.client.reqHistoricalData = lambda reqId, durationStr, **kwargs: None
+        future = self.manager._submit_with_bar_cache("AAPL", 30, "1 day")
+        request_future = self.manager._active_requests[future.req_id]['future']
+        request_future.set_running_or_notify_cancel()  # Already answering, so it cannot be cancelled
+
+        with caplog.at_level(logging.ERROR, logger="concurrent.futures"):
+            assert future.cancel()
+            request_future.set_exception(RuntimeError("late IBKR error"))
+
+        assert future.cancelled()
+        assert not caplog.records
@@ -0,0 +1,144 @@
+"""
+Tests for single-flight coalescing and the TTL + LRU memory cache in HistoricalDataGateway.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import pandas as pd
+import pytest
+
+from src.market_data.managers.historical_data_gateway import HistoricalDataGateway
+
+
+def _frame(value=1.0):
+    return pd.DataFrame({'close': [value], 'volume': [1000]})
+
+
+class TestHistoricalDataGateway:
+
+    def test_concurrent_identical_requests_share_one_load(self):
+        gateway = HistoricalDataGateway()
+        calls = []
+        release = threading.Event()
+
+        def loader():
+            calls.append(1)
+            release.wait(2)
+            return _frame()
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = [pool.submit(gateway.get, ('ibkr', 'AAPL', 100, '1 day', 'TRADES'), loader) for _ in range(5)]
+            time.sleep(0.1)
+            release.set()
+            frames = [r.result(timeout=2) for r in results]
+
+        assert len(calls) == 1
+        assert all(list(df['close']) == [1.0] for df in frames)
+        assert gateway.get_metrics()['coalesced'] == 4
+
+    def test_results_expire_after_ttl_and_consumers_get_copies(self):
+        now = [0.0]
+        gateway = HistoricalDataGateway(ttl_seconds=60, clock=lambda: now[0])
+        key = ('ibkr', 'AAPL', 100, '1 day', 'TRADES')
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return _frame()
+
+        first = gateway.get(key, loader)
+        first['close'] = 99.0
+        assert list(gateway.get(key, loader)['close']) == [1.0]
+
+        now[0] = 61
+        gateway.get(key, loader)
+        assert len(loads) == 2
+
+    def test_lru_bound_and_failures_are_not_cached(self):
+        gateway = HistoricalDataGateway(max_entries=2)
+        for symbol in ('A', 'B', 'C'):
+            gateway.get(('ibkr', symbol, 1, '1 day', 'TRADES'), _frame)
+        assert gateway.peek(('ibkr', 'A', 1, '1 day', 'TRADES')) is None
+        assert gateway.get_metrics()['evictions'] == 1
+
+        gateway.get(('ibkr', 'D', 1, '1 day', 'TRADES'), lambda: None)
+        assert gateway.peek(('ibkr', 'D', 1, '1 day', 'TRADES')) is None
+
+        with pytest.raises(ValueError):
+            gateway.get(('ibkr', 'E', 1, '1 day', 'TRADES'), lambda: (_ for _ in ()).throw(ValueError("boom")))
+        assert gateway.get_metrics()['in_flight'] == 0
+
+    def test_async_requests_join_the_in_flight_future(self):
+        gateway = HistoricalDataGateway()
+        key = ('ibkr', 'MSFT', 30, '1 day', 'TRADES')
+        request = Future()
+        submits = []
+
+        def submit():
+            submits.append(1)
+            return request
+
+        first = gateway.get_async(key, submit)
+        second = gateway.get_async(key, submit)
+        request.set_result(_frame(5.0))
+
+        assert len(submits) == 1
+        assert list(first.result(timeout=1)['close']) == [5.0]
+        assert list(second.result(timeout=1)['close']) == [5.0]
+        assert gateway.get_async(key, submit).done()
+
+    def test_shared_request_cancelled_only_when_all_callers_detach(self):
+        gateway = HistoricalDataGateway()
+        key = ('ibkr', 'MSFT', 30, '1 day', 'TRADES')
+        request = Future()
+
+        first = gateway.get_async(key, lambda: request)
+        second = gateway.get_async(key, lambda: request)
+
+        first.cancel()
+        assert not request.cancelled()
+        second.cancel()
+        assert request.cancelled()
+        assert gateway.get_metrics()['in_flight'] == 0
+
+    def test_sync_follower_detaches_when_async_request_never_completes(self):
+        gateway = HistoricalDataGateway(request_timeout=0.2)
+        key = ('ibkr', 'MSFT', 30, '1 day', 'TRADES')
+        request = Future()
+
+        async_caller = gateway.get_async(key, lambda: request)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            sync_caller = pool.submit(gateway.get, key, lambda: _frame())
+            time.sleep(0.05)
+            async_caller.cancel()  # e.g. the scheduler expiring its request
+
+            with pytest.raises(FutureTimeoutError):
+                sync_caller.result(timeout=2)
+
+        assert request.cancelled()
+        assert gateway.get_metrics()['in_flight'] == 0
+
+    def test_request_past_its_deadline_is_evicted_for_the_next_caller(self):
+        now = [0.0]
+        gateway = HistoricalDataGateway(request_timeout=15, clock=lambda: now[0])
+        key = ('ibkr', 'MSFT', 30, '1 day', 'TRADES')
+        stuck, fresh = Future(), Future()
+
+        first = gateway.get_async(key, lambda: stuck)
+        now[0] = 16
+        second = gateway.get_async(key, lambda: fresh)
+        fresh.set_result(_frame(7.0))
+
+        assert stuck.cancelled() and first.cancelled()
+        assert gateway.get_metrics()['expired_requests'] == 1
+        assert list(second.result(timeout=1)['close']) == [7.0]
+
+    def test_latest_returns_daily_bars_for_any_span(self):
+        gateway = HistoricalDataGateway()
+        gateway.get(('ibkr', 'AAPL', 100, '1 day', 'TRADES'), _frame)
+
+        assert gateway.latest('AAPL', '1 day') is not None
+        assert gateway.latest('AAPL', '1 hour') is None
+        assert gateway.latest('MSFT', '1 day') is None
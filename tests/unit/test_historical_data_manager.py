@@ -0,0 +1,266 @@
+"""
+Tests for event-driven completion of historical data and scanner requests.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+from ibapi.wrapper import EWrapper
+
+from src.brokers.ibkr.ibkr_client import IbkrClient
+
+from src.market_data.managers.historical_bar_buffer import HistoricalBarBuffer
+from src.market_data.managers.historical_data_manager import HistoricalDataError, HistoricalDataManager
+from src.scanning.integration.historical_eod_provider import HistoricalEODProvider
+
+
+def _bar(date, close):
+    return SimpleNamespace(date=date, open=close, high=close, low=close, close=close, volume=1000)
+
+
+class FakeHistoricalClient:
+    """IBKR client stand-in that answers reqHistoricalData from a background thread."""
+
+    def __init__(self, manager, bars=None, delay=0.05, respond=True):
+        self.connected = True
+        self.manager = manager
+        self.bars = bars if bars is not None else [_bar("20240102", 100.0), _bar("20240103", 101.0)]
+        self.delay = delay
+        self.respond = respond
+        self.requests = []
+        self.cancelled = []
+
+    def reqHistoricalData(self, reqId, **kwargs):
+        self.requests.append(reqId)
+        if self.respond:
+            threading.Thread(target=self._deliver, args=(reqId,), daemon=True).start()
+
+    def cancelHistoricalData(self, reqId):
+        self.cancelled.append(reqId)
+
+    def _deliver(self, req_id):
+        time.sleep(self.delay)
+        for bar in self.bars:
+            self.manager.historical_data(req_id, bar)
+        self.manager.historical_data_end(req_id, "", "")
+
+
+class TestHistoricalDataManagerFutures:
+
+    def setup_method(self):
+        self.manager = HistoricalDataManager()
+
+    def test_async_request_resolves_on_historical_data_end(self):
+        self.manager.set_ibkr_client(FakeHistoricalClient(self.manager))
+
+        future = self.manager.request_historical_data_async("AAPL", days=2)
+        df = future.result(timeout=2)
+
+        assert list(df['close']) == [100.0, 101.0]
+        assert self.manager.get_health_status()['active_requests'] == 0
+
+    def test_sync_request_returns_without_polling_delay(self):
+        self.manager.set_ibkr_client(FakeHistoricalClient(self.manager, delay=0.01))
+
+        start = time.time()
+        df = self.manager.request_historical_data("AAPL", days=2)
+
+        assert len(df) == 2
+        assert time.time() - start < 0.4
+
+    def test_response_before_wait_is_not_lost(self):
+        self.manager.set_ibkr_client(FakeHistoricalClient(self.manager, delay=0))
+        future = self.manager.request_historical_data_async("AAPL")
+        time.sleep(0.1)
+
+        assert future.done()
+        assert len(future.result()) == 2
+
+    def test_timeout_cancels_and_releases_request(self):
+        client = FakeHistoricalClient(self.manager, respond=False)
+        self.manager.set_ibkr_client(client)
+        self.manager._request_timeout = 0.1
+
+        future = self.manager._submit_historical_request("AAPL", "1 D", "1 day")
+        assert self.manager._wait_for_historical_response(future, "AAPL") is None
+        assert future.cancelled()
+        assert self.manager.get_health_status()['active_requests'] == 0
+        assert client.cancelled == [future.req_id]
+
+        # A late end callback for the cancelled request is ignored
+        self.manager.historical_data_end(future.req_id, "", "")
+
+    def test_cancelling_async_request_cancels_at_ibkr(self):
+        client = FakeHistoricalClient(self.manager, respond=False)
+        self.manager.set_ibkr_client(client)
+
+        future = self.manager.request_historical_data_async("AAPL", days=2)
+        future.cancel()
+
+        assert client.cancelled == client.requests
+        health = self.manager.get_health_status()
+        assert health['cancelled_requests'] == 1 and health['active_requests'] == 0
+
+    def test_async_request_without_connection_fails_fast(self):
+        future = self.manager.request_historical_data_async("AAPL")
+
+        with pytest.raises(ConnectionError):
+            future.result(timeout=0)
+
+
+class TestHistoricalEODProviderEvents:
+
+    def setup_method(self):
+        self.client = Mock()
+        self.provider = HistoricalEODProvider(SimpleNamespace(ibkr_client=self.client))
+
+    def test_scanner_wait_returns_when_scan_ends(self):
+        self.provider._scanner_done.clear()
+        self.provider._scanner_results = {"AAPL": {}, "MSFT": {}}
+        self.provider._process_scanner_results = Mock()
+        threading.Timer(0.05, self.provider.scanner_data_end_callback, args=(7,)).start()
+
+        start = time.time()
+        symbols = self.provider._wait_for_scanner_results(7, timeout=5)
+
+        assert sorted(symbols) == ["AAPL", "MSFT"]
+        assert time.time() - start < 1
+        self.client.cancelScannerSubscription.assert_called_once_with(7)
+
+    def test_single_eod_price_returns_on_first_bar(self):
+        def deliver(reqId, **kwargs):
+            threading.Timer(0.02, self.provider.historical_data_callback,
+                            args=(reqId, _bar("20240103 00:00:00", 55.0))).start()
+        self.client.reqHistoricalData.side_effect = deliver
+
+        start = time.time()
+        result = self.provider._get_single_eod_price("AAPL")
+
+        assert result['price'] == 55.0
+        assert time.time() - start < 0.4
+        assert self.provider._pending_requests == {}
+
+
+class TestHistoricalDataErrors:
+
+    def test_ibkr_error_fails_matching_request(self):
+        manager = HistoricalDataManager()
+        manager.set_ibkr_client(FakeHistoricalClient(manager, respond=False))
+        future = manager.request_historical_data_async("AAPL")
+
+        assert manager.historical_data_error(future.req_id, 162, "Historical data request pacing violation")
+        with pytest.raises(HistoricalDataError) as exc_info:
+            future.result(timeout=0)
+        assert exc_info.value.is_pacing_violation
+        assert manager.get_health_status()['active_requests'] == 0
+
+    def test_unrelated_error_codes_are_ignored(self):
+        manager = HistoricalDataManager()
+        manager.set_ibkr_client(FakeHistoricalClient(manager, respond=False))
+        future = manager.request_historical_data_async("AAPL")
+
+        assert not manager.historical_data_error(future.req_id, 2104, "Market data farm connection is OK")
+        assert not future.done()
+
+    def test_connection_manager_routes_errors_to_historical_requests(self, monkeypatch):
+        # IBKR calls back into the ConnectionManager, not the IbkrClient facade
+        monkeypatch.setattr(EWrapper, "error", lambda self, *args: None)
+        client = IbkrClient()
+        manager = HistoricalDataManager()
+        manager.set_ibkr_client(FakeHistoricalClient(manager, respond=False))
+        client.market_data_handler.set_historical_data_manager(manager)
+        future = manager.request_historical_data_async("MSFT")
+
+        client.connection_manager.error(future.req_id, 162, "Historical data request pacing violation")
+
+        with pytest.raises(HistoricalDataError) as exc_info:
+            future.result(timeout=0)
+        assert exc_info.value.is_pacing_violation
+
+
+class TestHistoricalDataCoalescing:
+
+    def test_managers_share_identical_in_flight_request(self):
+        first_manager, second_manager = HistoricalDataManager(), HistoricalDataManager()
+        client = FakeHistoricalClient(first_manager, delay=0.1)
+        first_manager.set_ibkr_client(client)
+        second_manager.set_ibkr_client(client)
+
+        first = first_manager.request_historical_data_async("AAPL", days=5, bar_size="1 hour")
+        second = second_manager.request_historical_data_async("AAPL", days=5, bar_size="1 hour")
+
+        assert len(first.result(timeout=2)) == len(second.result(timeout=2)) == 2
+        assert len(client.requests) == 1
+        assert second_manager.request_historical_data("AAPL", days=5, bar_size="1 hour") is not None
+        assert len(client.requests) == 1
+
+
+class TestHistoricalBarBuffer:
+
+    def test_intraday_bars_keep_their_time(self):
+        buffer = HistoricalBarBuffer(capacity=2)
+        for minute in range(5):
+            buffer.append(_bar(f"20240102  09:3{minute}:00 US/Eastern", 100.0 + minute))
+
+        df = buffer.to_frame("AAPL")
+
+        assert len(df) == 5
+        assert df.index[0] == pd.Timestamp("2024-01-02 09:30:00")
+        assert df.index[-1] == pd.Timestamp("2024-01-02 09:34:00")
+        assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume', 'symbol']
+
+    def test_daily_bars_sorted_and_bad_dates_dropped(self):
+        manager = HistoricalDataManager()
+        bars = [_bar("20240103", 2.0), _bar("not-a-date", 9.0), _bar("20240102", 1.0)]
+
+        df = manager._process_historical_bars(bars, "AAPL")
+
+        assert list(df['close']) == [1.0, 2.0]
+        assert df.index.is_monotonic_increasing
+
+    def test_large_intraday_request(self):
+        start = pd.Timestamp("2024-01-02 09:30:00")
+        stamps = pd.date_range(start, periods=10_000, freq="min")
+        buffer = HistoricalBarBuffer()
+        for i, stamp in enumerate(stamps):
+            buffer.append(_bar(stamp.strftime('%Y%m%d  %H:%M:%S'), float(i)))
+
+        df = buffer.to_frame()
+
+        assert len(df) == 10_000
+        assert (df.index == stamps).all()
+        assert df['close'].iloc[-1] == 9_999.0
+
+
+class TestHistoricalBarCallbacks:
+
+    def test_bars_are_not_logged_individually(self):
+        manager = HistoricalDataManager()
+        manager.context_logger = Mock()
+        request = manager._setup_request_tracking(1, "AAPL")
+
+        for minute in range(50):
+            manager.historical_data(1, _bar(f"20240102  10:{minute:02d}:00", 100.0))
+        manager.historical_data_end(1, "", "")
+
+        assert manager.context_logger.log_event.call_count == 1
+        summary = manager.context_logger.log_event.call_args.kwargs['context_provider']
+        assert summary['bars_received'] == 50
+        assert summary['first_bar'] == "20240102  10:00:00"
+        assert summary['last_bar'] == "20240102  10:49:00"
+        assert len(request['future'].result(timeout=0)) == 50
+
+    def test_debug_sampling_logs_every_nth_bar(self):
+        manager = HistoricalDataManager()
+        manager.context_logger = Mock()
+        manager._bar_log_sample_every = 10
+        manager._setup_request_tracking(1, "AAPL")
+
+        for minute in range(25):
+            manager.historical_data(1, _bar(f"20240102  10:{minute:02d}:00", 100.0))
+
+        assert manager.context_logger.log_event.call_count == 2
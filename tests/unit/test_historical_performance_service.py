@@ -21,4 +21,59 @@ class TestHistoricalPerformanceService(unittest.TestCase):
         
         self.assertEqual(performance['win_rate'], 0.5)
         self.assertEqual(performance['profit_factor'], 2.0)
-        self.assertEqual(performance['total_trades'], 2)
\ No newline at end of file
+        self.assertEqual(performance['total_trades'], 2)
+    
+    def test_setup_performance_from_rollups(self):
+        """Test setup performance is derived from summed daily rollups."""
+        self.mock_persistence.get_setup_performance_rollups.return_value = {
+            'Breakout': {
+                'total_trades': 4, 'winning_trades': 3, 'losing_trades': 1,
+                'total_profit': 300.0, 'total_loss': 100.0,
+                'holding_minutes': 240.0, 'holding_count': 4
+            }
+        }
+        
+        performance = self.service.get_setup_performance('Breakout', days_back=30)
+        
+        self.mock_persistence.get_setup_performance_rollups.assert_called_once_with(
+            days_back=30, account_number=None, setup_name='Breakout')
+        self.assertEqual(performance['win_rate'], 0.75)
+        self.assertEqual(performance['profit_factor'], 3.0)
+        self.assertEqual(performance['avg_pnl'], 50.0)
+        self.assertEqual(performance['avg_holding_period'], 60.0)
+        self.assertEqual(performance['analysis_period_days'], 30)
+    
+    def test_all_setups_performance_single_rollup_query(self):
+        """Test all setups are served by one grouped rollup query."""
+        self.mock_persistence.get_setup_performance_rollups.return_value = {
+            'Breakout': {'total_trades': 2, 'winning_trades': 1, 'losing_trades': 1,
+                         'total_profit': 100.0, 'total_loss': 50.0,
+                         'holding_minutes': 0.0, 'holding_count': 0},
+            'Reversal': {'total_trades': 1, 'winning_trades': 0, 'losing_trades': 1,
+                         'total_profit': 0.0, 'total_loss': 20.0,
+                         'holding_minutes': 0.0, 'holding_count': 0}
+        }
+        
+        performance = self.service.get_all_setups_performance(days_back=7)
+        
+        self.assertEqual(set(performance.keys()), {'Breakout', 'Reversal'})
+        self.assertEqual(self.mock_persistence.get_setup_performance_rollups.call_count, 1)
+        # Per-setup lookups are now served from the cache populated by the bulk query
+        self.service.get_setup_performance('Reversal', days_back=7)
+        self.assertEqual(self.mock_persistence.get_setup_performance_rollups.call_count, 1)
+    
+    def test_setup_performance_is_cached_per_account(self):
+        """Test account-specific lookups query and cache each account separately."""
+        self.mock_persistence.get_setup_performance_rollups.return_value = {
+            'Breakout': {'total_trades': 1, 'winning_trades': 1, 'losing_trades': 0,
+                         'total_profit': 100.0, 'total_loss': 0.0,
+                         'holding_minutes': 0.0, 'holding_count': 0}
+        }
+        
+        self.service.get_setup_performance('Breakout', days_back=30, account_number='DU123')
+        self.service.get_setup_performance('Breakout', days_back=30, account_number='DU456')
+        self.service.get_setup_performance('Breakout', days_back=30, account_number='DU123')
+        
+        accounts = [c.kwargs['account_number']
+                    for c in self.mock_persistence.get_setup_performance_rollups.call_args_list]
+        self.assertEqual(accounts, ['DU123', 'DU456'])
@@ -0,0 +1,226 @@
+"""
+Tests for the pacing-aware HistoricalRequestScheduler.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+import pandas as pd
+import pytest
+
+from src.market_data.managers.historical_data_manager import HistoricalDataError
+from src.market_data.managers.historical_request_scheduler import (
+    HistoricalRequestPriority,
+    HistoricalRequestScheduler,
+    _HistoricalJob,
+    get_historical_request_scheduler
+)
+from src.scanning.integration.historical_eod_provider import HistoricalEODProvider
+
+
+def _pacing(**overrides):
+    pacing = {
+        'max_in_flight': 4,
+        'pacing_window_requests': 60,
+        'pacing_window_seconds': 600,
+        'identical_request_seconds': 15,
+        'contract_burst_requests': 6,
+        'contract_burst_seconds': 2,
+        'request_timeout_seconds': 5,
+        'max_retries': 2,
+        'backoff_base_seconds': 0.05,
+        'backoff_max_seconds': 1
+    }
+    pacing.update(overrides)
+    return {'historical_data': pacing}
+
+
+class FakeManager:
+    """Resolves each async request from a background thread and records concurrency."""
+
+    def __init__(self, delay=0.05, errors=None, respond=True, silent=()):
+        self.delay = delay
+        self.errors = dict(errors or {})
+        self.respond = respond
+        self.silent = set(silent)  # Symbols whose requests are never answered
+        self.calls = []
+        self.requests = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def request_historical_data_async(self, symbol, days, bar_size):
+        future = Future()
+        with self._lock:
+            self.calls.append((symbol, time.monotonic()))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            error = self.errors.pop(symbol, None)
+            self.requests.setdefault(symbol, []).append(future)
+        if self.respond and symbol not in self.silent:
+            threading.Thread(target=self._resolve, args=(future, symbol, error), daemon=True).start()
+        return future
+
+    def _resolve(self, future, symbol, error):
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if error:
+            future.set_exception(error)
+        else:
+            future.set_result(pd.DataFrame({'close': [1.0]}, index=[pd.Timestamp('2024-01-02')]))
+
+
+class TestHistoricalRequestScheduler:
+
+    def test_requests_run_concurrently_up_to_limit(self):
+        manager = FakeManager(delay=0.1)
+        scheduler = HistoricalRequestScheduler(manager, _pacing(max_in_flight=4))
+
+        start = time.monotonic()
+        results = scheduler.fetch_many([f"S{i}" for i in range(8)], days=10, timeout=5)
+
+        assert all(df is not None for df in results.values())
+        assert manager.max_in_flight == 4
+        assert time.monotonic() - start < 0.6  # two waves of 0.1s, not eight sequential requests
+        metrics = scheduler.get_metrics()
+        assert metrics['completed'] == 8
+        assert metrics['in_flight'] == 0 and metrics['queued'] == 0
+
+    def test_pacing_window_limits_dispatch_rate(self):
+        manager = FakeManager(delay=0.01)
+        scheduler = HistoricalRequestScheduler(
+            manager, _pacing(pacing_window_requests=3, pacing_window_seconds=0.3)
+        )
+
+        scheduler.fetch_many([f"S{i}" for i in range(6)], timeout=5)
+
+        times = [t for _, t in manager.calls]
+        assert times[3] - times[0] >= 0.29
+
+    def test_identical_request_is_spaced(self):
+        manager = FakeManager(delay=0.01)
+        scheduler = HistoricalRequestScheduler(manager, _pacing(identical_request_seconds=0.2))
+
+        first = scheduler.submit("AAPL", days=5)
+        second = scheduler.submit("AAPL", days=5)
+        first.result(timeout=2)
+        second.result(timeout=2)
+
+        assert manager.calls[1][1] - manager.calls[0][1] >= 0.19
+
+    def test_contract_burst_rule(self):
+        clock = [100.0]
+        scheduler = HistoricalRequestScheduler(FakeManager(), _pacing(), clock=lambda: clock[0])
+        for days in range(6):
+            scheduler._record_dispatch(_HistoricalJob("AAPL", days, "1 day"), clock[0])
+
+        assert scheduler._pacing_delay(_HistoricalJob("AAPL", 99, "1 day"), clock[0]) == pytest.approx(2.0)
+        assert scheduler._pacing_delay(_HistoricalJob("MSFT", 99, "1 day"), clock[0]) == 0
+        clock[0] += 2.0
+        assert scheduler._pacing_delay(_HistoricalJob("AAPL", 99, "1 day"), clock[0]) == 0
+
+    def test_pacing_violation_is_retried_with_backoff(self):
+        violation = HistoricalDataError(1, 162, "Historical Market Data Service error message:Historical data request pacing violation")
+        manager = FakeManager(delay=0.01, errors={"AAPL": violation})
+        scheduler = HistoricalRequestScheduler(manager, _pacing(identical_request_seconds=0))
+
+        df = scheduler.submit("AAPL").result(timeout=2)
+
+        assert not df.empty
+        assert [symbol for symbol, _ in manager.calls] == ["AAPL", "AAPL"]
+        assert manager.calls[1][1] - manager.calls[0][1] >= 0.05
+        metrics = scheduler.get_metrics()
+        assert metrics['pacing_violations'] == 1
+        assert metrics['retried'] == 1
+
+    def test_other_errors_are_not_retried(self):
+        no_data = HistoricalDataError(1, 162, "HMDS query returned no data")
+        manager = FakeManager(delay=0.01, errors={"AAPL": no_data})
+        scheduler = HistoricalRequestScheduler(manager, _pacing())
+
+        with pytest.raises(HistoricalDataError):
+            scheduler.submit("AAPL").result(timeout=2)
+        assert len(manager.calls) == 1
+        assert scheduler.get_metrics()['failed'] == 1
+
+    def test_unanswered_request_times_out(self):
+        scheduler = HistoricalRequestScheduler(FakeManager(respond=False), _pacing(request_timeout_seconds=0.1))
+
+        with pytest.raises(FutureTimeoutError):
+            scheduler.submit("AAPL").result(timeout=2)
+        assert scheduler.get_metrics()['timed_out'] == 1
+
+    def test_urgent_request_is_dispatched_before_queued_batch_work(self):
+        manager = FakeManager(delay=0.05)
+        scheduler = HistoricalRequestScheduler(manager, _pacing(max_in_flight=1))
+
+        batch = [scheduler.submit(f"B{i}", priority=HistoricalRequestPriority.BATCH) for i in range(4)]
+        urgent = scheduler.submit("LIVE", priority=HistoricalRequestPriority.EXECUTION_CRITICAL)
+        urgent.result(timeout=2)
+        for future in batch:
+            future.result(timeout=2)
+
+        order = [symbol for symbol, _ in manager.calls]
+        assert order.index("LIVE") <= 1  # At most the batch request already in flight goes first
+
+    def test_urgent_request_preempts_in_flight_batch_request(self):
+        manager = FakeManager(delay=0.01, silent={"B0", "B1"})
+        scheduler = HistoricalRequestScheduler(manager, _pacing(max_in_flight=2))
+
+        batch = [scheduler.submit(f"B{i}", priority=HistoricalRequestPriority.BATCH) for i in range(2)]
+        deadline = time.monotonic() + 1
+        while scheduler.get_metrics()['in_flight'] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert not scheduler.submit("LIVE", priority=HistoricalRequestPriority.INTERACTIVE).result(timeout=2).empty
+        assert scheduler.get_metrics()['preempted'] == 1
+        assert sum(f.cancelled() for futures in manager.requests.values() for f in futures) == 1
+        assert not any(future.done() for future in batch)  # Preempted job is requeued, not failed
+        scheduler.shutdown()
+
+    def test_abandoned_request_is_cancelled(self):
+        manager = FakeManager(silent={"AAPL"})
+        scheduler = HistoricalRequestScheduler(manager, _pacing())
+
+        future = scheduler.submit("AAPL")
+        deadline = time.monotonic() + 1
+        while not manager.requests and time.monotonic() < deadline:
+            time.sleep(0.01)
+        future.cancel()
+
+        assert manager.requests["AAPL"][0].cancelled()
+        metrics = scheduler.get_metrics()
+        assert metrics['abandoned'] == 1 and metrics['in_flight'] == 0
+
+    def test_cancel_pending_drops_batch_jobs_only(self):
+        manager = FakeManager(silent={"B0", "LIVE"})
+        scheduler = HistoricalRequestScheduler(manager, _pacing(max_in_flight=1))
+
+        batch = [scheduler.submit(f"B{i}", priority=HistoricalRequestPriority.BATCH) for i in range(3)]
+        live = scheduler.submit("LIVE", priority=HistoricalRequestPriority.INTERACTIVE)
+        deadline = time.monotonic() + 1
+        while "LIVE" not in manager.requests and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert scheduler.cancel_pending(HistoricalRequestPriority.BATCH) == 3
+        assert all(future.cancelled() for future in batch)
+        assert not live.done()
+        scheduler.shutdown()
+
+    def test_process_wide_scheduler_is_shared_by_eod_providers(self):
+        first, second = HistoricalEODProvider(), HistoricalEODProvider()
+
+        assert first.request_scheduler is second.request_scheduler is get_historical_request_scheduler()
+        # The first manager offered is kept until the callback routing rebinds it
+        assert first.request_scheduler.historical_manager is first.historical_manager
+        first.request_scheduler.set_historical_manager(second.historical_manager)
+        assert get_historical_request_scheduler().historical_manager is second.historical_manager
+
+    def test_scheduler_without_manager_fails_fast(self):
+        scheduler = HistoricalRequestScheduler(None, _pacing())
+
+        with pytest.raises(ConnectionError):
+            scheduler.submit("AAPL", priority=HistoricalRequestPriority.EXECUTION_CRITICAL).result(timeout=2)
+        scheduler.shutdown()
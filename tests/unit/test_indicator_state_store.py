@@ -0,0 +1,76 @@
+"""
+Tests for the persisted incremental indicator state store.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.market_data.managers.indicator_state_store import IndicatorStateStore
+
+
+def _closes(bars, start='2024-01-01', seed=7):
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 + np.cumsum(rng.normal(0, 1, bars)), index=pd.bdate_range(start, periods=bars))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return IndicatorStateStore(path=str(tmp_path / "indicator_state.json"))
+
+
+def test_new_bars_are_folded_in_incrementally(store):
+    closes = _closes(130)
+
+    store.update_ema("AAPL", "1 day", 20, closes.iloc[:100])
+    value = store.update_ema("AAPL", "1 day", 20, closes.iloc[3:103])  # Next scan: window moved 3 bars
+
+    # Matches a full recompute over every bar seen so far
+    assert value == pytest.approx(closes.iloc[:103].ewm(span=20).mean().iloc[-1], rel=1e-12)
+    metrics = store.get_metrics()
+    assert metrics['full_recomputes'] == 1
+    assert metrics['incremental_updates'] == 1
+    assert metrics['bars_applied'] == 3
+
+
+def test_restated_close_or_gap_forces_recompute(store):
+    closes = _closes(60)
+    store.update_ema("AAPL", "1 day", 10, closes.iloc[:50])
+
+    split_adjusted = closes.iloc[:55] / 2
+    value = store.update_ema("AAPL", "1 day", 10, split_adjusted)
+    assert value == pytest.approx(split_adjusted.ewm(span=10).mean().iloc[-1])
+
+    later = _closes(30, start='2024-06-03')  # No overlap with the stored bar
+    store.update_ema("AAPL", "1 day", 10, later)
+
+    metrics = store.get_metrics()
+    assert metrics['restatements'] == 1
+    assert metrics['gaps'] == 1
+    assert metrics['full_recomputes'] == 3
+
+
+def test_state_survives_restart(store):
+    closes = _closes(80)
+    store.update_ema("MSFT", "1 day", 50, closes.iloc[:79])
+    store.flush(force=True)
+
+    reloaded = IndicatorStateStore(path=store.path)
+    value = reloaded.update_ema("MSFT", "1 day", 50, closes)
+
+    assert reloaded.get_metrics()['incremental_updates'] == 1
+    assert value == pytest.approx(closes.ewm(span=50).mean().iloc[-1], rel=1e-12)
+
+
+def test_forming_bar_is_not_committed(store):
+    closes = _closes(40)
+    first = store.update_sma("SPY", "1H", 20, closes, last_bar_final=False)
+
+    revised = closes.copy()
+    revised.iloc[-1] += 5.0  # The forming bar trades higher before it closes
+    second = store.update_sma("SPY", "1H", 20, revised, last_bar_final=False)
+
+    assert first == pytest.approx(closes.iloc[-20:].mean())
+    assert second == pytest.approx(revised.iloc[-20:].mean())
+    assert store.get_metrics()['restatements'] == 0
+    assert store.get("SPY", "1H", "sma", 20).timestamp == closes.index[-2].isoformat()
@@ -1,9 +1,15 @@
 """Tests for MarketContextService"""
 import unittest
+from concurrent.futures import Future
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 import pandas as pd
 from datetime import datetime
 
+from src.market_data.managers.historical_data_manager import HistoricalDataManager
+from src.market_data.managers.historical_request_scheduler import (
+    HistoricalRequestPriority, get_historical_request_scheduler
+)
 from src.services.market_context_service import MarketContextService
 
 class TestMarketContextService(unittest.TestCase):
@@ -25,3 +31,47 @@ class TestMarketContextService(unittest.TestCase):
 
             self.assertEqual(result1, result2)
             self.assertEqual(mock_analyze.call_count, first_call_count)  # no increase in calls
+
+    def test_dominant_timeframe_uses_single_base_request(self):
+        """All four timeframes are derived from one 15min request."""
+        index = pd.date_range("2024-01-02 09:30", periods=2000, freq="15min")
+        bars = pd.DataFrame({'open': 1.0, 'high': 2.0, 'low': 0.5,
+                             'close': [100 + (i % 7) for i in range(len(index))],
+                             'volume': 1000.0}, index=index)
+        self.mock_data_feed.get_historical_data.side_effect = lambda symbol, timeframe, count: bars.tail(count)
+
+        self.service.get_dominant_timeframe("MSFT")
+
+        requested = [call.args[1] for call in self.mock_data_feed.get_historical_data.call_args_list]
+        self.assertEqual(requested, ['15min'])
+
+    def test_broker_history_goes_through_scheduler_as_execution_critical(self):
+        """IBKR-backed feeds fetch bars through the shared scheduler, ahead of scanner batches."""
+        manager = HistoricalDataManager()
+        service = MarketContextService(SimpleNamespace(historical_data_manager=manager))
+        index = pd.date_range("2024-01-02 09:30", periods=100, freq="15min")
+        done = Future()
+        done.set_result(pd.DataFrame({'close': 100.0, 'volume': 1000.0}, index=index))
+
+        scheduler = get_historical_request_scheduler()
+        with patch.object(scheduler, 'submit', return_value=done) as submit:
+            data = service._get_historical_prices("MSFT", '15min', 20)
+
+        self.assertEqual(len(data), 20)
+        symbol, days, bar_size = submit.call_args.args
+        self.assertEqual((symbol, bar_size), ("MSFT", '15 mins'))
+        self.assertGreaterEqual(days, 1)
+        self.assertEqual(submit.call_args.kwargs['priority'], HistoricalRequestPriority.EXECUTION_CRITICAL)
+        self.assertIs(scheduler.historical_manager, manager)
+
+    def test_prefetch_failure_is_logged(self):
+        """A failed prefetch is reported instead of being silently dropped."""
+        self.service.bar_service = Mock()
+        self.service.bar_service.prefetch.side_effect = RuntimeError("feed down")
+
+        with patch.object(self.service, '_analyze_timeframe_strength', return_value=0.5), \
+                patch('src.services.market_context_service.context_logger') as mock_logger:
+            self.service.get_dominant_timeframe("MSFT")
+
+        reasons = [call.kwargs.get('decision_reason') for call in mock_logger.log_event.call_args_list]
+        self.assertIn("TIME_FRAME_PREFETCH_FAILED", reasons)
@@ -0,0 +1,120 @@
+"""
+Tests for MultiTimeframeBarService base fetching, local resampling and derived-frame caching.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.market_data.managers.multi_timeframe_bar_service import MultiTimeframeBarService
+
+
+def _session_bars(days=30, freq="15min"):
+    """Regular-session bars (09:30-16:00) on business days."""
+    frames = []
+    for day in pd.bdate_range("2024-01-02", periods=days):
+        index = pd.date_range(day + pd.Timedelta(hours=9, minutes=30), day + pd.Timedelta(hours=15, minutes=45), freq=freq)
+        frames.append(pd.DataFrame({
+            'open': np.arange(len(index), dtype=float),
+            'high': np.arange(len(index), dtype=float) + 1,
+            'low': np.arange(len(index), dtype=float) - 1,
+            'close': np.arange(len(index), dtype=float) + 0.5,
+            'volume': np.full(len(index), 100.0)
+        }, index=index))
+    frame = pd.concat(frames)
+    frame.index.name = 'date'
+    return frame
+
+
+class RecordingLoader:
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = []
+
+    def __call__(self, symbol, timeframe, bars):
+        self.calls.append((symbol, timeframe, bars))
+        return self.frame.tail(bars)
+
+
+class TestMultiTimeframeBarService:
+
+    def test_prefetch_fetches_base_once_for_all_timeframes(self):
+        loader = RecordingLoader(_session_bars())
+        service = MultiTimeframeBarService(loader, base_timeframe='15min')
+
+        service.prefetch("AAPL", ['15min', '1H', '4H', '1D'], 20)
+        frames = {tf: service.get_bars("AAPL", tf, 20) for tf in ['15min', '1H', '4H', '1D']}
+
+        assert [call[1] for call in loader.calls] == ['15min']
+        assert len(frames['1D']) == 20
+        assert len(frames['1H']) == 20
+        assert frames['1D']['volume'].iloc[-1] == 26 * 100.0  # 26 fifteen-minute bars per session
+
+    def test_daily_resample_aggregates_ohlcv(self):
+        bars = _session_bars(days=1)
+
+        daily = MultiTimeframeBarService.resample(bars, '1D')
+
+        assert len(daily) == 1
+        row = daily.iloc[0]
+        assert row['open'] == bars['open'].iloc[0]
+        assert row['high'] == bars['high'].max()
+        assert row['low'] == bars['low'].min()
+        assert row['close'] == bars['close'].iloc[-1]
+
+    def test_intraday_resample_anchors_at_session_open(self):
+        bars = _session_bars(days=1)
+
+        hourly = MultiTimeframeBarService.resample(bars, '1H')
+        four_hour = MultiTimeframeBarService.resample(bars, '4H')
+
+        assert hourly.index[0] == pd.Timestamp("2024-01-02 09:30")
+        assert len(hourly) == 7  # 09:30 ... 15:30, the last one a half hour
+        assert hourly['volume'].iloc[0] == 4 * 100.0
+        assert list(four_hour.index) == [pd.Timestamp("2024-01-02 09:30"), pd.Timestamp("2024-01-02 13:30")]
+        assert four_hour['volume'].iloc[0] == 16 * 100.0
+
+    def test_derived_frames_reused_until_new_base_bar(self):
+        loader = RecordingLoader(_session_bars())
+        service = MultiTimeframeBarService(loader)
+
+        first = service.get_bars("AAPL", '1H', 10)
+        service.get_bars("AAPL", '1H', 10)
+        assert service.get_metrics()['resamples'] == 1
+        assert service.get_metrics()['derived_hits'] == 1
+
+        next_bar = first.index[-1] + pd.Timedelta(minutes=45)
+        service.add_base_bar("AAPL", {'date': next_bar, 'open': 1.0, 'high': 2.0, 'low': 0.5,
+                                      'close': 999.0, 'volume': 10.0})
+        updated = service.get_bars("AAPL", '1H', 10)
+
+        assert updated['close'].iloc[-1] == 999.0
+        assert service.get_metrics()['resamples'] == 2
+        assert len(loader.calls) == 1
+
+    def test_base_is_refetched_after_a_base_period(self):
+        now = [0.0]
+        loader = RecordingLoader(_session_bars())
+        service = MultiTimeframeBarService(loader, clock=lambda: now[0])
+
+        service.get_bars("AAPL", '1H', 10)
+        now[0] += 15 * 60
+        service.get_bars("AAPL", '1H', 10)
+
+        assert len(loader.calls) == 2
+        assert service.get_metrics()['resamples'] == 1  # Same bars came back - derived frame kept
+
+    def test_finer_timeframes_and_untimed_data_go_to_the_loader(self):
+        loader = RecordingLoader(_session_bars())
+        service = MultiTimeframeBarService(loader, base_timeframe='15min')
+        service.get_bars("AAPL", '5min', 10)
+        assert loader.calls[-1][1] == '5min'
+
+        untimed = RecordingLoader(pd.DataFrame({'close': range(100)}))
+        service = MultiTimeframeBarService(untimed)
+        service.get_bars("AAPL", '4H', 10)
+        assert [call[1] for call in untimed.calls] == ['15min', '4H']
+
+    def test_unknown_base_timeframe_rejected(self):
+        with pytest.raises(ValueError):
+            MultiTimeframeBarService(lambda *args: None, base_timeframe='2W')
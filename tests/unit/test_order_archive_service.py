@@ -0,0 +1,122 @@
+"""
+Tests for OrderArchiveService: moving terminal orders and telemetry into
+per-month archive tables while keeping them visible through union views.
+"""
+
+import datetime
+
+import pytest
+from sqlalchemy import func, inspect, select
+
+from src.core.models import (
+    ExecutedOrderDB, MarketSnapshotDB, OrderAttemptDB, PlannedOrderDB
+)
+from src.trading.orders.order_archive_service import OrderArchiveService
+
+
+NOW = datetime.datetime(2024, 6, 15, 12, 0)
+OLD = datetime.datetime(2024, 3, 10, 12, 0)
+ARCHIVE_CONFIG = {'archive': {'order_retention_days': 30, 'telemetry_retention_days': 14, 'batch_size': 2}}
+
+
+def _add_order(session, strategy, symbol, status, updated_at, is_open=None):
+    order = PlannedOrderDB(
+        symbol=symbol, security_type="STK", action="BUY", order_type="LMT",
+        entry_price=100.0, stop_loss=95.0, risk_per_trade=0.01, risk_reward_ratio=2.0,
+        priority=3, position_strategy_id=strategy.id, status=status,
+        created_at=updated_at, updated_at=updated_at
+    )
+    session.add(order)
+    session.flush()
+    if is_open is not None:
+        session.add(ExecutedOrderDB(
+            planned_order_id=order.id, filled_price=100.0, filled_quantity=10,
+            status="FILLED", is_open=is_open, executed_at=updated_at
+        ))
+    session.add(OrderAttemptDB(planned_order_id=order.id, attempt_type="PLACEMENT", attempt_ts=updated_at))
+    return order
+
+
+@pytest.fixture
+def seeded_session(db_session, position_strategies):
+    day = position_strategies["DAY"]
+    _add_order(db_session, day, "OLDCXL", "CANCELLED", OLD)
+    _add_order(db_session, day, "OLDCLOSED", "FILLED", OLD, is_open=False)
+    _add_order(db_session, day, "OLDOPEN", "FILLED", OLD, is_open=True)
+    _add_order(db_session, day, "OLDPEND", "PENDING", OLD)
+    _add_order(db_session, day, "NEWCXL", "CANCELLED", NOW)
+    db_session.add(MarketSnapshotDB(symbol="OLDCXL", last=100.0, timestamp=OLD))
+    db_session.add(MarketSnapshotDB(symbol="NEWCXL", last=100.0, timestamp=NOW))
+    db_session.commit()
+    return db_session
+
+
+def _symbols(session, table):
+    return {row.symbol for row in session.execute(select(table.c.symbol))}
+
+
+class TestOrderArchiveService:
+
+    def test_archive_moves_terminal_orders_with_children(self, seeded_session):
+        moved = OrderArchiveService(seeded_session, ARCHIVE_CONFIG).archive(now=NOW)
+
+        assert moved['planned_orders'] == 2
+        assert moved['executed_orders'] == 1
+        assert moved['market_snapshots'] == 1
+        assert _symbols(seeded_session, PlannedOrderDB.__table__) == {"OLDOPEN", "OLDPEND", "NEWCXL"}
+        assert seeded_session.query(ExecutedOrderDB).count() == 1
+        assert seeded_session.query(MarketSnapshotDB).count() == 1
+
+        tables = inspect(seeded_session.connection()).get_table_names()
+        assert "planned_orders_archive_202403" in tables
+        assert "executed_orders_archive_202403" in tables
+
+    def test_open_positions_are_never_archived(self, seeded_session):
+        OrderArchiveService(seeded_session, ARCHIVE_CONFIG).archive(now=NOW)
+
+        open_positions = seeded_session.query(ExecutedOrderDB).filter_by(is_open=True).all()
+        assert [p.planned_order.symbol for p in open_positions] == ["OLDOPEN"]
+
+    def test_union_view_still_returns_full_history(self, seeded_session):
+        archiver = OrderArchiveService(seeded_session, ARCHIVE_CONFIG)
+        archiver.archive(now=NOW)
+
+        all_orders = archiver.union_table(PlannedOrderDB)
+        assert _symbols(seeded_session, all_orders) == {"OLDCXL", "OLDCLOSED", "OLDOPEN", "OLDPEND", "NEWCXL"}
+
+        cancelled = seeded_session.execute(
+            archiver.select_all(PlannedOrderDB, all_orders.c.status == "CANCELLED")
+        ).all()
+        assert {row.symbol for row in cancelled} == {"OLDCXL", "NEWCXL"}
+
+        attempts = archiver.union_table(OrderAttemptDB)
+        assert seeded_session.execute(select(func.count()).select_from(attempts)).scalar() == 5
+
+    def test_archive_is_idempotent(self, seeded_session):
+        archiver = OrderArchiveService(seeded_session, ARCHIVE_CONFIG)
+        archiver.archive(now=NOW)
+        second = archiver.archive(now=NOW)
+
+        assert sum(second.values()) == 0
+        all_orders = archiver.union_table(PlannedOrderDB)
+        assert seeded_session.execute(select(func.count()).select_from(all_orders)).scalar() == 5
+
+    def test_union_view_created_lazily_without_archive_run(self, seeded_session):
+        archiver = OrderArchiveService(seeded_session, ARCHIVE_CONFIG)
+
+        all_orders = archiver.union_table(PlannedOrderDB)
+        assert seeded_session.execute(select(func.count()).select_from(all_orders)).scalar() == 5
+
+    def test_archived_filled_plan_is_not_placed_again(self, seeded_session):
+        from unittest.mock import Mock, patch
+        from src.trading.orders.order_loading_service import OrderLoadingService
+        from src.trading.orders.planned_order import Action, PlannedOrder, SecurityType
+
+        OrderArchiveService(seeded_session, ARCHIVE_CONFIG).archive(now=NOW)
+        assert seeded_session.query(PlannedOrderDB).filter_by(symbol="OLDCLOSED").count() == 0
+
+        plan_row = PlannedOrder(security_type=SecurityType.STK, exchange="SMART", currency="USD",
+                                action=Action.BUY, symbol="OLDCLOSED", entry_price=100.0, stop_loss=95.0)
+        service = OrderLoadingService(Mock(), seeded_session, {})
+        with patch('src.trading.orders.planned_order.PlannedOrderManager.from_excel', return_value=[plan_row]):
+            assert service.load_and_validate_orders('plan.xlsx') == []
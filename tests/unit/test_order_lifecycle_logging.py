@@ -161,6 +161,21 @@ class TestOrderLifecycleLogging:
             # Verify fallback logging was called
             lifecycle_manager.context_logger.log_event.assert_called()
 
+    def test_daily_volume_is_fetched_as_execution_critical(self, lifecycle_manager):
+        """Uncached AON volume history goes through the shared scheduler ahead of scanner work."""
+        import pandas as pd
+        from concurrent.futures import Future
+        from src.market_data.managers.historical_request_scheduler import (
+            HistoricalRequestPriority, get_historical_request_scheduler
+        )
+
+        bars = Future()
+        bars.set_result(pd.DataFrame({'close': 10.0, 'volume': [1000.0, 3000.0]}))
+        with patch.object(get_historical_request_scheduler(), 'submit', return_value=bars) as submit:
+            assert lifecycle_manager._get_daily_volume("XYZ") == 2000.0
+
+        assert submit.call_args.kwargs['priority'] == HistoricalRequestPriority.EXECUTION_CRITICAL
+
     def test_order_persistence_logging(self, lifecycle_manager, sample_planned_order):
         """Test logging for order persistence operations."""
         # Mock no existing order and successful persistence
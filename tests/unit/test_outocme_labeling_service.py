@@ -100,8 +100,9 @@ class TestOutcomeLabelingService:
         )
         probability_score = self._make_probability_score()
 
-        self.db_session.query().filter().all.return_value = [label]
-        self.db_session.query().filter_by().order_by().first.return_value = probability_score
+        # Labels and their latest score are read from the archive-spanning views
+        self.db_session.execute.return_value.all.return_value = [label]
+        self.db_session.execute.return_value.first.return_value = probability_score
 
         output_file = tmp_path / "training.csv"
         success = self.service.export_training_data(str(output_file))
@@ -0,0 +1,137 @@
+"""
+Query-count budgets for reporting and position queries.
+Guards against N+1 relationship loads creeping back into hot paths.
+"""
+
+import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from src.core.models import PlannedOrderDB, ExecutedOrderDB, TradingSetup
+from src.services.end_of_day_service import EndOfDayService, EODConfig
+from src.services.market_hours_service import MarketHoursService
+from src.services.state_service import StateService
+from src.trading.orders.order_persistence_service import OrderPersistenceService
+
+
+POSITION_COUNT = 5
+
+
+@pytest.fixture
+def populated_session(db_session, position_strategies):
+    """Seed several planned orders with open executions under one setup."""
+    setup = TradingSetup(name="Breakout")
+    db_session.add(setup)
+    db_session.flush()
+
+    for i in range(POSITION_COUNT):
+        planned = PlannedOrderDB(
+            symbol=f"SYM{i}",
+            security_type="STK",
+            action="BUY",
+            order_type="LMT",
+            entry_price=100.0 + i,
+            stop_loss=95.0,
+            risk_per_trade=0.01,
+            risk_reward_ratio=2.0,
+            priority=3,
+            setup_id=setup.id,
+            position_strategy_id=position_strategies["DAY"].id,
+            status="FILLED",
+            core_timeframe="15min"
+        )
+        db_session.add(planned)
+        db_session.flush()
+        db_session.add(ExecutedOrderDB(
+            planned_order_id=planned.id,
+            filled_price=101.0 + i,
+            filled_quantity=10,
+            commission=1.0,
+            pnl=10.0 * (1 if i % 2 == 0 else -1),
+            status="FILLED",
+            is_open=True,
+            account_number="DU123",
+            executed_at=datetime.datetime.now()
+        ))
+    db_session.commit()
+    # Start every budgeted block from a cold identity map
+    db_session.expunge_all()
+    return db_session
+
+
+class TestQueryBudgets:
+    """Each reporting path must stay within a fixed number of SQL statements."""
+
+    def test_open_positions_load_planned_orders_in_one_query(self, populated_session, query_counter):
+        state_service = StateService(populated_session)
+
+        with query_counter() as qc:
+            positions = state_service.get_open_positions()
+            symbols = [p.planned_order.symbol for p in positions]
+            strategies = [p.planned_order.position_strategy_id for p in positions]
+
+        assert len(symbols) == POSITION_COUNT
+        assert len(strategies) == POSITION_COUNT
+        qc.assert_within_budget(1)
+
+    def test_open_positions_symbol_filter_in_one_query(self, populated_session, query_counter):
+        state_service = StateService(populated_session)
+
+        with query_counter() as qc:
+            positions = state_service.get_open_positions("SYM1")
+            symbols = [p.planned_order.symbol for p in positions]
+
+        assert symbols == ["SYM1"]
+        qc.assert_within_budget(1)
+
+    def test_trades_by_setup_in_one_query(self, populated_session, query_counter):
+        persistence = OrderPersistenceService(populated_session)
+
+        with query_counter() as qc:
+            trades = persistence.get_trades_by_setup("Breakout", "DU123")
+
+        assert len(trades) == POSITION_COUNT
+        assert {t['symbol'] for t in trades} == {f"SYM{i}" for i in range(POSITION_COUNT)}
+        assert all(t['trading_setup'] == "Breakout" for t in trades)
+        assert all(t['timeframe'] == "15min" for t in trades)
+        qc.assert_within_budget(1)
+
+    def test_all_trading_setups_in_one_query(self, populated_session, query_counter):
+        persistence = OrderPersistenceService(populated_session)
+
+        with query_counter() as qc:
+            setups = persistence.get_all_trading_setups("DU123")
+
+        assert setups == ["Breakout"]
+        qc.assert_within_budget(1)
+
+    def test_eod_position_classification_does_not_lazy_load(self, populated_session, query_counter):
+        state_service = StateService(populated_session)
+        eod_service = EndOfDayService(state_service, Mock(spec=MarketHoursService), EODConfig())
+
+        with query_counter() as qc:
+            positions = state_service.get_open_positions()
+            day_positions = [p for p in positions if eod_service._is_day_position(p)]
+            hybrid_positions = [p for p in positions if eod_service._is_hybrid_position(p)]
+            symbols = [eod_service._get_position_symbol(p) for p in day_positions]
+
+        assert len(day_positions) == POSITION_COUNT
+        assert hybrid_positions == []
+        assert "UNKNOWN" not in symbols
+        qc.assert_within_budget(1)
+
+    def test_realized_pnl_windows_in_one_query(self, populated_session, query_counter):
+        persistence = OrderPersistenceService(populated_session)
+        for days_ago in (0, 3, 20, 45):
+            persistence.record_realized_pnl(
+                order_id=None, symbol="SYM0", pnl=-10.0,
+                exit_date=datetime.datetime.now() - datetime.timedelta(days=days_ago),
+                account_number="DU123"
+            )
+
+        with query_counter() as qc:
+            windows = persistence.get_realized_pnl_windows("DU123", (1, 7, 30))
+
+        assert [float(windows[d]) for d in (1, 7, 30)] == [-10.0, -20.0, -30.0]
+        qc.assert_within_budget(1)
@@ -20,7 +20,7 @@ class TestRiskCapping(unittest.TestCase):
         self.risk_service = RiskManagementService(
             state_service=MagicMock(spec=StateService),
             persistence_service=MagicMock(spec=OrderPersistenceService),
-            ibkr_client=MagicMock(),
+            ibkr_client=MagicMock(account_number="DU123"),
             config={
                 'risk_limits': {
                     'max_risk_per_trade': Decimal('0.02'),  # 2% max
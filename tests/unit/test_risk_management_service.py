@@ -22,6 +22,7 @@ class TestRiskManagementService(unittest.TestCase):
         self.mock_state_service = MagicMock(spec=StateService)
         self.mock_persistence = MagicMock(spec=OrderPersistenceService)
         self.mock_ibkr_client = MagicMock()
+        self.mock_ibkr_client.account_number = "DU123"
         
         # Use keyword arguments to ensure correct parameter mapping
         self.risk_service = RiskManagementService(
@@ -234,6 +235,26 @@ class TestRiskManagementService(unittest.TestCase):
         
         self.assertTrue(success, "Should handle persistence exceptions gracefully")
     
+    def test_trading_halt_check_reads_ledger_windows_every_call(self):
+        """Test halt checks re-read realized P&L windows on every call (no stale cache)."""
+        self.mock_ibkr_client.connected = False
+        self.mock_ibkr_client.account_number = "DU123"
+        self.mock_persistence.get_realized_pnl_windows.return_value = {
+            1: Decimal('0'), 7: Decimal('0'), 30: Decimal('0')
+        }
+        
+        self.assertTrue(self.risk_service._check_trading_halts())
+        
+        # A large loss lands in the ledger; the very next check must see it
+        self.mock_persistence.get_realized_pnl_windows.return_value = {
+            1: Decimal('-5000'), 7: Decimal('-5000'), 30: Decimal('-5000')
+        }
+        self.assertFalse(self.risk_service._check_trading_halts())
+        self.assertIn("Daily loss limit exceeded", self.risk_service._halt_reason)
+        
+        self.mock_persistence.get_realized_pnl_windows.assert_called_with("DU123", (1, 7, 30))
+        self.assertEqual(self.mock_persistence.get_realized_pnl_windows.call_count, 2)
+    
     def test_pnl_calculation_edge_cases(self):
         """Test P&L calculation with edge case values."""
         # Very small values
@@ -278,6 +299,7 @@ class TestRiskCappingFunctionality(unittest.TestCase):
         self.mock_state_service = MagicMock(spec=StateService)
         self.mock_persistence = MagicMock(spec=OrderPersistenceService)
         self.mock_ibkr_client = MagicMock()
+        self.mock_ibkr_client.account_number = "DU123"
         
         # Create risk service with specific config for testing
         # Use the proper config structure that matches RiskManagementService expectations
@@ -36,6 +36,8 @@ class TestStateServiceLogging:
             
             service = StateService(db_session=mock_db_session)
             service.context_logger = mock_logger  # Ensure the logger is set
+            # Ledger/rollup writes are covered by DB-backed tests; keep this suite on the mocked session
+            service.persistence_service = Mock()
             
             return service
 
@@ -257,7 +259,7 @@ class TestStateServiceLogging:
     def test_open_positions_query_logging(self, state_service, mock_db_session):
         """Test logging for open positions queries."""
         # Mock empty positions list
-        mock_db_session.query.return_value.filter_by.return_value.join.return_value.filter.return_value.all.return_value = []
+        mock_db_session.query.return_value.options.return_value.filter_by.return_value.join.return_value.filter.return_value.all.return_value = []
         
         positions = state_service.get_open_positions(symbol="AAPL")
         
@@ -325,7 +327,7 @@ class TestStateServiceLogging:
     def test_open_position_check_logging(self, state_service, mock_db_session):
         """Test logging for open position checks."""
         # Mock no open positions
-        mock_db_session.query.return_value.filter_by.return_value.join.return_value.filter.return_value.all.return_value = []
+        mock_db_session.query.return_value.options.return_value.filter_by.return_value.join.return_value.filter.return_value.all.return_value = []
         
         has_position = state_service.has_open_position(symbol="AAPL")
         